@@ -0,0 +1,428 @@
+"""corpus.py — Seeded synthetic task corpora for scale-testing dedup and storage.
+
+Generates ``UnifiedTask`` streams of any size with a controlled duplicate
+rate and ground-truth cluster labels. Duplicates are near-copies of a
+recent task from another source, perturbed the way real cross-posted tasks
+differ: ``[GMAIL]``-style prefixes on Notion copies, typos, punctuation and
+case changes, and due-date jitter. Canonical titles are drawn from the
+vocabulary fixture, so unrelated tasks can still look alike (same verb and
+object, different client or reference) and precision is meaningful.
+
+The stream is produced lazily with bounded memory (only a window of recent
+clusters is kept), so corpora of a million tasks can be written straight to
+JSONL or to a SQLite database created by ``db.sqlite_store``.
+
+Usage:
+    python -m benchmarks.corpus generate --size 100000 --output corpus.jsonl
+    python -m benchmarks.corpus generate --size 1000000 --format sqlite --output corpus.db
+    python -m benchmarks.corpus evaluate --size 2000 --duplicate-rate 0.3
+    python -m benchmarks.corpus evaluate --input corpus.db
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(ROOT, "src") not in sys.path:
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from models import TaskPriority, TaskSource, UnifiedTask  # noqa: E402
+
+try:
+    from benchmarks.fake_servers import load_fixture
+except ImportError:
+    from fake_servers import load_fixture
+
+# Recent clusters a duplicate may copy from; bounds generator memory.
+CLUSTER_WINDOW = 256
+
+# Rows per transaction when writing a SQLite corpus.
+SQLITE_CHUNK_SIZE = 5000
+
+# Ground-truth labels stored next to the ``tasks`` table in SQLite corpora.
+_LABELS_SQL = """
+CREATE TABLE IF NOT EXISTS corpus_labels (
+    task_id     TEXT    PRIMARY KEY,
+    cluster     INTEGER NOT NULL
+)
+"""
+
+
+class LabeledTask(NamedTuple):
+    """A generated task and the ID of the ground-truth cluster it belongs to."""
+
+    task: UnifiedTask
+    cluster: int
+
+
+class _Cluster(NamedTuple):
+    id: int
+    task: UnifiedTask
+
+
+# ---------------------------------------------------------------------------
+# Perturbations
+# ---------------------------------------------------------------------------
+
+
+def _typo(rng: random.Random, title: str) -> str:
+    """Swap, drop, double or replace one letter."""
+    positions = [i for i, c in enumerate(title) if c.isalpha()]
+    if len(positions) < 4:
+        return title
+    i = rng.choice(positions[1:-1])
+    op = rng.randrange(4)
+    if op == 0 and title[i + 1].isalpha():
+        return title[:i] + title[i + 1] + title[i] + title[i + 2:]
+    if op == 1:
+        return title[:i] + title[i + 1:]
+    if op == 2:
+        return title[:i] + title[i] + title[i:]
+    return title[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + title[i + 1:]
+
+
+def _punctuation(rng: random.Random, title: str) -> str:
+    words = title.split(" ")
+    op = rng.randrange(5)
+    if op == 0:
+        return title + rng.choice(("!", ".", "?", " !!"))
+    if op == 1 and len(words) > 1:
+        return words[0] + ": " + " ".join(words[1:])
+    if op == 2 and len(words) > 2:
+        k = rng.randrange(1, len(words) - 1)
+        return " ".join(words[:k]) + " - " + " ".join(words[k:])
+    if op == 3:
+        return f'"{title}"'
+    return title.replace(" ", "  ", 1)
+
+
+def _case(rng: random.Random, title: str) -> str:
+    return rng.choice((title.lower(), title.title(), title.upper(), title.capitalize()))
+
+
+_PERTURBATIONS = (_typo, _punctuation, _case)
+
+
+# ---------------------------------------------------------------------------
+# Generator
+# ---------------------------------------------------------------------------
+
+
+class CorpusGenerator:
+    """Seeded generator of labeled task streams.
+
+    Each task is, with probability ``duplicate_rate``, a perturbed copy of
+    a task from one of the last ``CLUSTER_WINDOW`` clusters (from a
+    different source); otherwise it starts a new cluster. The expected
+    fraction of tasks that duplicate an earlier one is therefore
+    ``duplicate_rate``.
+
+    Args:
+        duplicate_rate: Fraction of tasks that are duplicates (0.0-1.0).
+        seed: Random seed; equal seeds give identical streams.
+        start: Earliest due date (default: 2026-01-01 UTC).
+        due_days: Span of canonical due dates, in days.
+        due_jitter_hours: Maximum due-date shift of a duplicate.
+        no_due_rate: Fraction of tasks without a due date.
+    """
+
+    def __init__(
+        self,
+        duplicate_rate: float = 0.2,
+        seed: int = 0,
+        start: Optional[datetime] = None,
+        due_days: int = 365,
+        due_jitter_hours: float = 12.0,
+        no_due_rate: float = 0.1,
+    ) -> None:
+        if not 0.0 <= duplicate_rate < 1.0:
+            raise ValueError("duplicate_rate must be in [0.0, 1.0)")
+        self.duplicate_rate = duplicate_rate
+        self.seed = seed
+        self.start = start or datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.due_days = due_days
+        self.due_jitter_hours = due_jitter_hours
+        self.no_due_rate = no_due_rate
+        self.vocab = load_fixture("vocabulary")
+
+    def _title(self, rng: random.Random) -> str:
+        v = self.vocab
+        parts = [rng.choice(v["verbs"]), rng.choice(v["objects"])]
+        if rng.random() < 0.5:
+            parts.append(f"for {rng.choice(v['clients'])}")
+        qualifier = rng.choice(v["qualifiers"])
+        if qualifier:
+            parts.append(qualifier)
+        if rng.random() < 0.3:
+            parts.append(f"#{rng.randrange(100, 100000)}")
+        return " ".join(parts)
+
+    def _canonical(self, rng: random.Random, seq: int) -> UnifiedTask:
+        source = rng.choice(list(TaskSource))
+        due = None
+        if rng.random() >= self.no_due_rate:
+            due = self.start + timedelta(days=rng.randrange(self.due_days), hours=rng.randrange(24))
+        return UnifiedTask(
+            id=f"{source.value}-{seq:08d}",
+            source=source,
+            title=self._title(rng),
+            snippet=rng.choice(self.vocab["snippets"]) if rng.random() < 0.6 else None,
+            status="Pending",
+            priority=rng.choice(list(TaskPriority)),
+            due_date=due,
+        )
+
+    def _duplicate(self, rng: random.Random, seq: int, original: UnifiedTask) -> UnifiedTask:
+        others = [s for s in TaskSource if s.value != original.source]
+        # The sync engine copies tasks into Notion as "[SOURCE] title".
+        if original.source != TaskSource.NOTION.value and rng.random() < 0.4:
+            source = TaskSource.NOTION
+        else:
+            source = rng.choice(others)
+
+        title = original.title
+        for perturb in rng.sample(_PERTURBATIONS, rng.randint(1, len(_PERTURBATIONS))):
+            title = perturb(rng, title)
+        if source == TaskSource.NOTION:
+            title = f"[{original.source.upper()}] {title}"
+
+        due = original.due_date
+        if due is not None:
+            if rng.random() < self.no_due_rate:
+                due = None
+            else:
+                jitter = rng.uniform(-self.due_jitter_hours, self.due_jitter_hours)
+                due = due + timedelta(hours=jitter)
+
+        priority = original.priority if rng.random() < 0.7 else rng.choice(list(TaskPriority))
+        return UnifiedTask(
+            id=f"{source.value}-{seq:08d}",
+            source=source,
+            title=title,
+            snippet=original.snippet if rng.random() < 0.5 else None,
+            status="Pending",
+            priority=priority,
+            due_date=due,
+        )
+
+    def generate(self, size: int) -> Iterator[LabeledTask]:
+        """Yield ``size`` labeled tasks."""
+        rng = random.Random(self.seed)
+        recent: Deque[_Cluster] = deque(maxlen=CLUSTER_WINDOW)
+        clusters = 0
+        for seq in range(size):
+            if recent and rng.random() < self.duplicate_rate:
+                cluster = rng.choice(recent)
+                yield LabeledTask(self._duplicate(rng, seq, cluster.task), cluster.id)
+            else:
+                task = self._canonical(rng, seq)
+                recent.append(_Cluster(clusters, task))
+                yield LabeledTask(task, clusters)
+                clusters += 1
+
+
+def generate_corpus(size: int, duplicate_rate: float = 0.2, seed: int = 0, **kwargs: Any) -> Iterator[LabeledTask]:
+    """Yield ``size`` labeled tasks; see ``CorpusGenerator`` for options."""
+    return CorpusGenerator(duplicate_rate=duplicate_rate, seed=seed, **kwargs).generate(size)
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def _pairs(n: int) -> int:
+    return n * (n - 1) // 2
+
+
+def pairwise_scores(truth: Sequence[int], predicted: Sequence[int]) -> Dict[str, float]:
+    """Pairwise precision, recall and F1 of a clustering.
+
+    A pair of tasks counts as predicted when both carry the same
+    ``predicted`` label and as true when both carry the same ``truth``
+    label. Computed from cluster sizes, without enumerating pairs.
+    """
+    if len(truth) != len(predicted):
+        raise ValueError("truth and predicted must label the same tasks")
+    true_pairs = sum(_pairs(n) for n in Counter(truth).values())
+    found_pairs = sum(_pairs(n) for n in Counter(predicted).values())
+    correct = sum(_pairs(n) for n in Counter(zip(truth, predicted)).values())
+    precision = correct / found_pairs if found_pairs else 1.0
+    recall = correct / true_pairs if true_pairs else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def evaluate_dedup(labeled: Iterable[LabeledTask], **params: Any) -> Dict[str, Any]:
+    """Run ``dedup.unifier.cluster_tasks`` over a labeled corpus.
+
+    Args:
+        labeled: Labeled tasks (e.g. from ``generate_corpus``).
+        **params: Forwarded to ``cluster_tasks`` (``similarity_threshold``,
+            ``date_window``).
+
+    Returns:
+        Task and cluster counts, pairwise precision/recall/F1, and the
+        clustering time and throughput.
+    """
+    from dedup.unifier import cluster_tasks
+
+    items = list(labeled)
+    tasks = [item.task for item in items]
+    start = time.perf_counter()
+    clusters = cluster_tasks(tasks, **params)
+    seconds = time.perf_counter() - start
+
+    predicted = [0] * len(tasks)
+    for label, members in enumerate(clusters):
+        for i in members:
+            predicted[i] = label
+    report: Dict[str, Any] = {
+        "tasks": len(tasks),
+        "true_clusters": len({item.cluster for item in items}),
+        "found_clusters": len(clusters),
+    }
+    report.update(pairwise_scores([item.cluster for item in items], predicted))
+    report["seconds"] = round(seconds, 3)
+    report["tasks_per_s"] = round(len(tasks) / seconds, 1) if seconds > 0 else 0.0
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def write_jsonl(labeled: Iterable[LabeledTask], out: IO[str]) -> int:
+    """Write one ``{"cluster": ..., "task": {...}}`` object per line."""
+    count = 0
+    for item in labeled:
+        out.write(json.dumps({"cluster": item.cluster, "task": item.task.model_dump(mode="json")}))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[LabeledTask]:
+    """Parse the output of ``write_jsonl``."""
+    for line in lines:
+        if line.strip():
+            obj = json.loads(line)
+            yield LabeledTask(UnifiedTask(**obj["task"]), int(obj["cluster"]))
+
+
+def write_sqlite(labeled: Iterable[LabeledTask], path: str, chunk_size: int = SQLITE_CHUNK_SIZE) -> int:
+    """Store tasks with ``db.sqlite_store`` plus a ``corpus_labels`` table."""
+    from db.sqlite_store import init_db, save_tasks
+    from pipeline import chunked
+
+    conn = init_db(path)
+    try:
+        conn.execute(_LABELS_SQL)
+        count = 0
+        for chunk in chunked(labeled, chunk_size):
+            save_tasks(conn, (item.task for item in chunk), chunk_size=chunk_size)
+            conn.executemany(
+                "INSERT OR REPLACE INTO corpus_labels (task_id, cluster) VALUES (?, ?)",
+                [(item.task.id, item.cluster) for item in chunk],
+            )
+            conn.commit()
+            count += len(chunk)
+        return count
+    finally:
+        conn.close()
+
+
+def read_sqlite(path: str) -> List[LabeledTask]:
+    """Load a corpus written by ``write_sqlite``, in generation order."""
+    from db.sqlite_store import get_task, init_db
+
+    conn = init_db(path)
+    try:
+        rows = conn.execute("SELECT task_id, cluster FROM corpus_labels ORDER BY rowid").fetchall()
+        out = []
+        for task_id, cluster in rows:
+            task = get_task(conn, task_id)
+            if task is not None:
+                out.append(LabeledTask(task, cluster))
+        return out
+    finally:
+        conn.close()
+
+
+def load_corpus(path: str) -> List[LabeledTask]:
+    """Load a ``.jsonl`` or SQLite corpus file."""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as fh:
+            return list(read_jsonl(fh))
+    try:
+        return read_sqlite(path)
+    except sqlite3.DatabaseError as exc:
+        raise ValueError(f"{path} is neither a .jsonl nor a SQLite corpus: {exc}") from exc
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic G_TaskCenter task corpora.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def corpus_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--size", type=int, default=1000, help="Number of tasks.")
+        p.add_argument("--duplicate-rate", type=float, default=0.2,
+                       help="Fraction of tasks that duplicate an earlier one.")
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--due-jitter-hours", type=float, default=12.0,
+                       help="Maximum due-date shift of a duplicate.")
+
+    gen = sub.add_parser("generate", help="Write a labeled corpus.")
+    corpus_args(gen)
+    gen.add_argument("--format", choices=("jsonl", "sqlite"), default="jsonl")
+    gen.add_argument("--output", default="-", help="Output path ('-' for stdout, JSONL only).")
+
+    ev = sub.add_parser("evaluate", help="Measure dedup precision/recall and throughput.")
+    corpus_args(ev)
+    ev.add_argument("--input", help="Evaluate a stored corpus instead of generating one.")
+    ev.add_argument("--threshold", type=float, default=None, help="Similarity threshold override.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        stream = generate_corpus(args.size, args.duplicate_rate, args.seed,
+                                 due_jitter_hours=args.due_jitter_hours)
+        start = time.perf_counter()
+        if args.format == "sqlite":
+            if args.output == "-":
+                parser.error("--format sqlite needs --output PATH")
+            count = write_sqlite(stream, args.output)
+        elif args.output == "-":
+            count = write_jsonl(stream, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as fh:
+                count = write_jsonl(stream, fh)
+        print(f"Wrote {count} tasks in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        return 0
+
+    if args.input:
+        labeled = load_corpus(args.input)
+    else:
+        labeled = list(generate_corpus(args.size, args.duplicate_rate, args.seed,
+                                       due_jitter_hours=args.due_jitter_hours))
+    params = {} if args.threshold is None else {"similarity_threshold": args.threshold}
+    print(json.dumps(evaluate_dedup(labeled, **params), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
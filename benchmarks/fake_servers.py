@@ -0,0 +1,744 @@
+"""fake_servers.py — Local HTTP stand-ins for every G_TaskCenter provider.
+
+Each ``FakeProvider`` serves a deterministic backlog of ``size`` items built
+from the payload templates in ``benchmarks/fixtures/`` (shaped after each
+provider's documented response format), with the provider's real pagination
+scheme and 429 responses. A ``ProviderProfile`` adds per-request latency and
+a server-side rate limit, so the same scenario can be measured on a
+loopback-fast backend or one that throttles like production.
+
+Servers count requests per endpoint, throttled responses and bytes moved;
+the benchmark runner reads those counters after each scenario. Providers
+with ``etags`` set (n8n) tag GET responses with an ``ETag`` and answer a
+matching ``If-None-Match`` with 304.
+
+Usage:
+    with FakeServer(JiraFake(size=500, profile=PROFILES["realistic"]["jira"])) as srv:
+        os.environ["JIRA_BASE_URL"] = srv.url
+        ...
+        srv.provider.stats()
+"""
+
+import copy
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# (status, JSON body or None, extra headers)
+Response = Tuple[int, Optional[Any], Dict[str, str]]
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    """Load ``benchmarks/fixtures/<name>.json``."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+# ---------------------------------------------------------------------------
+# Profiles
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ProviderProfile:
+    """Server-side behaviour of a fake provider.
+
+    ``rate``/``burst`` bound what the server accepts (None for unlimited);
+    requests beyond it get a 429 with ``Retry-After: retry_after``.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate: Optional[float] = None
+    burst: int = 1
+    retry_after: float = 1.0
+
+
+_LOCAL = ProviderProfile()
+
+PROFILES: Dict[str, Dict[str, ProviderProfile]] = {
+    # Loopback speed, no server limits: measures client-side overhead.
+    "local": {p: _LOCAL for p in ("notion", "gmail", "graph", "slack", "jira", "n8n")},
+    # Typical round-trip latencies; server limits above the client buckets.
+    "realistic": {
+        "notion": ProviderProfile(120, 40, rate=4.0, burst=10),
+        "gmail": ProviderProfile(60, 20, rate=50.0, burst=50),
+        "graph": ProviderProfile(90, 30, rate=20.0, burst=40),
+        "slack": ProviderProfile(100, 30, rate=2.0, burst=10),
+        "jira": ProviderProfile(150, 50, rate=15.0, burst=20),
+        "n8n": ProviderProfile(20, 5),
+    },
+    # Server limits below the client buckets: exercises 429 handling.
+    "throttled": {
+        "notion": ProviderProfile(120, 40, rate=1.5, burst=2),
+        "gmail": ProviderProfile(60, 20, rate=20.0, burst=10),
+        "graph": ProviderProfile(90, 30, rate=8.0, burst=10),
+        "slack": ProviderProfile(100, 30, rate=0.5, burst=2),
+        "jira": ProviderProfile(150, 50, rate=5.0, burst=5),
+        "n8n": ProviderProfile(20, 5, rate=5.0, burst=5),
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Provider base
+# ---------------------------------------------------------------------------
+
+
+class FakeProvider:
+    """Deterministic backlog plus request accounting for one provider.
+
+    Subclasses fill ``routes`` with ``(method, regex, handler)`` entries;
+    handlers receive the regex match, query parameters and decoded JSON
+    body, and return a ``Response``.
+    """
+
+    name = ""
+    # Send ETags on GET 200s and honour If-None-Match.
+    etags = False
+
+    def __init__(self, size: int, profile: ProviderProfile = _LOCAL, seed: int = 0) -> None:
+        self.size = size
+        self.profile = profile
+        self.fixture = load_fixture(self.name)
+        self.base_url = ""
+        self._rng = random.Random(f"{self.name}:{seed}")
+        self._titles = _titles(size, seed)
+        self._lock = threading.Lock()
+        self._tokens = float(profile.burst)
+        self._last = time.monotonic()
+        self.routes: List[Tuple[str, "re.Pattern", Callable[..., Response]]] = []
+        self.reset_stats()
+
+    # -- accounting -------------------------------------------------------
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests: Counter = Counter()
+            self.throttled = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Round trips, sub-requests carried inside batches, 429s and bytes."""
+        with self._lock:
+            batched = sum(n for k, n in self.requests.items() if k.startswith("$batch "))
+            return {
+                "requests": sum(self.requests.values()) - batched,
+                "batched": batched,
+                "throttled": self.throttled,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "endpoints": dict(self.requests),
+            }
+
+    def _count(self, endpoint: str, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        with self._lock:
+            self.requests[endpoint] += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    # -- server-side limits ----------------------------------------------
+
+    def try_take(self) -> bool:
+        """Take one token from the server-side bucket; False means throttle."""
+        if self.profile.rate is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.profile.burst), self._tokens + (now - self._last) * self.profile.rate
+            )
+            self._last = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.throttled += 1
+            return False
+
+    def latency(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-1.0, 1.0) * self.profile.jitter_ms
+        return max(0.0, self.profile.latency_ms + jitter) / 1000.0
+
+    def throttle_body(self) -> Any:
+        return {"error": "rate_limited"}
+
+    def throttled_response(self) -> Response:
+        return 429, self.throttle_body(), {"Retry-After": f"{self.profile.retry_after:g}"}
+
+    # -- dispatch ---------------------------------------------------------
+
+    def dispatch(
+        self, method: str, raw_path: str, body: bytes, headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """Route one HTTP request; counts it and applies the profile."""
+        status, payload, out = self._route(method, raw_path, body)
+        if self.etags and method == "GET" and status == 200:
+            # Weak ETag over the payload, answered with 304 when it matches.
+            digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+            out = dict(out, ETag=f'W/"{digest}"')
+            if (headers or {}).get("If-None-Match") == out["ETag"]:
+                return 304, None, out
+        return status, payload, out
+
+    def _route(self, method: str, raw_path: str, body: bytes) -> Response:
+        parts = urlsplit(raw_path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        payload = json.loads(body) if body else None
+
+        for route_method, pattern, handler in self.routes:
+            m = pattern.fullmatch(parts.path)
+            if m and route_method == method:
+                self._count(f"{method} {pattern.pattern}", bytes_in=len(body))
+                delay = self.latency()
+                if delay:
+                    time.sleep(delay)
+                if not self._self_throttled(handler) and not self.try_take():
+                    return self.throttled_response()
+                return handler(m, query, payload)
+
+        self._count(f"{method} <unknown>", bytes_in=len(body))
+        return 404, {"error": f"no route for {method} {parts.path}"}, {}
+
+    def _self_throttled(self, handler: Callable[..., Response]) -> bool:
+        """Handlers that throttle per item (Graph $batch) skip the request check."""
+        return getattr(handler, "per_item_throttle", False)
+
+    def record_bytes_out(self, n: int) -> None:
+        with self._lock:
+            self.bytes_out += n
+
+    # -- data -------------------------------------------------------------
+
+    def title(self, i: int) -> str:
+        return self._titles[i % len(self._titles)] if self._titles else f"Task {i}"
+
+    def template(self, key: str) -> Dict[str, Any]:
+        return copy.deepcopy(self.fixture[key])
+
+
+def _titles(size: int, seed: int) -> List[str]:
+    """Task titles drawn from the vocabulary fixture (seeded)."""
+    vocab = load_fixture("vocabulary")
+    rng = random.Random(f"titles:{seed}")
+    out = []
+    for _ in range(max(1, size)):
+        parts = [rng.choice(vocab["verbs"]), rng.choice(vocab["objects"]), rng.choice(vocab["qualifiers"])]
+        out.append(" ".join(p for p in parts if p))
+    return out
+
+
+def _int(value: Optional[str], default: int) -> int:
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _per_item_throttle(fn: Callable[..., Response]) -> Callable[..., Response]:
+    fn.per_item_throttle = True
+    return fn
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+
+_NOTION_STATUSES = ("Not started", "In progress", "Done")
+_NOTION_PRIORITIES = ("High", "Normal", "Low")
+
+
+class NotionFake(FakeProvider):
+    """Notion v1: database query (``start_cursor`` pages of 100), pages create/update."""
+
+    name = "notion"
+    PAGE_SIZE = 100
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pages = [self._page(f"bench-page-{i:06d}", self.title(i), i) for i in range(self.size)]
+        self.routes = [
+            ("POST", re.compile(r"/v1/databases/([^/]+)/query"), self.query),
+            ("POST", re.compile(r"/v1/pages"), self.create),
+            ("PATCH", re.compile(r"/v1/pages/([^/]+)"), self.update),
+        ]
+
+    def _page(self, page_id: str, title: str, i: int) -> Dict[str, Any]:
+        page = self.template("page")
+        page["id"] = page_id
+        props = page["properties"]
+        props["Name"]["title"][0]["text"]["content"] = title
+        props["Name"]["title"][0]["plain_text"] = title
+        props["Status"]["select"]["name"] = _NOTION_STATUSES[i % 3]
+        props["Priority"]["select"]["name"] = _NOTION_PRIORITIES[i % 3]
+        return page
+
+    def throttle_body(self) -> Any:
+        return {
+            "object": "error",
+            "status": 429,
+            "code": "rate_limited",
+            "message": "You have been rate limited. Please try again in a few minutes.",
+        }
+
+    def query(self, m, query, body) -> Response:
+        body = body or {}
+        start = _int(body.get("start_cursor"), 0)
+        page_size = min(_int(str(body.get("page_size", "")), self.PAGE_SIZE), self.PAGE_SIZE)
+        with self._lock:
+            results = self._pages[start : start + page_size]
+            end = start + len(results)
+            has_more = end < len(self._pages)
+        return 200, {
+            "object": "list",
+            "results": results,
+            "next_cursor": str(end) if has_more else None,
+            "has_more": has_more,
+            "type": "page_or_database",
+            "page_or_database": {},
+        }, {}
+
+    def create(self, m, query, body) -> Response:
+        props = (body or {}).get("properties", {})
+        title = "".join(
+            t.get("text", {}).get("content", "") for t in props.get("Name", {}).get("title", [])
+        )
+        with self._lock:
+            i = len(self._pages)
+            page = self._page(f"bench-page-{i:06d}", title, 0)
+            self._pages.append(page)
+        return 200, page, {}
+
+    def update(self, m, query, body) -> Response:
+        page = self._page(m.group(1), "updated", 0)
+        return 200, page, {}
+
+
+class GmailFake(FakeProvider):
+    """Gmail v1: messages.list (``pageToken``), messages.get, messages.batchModify."""
+
+    name = "gmail"
+    PAGE_SIZE = 100
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        prefix = r"/gmail/v1/users/([^/]+)/messages"
+        self.routes = [
+            ("GET", re.compile(prefix), self.list),
+            ("POST", re.compile(prefix + r"/batchModify"), self.batch_modify),
+            ("GET", re.compile(prefix + r"/([^/]+)"), self.get),
+        ]
+
+    def throttle_body(self) -> Any:
+        return {"error": {
+            "code": 429,
+            "message": "User-rate limit exceeded.",
+            "status": "RESOURCE_EXHAUSTED",
+            "errors": [{"message": "User-rate limit exceeded.", "domain": "usageLimits",
+                        "reason": "rateLimitExceeded"}],
+        }}
+
+    def list(self, m, query, body) -> Response:
+        start = _int(query.get("pageToken"), 0)
+        page_size = min(_int(query.get("maxResults"), self.PAGE_SIZE), 500)
+        end = min(start + page_size, self.size)
+        out: Dict[str, Any] = {
+            "messages": [{"id": f"{i:016x}", "threadId": f"{i:016x}"} for i in range(start, end)],
+            "resultSizeEstimate": self.size,
+        }
+        if end < self.size:
+            out["nextPageToken"] = str(end)
+        return 200, out, {}
+
+    def get(self, m, query, body) -> Response:
+        msg_id = m.group(2)
+        i = int(msg_id, 16) if re.fullmatch(r"[0-9a-f]+", msg_id) else 0
+        if i >= self.size:
+            return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}, {}
+        msg = self.template("message")
+        msg["id"] = msg["threadId"] = msg_id
+        if i % 2:
+            msg["labelIds"] = [l for l in msg["labelIds"] if l != "UNREAD"]
+        for header in msg["payload"]["headers"]:
+            if header["name"] == "Subject":
+                header["value"] = f"Task: {self.title(i)}"
+        return 200, msg, {}
+
+    def batch_modify(self, m, query, body) -> Response:
+        return 204, None, {}
+
+
+class GraphFake(FakeProvider):
+    """Microsoft Graph To Do: lists, task pages (``$skiptoken``) and ``$batch``.
+
+    ``size`` tasks are spread over lists of up to ``TASKS_PER_LIST``; every
+    tenth task is completed. ``$batch`` sub-requests are throttled one by
+    one, as Graph does.
+    """
+
+    name = "graph"
+    TASKS_PER_LIST = 200
+    PAGE_SIZE = 50
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.n_lists = max(1, math.ceil(self.size / self.TASKS_PER_LIST))
+        self.routes = [
+            ("GET", re.compile(r"/v1\.0/me/todo/lists"), self.lists),
+            ("POST", re.compile(r"/v1\.0/\$batch"), self.batch),
+            ("GET", re.compile(r"/v1\.0/me/todo/lists/([^/]+)/tasks"), self.tasks),
+            ("PATCH", re.compile(r"/v1\.0/me/todo/lists/([^/]+)/tasks/([^/]+)"), self.patch_task),
+        ]
+
+    def throttle_body(self) -> Any:
+        return {"error": {"code": "TooManyRequests", "message": "Too many requests."}}
+
+    def _list_tasks(self, list_no: int) -> range:
+        start = list_no * self.TASKS_PER_LIST
+        return range(start, min(start + self.TASKS_PER_LIST, self.size))
+
+    def lists(self, m, query, body) -> Response:
+        value = []
+        for n in range(self.n_lists):
+            item = self.template("list")
+            item["id"] = f"list-{n:04d}"
+            item["displayName"] = f"Tasks {n}"
+            value.append(item)
+        return 200, {"@odata.context": f"{self.base_url}/v1.0/$metadata#lists", "value": value}, {}
+
+    def tasks(self, m, query, body) -> Response:
+        list_id = m.group(1)
+        try:
+            list_no = int(list_id.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return 404, {"error": {"code": "ErrorItemNotFound"}}, {}
+        ids = self._list_tasks(list_no)
+        skip = _int(query.get("$skiptoken"), 0)
+        value = []
+        for i in list(ids)[skip : skip + self.PAGE_SIZE]:
+            task = self.template("task")
+            task["id"] = f"task-{i:06d}"
+            task["title"] = self.title(i)
+            task["status"] = "completed" if i % 10 == 9 else "notStarted"
+            task["importance"] = ("high", "normal", "low")[i % 3]
+            value.append(task)
+        out: Dict[str, Any] = {"value": value}
+        if skip + self.PAGE_SIZE < len(ids):
+            out["@odata.nextLink"] = (
+                f"{self.base_url}/v1.0/me/todo/lists/{list_id}/tasks?$skiptoken={skip + self.PAGE_SIZE}"
+            )
+        return 200, out, {}
+
+    def patch_task(self, m, query, body) -> Response:
+        task = self.template("task")
+        task["id"] = m.group(2)
+        task["status"] = (body or {}).get("status", task["status"])
+        return 200, task, {}
+
+    @_per_item_throttle
+    def batch(self, m, query, body) -> Response:
+        responses = []
+        for item in (body or {}).get("requests", []):
+            if not self.try_take():
+                status, payload, headers = self.throttled_response()
+            else:
+                url = item.get("url", "")
+                if url.startswith(self.base_url):
+                    url = url[len(self.base_url):]
+                if not url.startswith("/v1.0"):
+                    url = "/v1.0" + url
+                parts = urlsplit(url)
+                query_ = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                status, payload, headers = 404, {"error": {"code": "BadRequest"}}, {}
+                for route_method, pattern, handler in self.routes:
+                    sub = pattern.fullmatch(parts.path)
+                    if sub and route_method == item.get("method") and handler is not self.batch:
+                        self._count(f"$batch {route_method} {pattern.pattern}")
+                        status, payload, headers = handler(sub, query_, item.get("body"))
+                        break
+            responses.append({"id": item.get("id"), "status": status, "headers": headers, "body": payload})
+        return 200, {"responses": responses}, {}
+
+
+class SlackFake(FakeProvider):
+    """Slack Web API: conversations.list and conversations.history (cursors).
+
+    ``size`` messages are spread over channels of up to
+    ``MESSAGES_PER_CHANNEL``; every other message carries the task reaction.
+    """
+
+    name = "slack"
+    MESSAGES_PER_CHANNEL = 500
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.n_channels = max(1, math.ceil(self.size / self.MESSAGES_PER_CHANNEL))
+        self.routes = [
+            ("GET", re.compile(r"/api/conversations\.list"), self.conversations_list),
+            ("GET", re.compile(r"/api/conversations\.history"), self.history),
+        ]
+
+    def throttle_body(self) -> Any:
+        return {"ok": False, "error": "ratelimited"}
+
+    def conversations_list(self, m, query, body) -> Response:
+        start = _int(query.get("cursor"), 0)
+        limit = _int(query.get("limit"), 100)
+        channels = []
+        for n in range(start, min(start + limit, self.n_channels)):
+            ch = self.template("channel")
+            ch["id"] = f"C{n:08d}"
+            ch["name"] = ch["name_normalized"] = f"tasks-{n}"
+            channels.append(ch)
+        end = start + len(channels)
+        cursor = str(end) if end < self.n_channels else ""
+        return 200, {"ok": True, "channels": channels, "response_metadata": {"next_cursor": cursor}}, {}
+
+    def history(self, m, query, body) -> Response:
+        channel = query.get("channel", "")
+        try:
+            n = int(channel.lstrip("C"))
+        except ValueError:
+            return 200, {"ok": False, "error": "channel_not_found"}, {}
+        first = n * self.MESSAGES_PER_CHANNEL
+        ids = range(first, min(first + self.MESSAGES_PER_CHANNEL, self.size))
+        start = _int(query.get("cursor"), 0)
+        limit = min(_int(query.get("limit"), 100), 999)
+        messages = []
+        for i in list(ids)[start : start + limit]:
+            msg = self.template("message")
+            msg["text"] = self.title(i)
+            # Newest first, as Slack returns them.
+            msg["ts"] = f"{1768208040 - i:d}.{i % 1000000:06d}"
+            msg["client_msg_id"] = f"bench-{i:08d}"
+            if i % 2:
+                msg.pop("reactions", None)
+            messages.append(msg)
+        end = start + len(messages)
+        has_more = end < len(ids)
+        return 200, {
+            "ok": True,
+            "messages": messages,
+            "has_more": has_more,
+            "pin_count": 0,
+            "response_metadata": {"next_cursor": str(end) if has_more else ""},
+        }, {}
+
+
+class JiraFake(FakeProvider):
+    """Jira Cloud: legacy ``startAt`` search, ``/search/jql`` tokens, transitions."""
+
+    name = "jira"
+    MAX_RESULTS = 100
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.routes = [
+            ("GET", re.compile(r"/rest/api/2/search"), self.search),
+            ("GET", re.compile(r"/rest/api/3/search/jql"), self.search_jql),
+            ("GET", re.compile(r"/rest/api/2/issue/([^/]+)/transitions"), self.transitions),
+            ("POST", re.compile(r"/rest/api/2/issue/([^/]+)/transitions"), self.do_transition),
+        ]
+
+    def throttle_body(self) -> Any:
+        return {"errorMessages": ["Rate limit exceeded."], "errors": {}}
+
+    def _issue(self, i: int) -> Dict[str, Any]:
+        issue = self.template("issue")
+        issue["id"] = str(10000 + i)
+        issue["key"] = f"BENCH-{i + 1}"
+        issue["self"] = f"{self.base_url}/rest/api/2/issue/{issue['id']}"
+        issue["fields"]["summary"] = self.title(i)
+        issue["fields"]["priority"]["name"] = ("High", "Medium", "Low")[i % 3]
+        return issue
+
+    def _matching(self, jql: str) -> List[int]:
+        keys = re.search(r"key\s+in\s*\(([^)]*)\)", jql or "", re.IGNORECASE)
+        if keys:
+            wanted = [k.strip().strip("'\"") for k in keys.group(1).split(",")]
+            return [int(k.split("-")[1]) - 1 for k in wanted
+                    if re.fullmatch(r"BENCH-\d+", k) and int(k.split("-")[1]) <= self.size]
+        return list(range(self.size))
+
+    def search(self, m, query, body) -> Response:
+        matching = self._matching(query.get("jql", ""))
+        start = _int(query.get("startAt"), 0)
+        max_results = min(_int(query.get("maxResults"), 50), self.MAX_RESULTS)
+        return 200, {
+            "expand": "schema,names",
+            "startAt": start,
+            "maxResults": max_results,
+            "total": len(matching),
+            "issues": [self._issue(i) for i in matching[start : start + max_results]],
+        }, {}
+
+    def search_jql(self, m, query, body) -> Response:
+        matching = self._matching(query.get("jql", ""))
+        start = _int(query.get("nextPageToken"), 0)
+        max_results = min(_int(query.get("maxResults"), 50), self.MAX_RESULTS)
+        end = start + max_results
+        out: Dict[str, Any] = {
+            "issues": [self._issue(i) for i in matching[start:end]],
+            "isLast": end >= len(matching),
+        }
+        if end < len(matching):
+            out["nextPageToken"] = str(end)
+        return 200, out, {}
+
+    def transitions(self, m, query, body) -> Response:
+        return 200, self.template("transitions"), {}
+
+    def do_transition(self, m, query, body) -> Response:
+        return 204, None, {}
+
+
+class N8nFake(FakeProvider):
+    """n8n public API: workflows (``limit`` default 100, ``nextCursor``)."""
+
+    name = "n8n"
+    PAGE_SIZE = 100
+    # n8n's Express server sends ETags and answers If-None-Match with 304.
+    etags = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.routes = [("GET", re.compile(r"/api/v1/workflows"), self.workflows)]
+
+    def throttle_body(self) -> Any:
+        return {"code": 429, "message": "Too many requests"}
+
+    def workflows(self, m, query, body) -> Response:
+        start = _int(query.get("cursor"), 0)
+        limit = min(_int(query.get("limit"), self.PAGE_SIZE), 250)
+        data = []
+        for i in range(start, min(start + limit, self.size)):
+            wf = self.template("workflow")
+            wf["id"] = f"wf{i:06d}"
+            wf["name"] = self.title(i)
+            wf["active"] = bool(i % 2)
+            data.append(wf)
+        end = start + len(data)
+        return 200, {"data": data, "nextCursor": str(end) if end < self.size else None}, {}
+
+
+class OtlpCollectorFake(FakeProvider):
+    """OTLP/HTTP JSON trace collector: keeps every span it receives.
+
+    Not a task provider; stands in for an OpenTelemetry collector when the
+    sync engine exports traces (``TASKCENTER_OTLP_ENDPOINT``).
+    """
+
+    name = "otlp"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.spans: List[Dict[str, Any]] = []
+        self.routes = [("POST", re.compile(r"/v1/traces"), self.export)]
+
+    def export(self, m, query, body) -> Response:
+        with self._lock:
+            for resource in (body or {}).get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    self.spans.extend(scope.get("spans", []))
+        return 200, self.template("export_response"), {}
+
+
+PROVIDERS: Dict[str, type] = {
+    cls.name: cls for cls in (NotionFake, GmailFake, GraphFake, SlackFake, JiraFake, N8nFake)
+}
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The clients open many short connections in parallel.
+    request_queue_size = 128
+
+
+def _handler_for(provider: FakeProvider) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, delayed
+        # ACKs add ~40 ms to every keep-alive response.
+        disable_nagle_algorithm = True
+
+        def _handle(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            try:
+                status, payload, headers = provider.dispatch(self.command, self.path, body, dict(self.headers))
+            except Exception as exc:  # surface handler bugs as 500s
+                status, payload, headers = 500, {"error": repr(exc)}, {}
+            data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            provider.record_bytes_out(len(data))
+            self.send_response(status)
+            if data:
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            if data:
+                self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+class FakeServer:
+    """Serve a ``FakeProvider`` on an ephemeral loopback port."""
+
+    def __init__(self, provider: FakeProvider) -> None:
+        self.provider = provider
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("server not started")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        self._httpd = _Server(("127.0.0.1", 0), _handler_for(self.provider))
+        self.provider.base_url = self.url
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True, name=f"fake-{self.provider.name}"
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
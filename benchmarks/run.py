@@ -0,0 +1,298 @@
+"""run.py — Offline benchmark runner for G_TaskCenter.
+
+Starts a fake server per provider (see ``fake_servers.py``), points the
+integrations at them through their ``*_API_BASE`` / host settings and runs
+each scenario in a fresh child process, so import-time configuration, rate
+limit buckets and caches never leak between measurements.
+
+Per result it records wall time, items produced, requests/throttled
+responses/bytes seen by the fake servers, peak RSS and (in a separate
+``tracemalloc`` run) peak Python allocations, and compares them against a
+stored baseline.
+
+Usage:
+    python -m benchmarks.run                              # local profile, sizes 100,1000
+    python -m benchmarks.run --profile realistic --sizes 100 --scenarios jira_list,outlook_list
+    python -m benchmarks.run --save-baseline              # refresh benchmarks/baseline.json
+    python -m benchmarks.run --fail-on-regression         # exit 1 on regressions (CI)
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Marker prefixing the child's result line on stdout.
+_RESULT_MARKER = "BENCH_RESULT "
+
+# Client-side bucket limits for the "local" profile, where the fake servers
+# answer at loopback speed and the production pacing would dominate.
+_UNTHROTTLED_LIMITS = ",".join(
+    f"{key}=1000:1000"
+    for key in ("notion", "gmail", "graph", "jira", "n8n",
+                "slack", "slack:tier2", "slack:tier3", "slack:tier4")
+)
+
+# Settings that could redirect a scenario away from the fake servers.
+_CLEARED_ENV = (
+    "SLACK_TASK_CHANNELS", "SLACK_USER_TOKEN", "SLACK_TASK_USER",
+    "JIRA_PROJECT_KEY", "JIRA_JQL_FILTER", "TASKCENTER_RATE_LIMITS",
+)
+
+
+# ---------------------------------------------------------------------------
+# Child process
+# ---------------------------------------------------------------------------
+
+
+def _peak_rss_mib() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_child(scenario: str, size: int, alloc: bool) -> Dict[str, Any]:
+    """Run one scenario in this process and return its measurements."""
+    from benchmarks.scenarios import SCENARIOS
+
+    fn = SCENARIOS[scenario].run
+    if alloc:
+        import tracemalloc
+
+        tracemalloc.start()
+    start = time.perf_counter()
+    out = fn(size)
+    wall = time.perf_counter() - start
+    result: Dict[str, Any] = out if isinstance(out, dict) else {"items": out}
+    result.update({"wall_s": round(wall, 4), "peak_rss_mib": _peak_rss_mib()})
+    if alloc:
+        result["alloc_peak_mib"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        tracemalloc.stop()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Parent process
+# ---------------------------------------------------------------------------
+
+
+def _write_gmail_token(path: str) -> None:
+    """Pickle credentials that stay valid for the run (no refresh round trip)."""
+    from google.oauth2.credentials import Credentials
+
+    creds = Credentials(token="bench-token", expiry=datetime.utcnow() + timedelta(days=1))
+    with open(path, "wb") as fh:
+        pickle.dump(creds, fh)
+
+
+def _child_env(urls: Dict[str, str], profile: str, workdir: str) -> Dict[str, str]:
+    env = {k: v for k, v in os.environ.items() if k not in _CLEARED_ENV}
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (ROOT, os.path.join(ROOT, "src"), env.get("PYTHONPATH")) if p
+    )
+    env.update({
+        "SYNC_DB_PATH": os.path.join(workdir, "sync_state.db"),
+        "TASKCENTER_DB_PATH": os.path.join(workdir, "taskcenter.db"),
+        "TASKCENTER_HTTP_CACHE_DIR": os.path.join(workdir, "http_cache"),
+        # Point every integration at a closed port unless its fake is running.
+        "NOTION_TOKEN": "bench-token",
+        "NOTION_TASKS_DB_ID": "bench-db",
+        "NOTION_API_BASE": urls.get("notion", "http://127.0.0.1:9"),
+        "GMAIL_TOKEN_PATH": os.path.join(workdir, "gmail_token.pickle"),
+        "GMAIL_API_BASE": urls.get("gmail", "http://127.0.0.1:9"),
+        "GRAPH_API_BASE": urls.get("graph", "http://127.0.0.1:9") + "/v1.0",
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_API_BASE": urls.get("slack", "http://127.0.0.1:9") + "/api",
+        "SLACK_HISTORY_LOOKBACK_DAYS": "0",
+        "JIRA_BASE_URL": urls.get("jira", "http://127.0.0.1:9"),
+        "JIRA_USER_EMAIL": "bench@example.com",
+        "JIRA_API_TOKEN": "bench-token",
+        "N8N_HOST": urls.get("n8n", "http://127.0.0.1:9"),
+        "N8N_API_KEY": "bench-key",
+    })
+    if profile == "local":
+        env["TASKCENTER_RATE_LIMITS"] = _UNTHROTTLED_LIMITS
+    return env
+
+
+def run_once(scenario: str, size: int, profile: str, alloc: bool = False, seed: int = 0) -> Dict[str, Any]:
+    """Start the scenario's fake servers and run it once in a child process."""
+    from benchmarks.fake_servers import PROFILES, PROVIDERS, FakeServer
+    from benchmarks.scenarios import SCENARIOS
+
+    spec = SCENARIOS[scenario]
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as workdir:
+        servers = {
+            name: stack.enter_context(FakeServer(PROVIDERS[name](size, PROFILES[profile][name], seed)))
+            for name in spec.providers
+        }
+        _write_gmail_token(os.path.join(workdir, "gmail_token.pickle"))
+        env = _child_env({n: s.url for n, s in servers.items()}, profile, workdir)
+        cmd = [sys.executable, "-m", "benchmarks.run", "--child", scenario, "--sizes", str(size)]
+        if alloc:
+            cmd.append("--alloc")
+        proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+
+        lines = [l for l in proc.stdout.splitlines() if l.startswith(_RESULT_MARKER)]
+        if proc.returncode != 0 or not lines:
+            raise RuntimeError(
+                f"{scenario} (size {size}) failed with exit code {proc.returncode}:\n{proc.stderr[-2000:]}"
+            )
+        result = json.loads(lines[-1][len(_RESULT_MARKER):])
+
+        stats = [s.provider.stats() for s in servers.values()]
+        result["requests"] = sum(s["requests"] for s in stats)
+        result["throttled"] = sum(s["throttled"] for s in stats)
+        result["bytes"] = sum(s["bytes_in"] + s["bytes_out"] for s in stats)
+        result["endpoints"] = {name: s.provider.stats()["endpoints"] for name, s in servers.items()}
+        return result
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    sizes: List[int],
+    profile: str,
+    repeat: int = 1,
+    alloc: bool = True,
+    progress=None,
+) -> Dict[str, Dict[str, Any]]:
+    """Run every scenario/size pair; results are keyed ``profile/scenario/size``.
+
+    With ``repeat`` > 1 the median wall time is reported. Allocation peaks
+    come from one extra run under ``tracemalloc``, whose overhead would
+    otherwise distort the timings.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for scenario in scenarios:
+        for size in sizes:
+            runs = [run_once(scenario, size, profile) for _ in range(max(1, repeat))]
+            result = dict(runs[-1])
+            result["wall_s"] = round(statistics.median(r["wall_s"] for r in runs), 4)
+            result["peak_rss_mib"] = max((r["peak_rss_mib"] or 0) for r in runs) or None
+            if alloc:
+                result["alloc_peak_mib"] = run_once(scenario, size, profile, alloc=True)["alloc_peak_mib"]
+            key = f"{profile}/{scenario}/{size}"
+            results[key] = result
+            if progress:
+                progress(key, result)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Describe regressions of ``results`` against ``baseline``.
+
+    Wall time and allocation peaks regress when they exceed the baseline by
+    more than ``tolerance`` (a fraction); request counts are deterministic,
+    so any increase is a regression. Dedup ``precision``/``recall`` regress
+    when they drop by more than 0.01.
+    """
+    problems = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ("wall_s", "alloc_peak_mib"):
+            old, new = base.get(metric), cur.get(metric)
+            if old and new is not None and new > old * (1 + tolerance):
+                problems.append(f"{key}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+        for metric in ("precision", "recall"):
+            old, new = base.get(metric), cur.get(metric)
+            if old is not None and new is not None and new < old - 0.01:
+                problems.append(f"{key}: {metric} {old} -> {new}")
+        if cur.get("requests", 0) > base.get("requests", 0):
+            problems.append(f"{key}: requests {base.get('requests')} -> {cur['requests']}")
+    return problems
+
+
+def _format_row(key: str, r: Dict[str, Any]) -> str:
+    alloc = r.get("alloc_peak_mib")
+    return (
+        f"{key:<36} {r['wall_s']:>9.3f} {r['items']:>7} {r['requests']:>6} {r['throttled']:>5} "
+        f"{r['bytes'] / 1024:>9.0f} {r['peak_rss_mib'] or 0:>8.1f} "
+        f"{'-' if alloc is None else f'{alloc:.2f}':>8}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from benchmarks.fake_servers import PROFILES
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Offline G_TaskCenter benchmarks.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenario names (default: all).")
+    parser.add_argument("--sizes", default="100,1000", help="Comma-separated backlog sizes.")
+    parser.add_argument("--profile", default="local", choices=sorted(PROFILES))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measurement (median).")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip the tracemalloc run.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Merge these results into the baseline file.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a result counts as a regression.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results to PATH.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--child", metavar="SCENARIO", help=argparse.SUPPRESS)
+    parser.add_argument("--alloc", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if args.child:
+        print(_RESULT_MARKER + json.dumps(run_child(args.child, sizes[0], args.alloc)), flush=True)
+        return 0
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    print(f"{'benchmark':<36} {'wall_s':>9} {'items':>7} {'reqs':>6} {'429s':>5} "
+          f"{'KiB':>9} {'rss_MiB':>8} {'alloc':>8}")
+    results = run_benchmarks(
+        scenarios, sizes, args.profile, args.repeat, alloc=not args.no_alloc,
+        progress=lambda key, r: print(_format_row(key, r), flush=True),
+    )
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        baseline.update({k: {m: v for m, v in r.items() if m != "endpoints"} for k, r in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    problems = compare(results, baseline, args.tolerance)
+    for line in problems:
+        print(f"REGRESSION {line}")
+    if not problems and baseline:
+        print("No regressions against baseline.")
+    return 1 if problems and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
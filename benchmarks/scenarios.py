@@ -0,0 +1,147 @@
+"""scenarios.py — Benchmark scenarios for G_TaskCenter.
+
+Each scenario exercises one integration (or the sync engine) end to end
+against the fake provider servers and returns the number of items it
+produced, or a dict with ``items`` plus scenario-specific metrics.
+Scenarios run in a child process whose environment already points every
+integration at its fake server (see ``benchmarks/run.py``), so module level
+settings such as ``GRAPH_API_BASE`` pick the fake URLs up on import.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, Union
+
+# Keep integration INFO logs out of the measurements.
+logging.basicConfig(level=logging.WARNING)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(ROOT, "src") not in sys.path:
+    sys.path.insert(0, os.path.join(ROOT, "src"))
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A benchmark: the fake providers it needs and the function to time."""
+
+    name: str
+    providers: Tuple[str, ...]
+    run: Callable[[int], Union[int, Dict[str, float]]]
+    description: str = ""
+
+
+def _use_bench_graph_token() -> None:
+    """Skip MSAL: the fake Graph server accepts any bearer token."""
+    from integrations import outlook
+
+    outlook.get_access_token = lambda: "bench-token"
+
+
+# ---------------------------------------------------------------------------
+# Integration scenarios
+# ---------------------------------------------------------------------------
+
+
+def notion_list(size: int) -> int:
+    from integrations.notion import list_notion_tasks
+
+    return len(list_notion_tasks())
+
+
+def gmail_list(size: int) -> int:
+    from integrations.gmail import iter_task_emails
+
+    return sum(1 for _ in iter_task_emails(limit=size))
+
+
+def outlook_list(size: int) -> int:
+    _use_bench_graph_token()
+    from integrations.outlook import list_outlook_tasks
+
+    return len(list_outlook_tasks())
+
+
+def slack_list(size: int) -> int:
+    from integrations.slack import list_slack_tasks
+
+    return len(list_slack_tasks(limit=size, mode="history"))
+
+
+def jira_list(size: int) -> int:
+    from integrations.jira import list_jira_tasks
+
+    return len(list_jira_tasks(limit=size))
+
+
+def n8n_list(size: int) -> int:
+    from integrations.n8n import get_workflows
+
+    return len(get_workflows())
+
+
+def n8n_poll(size: int) -> Dict[str, float]:
+    """Five consecutive workflow listings; unchanged lists come back as 304s."""
+    from integrations.httpcache import get_cache_stats
+    from integrations.n8n import get_workflows
+
+    items = sum(len(get_workflows()) for _ in range(5))
+    return {"items": items, "cache_hit_rate": get_cache_stats()["hit_rate"] or 0.0}
+
+
+def sync_cycle(size: int) -> int:
+    """One full ``run_sync_cycle`` (Gmail capped at the engine's default limit)."""
+    _use_bench_graph_token()
+    import sync_engine
+
+    result = sync_engine.run_sync_cycle()
+    return int(result["stages"]["fetch"]["items"])
+
+
+# ---------------------------------------------------------------------------
+# Local scenarios (no provider traffic)
+# ---------------------------------------------------------------------------
+
+
+def unify(size: int) -> Dict[str, float]:
+    """Cluster a synthetic corpus; reports dedup quality alongside the timing."""
+    from benchmarks.corpus import evaluate_dedup, generate_corpus
+
+    report = evaluate_dedup(generate_corpus(size))
+    return {"items": report["found_clusters"], "precision": report["precision"], "recall": report["recall"]}
+
+
+def sqlite_save(size: int) -> int:
+    """Save a corpus twice (second pass is all unchanged) and read it back."""
+    from benchmarks.corpus import generate_corpus
+    from db.sqlite_store import get_tasks, init_db, save_tasks
+
+    tasks = [item.task for item in generate_corpus(size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "bench.db"))
+        try:
+            save_tasks(conn, tasks)
+            save_tasks(conn, tasks)
+            return len(get_tasks(conn, limit=size))
+        finally:
+            conn.close()
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("notion_list", ("notion",), notion_list, "Database query, pages of 100"),
+        Scenario("gmail_list", ("gmail",), gmail_list, "messages.list + one messages.get per email"),
+        Scenario("outlook_list", ("graph",), outlook_list, "To Do lists and task pages via $batch"),
+        Scenario("slack_list", ("slack",), slack_list, "Channel discovery + history scan"),
+        Scenario("jira_list", ("jira",), jira_list, "Concurrent startAt search pages"),
+        Scenario("n8n_list", ("n8n",), n8n_list, "Workflow listing"),
+        Scenario("n8n_poll", ("n8n",), n8n_poll, "Five workflow listings with conditional GETs"),
+        Scenario("sync_cycle", ("notion", "gmail", "graph", "jira"), sync_cycle,
+                 "run_sync_cycle against Notion, Gmail and Outlook"),
+        Scenario("unify", (), unify, "Dedup clustering of a synthetic corpus with 20% duplicates"),
+        Scenario("sqlite_save", (), sqlite_save, "save_tasks twice + get_tasks"),
+    )
+}
@@ -0,0 +1,142 @@
+"""startup.py — Cold-start benchmark for the MCP server.
+
+Imports ``server`` in fresh interpreters started with ``-X importtime`` and
+checks the result against a budget:
+
+    - the median cumulative import time of ``server`` stays under
+      ``STARTUP_BUDGET_MS``;
+    - the part not spent in the MCP framework (FastMCP and everything it
+      pulls in) stays under ``OWN_BUDGET_MS``;
+    - none of the integration SDKs in ``LAZY_MODULES`` is imported. They
+      are loaded on first use of their tools.
+
+Usage:
+    python -m benchmarks.startup                    # 5 runs, default budgets
+    python -m benchmarks.startup --runs 9 --budget-ms 2500 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# Median cumulative import time of ``server``. FastMCP alone accounts for
+# most of it, so this mainly catches new eager heavyweight imports.
+STARTUP_BUDGET_MS = 4000.0
+
+# Import time of ``server`` minus its framework imports.
+OWN_BUDGET_MS = 250.0
+
+# Top-level packages counted as framework rather than G_TaskCenter code.
+# griffe (docstring parsing) and certifi/httpx are loaded by FastMCP while
+# the tools are registered.
+FRAMEWORK_PACKAGES = ("fastmcp", "mcp", "pydantic", "pydantic_core", "griffe", "certifi", "httpx", "dotenv")
+
+# Packages that must not be imported until a tool needs them.
+LAZY_MODULES = ("notion_client", "googleapiclient", "google_auth_oauthlib", "msal", "requests")
+
+
+class ImportRecord(NamedTuple):
+    """One line of ``-X importtime`` output."""
+
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines (``import time: self | cumulative | name``)."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        label = parts[2][1:]
+        name = label.lstrip()
+        records.append(ImportRecord(name, (len(label) - len(name)) // 2, int(parts[0]), int(parts[1])))
+    return records
+
+
+def measure_import(module: str = "server") -> List[ImportRecord]:
+    """Import ``module`` from ``src/`` in a fresh interpreter and return its import records."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def summarize(records: List[ImportRecord], module: str = "server") -> Dict[str, Any]:
+    """Total, framework and own import time of ``module`` plus the lazy modules it loaded."""
+    total = next(r.cumulative_us for r in records if r.name == module and r.depth == 0)
+    # Direct children of the module; framework subtrees are attributed to
+    # whichever framework import pulled them in first.
+    framework = sum(
+        r.cumulative_us for r in records
+        if r.depth == 1 and r.name.split(".")[0] in FRAMEWORK_PACKAGES
+    )
+    loaded = sorted({r.name.split(".")[0] for r in records} & set(LAZY_MODULES))
+    children = sorted((r for r in records if r.depth == 1), key=lambda r: -r.cumulative_us)
+    return {
+        "total_ms": total / 1000,
+        "framework_ms": framework / 1000,
+        "own_ms": (total - framework) / 1000,
+        "lazy_loaded": loaded,
+        "top": [(r.name, r.cumulative_us / 1000) for r in children],
+    }
+
+
+def run_startup(runs: int = 5, module: str = "server") -> Dict[str, Any]:
+    """Median summary over ``runs`` cold imports (after one run that warms the bytecode cache)."""
+    measure_import(module)
+    summaries = [summarize(measure_import(module), module) for _ in range(max(1, runs))]
+    result = dict(summaries[-1])
+    for key in ("total_ms", "framework_ms", "own_ms"):
+        result[key] = round(statistics.median(s[key] for s in summaries), 1)
+    result["lazy_loaded"] = sorted({m for s in summaries for m in s["lazy_loaded"]})
+    return result
+
+
+def check_budget(
+    result: Dict[str, Any], budget_ms: float = STARTUP_BUDGET_MS, own_budget_ms: float = OWN_BUDGET_MS
+) -> List[str]:
+    """Describe every budget the result exceeds (empty when within budget)."""
+    problems = []
+    if result["total_ms"] > budget_ms:
+        problems.append(f"import took {result['total_ms']} ms (budget {budget_ms} ms)")
+    if result["own_ms"] > own_budget_ms:
+        problems.append(f"non-framework imports took {result['own_ms']} ms (budget {own_budget_ms} ms)")
+    if result["lazy_loaded"]:
+        problems.append(f"imported at startup: {', '.join(result['lazy_loaded'])}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MCP server cold-start benchmark.")
+    parser.add_argument("--runs", type=int, default=5, help="Measured imports (median).")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--own-budget-ms", type=float, default=OWN_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list.")
+    args = parser.parse_args(argv)
+
+    result = run_startup(args.runs)
+    print(f"server import: {result['total_ms']} ms "
+          f"(framework {result['framework_ms']} ms, own {result['own_ms']} ms)")
+    for name, ms in result["top"][: args.top]:
+        print(f"  {ms:>9.1f} ms  {name}")
+    problems = check_budget(result, args.budget_ms, args.own_budget_ms)
+    for line in problems:
+        print(f"OVER BUDGET {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,9 +15,8 @@ from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
 # Import integrations from src/integrations
+from src.integrations import registry
 from src.integrations.gmail import list_task_emails
-from src.integrations.notion import list_notion_tasks
-from src.integrations.outlook import list_outlook_tasks
 
 # Load environment variables (from .env file)
 load_dotenv()
@@ -27,6 +26,12 @@ mcp = FastMCP("g-taskcenter")
 
 logger = logging.getLogger(__name__)
 
+
+def _dumps(tasks: List) -> str:
+    """Serialize UnifiedTask models to a JSON string."""
+    return dumps([task.model_dump(mode="json") for task in tasks], indent=2)
+
+
 @mcp.lifespan
 async def on_startup(server: FastMCP):
     """Initialize startup logic here if needed."""
@@ -37,29 +42,21 @@ async def on_startup(server: FastMCP):
 @mcp.tool()
 async def get_all_tasks(source: Optional[str] = None) -> str:
     """
-    Fetch and unify tasks from all integrated sources (Gmail, Notion, Outlook).
+    Fetch and unify tasks from all configured sources (see src/integrations/registry.py).
     
     Args:
-        source: Optional filter for source (e.g., 'gmail', 'notion', 'outlook').
+        source: Optional filter for source (e.g., 'gmail', 'notion', 'outlook', 'slack', 'jira').
     """
     unified_tasks = []
     
-    if not source or source.lower() == "gmail":
-        gmail_tasks = list_task_emails()
-        unified_tasks.extend(gmail_tasks)
-        
-    if not source or source.lower() == "notion":
-        notion_tasks = list_notion_tasks()
-        unified_tasks.extend(notion_tasks)
-        
-    if not source or source.lower() == "outlook":
-        outlook_tasks = list_outlook_tasks()
-        unified_tasks.extend(outlook_tasks)
+    for adapter in registry.sources(configured_only=True):
+        if not source or source.lower() == adapter.name:
+            unified_tasks.extend(adapter.list_tasks())
         
     if not unified_tasks:
         return "No tasks found or all integrations are unconfigured."
         
-    return dumps(unified_tasks, indent=2)
+    return _dumps(unified_tasks)
 
 @mcp.tool()
 async def list_recent_emails() -> str:
@@ -67,23 +64,23 @@ async def list_recent_emails() -> str:
     tasks = list_task_emails()
     if not tasks:
         return "No task-related emails found or Gmail integration unconfigured."
-    return dumps(tasks, indent=2)
+    return _dumps(tasks)
 
 @mcp.tool()
 async def sync_notion_backlog() -> str:
     """List pending tasks from the configured Notion database."""
-    tasks = list_notion_tasks()
+    tasks = registry.get_source("notion").list_tasks()
     if not tasks:
         return "No Notion tasks found or integration unconfigured."
-    return dumps(tasks, indent=2)
+    return _dumps(tasks)
 
 @mcp.tool()
 async def list_outlook_todo() -> str:
     """Fetch pending tasks from Microsoft To-Do/Outlook."""
-    tasks = list_outlook_tasks()
+    tasks = registry.get_source("outlook").list_tasks()
     if not tasks:
         return "No Outlook tasks found or integration unconfigured."
-    return dumps(tasks, indent=2)
+    return _dumps(tasks)
 
 if __name__ == "__main__":
     mcp.run()
@@ -0,0 +1,352 @@
+"""retention.py — Retention, rollup and compaction for the sync_log table.
+
+``sync_log`` is append-only: every sync cycle adds one row per source. This
+module keeps it bounded:
+
+    1. Raw rows older than ``SYNC_LOG_RETENTION_DAYS`` are folded into the
+       ``sync_log_hourly`` rollup table and deleted.
+    2. Hourly rollups older than ``SYNC_ROLLUP_HOURLY_DAYS`` are folded into
+       ``sync_log_daily`` and deleted. Daily rollups are kept.
+    3. Freed pages are returned to the file system with
+       ``PRAGMA incremental_vacuum``.
+
+Each batch of ``RETENTION_BATCH_SIZE`` rows is rolled up and deleted in its
+own short write transaction, so concurrent writers (the sync engine, the
+Slack event receiver) wait at most one batch. Rollups are additive upserts
+keyed by ``(bucket, source, operation, status)``; a batch interrupted before
+its commit leaves both tables untouched.
+
+``maybe_compact()`` runs the whole pass at most once per
+``RETENTION_INTERVAL_HOURS`` and is called at the end of every sync cycle.
+It can also be run by hand::
+
+    python -m src.db.retention [DB_PATH] [--enable-incremental-vacuum]
+
+Environment variables:
+    - TASKCENTER_SYNC_LOG_RETENTION_DAYS: Days of raw sync_log rows to keep
+      (default: 30).
+    - TASKCENTER_SYNC_ROLLUP_HOURLY_DAYS: Days of hourly rollups to keep
+      (default: 180).
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    from db.sqlite_store import get_connection, get_sync_cursors, set_sync_cursors
+except ImportError:
+    from src.db.sqlite_store import get_connection, get_sync_cursors, set_sync_cursors
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SYNC_LOG_RETENTION_DAYS = int(os.environ.get("TASKCENTER_SYNC_LOG_RETENTION_DAYS", "30"))
+SYNC_ROLLUP_HOURLY_DAYS = int(os.environ.get("TASKCENTER_SYNC_ROLLUP_HOURLY_DAYS", "180"))
+
+# Rows rolled up and deleted per write transaction.
+RETENTION_BATCH_SIZE = 1000
+
+# Pause between batches, giving waiting writers the lock.
+RETENTION_BATCH_PAUSE = 0.01
+
+# Pages released per ``PRAGMA incremental_vacuum`` step.
+VACUUM_STEP_PAGES = 1000
+
+# Minimum time between two passes of maybe_compact().
+RETENTION_INTERVAL_HOURS = 6
+
+# sync_cursors key recording the last pass.
+_CURSOR_SOURCE, _CURSOR_SCOPE = "sync_log", "retention"
+
+# ---------------------------------------------------------------------------
+# Schema DDL
+# ---------------------------------------------------------------------------
+
+_ROLLUP_COLUMNS = """
+    bucket            TEXT    NOT NULL,
+    source            TEXT    NOT NULL,
+    operation         TEXT    NOT NULL,
+    status            TEXT    NOT NULL,
+    runs              INTEGER NOT NULL,
+    task_count        INTEGER NOT NULL,
+    timed_runs        INTEGER NOT NULL,
+    duration_ms_sum   REAL    NOT NULL,
+    duration_ms_max   REAL,
+    request_count     INTEGER NOT NULL,
+    bytes_transferred INTEGER NOT NULL,
+    throttle_seconds  REAL    NOT NULL,
+    PRIMARY KEY (bucket, source, operation, status)
+"""
+
+_ROLLUP_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS sync_log_hourly ({_ROLLUP_COLUMNS});
+CREATE TABLE IF NOT EXISTS sync_log_daily ({_ROLLUP_COLUMNS});
+"""
+
+_ROLLUP_TABLES = {"hourly": "sync_log_hourly", "daily": "sync_log_daily"}
+
+# Merge a grouped SELECT into a rollup table, adding to existing buckets.
+# ``{target}`` is the rollup table; the SELECT must produce its columns in order.
+_MERGE_SQL = """
+INSERT INTO {target}
+{select}
+ON CONFLICT (bucket, source, operation, status) DO UPDATE SET
+    runs = runs + excluded.runs,
+    task_count = task_count + excluded.task_count,
+    timed_runs = timed_runs + excluded.timed_runs,
+    duration_ms_sum = duration_ms_sum + excluded.duration_ms_sum,
+    duration_ms_max = max(coalesce(duration_ms_max, excluded.duration_ms_max),
+                          coalesce(excluded.duration_ms_max, duration_ms_max)),
+    request_count = request_count + excluded.request_count,
+    bytes_transferred = bytes_transferred + excluded.bytes_transferred,
+    throttle_seconds = throttle_seconds + excluded.throttle_seconds
+"""
+
+# Raw rows -> hourly buckets. Timestamps are normalized to UTC by strftime(),
+# which accepts both ISO-8601 with offset and SQLite's datetime('now') format.
+_RAW_TO_HOURLY_SELECT = """
+SELECT strftime('%Y-%m-%dT%H:00:00', timestamp), source, operation, status,
+       count(*), coalesce(sum(task_count), 0), count(duration_ms),
+       total(duration_ms), max(duration_ms), coalesce(sum(request_count), 0),
+       coalesce(sum(bytes_transferred), 0), total(throttle_seconds)
+FROM sync_log
+WHERE id <= :upto AND timestamp < :cutoff
+GROUP BY 1, 2, 3, 4
+"""
+
+_HOURLY_TO_DAILY_SELECT = """
+SELECT substr(bucket, 1, 10), source, operation, status,
+       sum(runs), sum(task_count), sum(timed_runs), total(duration_ms_sum),
+       max(duration_ms_max), sum(request_count), sum(bytes_transferred),
+       total(throttle_seconds)
+FROM sync_log_hourly
+WHERE rowid <= :upto AND bucket < :cutoff
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def ensure_rollup_tables(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables if needed."""
+    conn.executescript(_ROLLUP_SCHEMA_SQL)
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+
+def _day_cutoff(days: int, now: Optional[datetime] = None) -> str:
+    """Start of the UTC day ``days`` ago, as ``YYYY-MM-DD``.
+
+    Cutting at a day boundary keeps plain string comparison exact for both
+    timestamp formats found in ``sync_log`` (``T`` and space separated).
+    """
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _fold(
+    conn: sqlite3.Connection,
+    source_table: str,
+    key: str,
+    order_column: str,
+    target: str,
+    select: str,
+    cutoff: str,
+    batch_size: int,
+    pause: float,
+) -> int:
+    """Merge rows of ``source_table`` older than ``cutoff`` into ``target`` and
+    delete them, ``batch_size`` rows per transaction. Returns the rows folded.
+    """
+    folded = 0
+    while True:
+        upto = conn.execute(
+            f"SELECT max({key}) FROM (SELECT {key} FROM {source_table}"
+            f" WHERE {order_column} < ? ORDER BY {key} LIMIT ?)",
+            (cutoff, batch_size),
+        ).fetchone()[0]
+        if upto is None:
+            return folded
+        params = {"upto": upto, "cutoff": cutoff}
+        with conn:
+            conn.execute(_MERGE_SQL.format(target=target, select=select), params)
+            deleted = conn.execute(
+                f"DELETE FROM {source_table} WHERE {key} <= :upto AND {order_column} < :cutoff",
+                params,
+            ).rowcount
+        folded += deleted
+        if deleted < batch_size:
+            return folded
+        if pause:
+            time.sleep(pause)
+
+
+def incremental_vacuum(conn: sqlite3.Connection, max_pages: Optional[int] = None) -> int:
+    """Release free pages to the file system in steps of ``VACUUM_STEP_PAGES``.
+
+    Does nothing unless the database uses ``auto_vacuum = INCREMENTAL``
+    (see ``enable_incremental_vacuum``).
+
+    Returns:
+        Number of pages released.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return 0
+    released = 0
+    while max_pages is None or released < max_pages:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        step = min(free, VACUUM_STEP_PAGES)
+        if max_pages is not None:
+            step = min(step, max_pages - released)
+        if step <= 0:
+            break
+        # execute() would step the pragma once (one page); executescript()
+        # runs it to completion as its own transaction.
+        conn.executescript(f"PRAGMA incremental_vacuum({int(step)});")
+        done = free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if done <= 0:
+            break
+        released += done
+    return released
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """Switch an existing database to ``auto_vacuum = INCREMENTAL``.
+
+    Databases created by ``init_db`` already use it. Older ones need this
+    one-off full ``VACUUM``, which rewrites the file and blocks writers
+    while it runs.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def compact_sync_log(
+    conn: sqlite3.Connection,
+    retention_days: Optional[int] = None,
+    hourly_days: Optional[int] = None,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_BATCH_PAUSE,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Roll up and delete old sync_log rows, then vacuum freed pages.
+
+    Args:
+        conn: Open SQLite connection.
+        retention_days: Days of raw rows to keep (default: ``SYNC_LOG_RETENTION_DAYS``).
+        hourly_days: Days of hourly rollups to keep (default: ``SYNC_ROLLUP_HOURLY_DAYS``).
+        batch_size: Rows per write transaction.
+        pause: Seconds to sleep between batches.
+        now: Current time (for tests).
+
+    Returns:
+        ``{"raw_rows": ..., "hourly_rows": ..., "pages_released": ...}``: raw
+        rows folded into hourly buckets, hourly rows folded into daily
+        buckets, and pages returned by the incremental vacuum.
+    """
+    retention_days = SYNC_LOG_RETENTION_DAYS if retention_days is None else retention_days
+    hourly_days = SYNC_ROLLUP_HOURLY_DAYS if hourly_days is None else hourly_days
+    ensure_rollup_tables(conn)
+    conn.commit()
+
+    raw_rows = _fold(
+        conn, "sync_log", "id", "timestamp", "sync_log_hourly", _RAW_TO_HOURLY_SELECT,
+        _day_cutoff(retention_days, now), batch_size, pause,
+    )
+    hourly_rows = _fold(
+        conn, "sync_log_hourly", "rowid", "bucket", "sync_log_daily", _HOURLY_TO_DAILY_SELECT,
+        _day_cutoff(max(hourly_days, retention_days), now), batch_size, pause,
+    )
+    pages = incremental_vacuum(conn) if raw_rows or hourly_rows else 0
+
+    if raw_rows or hourly_rows:
+        logger.info(
+            "sync_log compacted: %d raw row(s) and %d hourly rollup(s) folded, %d page(s) released.",
+            raw_rows, hourly_rows, pages,
+        )
+    return {"raw_rows": raw_rows, "hourly_rows": hourly_rows, "pages_released": pages}
+
+
+def maybe_compact(conn: sqlite3.Connection, now: Optional[datetime] = None) -> Optional[Dict[str, int]]:
+    """Run ``compact_sync_log`` if ``RETENTION_INTERVAL_HOURS`` passed since the last pass.
+
+    Returns:
+        The compaction result, or None when it was not due.
+    """
+    now = now or datetime.now(timezone.utc)
+    last = get_sync_cursors(conn, _CURSOR_SOURCE).get(_CURSOR_SCOPE)
+    if last and now - datetime.fromisoformat(last) < timedelta(hours=RETENTION_INTERVAL_HOURS):
+        return None
+    result = compact_sync_log(conn, now=now)
+    set_sync_cursors(conn, _CURSOR_SOURCE, {_CURSOR_SCOPE: now.isoformat()})
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def get_sync_rollups(
+    conn: sqlite3.Connection,
+    granularity: str = "hourly",
+    source: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    """Read aggregated sync history, newest bucket first.
+
+    Args:
+        conn: Open SQLite connection.
+        granularity: ``"hourly"`` or ``"daily"``.
+        source: Optional filter by source.
+        since: Optional lower bound on the bucket (``YYYY-MM-DD[THH:00:00]``).
+        limit: Maximum rows to return.
+
+    Returns:
+        Rollup rows with ``avg_duration_ms`` added (None when no run in the
+        bucket was timed).
+    """
+    table = _ROLLUP_TABLES[granularity]
+    ensure_rollup_tables(conn)
+    clauses: List[str] = []
+    params: List[Any] = []
+    if source:
+        clauses.append("source = ?")
+        params.append(source)
+    if since:
+        clauses.append("bucket >= ?")
+        params.append(since)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT * FROM {table}{where} ORDER BY bucket DESC, source LIMIT ?", params + [limit]
+    ).fetchall()
+    out = []
+    for row in rows:
+        entry = dict(row)
+        entry["avg_duration_ms"] = (
+            round(entry["duration_ms_sum"] / entry["timed_runs"], 1) if entry["timed_runs"] else None
+        )
+        out.append(entry)
+    return out
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    with get_connection(args[0] if args else None) as db:
+        if "--enable-incremental-vacuum" in sys.argv:
+            enable_incremental_vacuum(db)
+        print(compact_sync_log(db))
@@ -5,9 +5,16 @@ synchronization logs. This enables offline mode and historical queries
 without re-fetching from remote APIs.
 
 Schema:
-    tasks      — Canonical task records (mirrors UnifiedTask fields).
+    tasks      — Canonical task records (mirrors UnifiedTask fields, plus the
+                 content ``fingerprint`` used to skip unchanged writes).
     sources    — Registered integration sources and their last-sync time.
-    sync_log   — Append-only log of sync operations for auditability.
+    sync_log   — Append-only log of sync operations for auditability, with
+                 per-run duration, request count, bytes, rate-limit wait and
+                 error class used for performance history.
+    sync_cursors — Per-source, per-scope resume points (e.g. Slack channel
+                   watermarks) for incremental fetches.
+
+Old ``sync_log`` rows are rolled up and pruned by ``db.retention``.
 
 The default database path is ``data/taskcenter.db`` relative to the project
 root. Override via the ``TASKCENTER_DB_PATH`` environment variable.
@@ -16,9 +23,12 @@ root. Override via the ``TASKCENTER_DB_PATH`` environment variable.
 import os
 import sqlite3
 import logging
+from collections import Counter
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, Generator, List, Optional
+from itertools import islice
+from statistics import median
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
 
 try:
     from models import UnifiedTask, TaskPriority
@@ -36,6 +46,13 @@ DEFAULT_DB_PATH = os.environ.get(
     os.path.join(os.path.dirname(__file__), "..", "..", "data", "taskcenter.db"),
 )
 
+# Rows per executemany() call when saving a stream of tasks.
+SAVE_CHUNK_SIZE = 500
+
+# Sync runs faster than this are never reported as duration regressions;
+# at that scale a 2x change is noise.
+REGRESSION_MIN_DURATION_MS = 250.0
+
 # ---------------------------------------------------------------------------
 # Schema DDL
 # ---------------------------------------------------------------------------
@@ -50,6 +67,7 @@ CREATE TABLE IF NOT EXISTS tasks (
     priority        TEXT    NOT NULL DEFAULT 'normal',
     due_date        TEXT,
     link            TEXT,
+    fingerprint     TEXT,
     created_at      TEXT    NOT NULL DEFAULT (datetime('now')),
     updated_at      TEXT    NOT NULL DEFAULT (datetime('now'))
 );
@@ -69,13 +87,58 @@ CREATE TABLE IF NOT EXISTS sync_log (
     task_count      INTEGER NOT NULL DEFAULT 0,
     status          TEXT    NOT NULL DEFAULT 'success',
     message         TEXT,
-    timestamp       TEXT    NOT NULL DEFAULT (datetime('now'))
+    timestamp       TEXT    NOT NULL DEFAULT (datetime('now')),
+    duration_ms     REAL,
+    request_count   INTEGER,
+    bytes_transferred INTEGER,
+    throttle_seconds REAL,
+    error_class     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    source          TEXT    NOT NULL,
+    scope           TEXT    NOT NULL,
+    cursor          TEXT    NOT NULL,
+    updated_at      TEXT    NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (source, scope)
 );
 
 CREATE INDEX IF NOT EXISTS idx_tasks_source ON tasks(source);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_sync_log_source ON sync_log(source);
 CREATE INDEX IF NOT EXISTS idx_sync_log_timestamp ON sync_log(timestamp);
+CREATE INDEX IF NOT EXISTS idx_sync_log_source_timestamp ON sync_log(source, timestamp);
+"""
+
+# Columns added after the first release, applied to existing databases.
+_MIGRATIONS = (
+    ("tasks", "fingerprint", "TEXT"),
+    ("sync_log", "duration_ms", "REAL"),
+    ("sync_log", "request_count", "INTEGER"),
+    ("sync_log", "bytes_transferred", "INTEGER"),
+    ("sync_log", "throttle_seconds", "REAL"),
+    ("sync_log", "error_class", "TEXT"),
+)
+
+# Upsert that leaves rows whose content fingerprint is unchanged untouched
+# (no write, ``updated_at`` and ``created_at`` preserved).
+_UPSERT_TASK_SQL = """
+INSERT INTO tasks
+    (id, source, title, snippet, status, priority, due_date, link, fingerprint, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    source = excluded.source,
+    title = excluded.title,
+    snippet = excluded.snippet,
+    status = excluded.status,
+    priority = excluded.priority,
+    due_date = excluded.due_date,
+    link = excluded.link,
+    fingerprint = excluded.fingerprint,
+    updated_at = excluded.updated_at
+WHERE tasks.fingerprint IS NOT excluded.fingerprint
+   OR tasks.source IS NOT excluded.source
+   OR tasks.link IS NOT excluded.link
 """
 
 # ---------------------------------------------------------------------------
@@ -98,15 +161,26 @@ def init_db(db_path: Optional[str] = None) -> sqlite3.Connection:
 
     conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
+    # Only takes effect on a new file; see db.retention.enable_incremental_vacuum.
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     conn.executescript(_SCHEMA_SQL)
+    _migrate(conn)
     conn.commit()
 
     logger.info("Database initialized at %s", path)
     return conn
 
 
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Add columns missing from databases created by older versions."""
+    for table, column, decl in _MIGRATIONS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 @contextmanager
 def get_connection(db_path: Optional[str] = None) -> Generator[sqlite3.Connection, None, None]:
     """Context manager that yields an initialized DB connection.
@@ -128,73 +202,90 @@ def get_connection(db_path: Optional[str] = None) -> Generator[sqlite3.Connectio
 # ---------------------------------------------------------------------------
 
 
-def save_task(conn: sqlite3.Connection, task: UnifiedTask) -> None:
+def _task_row(task: UnifiedTask, now: str) -> tuple:
+    due = task.due_date.isoformat() if task.due_date else None
+    return (
+        task.id,
+        task.source,
+        task.title,
+        task.snippet,
+        task.status,
+        task.priority,
+        due,
+        task.link,
+        task.fingerprint(),
+        now,
+    )
+
+
+def save_task(conn: sqlite3.Connection, task: UnifiedTask) -> bool:
     """Insert or update a task in the database.
 
-    Uses INSERT OR REPLACE to upsert. The ``updated_at`` timestamp is
-    refreshed on every write.
+    A stored row whose content fingerprint matches ``task`` is left as is;
+    otherwise the row is written and ``updated_at`` refreshed.
 
     Args:
         conn: Open SQLite connection.
         task: UnifiedTask instance to persist.
+
+    Returns:
+        True if a row was written, False if the task was unchanged.
     """
     now = datetime.now(timezone.utc).isoformat()
-    due = task.due_date.isoformat() if task.due_date else None
-
-    conn.execute(
-        """
-        INSERT OR REPLACE INTO tasks
-            (id, source, title, snippet, status, priority, due_date, link, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            task.id,
-            task.source,
-            task.title,
-            task.snippet,
-            task.status,
-            task.priority,
-            due,
-            task.link,
-            now,
-        ),
-    )
+    cursor = conn.execute(_UPSERT_TASK_SQL, _task_row(task, now))
     conn.commit()
+    return cursor.rowcount > 0
 
 
-def save_tasks(conn: sqlite3.Connection, tasks: List[UnifiedTask]) -> int:
+def save_tasks(
+    conn: sqlite3.Connection,
+    tasks: Iterable[UnifiedTask],
+    chunk_size: int = SAVE_CHUNK_SIZE,
+    counts: Optional[Dict[str, int]] = None,
+) -> int:
     """Batch-save multiple tasks.
 
+    ``tasks`` may be any iterable, including an ``iter_*`` generator; it is
+    consumed in chunks of ``chunk_size`` rows so memory stays bounded, and
+    everything is committed once at the end. Tasks whose stored fingerprint
+    matches are skipped by the upsert.
+
     Args:
         conn: Open SQLite connection.
-        tasks: List of UnifiedTask instances.
+        tasks: Iterable of UnifiedTask instances.
+        chunk_size: Rows written per executemany() call.
+        counts: Optional dict updated in place with ``written`` and
+            ``unchanged`` totals.
 
     Returns:
-        Number of tasks saved.
+        Number of tasks saved (written or already up to date).
     """
     now = datetime.now(timezone.utc).isoformat()
-    rows = []
-    for t in tasks:
-        due = t.due_date.isoformat() if t.due_date else None
-        rows.append((t.id, t.source, t.title, t.snippet, t.status, t.priority, due, t.link, now))
-
-    conn.executemany(
-        """
-        INSERT OR REPLACE INTO tasks
-            (id, source, title, snippet, status, priority, due_date, link, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows,
-    )
+    it = iter(tasks)
+    saved = 0
+    written = 0
+    while True:
+        rows = [_task_row(t, now) for t in islice(it, chunk_size)]
+        if not rows:
+            break
+
+        cursor = conn.executemany(_UPSERT_TASK_SQL, rows)
+        saved += len(rows)
+        written += max(cursor.rowcount, 0)
     conn.commit()
-    return len(rows)
+    if counts is not None:
+        counts["written"] = counts.get("written", 0) + written
+        counts["unchanged"] = counts.get("unchanged", 0) + saved - written
+    if saved > written:
+        logger.debug("save_tasks: %d of %d tasks unchanged.", saved - written, saved)
+    return saved
 
 
 def get_tasks(
     conn: sqlite3.Connection,
     source: Optional[str] = None,
     status: Optional[str] = None,
-    limit: int = 100,
+    limit: Optional[int] = 100,
 ) -> List[UnifiedTask]:
     """Retrieve tasks from the database with optional filters.
 
@@ -202,7 +293,7 @@ def get_tasks(
         conn: Open SQLite connection.
         source: Filter by source (e.g., 'gmail', 'notion').
         status: Filter by status string.
-        limit: Maximum number of records to return.
+        limit: Maximum number of records to return (None: all).
 
     Returns:
         List of UnifiedTask instances.
@@ -217,33 +308,44 @@ def get_tasks(
         query += " AND status = ?"
         params.append(status)
 
-    query += " ORDER BY updated_at DESC LIMIT ?"
-    params.append(limit)
+    query += " ORDER BY updated_at DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
 
     cursor = conn.execute(query, params)
-    tasks: List[UnifiedTask] = []
+    return [_row_to_task(row) for row in cursor.fetchall()]
 
-    for row in cursor.fetchall():
-        due_date = None
-        if row["due_date"]:
-            try:
-                due_date = datetime.fromisoformat(row["due_date"])
-            except (ValueError, TypeError):
-                pass
-
-        task = UnifiedTask(
-            id=row["id"],
-            source=row["source"],
-            title=row["title"],
-            snippet=row["snippet"],
-            status=row["status"],
-            priority=row["priority"],
-            due_date=due_date,
-            link=row["link"],
-        )
-        tasks.append(task)
 
-    return tasks
+def get_task(conn: sqlite3.Connection, task_id: str) -> Optional[UnifiedTask]:
+    """Retrieve a single task by ID.
+
+    Returns:
+        The UnifiedTask, or None if no such task is stored.
+    """
+    row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    return _row_to_task(row) if row else None
+
+
+def _row_to_task(row: sqlite3.Row) -> UnifiedTask:
+    """Convert a ``tasks`` row into a UnifiedTask."""
+    due_date = None
+    if row["due_date"]:
+        try:
+            due_date = datetime.fromisoformat(row["due_date"])
+        except (ValueError, TypeError):
+            pass
+
+    return UnifiedTask(
+        id=row["id"],
+        source=row["source"],
+        title=row["title"],
+        snippet=row["snippet"],
+        status=row["status"],
+        priority=row["priority"],
+        due_date=due_date,
+        link=row["link"],
+    )
 
 
 def delete_task(conn: sqlite3.Connection, task_id: str) -> bool:
@@ -292,6 +394,34 @@ def get_sources(conn: sqlite3.Connection) -> List[Dict]:
     return [dict(row) for row in cursor.fetchall()]
 
 
+def ensure_source(conn: sqlite3.Connection, name: str) -> None:
+    """Register a source if it is not registered yet, keeping existing state."""
+    conn.execute("INSERT OR IGNORE INTO sources (name) VALUES (?)", (name,))
+    conn.commit()
+
+
+def get_last_sync(conn: sqlite3.Connection, source: str) -> Optional[datetime]:
+    """Return the last successful sync time of a source, or None.
+
+    Args:
+        conn: Open SQLite connection.
+        source: Source name (e.g., 'jira').
+
+    Returns:
+        Timezone-aware datetime of the last successful sync.
+    """
+    row = conn.execute(
+        "SELECT last_sync_at FROM sources WHERE name = ?", (source,)
+    ).fetchone()
+    if not row or not row["last_sync_at"]:
+        return None
+    try:
+        value = datetime.fromisoformat(row["last_sync_at"])
+    except (ValueError, TypeError):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 # ---------------------------------------------------------------------------
 # Sync log
 # ---------------------------------------------------------------------------
@@ -304,9 +434,18 @@ def mark_synced(
     task_count: int,
     status: str = "success",
     message: Optional[str] = None,
+    duration_ms: Optional[float] = None,
+    request_count: Optional[int] = None,
+    bytes_transferred: Optional[int] = None,
+    throttle_seconds: Optional[float] = None,
+    error_class: Optional[str] = None,
+    advance: bool = True,
 ) -> None:
     """Record a sync operation in the log and update the source's last_sync_at.
 
+    ``last_sync_at`` only advances for successful operations, so incremental
+    syncs resume from the last point that is known to be complete.
+
     Args:
         conn: Open SQLite connection.
         source: Source name (e.g., 'gmail').
@@ -314,22 +453,39 @@ def mark_synced(
         task_count: Number of tasks processed.
         status: 'success' or 'error'.
         message: Optional details / error message.
+        duration_ms: Time spent on the operation.
+        request_count: Remote requests made.
+        bytes_transferred: Request plus response body bytes.
+        throttle_seconds: Time spent waiting on rate limits.
+        error_class: Exception class name of a failure.
+        advance: Whether a success moves ``last_sync_at``. False for
+            operations that do not consume the source's incremental sync
+            point (e.g. sync engine cycles, which keep their own).
+
+    The performance fields match ``integrations.ratelimit.UsageMeter.log_fields()``.
     """
     now = datetime.now(timezone.utc).isoformat()
 
     conn.execute(
         """
-        INSERT INTO sync_log (source, operation, task_count, status, message, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT INTO sync_log (
+            source, operation, task_count, status, message, timestamp,
+            duration_ms, request_count, bytes_transferred, throttle_seconds, error_class
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (source, operation, task_count, status, message, now),
+        (
+            source, operation, task_count, status, message, now,
+            duration_ms, request_count, bytes_transferred, throttle_seconds, error_class,
+        ),
     )
 
     # Update source last_sync_at
-    conn.execute(
-        "UPDATE sources SET last_sync_at = ? WHERE name = ?",
-        (now, source),
-    )
+    if status == "success" and advance:
+        conn.execute(
+            "UPDATE sources SET last_sync_at = ? WHERE name = ?",
+            (now, source),
+        )
     conn.commit()
 
 
@@ -360,3 +516,204 @@ def get_sync_log(
 
     cursor = conn.execute(query, params)
     return [dict(row) for row in cursor.fetchall()]
+
+
+# ---------------------------------------------------------------------------
+# Sync performance history
+# ---------------------------------------------------------------------------
+
+# Columns summarized by get_sync_stats() and checked by find_sync_regressions().
+_PERF_COLUMNS = ("duration_ms", "request_count", "bytes_transferred", "throttle_seconds")
+
+
+def _percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile of ``values`` (``q`` in 0..1)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _recent_runs(
+    conn: sqlite3.Connection, source: Optional[str], limit: int
+) -> Dict[str, List[sqlite3.Row]]:
+    """The last ``limit`` measured runs per source, oldest first."""
+    query = """
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY source ORDER BY timestamp DESC, id DESC
+            ) AS rn
+            FROM sync_log
+            WHERE duration_ms IS NOT NULL {source_filter}
+        )
+        WHERE rn <= ?
+        ORDER BY source, timestamp, id
+    """.format(source_filter="AND source = ?" if source else "")
+    params: list = [source] if source else []
+    params.append(limit)
+    runs: Dict[str, List[sqlite3.Row]] = {}
+    for row in conn.execute(query, params):
+        runs.setdefault(row["source"], []).append(row)
+    return runs
+
+
+def get_sync_stats(
+    conn: sqlite3.Connection,
+    source: Optional[str] = None,
+    window: int = 20,
+) -> Dict[str, Dict[str, Any]]:
+    """Rolling performance of the last ``window`` measured runs per source.
+
+    Only runs logged with a ``duration_ms`` are considered. Percentiles
+    cover successful runs; failed runs are counted in ``errors`` and
+    ``error_classes``.
+
+    Args:
+        conn: Open SQLite connection.
+        source: Optional filter by source.
+        window: Number of most recent runs per source.
+
+    Returns:
+        ``{source: {"runs", "errors", "error_classes", "last_run",
+        "duration_ms": {"p50", "p95", "last"}, "request_count": {...},
+        "bytes_transferred": {...}, "throttle_seconds": {...}}}``.
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for name, rows in _recent_runs(conn, source, window).items():
+        ok = [r for r in rows if r["status"] == "success"]
+        entry: Dict[str, Any] = {
+            "runs": len(rows),
+            "errors": len(rows) - len(ok),
+            "error_classes": dict(Counter(r["error_class"] for r in rows if r["error_class"])),
+            "last_run": rows[-1]["timestamp"],
+        }
+        for column in _PERF_COLUMNS:
+            values = [r[column] for r in ok if r[column] is not None]
+            entry[column] = {
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "last": values[-1] if values else None,
+            }
+        stats[name] = entry
+    return stats
+
+
+def _regressed_streak(
+    values: Sequence[float], threshold: float, window: int, min_baseline: int
+) -> Tuple[int, Optional[float]]:
+    """Length of the trailing run of values above ``threshold`` x the median
+    of the ``window`` values before each, and the baseline before the streak.
+    """
+    streak, baseline = 0, None
+    while streak < len(values):
+        end = len(values) - streak - 1
+        prior = values[max(0, end - window):end]
+        if len(prior) < min_baseline:
+            break
+        base = median(prior)
+        if base <= 0 or values[end] <= threshold * base:
+            break
+        streak, baseline = streak + 1, base
+    return streak, baseline
+
+
+def find_sync_regressions(
+    conn: sqlite3.Connection,
+    source: Optional[str] = None,
+    threshold: float = 2.0,
+    window: int = 20,
+    min_baseline: int = 3,
+) -> List[Dict[str, Any]]:
+    """Flag sources whose latest successful runs regressed against their history.
+
+    For each source, the most recent runs whose duration (or request count)
+    exceeds ``threshold`` times the median of the ``window`` runs before
+    them form a regression streak. Durations below
+    ``REGRESSION_MIN_DURATION_MS`` are ignored.
+
+    Args:
+        conn: Open SQLite connection.
+        source: Optional filter by source.
+        threshold: Ratio to the baseline median that counts as a regression.
+        window: Runs per baseline.
+        min_baseline: Minimum runs needed to form a baseline.
+
+    Returns:
+        One dict per regression: ``source``, ``metric``, ``baseline``,
+        ``current`` (median of the streak), ``ratio``, ``since`` (timestamp
+        of the first regressed run), ``runs`` (streak length) and a
+        human-readable ``message``.
+    """
+    regressions: List[Dict[str, Any]] = []
+    for name, rows in _recent_runs(conn, source, 2 * window).items():
+        ok = [r for r in rows if r["status"] == "success"]
+        for column in ("duration_ms", "request_count"):
+            measured = [r for r in ok if r[column] is not None]
+            values = [float(r[column]) for r in measured]
+            streak, baseline = _regressed_streak(values, threshold, window, min_baseline)
+            if not streak:
+                continue
+            current = median(values[-streak:])
+            if column == "duration_ms" and current < REGRESSION_MIN_DURATION_MS:
+                continue
+            since = measured[-streak]["timestamp"]
+            ratio = current / baseline
+            try:
+                when = datetime.fromisoformat(since).strftime("%A %Y-%m-%d")
+            except ValueError:
+                when = since
+            change = "got {:.1f}x slower" if column == "duration_ms" else "made {:.1f}x more requests"
+            regressions.append({
+                "source": name,
+                "metric": column,
+                "baseline": round(baseline, 3),
+                "current": round(current, 3),
+                "ratio": round(ratio, 2),
+                "since": since,
+                "runs": streak,
+                "message": f"{name.capitalize()} sync {change.format(ratio)} since {when}",
+            })
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Sync cursors
+# ---------------------------------------------------------------------------
+
+
+def get_sync_cursors(conn: sqlite3.Connection, source: str) -> Dict[str, str]:
+    """Return all stored cursors for a source, keyed by scope.
+
+    Args:
+        conn: Open SQLite connection.
+        source: Source name (e.g., 'slack').
+
+    Returns:
+        Mapping of scope (e.g. channel ID) to cursor value.
+    """
+    cursor = conn.execute(
+        "SELECT scope, cursor FROM sync_cursors WHERE source = ?", (source,)
+    )
+    return {row["scope"]: row["cursor"] for row in cursor.fetchall()}
+
+
+def set_sync_cursors(conn: sqlite3.Connection, source: str, cursors: Dict[str, str]) -> None:
+    """Upsert cursors for a source.
+
+    Args:
+        conn: Open SQLite connection.
+        source: Source name (e.g., 'slack').
+        cursors: Mapping of scope to cursor value.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO sync_cursors (source, scope, cursor, updated_at)
+        VALUES (?, ?, ?, ?)
+        """,
+        [(source, scope, value, now) for scope, value in cursors.items()],
+    )
+    conn.commit()
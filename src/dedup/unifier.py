@@ -7,13 +7,16 @@ single canonical representation while preserving provenance metadata.
 
 import logging
 import re
+import threading
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
 try:
+    import metrics
     from models import UnifiedTask, TaskPriority
 except ImportError:
+    from src import metrics
     from src.models import UnifiedTask, TaskPriority
 
 logger = logging.getLogger(__name__)
@@ -176,37 +179,29 @@ def merge_duplicates(tasks: List[UnifiedTask]) -> UnifiedTask:
 # Main unification pipeline
 # ---------------------------------------------------------------------------
 
-
-def unify_tasks(
+def cluster_tasks(
     tasks: List[UnifiedTask],
     similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
     date_window: timedelta = DEFAULT_DATE_WINDOW,
-) -> List[UnifiedTask]:
-    """Deduplicate and unify a list of tasks from heterogeneous sources.
+) -> List[List[int]]:
+    """Group duplicate tasks, returning clusters as lists of input indices.
 
-    Algorithm (O(n^2) pairwise — acceptable for typical personal task volumes
-    of < 500 items):
-        1. For each unprocessed task, find all other tasks whose normalized
-           title similarity exceeds ``similarity_threshold`` AND whose due
-           dates are within ``date_window``.
-        2. Group matched tasks into a cluster.
-        3. Merge each cluster into a single canonical UnifiedTask.
+    This is the matching step of ``unify_tasks``: each unvisited task
+    claims every later unvisited task whose normalized title similarity is
+    at least ``similarity_threshold`` and whose due date is within
+    ``date_window``. Clusters are ordered by their first member.
 
     Args:
         tasks: Raw list of UnifiedTask from all integrations.
-        similarity_threshold: Minimum similarity ratio to consider a pair
-                              as duplicates (default 0.80).
+        similarity_threshold: Minimum similarity ratio for a duplicate pair.
         date_window: Maximum due-date difference allowed for dedup.
 
     Returns:
-        Deduplicated list of UnifiedTask instances.
+        List of clusters; every input index appears in exactly one.
     """
-    if not tasks:
-        return []
-
     n = len(tasks)
     visited: List[bool] = [False] * n
-    unified: List[UnifiedTask] = []
+    clusters: List[List[int]] = []
 
     # Pre-compute normalized titles for efficiency
     normalized: List[str] = [normalize_task(t.title) for t in tasks]
@@ -215,7 +210,7 @@ def unify_tasks(
         if visited[i]:
             continue
 
-        cluster: List[UnifiedTask] = [tasks[i]]
+        cluster: List[int] = [i]
         visited[i] = True
 
         for j in range(i + 1, n):
@@ -226,7 +221,7 @@ def unify_tasks(
             if sim >= similarity_threshold and _dates_are_close(
                 tasks[i].due_date, tasks[j].due_date, date_window
             ):
-                cluster.append(tasks[j])
+                cluster.append(j)
                 visited[j] = True
                 logger.debug(
                     "Duplicate detected (sim=%.2f): '%s' <-> '%s'",
@@ -235,8 +230,74 @@ def unify_tasks(
                     tasks[j].title,
                 )
 
-        merged = merge_duplicates(cluster)
-        unified.append(merged)
+        clusters.append(cluster)
+    return clusters
+
+
+# Result of the last unify_tasks() call, keyed by the full serialized form of
+# every input task and the matching parameters. The key must cover every
+# field merge_duplicates() copies (link included, which fingerprint() leaves
+# out). Repeated calls over an unchanged task set skip the O(n^2) comparison.
+_last_result: Optional[Tuple[tuple, List[UnifiedTask]]] = None
+_last_result_lock = threading.Lock()
+
+
+def clear_unify_cache() -> None:
+    """Forget the memoized unify_tasks() result."""
+    global _last_result
+    with _last_result_lock:
+        _last_result = None
+
+
+def unify_tasks(
+    tasks: List[UnifiedTask],
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    date_window: timedelta = DEFAULT_DATE_WINDOW,
+) -> List[UnifiedTask]:
+    """Deduplicate and unify a list of tasks from heterogeneous sources.
+
+    Algorithm (O(n^2) pairwise — acceptable for typical personal task volumes
+    of < 500 items):
+        1. For each unprocessed task, find all other tasks whose normalized
+           title similarity exceeds ``similarity_threshold`` AND whose due
+           dates are within ``date_window``.
+        2. Group matched tasks into a cluster.
+        3. Merge each cluster into a single canonical UnifiedTask.
+
+    Args:
+        tasks: Raw list of UnifiedTask from all integrations.
+        similarity_threshold: Minimum similarity ratio to consider a pair
+                              as duplicates (default 0.80).
+        date_window: Maximum due-date difference allowed for dedup.
+
+    Returns:
+        Deduplicated list of UnifiedTask instances.
+
+    When every input task is identical to the previous call's (and the
+    parameters match), a copy of the previous result is returned without
+    re-running the comparison.
+    """
+    global _last_result
+    if not tasks:
+        return []
+
+    key = (
+        tuple(t.model_dump_json() for t in tasks),
+        similarity_threshold,
+        date_window,
+    )
+    with _last_result_lock:
+        hit = _last_result is not None and _last_result[0] == key
+        metrics.record_cache("dedup", "unify_tasks", hit)
+        if hit:
+            logger.debug("unify_tasks: %d tasks unchanged, reusing previous result.", len(tasks))
+            return [t.model_copy(deep=True) for t in _last_result[1]]
+
+    unified = [
+        merge_duplicates([tasks[i] for i in cluster])
+        for cluster in cluster_tasks(tasks, similarity_threshold, date_window)
+    ]
+    n = len(tasks)
 
     dedup_count = n - len(unified)
     if dedup_count > 0:
@@ -247,4 +308,6 @@ def unify_tasks(
             dedup_count,
         )
 
+    with _last_result_lock:
+        _last_result = (key, [t.model_copy(deep=True) for t in unified])
     return unified
@@ -1,19 +1,24 @@
 """gmail.py — Gmail integration for G_TaskCenter."""
 
 import os
+import json
 import pickle
 import logging
-from typing import List, Optional
-from datetime import datetime
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+from datetime import datetime, timedelta, timezone
 from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from tenacity import retry, wait_exponential, stop_after_attempt
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 
 try:
+    import tracing
     from models import UnifiedTask, TaskSource, TaskPriority
+    from integrations import ratelimit, registry
 except ImportError:
+    from src import tracing
     from src.models import UnifiedTask, TaskSource, TaskPriority
+    from src.integrations import ratelimit, registry
 
 logger = logging.getLogger(__name__)
 
@@ -21,102 +26,214 @@ logger = logging.getLogger(__name__)
 SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
 
 
-def get_gmail_service():
-    """Build and return a Gmail service object."""
-    creds = None
-    token_path = os.environ.get("GMAIL_TOKEN_PATH", "credentials/gmail_token.pickle")
+# messages.batchModify accepts at most this many IDs per call.
+BATCH_MODIFY_MAX_IDS = 1000
 
-    if os.path.exists(token_path):
-        with open(token_path, "rb") as token:
-            creds = pickle.load(token)
+# Messages requested per list page (registry policy).
+GMAIL_PAGE_SIZE = registry.policy("gmail").page_size or 100
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            logger.warning(
-                "Gmail credentials not found or invalid. Manual auth required."
-            )
+# Refresh credentials this many seconds before the access token expires.
+TOKEN_REFRESH_MARGIN = int(os.environ.get("GMAIL_TOKEN_REFRESH_MARGIN", "300"))
+
+_discovery_doc: Optional[dict] = None
+_discovery_lock = threading.Lock()
+
+
+def _gmail_discovery_document() -> Optional[dict]:
+    """Parsed Gmail v1 discovery document bundled with google-api-python-client."""
+    global _discovery_doc
+    if _discovery_doc is None:
+        with _discovery_lock:
+            if _discovery_doc is None:
+                raw = discovery_cache.get_static_doc("gmail", "v1")
+                _discovery_doc = json.loads(raw) if raw else None
+    return _discovery_doc
+
+
+class GmailClientCache:
+    """Process-wide Gmail credentials and per-thread service objects.
+
+    Credentials are unpickled once per token path (re-checked on each call
+    while the file is missing) and refreshed in place
+    ``margin`` seconds before expiry (the refreshed token is written back
+    to disk). Service objects are built from the bundled discovery document
+    without network access. httplib2 connections are not thread-safe, so
+    each thread gets its own service sharing the same credentials.
+    """
+
+    def __init__(self, margin: float = TOKEN_REFRESH_MARGIN) -> None:
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._token_path: Optional[str] = None
+        self._creds = None
+        self._local = threading.local()
+
+    def credentials(self, token_path: str):
+        """Return valid credentials for ``token_path``, or None."""
+        with self._lock:
+            if token_path != self._token_path:
+                self._creds = None
+                self._token_path = token_path
+            # Until a token is found, look again on every call (it may be
+            # written later, e.g. by cli_auth).
+            if self._creds is None and os.path.exists(token_path):
+                with open(token_path, "rb") as token:
+                    self._creds = pickle.load(token)
+
+            creds = self._creds
+            if creds is not None and self._needs_refresh(creds):
+                if creds.refresh_token:
+                    creds.refresh(Request())
+                    with open(token_path, "wb") as token:
+                        pickle.dump(creds, token)
+                elif not creds.valid:
+                    creds = None
+
+            if creds is None:
+                logger.warning(
+                    "Gmail credentials not found or invalid. Manual auth required."
+                )
+            return creds
+
+    def service(self, token_path: str):
+        """Return this thread's Gmail service for ``token_path``, or None."""
+        creds = self.credentials(token_path)
+        if creds is None:
             return None
 
-    return build("gmail", "v1", credentials=creds)
+        cached = getattr(self._local, "service", None)
+        if cached is not None and cached[0] is creds:
+            return cached[1]
+
+        # GMAIL_API_BASE points the client at a proxy or local stand-in.
+        api_base = os.environ.get("GMAIL_API_BASE")
+        options = {"api_endpoint": api_base.rstrip("/") + "/"} if api_base else None
+        doc = _gmail_discovery_document()
+        if doc is not None:
+            service = build_from_document(doc, credentials=creds, client_options=options)
+        else:
+            service = build("gmail", "v1", credentials=creds, client_options=options)
+        self._local.service = (creds, service)
+        return service
+
+    def reset(self) -> None:
+        """Forget loaded credentials; services are rebuilt on next use."""
+        with self._lock:
+            self._token_path = None
+            self._creds = None
+
+    def _needs_refresh(self, creds) -> bool:
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth stores expiry as naive UTC.
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - timedelta(seconds=self.margin) <= now
+
+
+_client_cache = GmailClientCache()
+
+
+def get_gmail_service():
+    """Return a Gmail service object from the process-wide client cache."""
+    token_path = os.environ.get("GMAIL_TOKEN_PATH", "credentials/gmail_token.pickle")
+    try:
+        return _client_cache.service(token_path)
+    except Exception as e:
+        logger.error(f"Failed to initialise Gmail service: {e}")
+        return None
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def _fetch_message_details(service, user_id, msg_id):
-    """Fetch message detail with exponential backoff on failure."""
-    return service.users().messages().get(userId=user_id, id=msg_id).execute()
+    """Fetch message detail; ``ratelimit.call`` paces and retries throttled calls."""
+    return ratelimit.call(
+        "gmail", service.users().messages().get(userId=user_id, id=msg_id).execute
+    )
 
 
-def list_task_emails(
+def _message_to_task(m: dict) -> UnifiedTask:
+    """Convert a Gmail message resource into a UnifiedTask."""
+    headers = m["payload"].get("headers", [])
+
+    subject = next(
+        (h["value"] for h in headers if h["name"] == "Subject"),
+        "No Subject",
+    )
+    snippet = m.get("snippet", "")
+
+    # We can deduce priority from subject keywords
+    priority = TaskPriority.NORMAL
+    if "urgent" in subject.lower() or "asap" in subject.lower():
+        priority = TaskPriority.HIGH
+
+    return UnifiedTask(
+        id=m["id"],
+        source=TaskSource.GMAIL,
+        title=subject,
+        snippet=snippet,
+        status="Pending" if "UNREAD" in m.get("labelIds", []) else "Read",
+        priority=priority,
+        link=f"https://mail.google.com/mail/u/0/#inbox/{m['id']}",
+    )
+
+
+def iter_task_emails(
     query: str = "label:todo OR label:task OR subject:task AND is:unread",
     limit: int = 20,
-) -> List[UnifiedTask]:
-    """List emails matching a task-related query, utilizing pagination."""
+) -> Iterator[UnifiedTask]:
+    """Yield task emails as their details arrive, page by page.
+
+    Errors propagate to the caller.
+    """
     service = get_gmail_service()
     if not service:
-        return []
+        return
 
-    unified_tasks: List[UnifiedTask] = []
+    # Paginating up to the limit
+    page_token = None
+    messages_fetched = 0
 
-    try:
-        # Paginating up to the limit
-        page_token = None
-        messages_fetched = 0
-
-        while messages_fetched < limit:
-            results = (
+    page_no = 0
+    while messages_fetched < limit:
+        page_no += 1
+        with tracing.span("gmail.page", source="gmail", page=page_no) as span:
+            results = ratelimit.call(
+                "gmail",
                 service.users()
                 .messages()
                 .list(
                     userId="me",
                     q=query,
-                    maxResults=min(limit - messages_fetched, 100),
+                    maxResults=min(limit - messages_fetched, GMAIL_PAGE_SIZE),
                     pageToken=page_token,
                 )
-                .execute()
+                .execute,
             )
+            span.set_attribute("items", len(results.get("messages", [])))
 
-            messages = results.get("messages", [])
-            if not messages:
-                break
-
-            for msg in messages:
-                if messages_fetched >= limit:
-                    break
-
-                m = _fetch_message_details(service, "me", msg["id"])
-                headers = m["payload"].get("headers", [])
+        messages = results.get("messages", [])
+        if not messages:
+            break
 
-                subject = next(
-                    (h["value"] for h in headers if h["name"] == "Subject"),
-                    "No Subject",
-                )
-                snippet = m.get("snippet", "")
-
-                # We can deduce priority from subject keywords
-                priority = TaskPriority.NORMAL
-                if "urgent" in subject.lower() or "asap" in subject.lower():
-                    priority = TaskPriority.HIGH
-
-                task = UnifiedTask(
-                    id=msg["id"],
-                    source=TaskSource.GMAIL,
-                    title=subject,
-                    snippet=snippet,
-                    status="Pending" if "UNREAD" in m.get("labelIds", []) else "Read",
-                    priority=priority,
-                    link=f"https://mail.google.com/mail/u/0/#inbox/{msg['id']}",
-                )
-                unified_tasks.append(task)
-                messages_fetched += 1
-
-            page_token = results.get("nextPageToken")
-            if not page_token:
+        for msg in messages:
+            if messages_fetched >= limit:
                 break
+            yield _message_to_task(_fetch_message_details(service, "me", msg["id"]))
+            messages_fetched += 1
+
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
 
-        return unified_tasks
 
+def list_task_emails(
+    query: str = "label:todo OR label:task OR subject:task AND is:unread",
+    limit: int = 20,
+) -> List[UnifiedTask]:
+    """List emails matching a task-related query, utilizing pagination."""
+    try:
+        return list(iter_task_emails(query, limit))
     except Exception as e:
         logger.error(f"Error listing Gmail tasks: {e}")
         return []
@@ -129,11 +246,58 @@ def archive_email_task(msg_id: str) -> bool:
         return False
 
     try:
-        service.users().messages().modify(
-            userId="me", id=msg_id, body={"removeLabelIds": ["INBOX"]}
-        ).execute()
+        ratelimit.call(
+            "gmail",
+            service.users()
+            .messages()
+            .modify(userId="me", id=msg_id, body={"removeLabelIds": ["INBOX"]})
+            .execute,
+        )
         logger.info(f"Successfully archived Gmail task {msg_id}")
         return True
     except Exception as e:
         logger.error(f"Failed to archive Gmail task {msg_id}: {e}")
         return False
+
+
+def archive_email_tasks(msg_ids: Iterable[str]) -> Dict[str, bool]:
+    """Archive many emails with ``messages.batchModify``.
+
+    Removes the INBOX label from up to 1,000 messages per request instead
+    of one ``messages.modify`` call per message. batchModify succeeds or
+    fails per request, so each chunk's IDs share one outcome.
+
+    Args:
+        msg_ids: Gmail message IDs.
+
+    Returns:
+        Mapping of each message ID to whether it was archived.
+    """
+    ids = list(dict.fromkeys(msg_ids))
+    if not ids:
+        return {}
+
+    results = {msg_id: False for msg_id in ids}
+    service = get_gmail_service()
+    if not service:
+        return results
+
+    for i in range(0, len(ids), BATCH_MODIFY_MAX_IDS):
+        chunk = ids[i : i + BATCH_MODIFY_MAX_IDS]
+        try:
+            ratelimit.call(
+                "gmail",
+                service.users()
+                .messages()
+                .batchModify(
+                    userId="me", body={"ids": chunk, "removeLabelIds": ["INBOX"]}
+                )
+                .execute,
+            )
+            results.update({msg_id: True for msg_id in chunk})
+        except Exception as e:
+            logger.error(f"Failed to archive {len(chunk)} Gmail task(s): {e}")
+
+    archived = sum(results.values())
+    logger.info(f"Archived {archived}/{len(ids)} Gmail task(s)")
+    return results
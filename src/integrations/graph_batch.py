@@ -0,0 +1,274 @@
+"""graph_batch.py — Microsoft Graph JSON batching for G_TaskCenter.
+
+Groups Graph sub-requests into ``$batch`` POSTs of at most 20 requests each,
+so that reading dozens of To-Do lists or completing many tasks takes a
+handful of round trips instead of one per list, page or task.
+
+Features:
+    - ``dependsOn`` ordering: requests that depend on each other are always
+      placed in the same batch (Graph rejects cross-batch dependencies).
+    - Per-item retry: sub-responses throttled with 429 (or 503 with
+      ``Retry-After``) are resent in a later batch after the longest
+      requested delay, together with dependants that failed with 424.
+    - Rate limiting: each batch draws one token per sub-request from the
+      shared ``graph`` bucket, since Graph evaluates throttling per item.
+
+Usage:
+    responses = execute_batch(
+        [BatchRequest("1", "GET", "/me/todo/lists/abc/tasks")], token
+    )
+    responses["1"].status, responses["1"].body
+"""
+
+import os
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from integrations import ratelimit
+except ImportError:
+    from src.integrations import ratelimit
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Overridable to point the integration at a proxy or local stand-in.
+GRAPH_API_BASE = os.environ.get("GRAPH_API_BASE", "https://graph.microsoft.com/v1.0").rstrip("/")
+
+# Graph accepts at most 20 sub-requests per $batch call.
+MAX_BATCH_SIZE = 20
+
+# Status Graph returns for a request whose dependency failed.
+_FAILED_DEPENDENCY = 424
+
+
+# ---------------------------------------------------------------------------
+# Data types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BatchRequest:
+    """One sub-request of a Graph ``$batch`` call.
+
+    ``url`` is relative to the API version root (e.g. ``/me/todo/lists``);
+    absolute Graph URLs such as ``@odata.nextLink`` are accepted too.
+    """
+
+    id: str
+    method: str
+    url: str
+    body: Optional[Any] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+    def to_json(self, base_url: str) -> Dict[str, Any]:
+        url = self.url
+        if url.startswith(base_url):
+            url = url[len(base_url):]
+        item: Dict[str, Any] = {"id": self.id, "method": self.method.upper(), "url": url}
+        headers = dict(self.headers)
+        if self.body is not None:
+            item["body"] = self.body
+            headers.setdefault("Content-Type", "application/json")
+        if headers:
+            item["headers"] = headers
+        if self.depends_on:
+            item["dependsOn"] = list(self.depends_on)
+        return item
+
+
+@dataclass
+class BatchResponse:
+    """Result of one sub-request."""
+
+    id: str
+    status: int
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _components(requests: List[BatchRequest]) -> List[List[BatchRequest]]:
+    """Group requests linked by ``dependsOn`` (in input order)."""
+    parent = {r.id: r.id for r in requests}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for r in requests:
+        for dep in r.depends_on:
+            if dep not in parent:
+                raise ValueError(f"Request {r.id} depends on unknown request {dep}")
+            parent[find(r.id)] = find(dep)
+
+    groups: Dict[str, List[BatchRequest]] = {}
+    for r in requests:
+        groups.setdefault(find(r.id), []).append(r)
+    return list(groups.values())
+
+
+def plan_batches(
+    requests: Iterable[BatchRequest], max_size: int = MAX_BATCH_SIZE
+) -> List[List[BatchRequest]]:
+    """Pack requests into batches of at most ``max_size``.
+
+    Dependency groups are kept together and in their original order.
+
+    Raises:
+        ValueError: On duplicate IDs, unknown dependencies, or a dependency
+            group larger than ``max_size``.
+    """
+    requests = list(requests)
+    ids = [r.id for r in requests]
+    if len(ids) != len(set(ids)):
+        raise ValueError("Batch request IDs must be unique")
+
+    batches: List[List[BatchRequest]] = []
+    current: List[BatchRequest] = []
+    for group in _components(requests):
+        if len(group) > max_size:
+            raise ValueError(
+                f"Dependency chain of {len(group)} requests exceeds the batch size {max_size}"
+            )
+        if len(current) + len(group) > max_size:
+            batches.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _retry_delay(resp: BatchResponse, attempt: int) -> Optional[float]:
+    """Delay requested by a throttled sub-response, or None."""
+    headers = {k.lower(): v for k, v in (resp.headers or {}).items()}
+    retry_after = headers.get("retry-after")
+    if resp.status == 429 or (resp.status == 503 and retry_after):
+        return ratelimit.parse_retry_after(retry_after, float(2 ** attempt))
+    return None
+
+
+def _post_batch(
+    batch: List[BatchRequest], token: str, base_url: str
+) -> Dict[str, BatchResponse]:
+    """Send one ``$batch`` POST and index its sub-responses by ID."""
+    limiter = ratelimit.get_bucket("graph")
+    extra = min(len(batch) - 1, limiter.burst - 1)
+    if extra > 0:
+        # ratelimit.request() takes one token; charge the rest of the items.
+        limiter.acquire(extra)
+
+    resp = ratelimit.request(
+        "graph",
+        "POST",
+        f"{base_url}/$batch",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        json={"requests": [r.to_json(base_url) for r in batch]},
+    )
+    if resp.status_code != 200:
+        logger.error("Graph $batch failed (%d): %s", resp.status_code, resp.text[:300])
+        return {r.id: BatchResponse(r.id, resp.status_code) for r in batch}
+
+    out: Dict[str, BatchResponse] = {}
+    for item in resp.json().get("responses", []):
+        out[str(item.get("id"))] = BatchResponse(
+            id=str(item.get("id")),
+            status=int(item.get("status", 0)),
+            body=item.get("body"),
+            headers=item.get("headers") or {},
+        )
+    for r in batch:
+        out.setdefault(r.id, BatchResponse(r.id, 0))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def execute_batch(
+    requests: Iterable[BatchRequest],
+    token: str,
+    base_url: str = GRAPH_API_BASE,
+    max_retries: Optional[int] = None,
+    max_size: int = MAX_BATCH_SIZE,
+) -> Dict[str, BatchResponse]:
+    """Run requests through Graph ``$batch`` with per-item throttle retries.
+
+    Args:
+        requests: Sub-requests with unique IDs.
+        token: Graph access token.
+        base_url: API version root.
+        max_retries: Retry rounds for throttled items
+            (default: ``ratelimit.MAX_RETRIES``).
+        max_size: Sub-requests per ``$batch`` call (capped at
+            ``MAX_BATCH_SIZE``).
+
+    Returns:
+        Mapping of request ID to its final BatchResponse.
+    """
+    pending = list(requests)
+    by_id = {r.id: r for r in pending}
+    retries = ratelimit.MAX_RETRIES if max_retries is None else max_retries
+    results: Dict[str, BatchResponse] = {}
+
+    attempt = 0
+    while pending:
+        for batch in plan_batches(pending, max(1, min(max_size, MAX_BATCH_SIZE))):
+            results.update(_post_batch(batch, token, base_url))
+
+        delays: Dict[str, float] = {}
+        for r in pending:
+            d = _retry_delay(results[r.id], attempt)
+            if d is not None:
+                delays[r.id] = d
+        if not delays:
+            break
+        ratelimit._record("graph", throttled=len(delays), retry_after_seconds=max(delays.values()))
+        if attempt >= retries:
+            logger.error("Graph $batch: %d item(s) still throttled after %d retries.", len(delays), retries)
+            break
+
+        # Resend throttled items plus dependants that failed because of them.
+        retry_ids = set(delays)
+        changed = True
+        while changed:
+            changed = False
+            for r in pending:
+                if (
+                    r.id not in retry_ids
+                    and results[r.id].status == _FAILED_DEPENDENCY
+                    and any(dep in retry_ids for dep in r.depends_on)
+                ):
+                    retry_ids.add(r.id)
+                    changed = True
+
+        delay = max(delays.values())
+        logger.warning("Graph $batch: retrying %d item(s) in %.1fs.", len(retry_ids), delay)
+        ratelimit.get_bucket("graph").pause(delay)
+        ratelimit._record("graph", retries=1)
+        pending = [
+            BatchRequest(r.id, r.method, r.url, r.body, r.headers,
+                         [d for d in r.depends_on if d in retry_ids])
+            for r in (by_id[rid] for rid in by_id if rid in retry_ids)
+        ]
+        attempt += 1
+
+    return results
@@ -0,0 +1,339 @@
+"""httpcache.py — Conditional GETs and response reuse for G_TaskCenter integrations.
+
+Remote list endpoints (Outlook task lists, n8n workflows, Jira search) are
+polled repeatedly and mostly return the same payload. ``get()`` wraps
+``ratelimit.request`` for such GETs:
+
+    - When a previous response carried ``ETag`` / ``Last-Modified``, the
+      request is sent with ``If-None-Match`` / ``If-Modified-Since``. A 304
+      answer is served from the cache without downloading the body again.
+    - When the provider sends no validators (e.g. Jira search), the body is
+      still downloaded, but if its SHA-256 matches the previous response
+      the already parsed JSON is reused instead of parsing it again.
+
+Responses with validators are stored on disk (one JSON file per URL under
+``TASKCENTER_HTTP_CACHE_DIR``), so they survive restarts. The least
+recently used entries are evicted once the directory exceeds
+``TASKCENTER_HTTP_CACHE_MAX_MB``. Parsed payloads of the most recent
+``MEMORY_ENTRIES`` URLs are kept in memory. They are shared between callers
+and must be treated as read-only.
+
+Cache keys are the provider, URL and query parameters. Credentials are not
+part of the key: the server revalidates every stored entry before it is
+reused.
+
+Each lookup is recorded with ``metrics.record_cache`` under the request's
+provider and endpoint. 304s and unchanged bodies count as hits.
+
+Environment variables:
+    - TASKCENTER_HTTP_CACHE: Set to ``0`` to send plain GETs.
+    - TASKCENTER_HTTP_CACHE_DIR: Cache directory (default: ``data/http_cache``).
+    - TASKCENTER_HTTP_CACHE_MAX_MB: Disk budget (default: 50).
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+
+try:
+    import metrics
+    from integrations import ratelimit
+except ImportError:
+    from src import metrics
+    from src.integrations import ratelimit
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+ENABLED = os.environ.get("TASKCENTER_HTTP_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+CACHE_DIR = os.environ.get(
+    "TASKCENTER_HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "http_cache"),
+)
+MAX_BYTES = int(float(os.environ.get("TASKCENTER_HTTP_CACHE_MAX_MB", "50")) * 1024 * 1024)
+
+# Parsed payloads kept in memory (most recently used URLs).
+MEMORY_ENTRIES = 256
+
+# ---------------------------------------------------------------------------
+# Cached responses
+# ---------------------------------------------------------------------------
+
+
+class CachedResponse:
+    """A 200 response served (or confirmed) by the cache.
+
+    Offers the parts of ``requests.Response`` the integrations read:
+    ``status_code``, ``text``, ``content``, ``headers`` and ``json()``.
+    """
+
+    status_code = 200
+
+    def __init__(self, body: bytes, data: Any, headers: Dict[str, str], from_cache: bool) -> None:
+        self.content = body
+        self.headers = headers
+        # True when the payload was not re-parsed (304 or unchanged body).
+        self.from_cache = from_cache
+        self._data = data
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return self._data
+
+
+class _Entry(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    sha256: str
+    body: bytes
+
+
+class HttpCache:
+    """Size-bounded on-disk store of GET responses plus their parsed payloads.
+
+    Args:
+        directory: Where entries are stored.
+        max_bytes: Disk budget; least recently used entries are evicted
+            beyond it.
+        memory_entries: Parsed payloads kept in memory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES, memory_entries: int = MEMORY_ENTRIES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        # key -> (sha256, parsed payload), most recently used last.
+        self._parsed: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        # key -> file size; loaded from the directory on first use.
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._stats = {"not_modified": 0, "unchanged": 0, "misses": 0, "evictions": 0}
+
+    # -- disk -------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            found = []
+            try:
+                with os.scandir(self.directory) as it:
+                    for e in it:
+                        if e.name.endswith(".json"):
+                            st = e.stat()
+                            found.append((st.st_mtime, e.name[:-5], st.st_size))
+            except FileNotFoundError:
+                pass
+            self._index = OrderedDict((key, size) for _, key, size in sorted(found))
+        return self._index
+
+    def _read(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            if key not in self._load_index():
+                return None
+        try:
+            with open(self._path(key), encoding="utf-8") as fh:
+                raw = json.load(fh)
+            body = raw["body"].encode("utf-8", "surrogateescape")
+            return _Entry(raw["etag"], raw["last_modified"], raw["sha256"], body)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Dropping unreadable HTTP cache entry %s: %s", key, exc)
+            self._remove(key)
+            return None
+
+    def _write(self, key: str, url: str, entry: _Entry) -> None:
+        data = json.dumps({
+            "url": url, "etag": entry.etag, "last_modified": entry.last_modified,
+            "sha256": entry.sha256, "body": entry.body.decode("utf-8", "surrogateescape"),
+        }).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError as exc:
+            logger.warning("Could not write HTTP cache entry for %s: %s", url, exc)
+            return
+        with self._lock:
+            index = self._load_index()
+            index[key] = len(data)
+            index.move_to_end(key)
+            victims = []
+            total = sum(index.values())
+            while total > self.max_bytes and len(index) > 1:
+                victim, size = index.popitem(last=False)
+                total -= size
+                victims.append(victim)
+            self._stats["evictions"] += len(victims)
+        for victim in victims:
+            self._unlink(victim)
+
+    def _touch(self, key: str) -> None:
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._load_index().pop(key, None)
+        self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    # -- memory -----------------------------------------------------------
+
+    def _parse(self, key: str, sha: str, body: bytes) -> Tuple[Any, bool]:
+        """Parsed ``body``, reusing the previous parse when the hash matches."""
+        with self._lock:
+            cached = self._parsed.get(key)
+            if cached is not None and cached[0] == sha:
+                self._parsed.move_to_end(key)
+                return cached[1], True
+        data = json.loads(body)
+        with self._lock:
+            self._parsed[key] = (sha, data)
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > self.memory_entries:
+                self._parsed.popitem(last=False)
+        return data, False
+
+    # -- public -----------------------------------------------------------
+
+    def get(
+        self,
+        provider: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Union[CachedResponse, requests.Response]:
+        """Conditional GET through ``ratelimit.request`` (see module docstring).
+
+        Returns:
+            A ``CachedResponse`` for 200 and 304 answers with a JSON body;
+            any other response unchanged.
+        """
+        key = _key(provider, url, params)
+        stored = self._read(key)
+        send = dict(headers or {})
+        if stored is not None:
+            if stored.etag:
+                send["If-None-Match"] = stored.etag
+            if stored.last_modified:
+                send["If-Modified-Since"] = stored.last_modified
+
+        resp = ratelimit.request(provider, "GET", url, params=params, headers=send, **kwargs)
+        endpoint = metrics.endpoint_for_url("GET", url) if metrics.ENABLED else ""
+
+        if resp.status_code == 304 and stored is not None:
+            self._touch(key)
+            data, _ = self._parse(key, stored.sha256, stored.body)
+            self._count(provider, endpoint, "not_modified")
+            return CachedResponse(stored.body, data, dict(resp.headers), True)
+
+        body = resp.content
+        if resp.status_code != 200 or not isinstance(body, bytes):
+            return resp
+        sha = hashlib.sha256(body).hexdigest()
+        try:
+            data, reused = self._parse(key, sha, body)
+        except ValueError:
+            return resp  # not JSON; leave it to the caller
+        self._count(provider, endpoint, "unchanged" if reused else "misses")
+
+        etag = _header(resp, "ETag")
+        last_modified = _header(resp, "Last-Modified")
+        if etag or last_modified:
+            if stored is None or (stored.sha256, stored.etag, stored.last_modified) != (sha, etag, last_modified):
+                self._write(key, url, _Entry(etag, last_modified, sha, body))
+            else:
+                self._touch(key)
+        elif stored is not None:
+            self._remove(key)  # validators no longer offered
+        return CachedResponse(body, data, dict(resp.headers), reused)
+
+    def _count(self, provider: str, endpoint: str, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+        metrics.record_cache(provider, endpoint, outcome != "misses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit counts (304s, unchanged bodies), misses, evictions, hit rate and disk usage."""
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["entries"] = len(self._load_index())
+            out["bytes"] = sum(self._load_index().values())
+        lookups = out["not_modified"] + out["unchanged"] + out["misses"]
+        out["hit_rate"] = round((out["not_modified"] + out["unchanged"]) / lookups, 4) if lookups else None
+        return out
+
+    def clear(self) -> None:
+        """Drop every entry, on disk and in memory."""
+        with self._lock:
+            keys = list(self._load_index())
+            self._index = OrderedDict()
+            self._parsed.clear()
+        for key in keys:
+            self._unlink(key)
+
+
+def _key(provider: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha256(f"{provider} {url}?{query}".encode("utf-8")).hexdigest()
+
+
+def _header(resp: Any, name: str) -> Optional[str]:
+    value = resp.headers.get(name)
+    return value if isinstance(value, str) and value else None
+
+
+# ---------------------------------------------------------------------------
+# Module-level cache
+# ---------------------------------------------------------------------------
+
+_cache = HttpCache(CACHE_DIR)
+
+
+def get(
+    provider: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    **kwargs: Any,
+) -> Union[CachedResponse, requests.Response]:
+    """GET ``url`` through the shared cache (a plain request when disabled)."""
+    if not ENABLED:
+        return ratelimit.request(provider, "GET", url, params=params, headers=headers, **kwargs)
+    return _cache.get(provider, url, params=params, headers=headers, **kwargs)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Statistics of the shared cache (see ``HttpCache.stats``)."""
+    return _cache.stats()
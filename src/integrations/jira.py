@@ -9,6 +9,13 @@ Requires:
     - JIRA_API_TOKEN: API token (Jira Cloud) or password (Jira Server)
     - JIRA_PROJECT_KEY: (optional) Filter issues to a specific project
     - JIRA_JQL_FILTER: (optional) Custom JQL override
+    - JIRA_INCREMENTAL_OVERLAP_MINUTES: (optional) Safety overlap applied to
+      the ``updated >=`` bound of incremental syncs (default: 5)
+    - JIRA_MAX_IN_FLIGHT: (optional) Search pages fetched concurrently once
+      the result total is known, and bulk transitions run in parallel
+      (default: 4)
+    - JIRA_TRANSITION_CACHE_TTL: (optional) Seconds a transition-ID lookup
+      is reused for the same project / issue type / status (default: 3600)
 
 Install:  pip install requests (already in requirements.txt)
 
@@ -17,17 +24,39 @@ the jira Python library, keeping dependencies minimal.
 """
 
 import os
+import math
+import time
+import sqlite3
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Protocol
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Tuple, Union
 
-import requests
 from requests.auth import HTTPBasicAuth
 
 try:
+    import metrics
     from models import UnifiedTask, TaskSource, TaskPriority
+    from integrations import httpcache, ratelimit, registry
+    from db.sqlite_store import (
+        delete_task,
+        ensure_source,
+        get_last_sync,
+        mark_synced,
+        save_tasks,
+    )
 except ImportError:
+    from src import metrics
     from src.models import UnifiedTask, TaskSource, TaskPriority
+    from src.integrations import httpcache, ratelimit, registry
+    from src.db.sqlite_store import (
+        delete_task,
+        ensure_source,
+        get_last_sync,
+        mark_synced,
+        save_tasks,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +69,19 @@ JIRA_USER_EMAIL = os.environ.get("JIRA_USER_EMAIL", "")
 JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN", "")
 JIRA_PROJECT_KEY = os.environ.get("JIRA_PROJECT_KEY", "")
 JIRA_JQL_FILTER = os.environ.get("JIRA_JQL_FILTER", "")
+JIRA_INCREMENTAL_OVERLAP_MINUTES = int(os.environ.get("JIRA_INCREMENTAL_OVERLAP_MINUTES", "5"))
+# Concurrency and page size come from the source registry
+# (JIRA_MAX_IN_FLIGHT or TASKCENTER_SOURCE_POLICIES).
+JIRA_MAX_IN_FLIGHT = registry.policy("jira").concurrency
+JIRA_PAGE_SIZE = registry.policy("jira").page_size or 100
+JIRA_TRANSITION_CACHE_TTL = float(os.environ.get("JIRA_TRANSITION_CACHE_TTL", "3600"))
+
+# Keys per ``key in (...)`` lookup when resolving issue workflow context.
+_KEY_LOOKUP_CHUNK = 100
+
+# Minimal field projection for incremental sync: everything UnifiedTask needs
+# except the (potentially large) description.
+_JIRA_SYNC_FIELDS = ["summary", "status", "priority", "duedate"]
 
 _JIRA_SOURCE = "jira"
 
@@ -120,16 +162,193 @@ def _parse_priority(fields: dict) -> TaskPriority:
     return _JIRA_PRIORITY_MAP.get(name, TaskPriority.NORMAL)
 
 
+def _issue_to_task(issue: dict) -> UnifiedTask:
+    """Convert a Jira issue payload into a UnifiedTask."""
+    fields = issue.get("fields", {})
+    key = issue.get("key", issue.get("id", ""))
+    description = fields.get("description") or ""
+    if not isinstance(description, str):
+        # REST v3 returns Atlassian Document Format; only v2 strings are kept.
+        description = ""
+
+    return UnifiedTask(
+        id=f"jira-{key}",
+        source=_JIRA_SOURCE,
+        title=fields.get("summary", "Untitled"),
+        snippet=description[:300] if description else None,
+        status=(fields.get("status") or {}).get("name", "Unknown"),
+        priority=_parse_priority(fields),
+        due_date=_parse_due_date(fields),
+        link=f"{JIRA_BASE_URL.rstrip('/')}/browse/{key}",
+    )
+
+
+def _is_done(issue: dict) -> bool:
+    """True if the issue's status belongs to the Done category."""
+    status = issue.get("fields", {}).get("status") or {}
+    return (status.get("statusCategory") or {}).get("key") == "done"
+
+
+def _build_incremental_jql(since: Optional[datetime]) -> str:
+    """JQL for issues updated since the last sync, including ones now Done.
+
+    The bound is expressed as a relative duration (``-Nm``) so it does not
+    depend on the Jira user's timezone. Without a previous sync, only open
+    issues are requested.
+    """
+    if JIRA_JQL_FILTER:
+        parts = [f"({JIRA_JQL_FILTER.split(' ORDER BY')[0]})"]
+    else:
+        parts = ["assignee = currentUser()"]
+        if JIRA_PROJECT_KEY:
+            parts.append(f"project = {JIRA_PROJECT_KEY}")
+
+    if since is None:
+        parts.append("statusCategory != Done")
+    else:
+        elapsed = (datetime.now(timezone.utc) - since).total_seconds() / 60
+        minutes = max(1, math.ceil(elapsed)) + JIRA_INCREMENTAL_OVERLAP_MINUTES
+        parts.append(f'updated >= "-{minutes}m"')
+
+    return " AND ".join(parts) + " ORDER BY updated ASC"
+
+
+class _JiraSearchError(Exception):
+    """Raised when a Jira search request fails."""
+
+    def __init__(self, status_code: int, text: str) -> None:
+        super().__init__(f"Jira search failed ({status_code}): {text[:300]}")
+        self.status_code = status_code
+
+
+def _search_jql_pages(jql: str, fields: List[str], page_size: int = JIRA_PAGE_SIZE) -> Iterator[List[dict]]:
+    """Yield pages of issues from ``/rest/api/3/search/jql`` (token pagination)."""
+    url = f"{JIRA_BASE_URL.rstrip('/')}/rest/api/3/search/jql"
+    token: Optional[str] = None
+
+    while True:
+        params = {"jql": jql, "maxResults": page_size, "fields": ",".join(fields)}
+        if token:
+            params["nextPageToken"] = token
+        resp = httpcache.get("jira", url, headers=_jira_headers(), auth=_jira_auth(), params=params)
+        if resp.status_code != 200:
+            raise _JiraSearchError(resp.status_code, resp.text)
+
+        data = resp.json()
+        yield data.get("issues", [])
+
+        token = data.get("nextPageToken")
+        if data.get("isLast", not token) or not token:
+            return
+
+
+def _fetch_offset_page(url: str, jql: str, fields: List[str], start_at: int, page_size: int) -> dict:
+    """Fetch one ``startAt`` page from the legacy search endpoint."""
+    resp = httpcache.get(
+        "jira",
+        url,
+        headers=_jira_headers(),
+        auth=_jira_auth(),
+        params={"jql": jql, "startAt": start_at, "maxResults": page_size, "fields": ",".join(fields)},
+    )
+    if resp.status_code != 200:
+        raise _JiraSearchError(resp.status_code, resp.text)
+    return resp.json()
+
+
+def _search_offset_pages(
+    jql: str,
+    fields: List[str],
+    page_size: int = JIRA_PAGE_SIZE,
+    limit: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[List[dict]]:
+    """Yield pages of issues from the legacy ``/rest/api/2/search`` endpoint.
+
+    The first response carries ``total``, so every remaining ``startAt``
+    offset is known up front. Those pages are requested concurrently (at
+    most ``max_in_flight`` at a time, still paced by the shared ``jira``
+    rate-limit bucket) and yielded in order.
+
+    Args:
+        jql: JQL query.
+        fields: Fields to request.
+        page_size: Issues requested per page.
+        limit: Stop after this many issues (None for all).
+        max_in_flight: Concurrent page requests (default: JIRA_MAX_IN_FLIGHT).
+    """
+    url = f"{JIRA_BASE_URL.rstrip('/')}/rest/api/2/search"
+    first = _fetch_offset_page(url, jql, fields, 0, page_size)
+    issues = first.get("issues", [])
+    if not issues:
+        return
+    yield issues
+
+    # The server may clamp maxResults below what was asked for; stride by
+    # what it actually returned so no offset is skipped.
+    stride = int(first.get("maxResults") or len(issues)) or len(issues)
+    end = int(first.get("total", 0))
+    if limit is not None:
+        end = min(end, limit)
+    offsets = list(range(len(issues), end, stride))
+    if not offsets:
+        return
+
+    workers = max(1, min(max_in_flight or JIRA_MAX_IN_FLIGHT, len(offsets)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-search")
+    try:
+        futures = [
+            pool.submit(_fetch_offset_page, url, jql, fields, start_at, stride)
+            for start_at in offsets
+        ]
+        for future in futures:
+            page = future.result().get("issues", [])
+            if not page:
+                return
+            yield page
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
 # ---------------------------------------------------------------------------
 # Public API (implements JiraTaskSource protocol)
 # ---------------------------------------------------------------------------
 
 
+def iter_jira_tasks(limit: int = 50) -> Iterator[UnifiedTask]:
+    """Yield issues assigned to the authenticated user, page by page.
+
+    Pages of up to ``JIRA_PAGE_SIZE`` issues (the source policy's
+    ``page_size``) arrive in order from the concurrent prefetch in
+    ``_search_offset_pages``. Errors propagate to the caller.
+
+    Args:
+        limit: Maximum number of tasks to yield.
+    """
+    if not JIRA_BASE_URL:
+        logger.warning("JIRA_BASE_URL not set. Jira integration disabled.")
+        return
+
+    if _jira_auth() is None:
+        logger.warning("Jira credentials incomplete. Set JIRA_USER_EMAIL and JIRA_API_TOKEN.")
+        return
+
+    fields = ["summary", "status", "priority", "duedate", "description"]
+    count = 0
+    for issues in _search_offset_pages(_build_jql(), fields, min(limit, JIRA_PAGE_SIZE), limit=limit):
+        for issue in issues[: limit - count]:
+            yield _issue_to_task(issue)
+            count += 1
+        if count >= limit:
+            return
+
+
 def list_jira_tasks(limit: int = 50) -> List[UnifiedTask]:
     """Fetch issues assigned to the authenticated user from Jira.
 
     Uses JQL to filter for non-Done issues in the configured project.
-    Supports pagination via Jira's startAt/maxResults parameters.
+    After the first page reports the total, the remaining startAt pages
+    are fetched concurrently (see ``_search_offset_pages``).
 
     Args:
         limit: Maximum number of tasks to return.
@@ -137,78 +356,138 @@ def list_jira_tasks(limit: int = 50) -> List[UnifiedTask]:
     Returns:
         List of UnifiedTask instances sourced from Jira.
     """
-    if not JIRA_BASE_URL:
-        logger.warning("JIRA_BASE_URL not set. Jira integration disabled.")
-        return []
+    tasks: List[UnifiedTask] = []
+    try:
+        for task in iter_jira_tasks(limit):
+            tasks.append(task)
+    except Exception as exc:
+        logger.error("Error fetching Jira tasks: %s", exc)
 
-    auth = _jira_auth()
-    if auth is None:
-        logger.warning("Jira credentials incomplete. Set JIRA_USER_EMAIL and JIRA_API_TOKEN.")
-        return []
+    logger.info("Retrieved %d task(s) from Jira.", len(tasks))
+    return tasks
 
-    jql = _build_jql()
-    url = f"{JIRA_BASE_URL.rstrip('/')}/rest/api/2/search"
-    tasks: List[UnifiedTask] = []
-    start_at = 0
-    page_size = min(limit, 50)
 
-    while len(tasks) < limit:
-        try:
-            resp = requests.get(
-                url,
-                headers=_jira_headers(),
-                auth=auth,
-                params={
-                    "jql": jql,
-                    "startAt": start_at,
-                    "maxResults": page_size,
-                    "fields": "summary,status,priority,duedate,description",
-                },
-            )
+class JiraChanges(NamedTuple):
+    """Result of an incremental Jira fetch."""
 
-            if resp.status_code != 200:
-                logger.error("Jira API error (%d): %s", resp.status_code, resp.text[:300])
-                break
+    active: List[UnifiedTask]
+    done: List[str]
 
-            data = resp.json()
-            issues = data.get("issues", [])
-            if not issues:
-                break
 
+def fetch_jira_changes(
+    since: Optional[datetime] = None, page_size: int = JIRA_PAGE_SIZE
+) -> Optional[JiraChanges]:
+    """Fetch issues updated since ``since`` with a minimal field set.
+
+    Uses the ``/rest/api/3/search/jql`` token-paginated endpoint, falling
+    back to ``/rest/api/2/search`` on Jira Server / Data Center (404).
+    Issues whose status is now in the Done category are reported in
+    ``done`` so the caller can remove them locally.
+
+    Args:
+        since: Last successful sync time (None for an initial full pull).
+        page_size: Issues requested per page.
+
+    Returns:
+        JiraChanges, or None if Jira is not configured or a request failed
+        (in which case the sync point must not advance).
+    """
+    if not JIRA_BASE_URL or _jira_auth() is None:
+        logger.warning("Jira not configured. Set JIRA_BASE_URL, JIRA_USER_EMAIL and JIRA_API_TOKEN.")
+        return None
+
+    jql = _build_incremental_jql(since)
+    fields = _JIRA_SYNC_FIELDS
+    active: List[UnifiedTask] = []
+    done: List[str] = []
+
+    def collect(pages: Iterator[List[dict]]) -> None:
+        for issues in pages:
             for issue in issues:
-                if len(tasks) >= limit:
-                    break
-
-                fields = issue.get("fields", {})
-                key = issue.get("key", issue.get("id", ""))
-                summary = fields.get("summary", "Untitled")
-                status_name = fields.get("status", {}).get("name", "Unknown")
-                description = fields.get("description") or ""
-
-                task = UnifiedTask(
-                    id=f"jira-{key}",
-                    source=_JIRA_SOURCE,
-                    title=summary,
-                    snippet=description[:300] if description else None,
-                    status=status_name,
-                    priority=_parse_priority(fields),
-                    due_date=_parse_due_date(fields),
-                    link=f"{JIRA_BASE_URL.rstrip('/')}/browse/{key}",
-                )
-                tasks.append(task)
+                if _is_done(issue):
+                    done.append(f"jira-{issue.get('key', issue.get('id', ''))}")
+                else:
+                    active.append(_issue_to_task(issue))
 
-            # Pagination
-            total = data.get("total", 0)
-            start_at += len(issues)
-            if start_at >= total:
-                break
+    try:
+        try:
+            collect(_search_jql_pages(jql, fields, page_size))
+        except _JiraSearchError as exc:
+            if exc.status_code != 404 or active or done:
+                raise
+            collect(_search_offset_pages(jql, fields, page_size))
+    except Exception as exc:
+        logger.error("Error fetching Jira changes: %s", exc)
+        return None
 
-        except Exception as exc:
-            logger.error("Error fetching Jira tasks: %s", exc)
-            break
+    logger.info("Jira changes: %d active, %d done.", len(active), len(done))
+    return JiraChanges(active, done)
 
-    logger.info("Retrieved %d task(s) from Jira.", len(tasks))
-    return tasks
+
+def iter_jira_changes(cursors: Dict[str, str]) -> Iterator[Union[UnifiedTask, registry.DoneAtOrigin]]:
+    """Yield open issues updated since ``cursors["updated_since"]``.
+
+    Incremental fetch of the source registry (``Capability.INCREMENTAL``),
+    used by the sync engine. Without a stored point, every open issue is
+    fetched. Keys of issues that moved to Done follow as one
+    ``registry.DoneAtOrigin`` item. Once everything was yielded,
+    ``cursors["updated_since"]`` is set to the start of this fetch; the
+    next run adds ``JIRA_INCREMENTAL_OVERLAP_MINUTES`` of overlap to it.
+
+    Raises:
+        RuntimeError: The fetch failed; ``cursors`` is left unchanged.
+    """
+    since: Optional[datetime] = None
+    if cursors.get("updated_since"):
+        try:
+            since = datetime.fromisoformat(cursors["updated_since"])
+        except ValueError:
+            logger.warning("Ignoring invalid Jira sync point %r", cursors["updated_since"])
+    started = datetime.now(timezone.utc)
+    changes = fetch_jira_changes(since)
+    if changes is None:
+        raise RuntimeError("Jira fetch failed")
+    yield from changes.active
+    if changes.done:
+        yield registry.DoneAtOrigin(_JIRA_SOURCE, changes.done)
+    cursors["updated_since"] = started.isoformat()
+
+
+def sync_jira_incremental(conn: sqlite3.Connection) -> Optional[Dict[str, int]]:
+    """Apply Jira changes since the last successful sync to the local store.
+
+    Reads ``last_sync_at`` for the ``jira`` source, upserts changed open
+    issues, deletes issues that moved to Done, and records the run with
+    ``mark_synced`` (which advances ``last_sync_at`` only on success),
+    including the fetch's duration, requests, bytes and rate-limit wait.
+
+    Args:
+        conn: Open connection from ``db.sqlite_store``.
+
+    Returns:
+        Counts of ``upserted`` and ``deleted`` tasks, or None on failure.
+    """
+    ensure_source(conn, _JIRA_SOURCE)
+    meter = ratelimit.UsageMeter()
+    with ratelimit.metered(meter):
+        changes = fetch_jira_changes(get_last_sync(conn, _JIRA_SOURCE))
+    if changes is None:
+        mark_synced(
+            conn, _JIRA_SOURCE, "incremental_pull", 0, "error", "Jira fetch failed", **meter.log_fields()
+        )
+        return None
+
+    upserted = save_tasks(conn, changes.active)
+    deleted = sum(1 for task_id in changes.done if delete_task(conn, task_id))
+    mark_synced(
+        conn,
+        _JIRA_SOURCE,
+        "incremental_pull",
+        upserted + deleted,
+        message=f"{upserted} upserted, {deleted} removed",
+        **meter.log_fields(),
+    )
+    return {"upserted": upserted, "deleted": deleted}
 
 
 def transition_jira_issue(issue_key: str, transition_name: str = "Done") -> bool:
@@ -236,7 +515,9 @@ def transition_jira_issue(issue_key: str, transition_name: str = "Done") -> bool
 
     try:
         # 1. Get available transitions
-        resp = requests.get(
+        resp = ratelimit.request(
+            "jira",
+            "GET",
             transitions_url,
             headers=_jira_headers(),
             auth=auth,
@@ -262,7 +543,9 @@ def transition_jira_issue(issue_key: str, transition_name: str = "Done") -> bool
             return False
 
         # 2. Execute the transition
-        resp = requests.post(
+        resp = ratelimit.request(
+            "jira",
+            "POST",
             transitions_url,
             headers=_jira_headers(),
             auth=auth,
@@ -279,3 +562,244 @@ def transition_jira_issue(issue_key: str, transition_name: str = "Done") -> bool
     except Exception as exc:
         logger.error("Error transitioning Jira issue %s: %s", clean_key, exc)
         return False
+
+
+# ---------------------------------------------------------------------------
+# Bulk transitions
+# ---------------------------------------------------------------------------
+
+# (project key, issue type id, status id) — available transitions depend on
+# the workflow, which is fixed by project and issue type, and on the status.
+_WorkflowContext = Tuple[str, str, str]
+
+
+class TransitionCache:
+    """Thread-safe TTL cache of transition name -> ID per workflow context."""
+
+    def __init__(self, ttl: float = JIRA_TRANSITION_CACHE_TTL, clock=time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[_WorkflowContext, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, context: _WorkflowContext) -> Optional[Dict[str, str]]:
+        """Return cached transitions for ``context``, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(context)
+            if entry is not None and self._clock() >= entry[0]:
+                del self._entries[context]
+                entry = None
+        metrics.record_cache("jira", "transitions", entry is not None)
+        return entry[1] if entry is not None else None
+
+    def put(self, context: _WorkflowContext, transitions: Dict[str, str]) -> None:
+        """Store transitions for ``context``."""
+        with self._lock:
+            self._entries[context] = (self._clock() + self.ttl, transitions)
+
+    def invalidate(self, context: _WorkflowContext) -> None:
+        """Drop ``context`` (e.g. after a transition was rejected)."""
+        with self._lock:
+            self._entries.pop(context, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+_transition_cache = TransitionCache()
+
+
+class TransitionResult(NamedTuple):
+    """Outcome of transitioning a single issue."""
+
+    key: str
+    success: bool
+    error: Optional[str] = None
+
+
+def _clean_key(issue_key: str) -> str:
+    """Strip the local ``jira-`` prefix from a task ID."""
+    return issue_key.replace("jira-", "")
+
+
+def _search_all_pages(jql: str, fields: List[str], page_size: int) -> List[List[dict]]:
+    """Run a search on the token-paginated endpoint, falling back to the legacy one (404)."""
+    try:
+        return list(_search_jql_pages(jql, fields, page_size))
+    except _JiraSearchError as exc:
+        if exc.status_code != 404:
+            raise
+        return list(_search_offset_pages(jql, fields, page_size))
+
+
+def _lookup_workflow_contexts(keys: List[str]) -> Dict[str, _WorkflowContext]:
+    """Resolve project, issue type and status for ``keys`` via JQL search.
+
+    Jira rejects a whole ``key in (...)`` query (400) when one key does not
+    exist or is not visible, so such a chunk is retried key by key; keys
+    rejected on their own are left out of the result.
+    """
+    contexts: Dict[str, _WorkflowContext] = {}
+    fields = ["project", "issuetype", "status"]
+
+    def search(chunk: List[str]) -> List[List[dict]]:
+        return _search_all_pages(f"key in ({', '.join(chunk)})", fields, len(chunk))
+
+    for i in range(0, len(keys), _KEY_LOOKUP_CHUNK):
+        chunk = keys[i : i + _KEY_LOOKUP_CHUNK]
+        try:
+            pages = search(chunk)
+        except _JiraSearchError as exc:
+            if exc.status_code != 400:
+                raise
+            if len(chunk) == 1:
+                logger.warning("Jira issue %s not found: %s", chunk[0], exc)
+                continue
+            pages = []
+            for key in chunk:
+                try:
+                    pages.extend(search([key]))
+                except _JiraSearchError as key_exc:
+                    if key_exc.status_code != 400:
+                        raise
+                    logger.warning("Jira issue %s not found: %s", key, key_exc)
+
+        for issues in pages:
+            for issue in issues:
+                f = issue.get("fields", {})
+                contexts[issue.get("key", "")] = (
+                    (f.get("project") or {}).get("key", ""),
+                    str((f.get("issuetype") or {}).get("id", "")),
+                    str((f.get("status") or {}).get("id", "")),
+                )
+    return contexts
+
+
+def _fetch_transitions(issue_key: str) -> Dict[str, str]:
+    """GET the transitions currently available for one issue (name -> ID)."""
+    url = f"{JIRA_BASE_URL.rstrip('/')}/rest/api/2/issue/{issue_key}/transitions"
+    resp = ratelimit.request("jira", "GET", url, headers=_jira_headers(), auth=_jira_auth())
+    if resp.status_code != 200:
+        raise _JiraSearchError(resp.status_code, resp.text)
+    return {t["name"].lower(): t["id"] for t in resp.json().get("transitions", [])}
+
+
+def _post_transition(issue_key: str, transition_id: str) -> Tuple[int, str]:
+    """POST a transition; returns (status code, response text)."""
+    url = f"{JIRA_BASE_URL.rstrip('/')}/rest/api/2/issue/{issue_key}/transitions"
+    resp = ratelimit.request(
+        "jira",
+        "POST",
+        url,
+        headers=_jira_headers(),
+        auth=_jira_auth(),
+        json={"transition": {"id": transition_id}},
+    )
+    return resp.status_code, resp.text
+
+
+def transition_jira_issues(
+    issue_keys: Iterable[str],
+    transition_name: str = "Done",
+    max_workers: Optional[int] = None,
+) -> Dict[str, TransitionResult]:
+    """Transition many Jira issues, reusing transition-ID lookups.
+
+    Issue workflow contexts (project, issue type, status) are resolved with
+    one ``key in (...)`` search per 100 keys (key by key if Jira rejects a
+    chunk because one key does not exist). Transition IDs are then looked
+    up once per context and cached for ``JIRA_TRANSITION_CACHE_TTL``
+    seconds, and the POSTs run concurrently. If Jira rejects a cached ID
+    (400/409), the issue's own transitions are re-read and the POST retried
+    once.
+
+    Args:
+        issue_keys: Jira keys, with or without the local ``jira-`` prefix.
+        transition_name: Target transition name (case-insensitive).
+        max_workers: Concurrent requests (default: JIRA_MAX_IN_FLIGHT).
+
+    Returns:
+        Mapping of each given key to its TransitionResult.
+    """
+    given = list(dict.fromkeys(issue_keys))
+    if not given:
+        return {}
+    if not JIRA_BASE_URL or _jira_auth() is None:
+        return {k: TransitionResult(k, False, "Jira not configured") for k in given}
+
+    clean = {k: _clean_key(k) for k in given}
+    name = transition_name.lower()
+    workers = max(1, max_workers or JIRA_MAX_IN_FLIGHT)
+
+    try:
+        contexts = _lookup_workflow_contexts(list(dict.fromkeys(clean.values())))
+    except Exception as exc:
+        logger.error("Error resolving Jira issues for transition: %s", exc)
+        return {k: TransitionResult(k, False, str(exc)) for k in given}
+
+    # One transitions GET per uncached context, using any issue in it.
+    missing: Dict[_WorkflowContext, str] = {}
+    for key in clean.values():
+        ctx = contexts.get(key)
+        if ctx is not None and _transition_cache.get(ctx) is None:
+            missing.setdefault(ctx, key)
+
+    def load(item: Tuple[_WorkflowContext, str]) -> None:
+        ctx, sample_key = item
+        try:
+            _transition_cache.put(ctx, _fetch_transitions(sample_key))
+        except Exception as exc:
+            logger.error("Failed to fetch transitions for %s: %s", sample_key, exc)
+
+    def run(key: str) -> TransitionResult:
+        ctx = contexts.get(key)
+        if ctx is None:
+            return TransitionResult(key, False, "Issue not found")
+        transitions = _transition_cache.get(ctx)
+        if transitions is None:
+            return TransitionResult(key, False, "Transitions unavailable")
+        if name not in transitions:
+            return TransitionResult(
+                key, False, f"Transition '{transition_name}' not available"
+            )
+
+        try:
+            status, text = _post_transition(key, transitions[name])
+            if status in (400, 409):
+                # Workflow changed or a condition differs for this issue.
+                _transition_cache.invalidate(ctx)
+                fresh = _fetch_transitions(key)
+                if name in fresh and fresh[name] != transitions[name]:
+                    status, text = _post_transition(key, fresh[name])
+        except Exception as exc:
+            return TransitionResult(key, False, str(exc))
+
+        if status in (200, 204):
+            return TransitionResult(key, True)
+        return TransitionResult(key, False, f"HTTP {status}: {text[:200]}")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-transition") as pool:
+        list(pool.map(load, missing.items()))
+        results = list(pool.map(run, list(dict.fromkeys(clean.values()))))
+
+    by_clean = {r.key: r for r in results}
+    out = {k: by_clean[clean[k]]._replace(key=k) for k in given}
+
+    done = sum(1 for r in out.values() if r.success)
+    logger.info("Transitioned %d/%d Jira issue(s) to '%s'.", done, len(out), transition_name)
+    return out
+
+
+def complete_jira_issues(issue_keys: Iterable[str], transition_name: str = "Done") -> Dict[str, bool]:
+    """Transition issues to ``transition_name``, returning success per key.
+
+    Registry completion adapter around ``transition_jira_issues``; failures
+    are logged with their reason.
+    """
+    results = transition_jira_issues(issue_keys, transition_name)
+    for key, result in results.items():
+        if not result.success:
+            logger.warning("Could not transition Jira issue %s: %s", key, result.error)
+    return {key: result.success for key, result in results.items()}
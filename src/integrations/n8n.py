@@ -1,10 +1,14 @@
 """n8n.py — n8n API integration for G_TaskCenter."""
 
 import os
-import requests
 import logging
 from typing import List, Dict, Any, Optional
 
+try:
+    from integrations import httpcache, ratelimit
+except ImportError:
+    from src.integrations import httpcache, ratelimit
+
 logger = logging.getLogger(__name__)
 
 # Constants for N8N Auth & Host
@@ -24,13 +28,17 @@ def _get_headers() -> Dict[str, str]:
 
 
 def get_workflows() -> List[Dict[str, Any]]:
-    """Retrieve all workflows from the n8n instance."""
+    """Retrieve all workflows from the n8n instance.
+
+    Conditional GET: an unchanged list is answered with 304 and served from
+    ``httpcache``.
+    """
     if not N8N_HOST:
         return []
 
     url = f"{N8N_HOST.rstrip('/')}/api/v1/workflows"
     try:
-        response = requests.get(url, headers=_get_headers())
+        response = httpcache.get("n8n", url, headers=_get_headers())
         if response.status_code == 200:
             return response.json().get("data", [])
         else:
@@ -52,7 +60,7 @@ def activate_workflow(workflow_id: str, active: bool = True) -> bool:
         else f"{N8N_HOST.rstrip('/')}/api/v1/workflows/{workflow_id}/deactivate"
     )
     try:
-        response = requests.post(url, headers=_get_headers())
+        response = ratelimit.request("n8n", "POST", url, headers=_get_headers())
         return response.status_code == 200
     except Exception as e:
         logger.error(f"Failed to change workflow activation state: {e}")
@@ -75,7 +83,7 @@ def test_execute_workflow(
 
     try:
         # Request a test execution dynamically. (Varies based on n8n version, assumes standard API /executions POST)
-        response = requests.post(url, headers=_get_headers(), json=data)
+        response = ratelimit.request("n8n", "POST", url, headers=_get_headers(), json=data)
         if response.status_code in [200, 201]:
             return {"success": True, "execution_id": response.json().get("id")}
         return {"error": response.text}
@@ -91,7 +99,7 @@ def get_execution_status(execution_id: str) -> Dict[str, Any]:
 
     url = f"{N8N_HOST.rstrip('/')}/api/v1/executions/{execution_id}"
     try:
-        response = requests.get(url, headers=_get_headers())
+        response = ratelimit.request("n8n", "GET", url, headers=_get_headers())
         if response.status_code == 200:
             data = response.json()
             return {
@@ -2,17 +2,31 @@
 
 import os
 import logging
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 from notion_client import Client
 
 try:
+    import tracing
     from models import UnifiedTask, TaskSource, TaskPriority
+    from integrations import ratelimit, registry
 except ImportError:
+    from src import tracing
     from src.models import UnifiedTask, TaskSource, TaskPriority
+    from src.integrations import ratelimit, registry
 
 logger = logging.getLogger(__name__)
 
+# Concurrent pages.update calls in update_tasks(). Notion allows an average
+# of three requests per second per integration; the notion bucket paces them.
+# Set by the source policy (``NOTION_MAX_IN_FLIGHT``, see ``registry``).
+NOTION_MAX_IN_FLIGHT = registry.policy("notion").concurrency
+
+# Pages per databases.query call (Notion allows at most 100).
+# Set by the source policy (``page_size``, see ``registry``).
+NOTION_PAGE_SIZE = registry.policy("notion").page_size or 100
+
 
 def get_notion_client():
     """Return an initialized Notion client."""
@@ -20,6 +34,9 @@ def get_notion_client():
     if not token:
         logger.warning("NOTION_TOKEN not found in environment.")
         return None
+    base_url = os.environ.get("NOTION_API_BASE")
+    if base_url:
+        return Client(auth=token, base_url=base_url)
     return Client(auth=token)
 
 
@@ -47,80 +64,138 @@ def _parse_property(prop: dict) -> str:
     return str(prop)
 
 
-def list_notion_tasks(database_id: Optional[str] = None) -> List[UnifiedTask]:
-    """List tasks from a specific Notion database using cursor pagination."""
+def _page_to_task(page: dict) -> UnifiedTask:
+    """Convert a Notion database page into a UnifiedTask."""
+    props = page.get("properties", {})
+
+    # Finding the actual title property regardless of its name
+    title = "Untitled"
+    for k, v in props.items():
+        if v.get("type") == "title":
+            title = _parse_property(v)
+            break
+
+    status = _parse_property(props.get("Status", {}))
+
+    raw_priority = _parse_property(props.get("Priority", {})).lower()
+    priority = TaskPriority.NORMAL
+    if "high" in raw_priority or "urgent" in raw_priority:
+        priority = TaskPriority.HIGH
+    elif "low" in raw_priority:
+        priority = TaskPriority.LOW
+
+    date_str = _parse_property(props.get("Due Date", {}))
+    due_date = None
+    if date_str:
+        try:
+            due_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+
+    return UnifiedTask(
+        id=page["id"],
+        source=TaskSource.NOTION,
+        title=title,
+        status=status,
+        priority=priority,
+        due_date=due_date,
+        link=page.get("url", ""),
+    )
+
+
+def iter_notion_tasks(database_id: Optional[str] = None) -> Iterator[UnifiedTask]:
+    """Yield open tasks from a Notion database page by page.
+
+    Each ``databases.query`` page (``NOTION_PAGE_SIZE`` results) is
+    converted and yielded before the next one is requested. Errors
+    propagate to the caller.
+    """
     client = get_notion_client()
     db_id = database_id or os.environ.get("NOTION_TASKS_DB_ID")
 
     if not client or not db_id:
-        return []
+        return
+
+    query = getattr(client.databases, "query", None)
+    if query is None:
+        # notion-client 3.x dropped the databases.query helper; the endpoint
+        # is still reachable through the generic request method.
+        def query(database_id: str, **body):
+            return client.request(path=f"databases/{database_id}/query", method="POST", body=body)
 
-    unified_tasks: List[UnifiedTask] = []
     has_more = True
     next_cursor = None
+    page_no = 0
+    while has_more:
+        kwargs = {
+            "database_id": db_id,
+            "filter": {"property": "Status", "select": {"does_not_equal": "Done"}},
+            "page_size": NOTION_PAGE_SIZE,
+        }
+        if next_cursor:
+            kwargs["start_cursor"] = next_cursor
+
+        page_no += 1
+        with tracing.span("notion.page", source="notion", page=page_no) as span:
+            results = ratelimit.call("notion", query, **kwargs)
+            span.set_attribute("items", len(results.get("results", [])))
+        for page in results.get("results", []):
+            yield _page_to_task(page)
+
+        has_more = results.get("has_more", False)
+        next_cursor = results.get("next_cursor")
 
+
+def list_notion_tasks(database_id: Optional[str] = None) -> List[UnifiedTask]:
+    """List tasks from a specific Notion database using cursor pagination."""
     try:
-        while has_more:
-            kwargs = {
-                "database_id": db_id,
-                "filter": {"property": "Status", "select": {"does_not_equal": "Done"}},
-            }
-            if next_cursor:
-                kwargs["start_cursor"] = next_cursor
-
-            results = client.databases.query(**kwargs)
-
-            for page in results.get("results", []):
-                props = page.get("properties", {})
-
-                # Finding the actual title property regardless of its name
-                title = "Untitled"
-                for k, v in props.items():
-                    if v.get("type") == "title":
-                        title = _parse_property(v)
-                        break
-
-                status = _parse_property(props.get("Status", {}))
-
-                raw_priority = _parse_property(props.get("Priority", {})).lower()
-                priority = TaskPriority.NORMAL
-                if "high" in raw_priority or "urgent" in raw_priority:
-                    priority = TaskPriority.HIGH
-                elif "low" in raw_priority:
-                    priority = TaskPriority.LOW
-
-                date_str = _parse_property(props.get("Due Date", {}))
-                due_date = None
-                if date_str:
-                    try:
-                        due_date = datetime.fromisoformat(
-                            date_str.replace("Z", "+00:00")
-                        )
-                    except ValueError:
-                        pass
-
-                task = UnifiedTask(
-                    id=page["id"],
-                    source=TaskSource.NOTION,
-                    title=title,
-                    status=status,
-                    priority=priority,
-                    due_date=due_date,
-                    link=page.get("url", ""),
-                )
-                unified_tasks.append(task)
-
-            has_more = results.get("has_more", False)
-            next_cursor = results.get("next_cursor")
-
-        return unified_tasks
+        return list(iter_notion_tasks(database_id))
     except Exception as e:
         logger.error(f"Error listing Notion tasks: {e}")
         return []
 
 
+def task_fields(
+    title: str, priority: TaskPriority = TaskPriority.NORMAL, due_date: Optional[datetime] = None
+) -> Dict[str, Optional[str]]:
+    """Normalized values of the page properties the sync engine manages.
+
+    These are what callers store to diff against later with
+    ``diff_properties``.
+    """
+    return {
+        "title": title,
+        "priority": getattr(priority, "value", priority),
+        "due_date": due_date.isoformat() if due_date else None,
+    }
+
+
+def diff_properties(
+    old: Dict[str, Optional[str]], new: Dict[str, Optional[str]]
+) -> Dict[str, dict]:
+    """Build Notion property payloads for the fields that differ.
+
+    Args:
+        old: Stored ``task_fields`` of the page.
+        new: ``task_fields`` of the current task.
+
+    Returns:
+        Properties for ``pages.update``; empty when nothing changed.
+    """
+    props: Dict[str, dict] = {}
+    if new["title"] != old.get("title"):
+        props["Name"] = {"title": [{"text": {"content": new["title"]}}]}
+    if new["priority"] != old.get("priority"):
+        props["Priority"] = {"select": {"name": str(new["priority"]).capitalize()}}
+    if new["due_date"] != old.get("due_date"):
+        props["Due Date"] = {"date": {"start": new["due_date"]} if new["due_date"] else None}
+    return props
+
+
 def create_task(
-    title: str, priority: TaskPriority = TaskPriority.NORMAL
+    title: str,
+    priority: TaskPriority = TaskPriority.NORMAL,
+    due_date: Optional[datetime] = None,
 ) -> Optional[UnifiedTask]:
     """Create a new task in the configured Notion database."""
     client = get_notion_client()
@@ -129,16 +204,22 @@ def create_task(
     if not client or not db_id:
         return None
 
+    properties = {
+        "Name": {  # Standardizing on Name for creation
+            "title": [{"text": {"content": title}}]
+        },
+        "Status": {"select": {"name": "Not started"}},
+        "Priority": {"select": {"name": priority.capitalize()}},
+    }
+    if due_date:
+        properties["Due Date"] = {"date": {"start": due_date.isoformat()}}
+
     try:
-        new_page = client.pages.create(
+        new_page = ratelimit.call(
+            "notion",
+            client.pages.create,
             parent={"database_id": db_id},
-            properties={
-                "Name": {  # Standardizing on Name for creation
-                    "title": [{"text": {"content": title}}]
-                },
-                "Status": {"select": {"name": "Not started"}},
-                "Priority": {"select": {"name": priority.capitalize()}},
-            },
+            properties=properties,
         )
         return UnifiedTask(
             id=new_page["id"],
@@ -146,8 +227,69 @@ def create_task(
             title=title,
             status="Not started",
             priority=priority,
+            due_date=due_date,
             link=new_page.get("url", ""),
         )
     except Exception as e:
         logger.error(f"Failed to create Notion task: {e}")
         return None
+
+
+def update_task(page_id: str, properties: Dict[str, dict], client=None) -> bool:
+    """PATCH only the given properties of a Notion page.
+
+    Args:
+        page_id: Notion page ID.
+        properties: Property payloads, typically from ``diff_properties``.
+            An empty dict is a no-op and sends nothing.
+        client: Optional Notion client to reuse.
+
+    Returns:
+        True if the page is up to date.
+    """
+    if not properties:
+        return True
+    client = client or get_notion_client()
+    if not client:
+        return False
+    try:
+        ratelimit.call("notion", client.pages.update, page_id=page_id, properties=properties)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to update Notion task {page_id}: {e}")
+        return False
+
+
+def update_tasks(
+    updates: Dict[str, Dict[str, dict]], max_workers: Optional[int] = None
+) -> Dict[str, bool]:
+    """Apply property updates to many pages with bounded concurrency.
+
+    Pages with no changed properties are not sent.
+
+    Args:
+        updates: Mapping of page ID to property payloads.
+        max_workers: Concurrent requests (default: ``NOTION_MAX_IN_FLIGHT``).
+
+    Returns:
+        Mapping of page ID to success.
+    """
+    results = {page_id: True for page_id, props in updates.items() if not props}
+    pending = {page_id: props for page_id, props in updates.items() if props}
+    if not pending:
+        return results
+
+    client = get_notion_client()
+    if not client:
+        results.update({page_id: False for page_id in pending})
+        return results
+
+    workers = max(1, min(max_workers or NOTION_MAX_IN_FLIGHT, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notion-update") as pool:
+        futures = {
+            page_id: pool.submit(update_task, page_id, props, client)
+            for page_id, props in pending.items()
+        }
+        for page_id, future in futures.items():
+            results[page_id] = future.result()
+    return results
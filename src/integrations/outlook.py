@@ -1,15 +1,22 @@
 """outlook.py — Outlook integration for G_TaskCenter."""
 
 import os
+import time
 import msal
 import logging
-import requests
-from typing import List, Optional
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
+    import tracing
     from models import UnifiedTask, TaskSource, TaskPriority
+    from integrations import httpcache, ratelimit, registry
+    from integrations.graph_batch import GRAPH_API_BASE, BatchRequest, execute_batch
 except ImportError:
+    from src import tracing
     from src.models import UnifiedTask, TaskSource, TaskPriority
+    from src.integrations import httpcache, ratelimit, registry
+    from src.integrations.graph_batch import GRAPH_API_BASE, BatchRequest, execute_batch
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +28,19 @@ SCOPES = ["https://graph.microsoft.com/Tasks.ReadWrite"]
 CACHE_FILE = os.environ.get("OUTLOOK_TOKEN_CACHE", "credentials/outlook_cache.bin")
 
 
+# Refresh this many seconds before the access token expires (MSAL itself
+# treats tokens with less than five minutes left as expired).
+TOKEN_REFRESH_MARGIN = int(os.environ.get("OUTLOOK_TOKEN_REFRESH_MARGIN", "300"))
+
+# Sub-requests per Graph $batch call.
+# Set by the source policy (``concurrency``, see ``registry``).
+OUTLOOK_BATCH_SIZE = registry.policy("outlook").concurrency
+
+# To Do list of every task seen by iter_outlook_tasks(), so tasks can be
+# completed by ID alone (complete_outlook_task_ids).
+_TASK_LISTS: Dict[str, str] = {}
+
+
 def _load_cache():
     """Load the MSAL token cache."""
     cache = msal.SerializableTokenCache()
@@ -31,98 +51,209 @@ def _load_cache():
 
 
 def _save_cache(cache):
-    """Save the MSAL token cache."""
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    """Save the MSAL token cache if it changed since the last save."""
     if cache.has_state_changed:
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(CACHE_FILE) or ".", exist_ok=True)
         with open(CACHE_FILE, "w") as f:
             f.write(cache.serialize())
+        cache.has_state_changed = False
+
+
+class GraphTokenManager:
+    """Process-wide Microsoft Graph token holder.
+
+    Builds the MSAL application and loads the token cache once, serves the
+    access token from memory until ``margin`` seconds before it expires, and
+    schedules a background refresh for that moment. The cache file is only
+    rewritten when MSAL reports a change.
+    """
+
+    def __init__(self, margin: float = TOKEN_REFRESH_MARGIN, clock=time.time) -> None:
+        self.margin = margin
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._config = None
+        self._app = None
+        self._cache = None
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    def get_token(self) -> Optional[str]:
+        """Return a valid access token, acquiring one only when needed."""
+        config = (CLIENT_ID, TENANT_ID, CLIENT_SECRET, CACHE_FILE)
+        token = self._token
+        if token and config == self._config and self._clock() < self._expires_at - self.margin:
+            return token
+        with self._lock:
+            if config != self._config:
+                self._reset_locked()
+            if self._token and self._clock() < self._expires_at - self.margin:
+                return self._token
+            return self._acquire_locked()
+
+    def reset(self) -> None:
+        """Forget the application, cache and token (e.g. after config changes)."""
+        with self._lock:
+            self._reset_locked()
+
+    def _reset_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._config = self._app = self._cache = self._token = self._timer = None
+        self._expires_at = 0.0
+
+    def _acquire_locked(self) -> Optional[str]:
+        if not all([CLIENT_ID, TENANT_ID, CLIENT_SECRET]):
+            logger.warning("Outlook credentials not fully provided in env.")
+            return None
+
+        if self._app is None:
+            self._cache = _load_cache()
+            self._app = msal.ConfidentialClientApplication(
+                CLIENT_ID,
+                authority=AUTHORITY,
+                client_credential=CLIENT_SECRET,
+                token_cache=self._cache,
+            )
+            self._config = (CLIENT_ID, TENANT_ID, CLIENT_SECRET, CACHE_FILE)
+
+        # Attempt to acquire silently from cache
+        result = None
+        accounts = self._app.get_accounts()
+        if accounts:
+            result = self._app.acquire_token_silent(SCOPES, account=accounts[0])
+        if not result:
+            # Fallback to daemon token (Client Credentials flow)
+            result = self._app.acquire_token_for_client(scopes=SCOPES)
+
+        _save_cache(self._cache)
+
+        token = (result or {}).get("access_token")
+        if not token:
+            logger.error("Failed to acquire Graph token: %s", (result or {}).get("error_description"))
+            self._token = None
+            return None
+
+        self._token = token
+        self._expires_at = self._clock() + float(result.get("expires_in", 3600))
+        self._schedule_refresh()
+        return token
+
+    def _schedule_refresh(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        delay = self._expires_at - self.margin - self._clock()
+        if delay <= 0:
+            # MSAL handed back a token already inside the margin; callers
+            # will re-acquire inline rather than spin a refresh loop.
+            return
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh(self) -> None:
+        """Background refresh; on failure the next caller acquires inline."""
+        try:
+            with self._lock:
+                if self._app is not None:
+                    self._acquire_locked()
+        except Exception as exc:
+            logger.warning("Background Graph token refresh failed: %s", exc)
+
+
+_token_manager = GraphTokenManager()
 
 
 def get_access_token():
-    """Get access token for Microsoft Graph API safely leveraging the cache."""
-    if not all([CLIENT_ID, TENANT_ID, CLIENT_SECRET]):
-        logger.warning("Outlook credentials not fully provided in env.")
-        return None
-
-    cache = _load_cache()
-    app = msal.ConfidentialClientApplication(
-        CLIENT_ID,
-        authority=AUTHORITY,
-        client_credential=CLIENT_SECRET,
-        token_cache=cache,
-    )
+    """Get access token for Microsoft Graph API from the process-wide manager."""
+    return _token_manager.get_token()
 
-    # Attempt to acquire silently from cache
-    accounts = app.get_accounts()
-    result = None
-    if accounts:
-        result = app.acquire_token_silent(SCOPES, account=accounts[0])
 
-    if not result:
-        # Fallback to daemon token (Client Credentials flow)
-        result = app.acquire_token_for_client(scopes=SCOPES)
+def _task_to_unified(task: dict) -> UnifiedTask:
+    """Convert a Graph todoTask into a UnifiedTask."""
+    priority = TaskPriority.NORMAL
+    if task.get("importance") == "high":
+        priority = TaskPriority.HIGH
+    elif task.get("importance") == "low":
+        priority = TaskPriority.LOW
 
-    _save_cache(cache)
-    return result.get("access_token")
+    return UnifiedTask(
+        id=task["id"],
+        source=TaskSource.OUTLOOK,
+        title=task["title"],
+        status=task["status"],
+        priority=priority,
+        link=f"https://to-do.office.com/tasks/id/{task['id']}",
+    )
 
 
-def list_outlook_tasks() -> List[UnifiedTask]:
-    """List tasks from Outlook using Microsoft Graph API with pagination."""
+def iter_outlook_tasks() -> Iterator[UnifiedTask]:
+    """Yield open Outlook tasks as each Graph ``$batch`` round completes.
+
+    Task pages for all lists are fetched through Graph ``$batch``
+    (``OUTLOOK_BATCH_SIZE`` per request); each round requests the
+    ``@odata.nextLink`` of every list that still has more pages. The list
+    of every task seen is remembered for ``complete_outlook_task_ids``.
+    Errors propagate to the caller.
+    """
     token = get_access_token()
     if not token:
-        return []
+        return
 
     headers = {"Authorization": f"Bearer {token}"}
-    list_url = "https://graph.microsoft.com/v1.0/me/todo/lists"
-    unified_tasks: List[UnifiedTask] = []
 
-    try:
-        # First get the task lists
-        list_resp = requests.get(list_url, headers=headers)
-        if list_resp.status_code != 200:
-            logger.error(f"Failed to fetch Outlook task lists: {list_resp.text}")
-            return []
-
-        lists = list_resp.json().get("value", [])
-
-        for t_list in lists:
-            list_id = t_list["id"]
-            # Fetch tasks iteratively navigating pagination links
-            tasks_url = (
-                f"https://graph.microsoft.com/v1.0/me/todo/lists/{list_id}/tasks"
+    # First get the task lists
+    lists = []
+    list_url = f"{GRAPH_API_BASE}/me/todo/lists"
+    with tracing.span("outlook.lists", source="outlook") as span:
+        while list_url:
+            list_resp = httpcache.get("graph", list_url, headers=headers)
+            if list_resp.status_code != 200:
+                raise RuntimeError(f"Failed to fetch Outlook task lists: {list_resp.text}")
+            data = list_resp.json()
+            lists.extend(data.get("value", []))
+            list_url = data.get("@odata.nextLink")
+        span.set_attribute("items", len(lists))
+
+    # Then page through every list's tasks, one batch round per page depth
+    pending: Dict[str, str] = {
+        t_list["id"]: f"/me/todo/lists/{t_list['id']}/tasks" for t_list in lists
+    }
+    page_no = 0
+    while pending:
+        order = list(pending)
+        page_no += 1
+        with tracing.span("outlook.page", source="outlook", page=page_no, lists=len(order)) as span:
+            responses = execute_batch(
+                [BatchRequest(str(i), "GET", pending[list_id]) for i, list_id in enumerate(order)],
+                token,
+                max_size=OUTLOOK_BATCH_SIZE,
+            )
+            span.set_attribute(
+                "items", sum(len((r.body or {}).get("value", [])) for r in responses.values() if r.ok)
             )
+        pending = {}
+        for i, list_id in enumerate(order):
+            resp = responses[str(i)]
+            if not resp.ok:
+                logger.error(f"Failed to fetch tasks for Outlook list {list_id}: {resp.status}")
+                continue
+            body = resp.body or {}
+            for task in body.get("value", []):
+                _TASK_LISTS[task["id"]] = list_id
+                if task["status"] != "completed":
+                    yield _task_to_unified(task)
+            if body.get("@odata.nextLink"):
+                pending[list_id] = body["@odata.nextLink"]
+
 
-            while tasks_url:
-                tasks_resp = requests.get(tasks_url, headers=headers)
-                if tasks_resp.status_code == 200:
-                    data = tasks_resp.json()
-                    tasks = data.get("value", [])
-
-                    for task in tasks:
-                        if task["status"] != "completed":
-                            priority = TaskPriority.NORMAL
-                            if task.get("importance") == "high":
-                                priority = TaskPriority.HIGH
-                            elif task.get("importance") == "low":
-                                priority = TaskPriority.LOW
-
-                            unified_tasks.append(
-                                UnifiedTask(
-                                    id=task["id"],
-                                    source=TaskSource.OUTLOOK,
-                                    title=task["title"],
-                                    status=task["status"],
-                                    priority=priority,
-                                    link=f"https://to-do.office.com/tasks/id/{task['id']}",
-                                )
-                            )
-
-                    tasks_url = data.get("@odata.nextLink", None)
-                else:
-                    break
-
-        return unified_tasks
+def list_outlook_tasks() -> List[UnifiedTask]:
+    """List tasks from Outlook using Microsoft Graph API with pagination."""
+    try:
+        return list(iter_outlook_tasks())
     except Exception as e:
         logger.error(f"Error listing Outlook tasks: {e}")
         return []
@@ -135,11 +266,78 @@ def complete_outlook_task(list_id: str, task_id: str) -> bool:
         return False
 
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    url = f"https://graph.microsoft.com/v1.0/me/todo/lists/{list_id}/tasks/{task_id}"
+    url = f"{GRAPH_API_BASE}/me/todo/lists/{list_id}/tasks/{task_id}"
 
     try:
-        resp = requests.patch(url, headers=headers, json={"status": "completed"})
+        resp = ratelimit.request(
+            "graph", "PATCH", url, headers=headers, json={"status": "completed"}
+        )
         return resp.status_code in [200, 204]
     except Exception as e:
         logger.error(f"Failed to complete Outlook task: {e}")
         return False
+
+
+def complete_outlook_tasks(items: Iterable[Tuple[str, str]]) -> Dict[str, bool]:
+    """Mark many Outlook tasks as completed via Graph ``$batch``.
+
+    Args:
+        items: ``(list_id, task_id)`` pairs.
+
+    Returns:
+        Mapping of task ID to whether it was completed.
+    """
+    pairs = list(dict.fromkeys(items))
+    if not pairs:
+        return {}
+    token = get_access_token()
+    if not token:
+        return {task_id: False for _, task_id in pairs}
+
+    try:
+        responses = execute_batch(
+            [
+                BatchRequest(
+                    str(i),
+                    "PATCH",
+                    f"/me/todo/lists/{list_id}/tasks/{task_id}",
+                    body={"status": "completed"},
+                )
+                for i, (list_id, task_id) in enumerate(pairs)
+            ],
+            token,
+            max_size=OUTLOOK_BATCH_SIZE,
+        )
+    except Exception as e:
+        logger.error(f"Failed to complete Outlook tasks: {e}")
+        return {task_id: False for _, task_id in pairs}
+
+    return {task_id: responses[str(i)].ok for i, (_, task_id) in enumerate(pairs)}
+
+
+def complete_outlook_task_ids(task_ids: Iterable[str]) -> Dict[str, bool]:
+    """Mark Outlook tasks as completed by task ID alone.
+
+    Task IDs do not carry their To Do list, so the lists are looked up in
+    the ones remembered by ``iter_outlook_tasks``; when some are unknown,
+    the tasks are listed once more first. Tasks that are still not found
+    (e.g. deleted in Outlook) are reported as failed.
+
+    Returns:
+        Mapping of task ID to whether it was completed.
+    """
+    ids = list(dict.fromkeys(task_ids))
+    if any(task_id not in _TASK_LISTS for task_id in ids):
+        try:
+            for _ in iter_outlook_tasks():
+                pass
+        except Exception as e:
+            logger.error(f"Failed to look up Outlook task lists: {e}")
+
+    results = {task_id: False for task_id in ids}
+    known = [(_TASK_LISTS[task_id], task_id) for task_id in ids if task_id in _TASK_LISTS]
+    for task_id in ids:
+        if task_id not in _TASK_LISTS:
+            logger.warning(f"Outlook task {task_id} not found in any To Do list.")
+    results.update(complete_outlook_tasks(known))
+    return results
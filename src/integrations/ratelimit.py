@@ -0,0 +1,536 @@
+"""ratelimit.py — Provider-aware rate limiting for G_TaskCenter integrations.
+
+Every outbound call to a remote API goes through a token bucket configured
+for its provider, so high-volume syncs run at the maximum sustainable rate
+instead of tripping the provider's throttling. When a provider still answers
+with HTTP 429 (or 503 with ``Retry-After``), the bucket is paused for the
+requested delay and the call is retried automatically.
+
+Two entry points are provided:
+    - ``request()`` wraps ``requests.request`` for REST integrations
+      (Slack, Jira, Microsoft Graph, n8n).
+    - ``call()`` wraps SDK calls (Notion, Gmail) whose throttling surfaces
+      as an exception carrying a status code and headers.
+
+Bucket keys are ``provider`` or ``provider:class`` (e.g. ``slack:tier2``);
+unknown classes fall back to the provider-wide bucket.
+
+Limits can be overridden with ``TASKCENTER_RATE_LIMITS``, a comma-separated
+list of ``key=rate:burst`` entries (rate in requests per second), e.g.
+``TASKCENTER_RATE_LIMITS=notion=2:2,jira=5:10``.
+
+Each attempt is also recorded in ``metrics`` (latency, bytes, retries) per
+provider and endpoint, inside an active trace as a ``tracing`` span, and in
+the active ``UsageMeter`` (see ``metered()``), which attributes requests,
+bytes and wait time to one unit of work such as a source's sync.
+"""
+
+import os
+import math
+import time
+import random
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+import requests
+
+try:
+    import metrics
+    import tracing
+except ImportError:
+    from src import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket parameters: sustained ``rate`` (req/s) and ``burst`` size."""
+
+    rate: float
+    burst: int
+
+
+# Published or empirically safe limits per provider.
+PROVIDER_LIMITS: Dict[str, RateLimit] = {
+    # Notion: average of 3 requests per second per integration.
+    "notion": RateLimit(rate=3.0, burst=3),
+    # Slack Web API tiers (per method, per workspace).
+    "slack": RateLimit(rate=50 / 60, burst=5),
+    "slack:tier2": RateLimit(rate=20 / 60, burst=3),
+    "slack:tier3": RateLimit(rate=50 / 60, burst=5),
+    "slack:tier4": RateLimit(rate=100 / 60, burst=10),
+    # Microsoft Graph (To Do): 10,000 requests per 10 minutes per mailbox.
+    "graph": RateLimit(rate=15.0, burst=20),
+    # Gmail: 250 quota units/user/s; messages.get costs 5 units.
+    "gmail": RateLimit(rate=40.0, burst=40),
+    # Jira Cloud: cost-based; 10 req/s is sustainable for a single user.
+    "jira": RateLimit(rate=10.0, burst=10),
+    # n8n is self-hosted; keep a polite ceiling.
+    "n8n": RateLimit(rate=20.0, burst=20),
+}
+
+# Fallback for providers without an explicit entry.
+DEFAULT_LIMIT = RateLimit(rate=5.0, burst=5)
+
+# Retries performed after a throttled response before giving up.
+MAX_RETRIES: int = int(os.environ.get("TASKCENTER_RATE_MAX_RETRIES", "5"))
+
+# Upper bound on a single Retry-After pause, in seconds.
+MAX_RETRY_AFTER: float = 120.0
+
+
+def _load_env_overrides() -> None:
+    """Apply ``TASKCENTER_RATE_LIMITS`` overrides to PROVIDER_LIMITS.
+
+    Entries whose rate is not a positive, finite number are ignored, since
+    a bucket that never refills would block (or divide by zero) forever.
+    """
+    raw = os.environ.get("TASKCENTER_RATE_LIMITS", "")
+    for entry in filter(None, (e.strip() for e in raw.split(","))):
+        try:
+            key, spec = entry.split("=", 1)
+            rate, _, burst = spec.partition(":")
+            if not 0 < float(rate) < math.inf:
+                raise ValueError(rate)
+            PROVIDER_LIMITS[key.strip()] = RateLimit(
+                rate=float(rate), burst=int(burst or max(1, int(float(rate))))
+            )
+        except ValueError:
+            logger.warning("Ignoring invalid rate limit override: %r", entry)
+
+
+_load_env_overrides()
+
+# ---------------------------------------------------------------------------
+# Token bucket
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Thread-safe token bucket with support for server-imposed pauses.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Maximum number of tokens held.
+        clock: Monotonic clock (injectable for tests).
+        sleep: Sleep function (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock or time.monotonic
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = self._clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+            (self._sleep or time.sleep)(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _limit_for(key: str) -> RateLimit:
+    if key in PROVIDER_LIMITS:
+        return PROVIDER_LIMITS[key]
+    return PROVIDER_LIMITS.get(key.split(":", 1)[0], DEFAULT_LIMIT)
+
+
+def get_bucket(key: str) -> TokenBucket:
+    """Return the shared bucket for a provider key, creating it on first use."""
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                limit = _limit_for(key)
+                bucket = TokenBucket(limit.rate, limit.burst)
+                _buckets[key] = bucket
+    return bucket
+
+
+def configure_limit(key: str, rate: float, burst: int) -> None:
+    """Override the limit for ``key`` and reset its bucket."""
+    with _buckets_lock:
+        PROVIDER_LIMITS[key] = RateLimit(rate=rate, burst=burst)
+        _buckets.pop(key, None)
+
+
+# ---------------------------------------------------------------------------
+# Throttle metrics
+# ---------------------------------------------------------------------------
+
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(provider: str, **deltas: float) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(
+            provider,
+            {
+                "requests": 0,
+                "throttled": 0,
+                "retries": 0,
+                "wait_seconds": 0.0,
+                "retry_after_seconds": 0.0,
+            },
+        )
+        for name, value in deltas.items():
+            entry[name] += value
+
+
+def get_throttle_stats() -> Dict[str, Dict[str, float]]:
+    """Per-provider counters for requests, throttled responses and time waited.
+
+    ``wait_seconds`` is the total time callers spent blocked in the bucket
+    (pacing plus Retry-After pauses); ``retry_after_seconds`` is the part
+    requested by the provider itself.
+    """
+    with _stats_lock:
+        return {provider: dict(entry) for provider, entry in _stats.items()}
+
+
+def reset_throttle_stats() -> None:
+    """Clear all throttle counters."""
+    with _stats_lock:
+        _stats.clear()
+
+
+# ---------------------------------------------------------------------------
+# Usage meters
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class UsageMeter:
+    """Outbound usage attributed to one unit of work (e.g. one source's sync).
+
+    ``request()`` and ``call()`` add to the meter that is active in the
+    calling context (``metered()`` / ``metered_iter()``). Worker threads do
+    not inherit it, so calls fanned out to a thread pool inside an
+    integration are not counted.
+    """
+
+    requests: int = 0
+    throttled: int = 0
+    bytes: int = 0
+    wait_seconds: float = 0.0
+    busy_seconds: float = 0.0
+    items: int = 0
+    error_class: Optional[str] = None
+
+    def record(self, waited: float, nbytes: int = 0, throttled: bool = False) -> None:
+        self.requests += 1
+        self.wait_seconds += waited
+        self.bytes += nbytes
+        self.throttled += throttled
+
+    def log_fields(self) -> Dict[str, Any]:
+        """Keyword arguments for ``db.sqlite_store.mark_synced``."""
+        return {
+            "duration_ms": round(1000 * self.busy_seconds, 1),
+            "request_count": self.requests,
+            "bytes_transferred": self.bytes,
+            "throttle_seconds": round(self.wait_seconds, 3),
+            "error_class": self.error_class,
+        }
+
+
+_meter: ContextVar[Optional[UsageMeter]] = ContextVar("taskcenter_usage_meter", default=None)
+
+
+@contextmanager
+def metered(meter: UsageMeter) -> Iterator[UsageMeter]:
+    """Attribute calls made in the enclosed block to ``meter``.
+
+    The block's wall time is added to ``busy_seconds``; an exception sets
+    ``error_class`` and propagates.
+    """
+    token = _meter.set(meter)
+    start = time.perf_counter()
+    try:
+        yield meter
+    except Exception as exc:
+        meter.error_class = type(exc).__name__
+        raise
+    finally:
+        meter.busy_seconds += time.perf_counter() - start
+        _meter.reset(token)
+
+
+def metered_iter(meter: UsageMeter, iterable: Iterable[T]) -> Iterator[T]:
+    """Meter the production of each item (not the consumer's handling of it).
+
+    Items are counted in ``items``. Suited to source generators consumed in
+    another thread, such as the producers of ``pipeline.merge``.
+    """
+    it = iter(iterable)
+    while True:
+        with metered(meter):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        meter.items += 1
+        yield item
+
+
+# ---------------------------------------------------------------------------
+# Retry-After handling
+# ---------------------------------------------------------------------------
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter, used when no Retry-After is given."""
+    return min(MAX_RETRY_AFTER, (2 ** attempt) + random.uniform(0, 1))
+
+
+def _payload_size(body: Any) -> int:
+    """Size of a request/response body, or 0 when it is not materialised."""
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0
+
+
+def _attempt_span(provider: str, endpoint: str, attempt: int) -> Any:
+    """Child span for one attempt, only when the caller is being traced."""
+    if tracing.current_span() is None:
+        return nullcontext(tracing.NOOP_SPAN)
+    return tracing.span(f"{provider} {endpoint}", provider=provider, attempt=attempt)
+
+
+def _throttle_delay(status: Optional[int], headers: Any, attempt: int) -> Optional[float]:
+    """Return the delay to apply if the response is a throttle signal."""
+    retry_after = None
+    if headers is not None:
+        retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    if status == 429 or (status == 503 and retry_after):
+        return parse_retry_after(retry_after, _backoff(attempt))
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def request(
+    provider: str,
+    method: str,
+    url: str,
+    bucket: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Perform an HTTP request under the provider's rate limit.
+
+    Throttled responses (429, or 503 with Retry-After) pause the bucket for
+    the requested delay and are retried up to ``max_retries`` times. The last
+    response is returned unchanged if retries are exhausted, so callers keep
+    their existing status-code handling.
+
+    Args:
+        provider: Provider name used for metrics (e.g. 'slack', 'jira').
+        method: HTTP method.
+        url: Request URL.
+        bucket: Bucket key override (e.g. 'slack:tier2'). Defaults to provider.
+        max_retries: Retry budget for throttled responses.
+        **kwargs: Forwarded to ``requests.request``.
+
+    Returns:
+        The final ``requests.Response``.
+    """
+    key = bucket or provider
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    limiter = get_bucket(key)
+
+    traced = tracing.current_span() is not None
+    endpoint = metrics.endpoint_for_url(method, url) if metrics.ENABLED or traced else ""
+
+    attempt = 0
+    while True:
+        waited = limiter.acquire()
+        start = time.perf_counter()
+        with _attempt_span(provider, endpoint, attempt) as span:
+            try:
+                resp = requests.request(method, url, **kwargs)
+            except Exception:
+                metrics.record_call(provider, endpoint, time.perf_counter() - start, error=True)
+                if _meter.get() is not None:
+                    _meter.get().record(waited)
+                raise
+            span.set_attribute("http.status_code", resp.status_code)
+        _record(provider, requests=1, wait_seconds=waited)
+
+        delay = _throttle_delay(resp.status_code, resp.headers, attempt)
+        meter = _meter.get()
+        if metrics.ENABLED or meter is not None:
+            received = (
+                int(resp.headers.get("Content-Length") or 0) if kwargs.get("stream") else _payload_size(resp.content)
+            )
+            sent = _payload_size(getattr(getattr(resp, "request", None), "body", None))
+            metrics.record_call(
+                provider,
+                endpoint,
+                time.perf_counter() - start,
+                error=delay is None and isinstance(resp.status_code, int) and resp.status_code >= 400,
+                throttled=delay is not None,
+                bytes_in=received,
+                bytes_out=sent,
+            )
+            if meter is not None:
+                meter.record(waited, received + sent, delay is not None)
+        if delay is None:
+            return resp
+
+        _record(provider, throttled=1, retry_after_seconds=delay)
+        if attempt >= retries:
+            logger.error(
+                "%s throttled %s %s; giving up after %d retries.",
+                provider, method, url, retries,
+            )
+            return resp
+
+        logger.warning(
+            "%s throttled (%d); retrying %s in %.1fs.", provider, resp.status_code, url, delay
+        )
+        limiter.pause(delay)
+        attempt += 1
+        _record(provider, retries=1)
+        metrics.record_retry(provider, endpoint)
+
+
+def call(
+    provider: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    bucket: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    **kwargs: Any,
+) -> Any:
+    """Invoke an SDK call under the provider's rate limit.
+
+    Throttling is detected from the raised exception: ``status`` /
+    ``status_code`` attributes (notion_client) or a ``resp`` object with a
+    ``status`` (googleapiclient). Headers are read from ``exc.headers`` or
+    ``exc.resp``.
+    """
+    key = bucket or provider
+    retries = MAX_RETRIES if max_retries is None else max_retries
+    limiter = get_bucket(key)
+    traced = tracing.current_span() is not None
+    endpoint = metrics.endpoint_for_callable(fn) if metrics.ENABLED or traced else ""
+
+    attempt = 0
+    while True:
+        waited = limiter.acquire()
+        _record(provider, requests=1, wait_seconds=waited)
+        start = time.perf_counter()
+        meter = _meter.get()
+        try:
+            with _attempt_span(provider, endpoint, attempt):
+                result = fn(*args, **kwargs)
+            metrics.record_call(provider, endpoint, time.perf_counter() - start)
+            if meter is not None:
+                meter.record(waited)
+            return result
+        except Exception as exc:
+            elapsed = time.perf_counter() - start
+            resp = getattr(exc, "resp", None)
+            status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+            if status is None and resp is not None:
+                status = getattr(resp, "status", None)
+            headers = getattr(exc, "headers", None) or resp
+            try:
+                status = int(status) if status is not None else None
+            except (TypeError, ValueError):
+                status = None
+
+            delay = _throttle_delay(status, headers if hasattr(headers, "get") else None, attempt)
+            metrics.record_call(provider, endpoint, elapsed, error=delay is None, throttled=delay is not None)
+            if meter is not None:
+                meter.record(waited, throttled=delay is not None)
+            if delay is None:
+                raise
+            _record(provider, throttled=1, retry_after_seconds=delay)
+            if attempt >= retries:
+                raise
+            logger.warning("%s throttled; retrying in %.1fs.", provider, delay)
+            limiter.pause(delay)
+            attempt += 1
+            _record(provider, retries=1)
+            metrics.record_retry(provider, endpoint)
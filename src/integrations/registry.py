@@ -0,0 +1,360 @@
+"""registry.py — Pluggable registry of task sources for G_TaskCenter.
+
+Every task source is described once, here: how to stream its tasks, how
+to complete tasks at the origin, which capabilities its API offers and the
+performance policy (concurrency, page size, list cache TTL) the fan-out,
+scheduling and caching layers apply to it. ``server.py``,
+``scripts/mcp_server.py`` and ``sync_engine.py`` iterate over the registry
+instead of naming sources.
+
+Sources implement ``TaskSourceAdapter``, the generalization of the
+``SlackTaskSource`` / ``JiraTaskSource`` protocols. The built-in sources are
+``RegisteredSource`` entries that name functions in their integration
+module; the module is imported on first use, so listing sources or reading
+a policy does not load any SDK.
+
+Policies default to the per-integration settings (``NOTION_MAX_IN_FLIGHT``,
+``JIRA_MAX_IN_FLIGHT``, ``SLACK_SCAN_WORKERS``, ``TASKCENTER_LIST_CACHE_TTL``)
+and can be overridden with
+``TASKCENTER_SOURCE_POLICIES``, a comma-separated list of
+``source.field=value`` entries, e.g.
+``TASKCENTER_SOURCE_POLICIES=jira.concurrency=8,slack.page_size=100``.
+
+``list_tasks`` calls are coalesced per source and limit: concurrent
+identical calls share one fetch, and its result is reused for the source's
+``ttl_seconds`` (default: ``TASKCENTER_LIST_CACHE_TTL``, 5; 0 only
+coalesces).
+Completing tasks through the registry, or ``invalidate(name)``, drops the
+source's cached lists.
+
+Push-capable sources listed in ``TASKCENTER_PUSH_SOURCES`` (e.g.
+``slack`` while ``slack_events`` runs) are read by the sync engine from the
+task store instead of their API.
+"""
+
+import os
+import logging
+import importlib
+from dataclasses import dataclass, field, fields, replace
+from enum import Enum
+from itertools import islice
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Tuple, Union
+
+try:
+    import tracing
+    from models import UnifiedTask
+    from singleflight import SingleFlight
+except ImportError:
+    from src import tracing
+    from src.models import UnifiedTask
+    from src.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Default seconds a list_tasks result is reused by identical calls
+# (SourcePolicy.ttl_seconds).
+LIST_CACHE_TTL = float(os.environ.get("TASKCENTER_LIST_CACHE_TTL", "5"))
+
+# Each call passes its source's TTL.
+_list_flight = SingleFlight()
+
+# ---------------------------------------------------------------------------
+# Capabilities and policies
+# ---------------------------------------------------------------------------
+
+
+class Capability(str, Enum):
+    """Optional features of a source's API."""
+
+    # Can fetch only what changed since stored resume points
+    # (``iter_changes``); the sync engine reads such sources incrementally.
+    INCREMENTAL = "incremental"
+    # ``complete_tasks`` completes many tasks per request (Gmail batchModify,
+    # Graph $batch, ...); the sync engine hands such sources whole batches
+    # and completes tasks of other sources one call at a time.
+    BATCH_WRITE = "batch_write"
+    # Changes can be pushed to a local receiver (``slack_events``) that
+    # writes them to the task store; see ``pushed``.
+    PUSH = "push"
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    """Performance policy for one source.
+
+    Attributes:
+        concurrency: Requests in flight at once for fan-out operations.
+        page_size: Items requested per page (None: the API default).
+        ttl_seconds: How long a ``list_tasks`` result is reused by
+            identical calls (0: only concurrent calls share a fetch).
+    """
+
+    concurrency: int = 1
+    page_size: Optional[int] = None
+    ttl_seconds: float = LIST_CACHE_TTL
+
+
+class DoneAtOrigin(NamedTuple):
+    """Tasks an ``iter_changes`` stream reports as completed at the origin.
+
+    Incremental streams may yield it between their ``UnifiedTask`` items;
+    the sync engine marks the tracked tasks completed and closes their
+    Notion pages.
+    """
+
+    source: str
+    task_ids: List[str]
+
+
+# ---------------------------------------------------------------------------
+# Typed Interface (Protocol)
+# ---------------------------------------------------------------------------
+
+
+class TaskSourceAdapter(Protocol):
+    """Protocol every registered task source satisfies."""
+
+    name: str
+    capabilities: FrozenSet[Capability]
+    policy: SourcePolicy
+
+    def is_configured(self) -> bool:
+        """Whether the credentials or settings the source needs are present."""
+        ...
+
+    def iter_tasks(self, limit: Optional[int] = None) -> Iterator[UnifiedTask]:
+        """Stream open tasks (at most ``limit``, None: the source's default).
+
+        Errors propagate to the caller.
+        """
+        ...
+
+    def list_tasks(self, limit: Optional[int] = None) -> List[UnifiedTask]:
+        """Fetch open tasks; errors are logged and yield an empty list."""
+        ...
+
+    def iter_changes(self, cursors: Dict[str, str]) -> Iterator[Union[UnifiedTask, DoneAtOrigin]]:
+        """Stream tasks changed since the resume points in ``cursors``.
+
+        Only sources with ``Capability.INCREMENTAL`` support this. Tasks
+        completed at the origin may be reported as ``DoneAtOrigin`` items.
+        Once the stream is exhausted, ``cursors`` has been advanced in
+        place; callers persist it only after handling every task. Errors
+        propagate to the caller.
+        """
+        ...
+
+    def can_complete(self) -> bool:
+        """Whether ``complete_tasks`` is supported.
+
+        With ``Capability.BATCH_WRITE`` it accepts many IDs per call;
+        otherwise callers pass one ID at a time.
+        """
+        ...
+
+    def complete_tasks(self, task_ids: Iterable[str]) -> Dict[str, bool]:
+        """Complete tasks at the origin, returning success per task ID."""
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Built-in sources
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RegisteredSource:
+    """A source backed by functions of an ``integrations`` module.
+
+    Attributes:
+        name: Source name (a ``models.TaskSource`` value).
+        module: Integration module, relative to this package (e.g. ``gmail``).
+        iter_fn: Name of the task generator in ``module``.
+        complete_fn: Name of a ``(task_ids) -> {task_id: bool}`` function,
+            or None when tasks cannot be completed at the origin.
+        complete_span: Trace span recorded around ``complete_tasks``
+            (default: ``<name>.complete``).
+        capabilities: Optional API features.
+        policy: Performance policy.
+        required_env: Environment variables that must be set for the source
+            to count as configured.
+        limit_arg: Whether ``iter_fn`` accepts a ``limit`` keyword.
+        changes_fn: Name of a ``(cursors) -> Iterator[UnifiedTask |
+            DoneAtOrigin]`` incremental generator (required for
+            ``Capability.INCREMENTAL``).
+
+    Raises:
+        ValueError: If ``Capability.INCREMENTAL`` is declared without a
+            ``changes_fn`` or ``Capability.BATCH_WRITE`` without a
+            ``complete_fn``.
+    """
+
+    name: str
+    module: str
+    iter_fn: str
+    complete_fn: Optional[str] = None
+    complete_span: Optional[str] = None
+    capabilities: FrozenSet[Capability] = frozenset()
+    policy: SourcePolicy = field(default_factory=SourcePolicy)
+    required_env: Tuple[str, ...] = ()
+    limit_arg: bool = True
+    changes_fn: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if Capability.INCREMENTAL in self.capabilities and self.changes_fn is None:
+            raise ValueError(f"{self.name}: Capability.INCREMENTAL needs a changes_fn")
+        if Capability.BATCH_WRITE in self.capabilities and self.complete_fn is None:
+            raise ValueError(f"{self.name}: Capability.BATCH_WRITE needs a complete_fn")
+
+    def _function(self, name: str) -> Callable:
+        return getattr(importlib.import_module(f".{self.module}", __package__), name)
+
+    def is_configured(self) -> bool:
+        return all(os.environ.get(var) for var in self.required_env)
+
+    def can_complete(self) -> bool:
+        return self.complete_fn is not None
+
+    def iter_tasks(self, limit: Optional[int] = None) -> Iterator[UnifiedTask]:
+        fn = self._function(self.iter_fn)
+        if limit is None:
+            return fn()
+        return fn(limit=limit) if self.limit_arg else islice(fn(), limit)
+
+    def iter_changes(self, cursors: Dict[str, str]) -> Iterator[Union[UnifiedTask, DoneAtOrigin]]:
+        if self.changes_fn is None:
+            raise NotImplementedError(f"{self.name} has no incremental fetch")
+        return self._function(self.changes_fn)(cursors)
+
+    def list_tasks(self, limit: Optional[int] = None) -> List[UnifiedTask]:
+        try:
+            # A copy, so callers cannot modify the shared result.
+            return list(_list_flight.do(
+                (self.name, limit), lambda: list(self.iter_tasks(limit)), (self.name, "list_tasks"),
+                ttl=self.policy.ttl_seconds,
+            ))
+        except Exception as e:
+            logger.error("Error fetching %s tasks: %s", self.name, e)
+            return []
+
+    def complete_tasks(self, task_ids: Iterable[str]) -> Dict[str, bool]:
+        if self.complete_fn is None:
+            raise NotImplementedError(f"{self.name} tasks cannot be completed at the origin")
+        ids = list(task_ids)
+        try:
+            with tracing.span(self.complete_span or f"{self.name}.complete", source=self.name, items=len(ids)) as span:
+                results = self._function(self.complete_fn)(ids)
+                span.set_attribute("failed", sum(1 for ok in results.values() if not ok))
+        finally:
+            invalidate(self.name)
+        return results
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)))
+
+
+SOURCES: Dict[str, TaskSourceAdapter] = {}
+
+
+def register(source: TaskSourceAdapter) -> TaskSourceAdapter:
+    """Add (or replace) a source; registration order is fetch order."""
+    SOURCES[source.name] = source
+    return source
+
+
+for _source in (
+    RegisteredSource(
+        "notion", "notion", "iter_notion_tasks", limit_arg=False,
+        policy=SourcePolicy(concurrency=_env_int("NOTION_MAX_IN_FLIGHT", 3), page_size=100),
+    ),
+    RegisteredSource(
+        "gmail", "gmail", "iter_task_emails", "archive_email_tasks", "gmail.archive",
+        capabilities=frozenset({Capability.BATCH_WRITE}),
+        policy=SourcePolicy(page_size=100),
+    ),
+    RegisteredSource(
+        "outlook", "outlook", "iter_outlook_tasks", "complete_outlook_task_ids", "outlook.complete",
+        capabilities=frozenset({Capability.BATCH_WRITE}),
+        # Sub-requests per Graph $batch call (at most 20).
+        policy=SourcePolicy(concurrency=20),
+        limit_arg=False,
+    ),
+    RegisteredSource(
+        "slack", "slack", "iter_slack_tasks", "complete_slack_tasks", "slack.complete",
+        capabilities=frozenset({Capability.INCREMENTAL, Capability.BATCH_WRITE, Capability.PUSH}),
+        policy=SourcePolicy(concurrency=_env_int("SLACK_SCAN_WORKERS", 4), page_size=200),
+        required_env=("SLACK_BOT_TOKEN",),
+        changes_fn="iter_slack_changes",
+    ),
+    RegisteredSource(
+        "jira", "jira", "iter_jira_tasks", "complete_jira_issues", "jira.transition",
+        capabilities=frozenset({Capability.INCREMENTAL, Capability.BATCH_WRITE}),
+        policy=SourcePolicy(concurrency=_env_int("JIRA_MAX_IN_FLIGHT", 4), page_size=100),
+        required_env=("JIRA_BASE_URL", "JIRA_USER_EMAIL", "JIRA_API_TOKEN"),
+        changes_fn="iter_jira_changes",
+    ),
+):
+    register(_source)
+
+
+def _load_env_overrides() -> None:
+    """Apply ``TASKCENTER_SOURCE_POLICIES`` overrides to the registered policies."""
+    raw = os.environ.get("TASKCENTER_SOURCE_POLICIES", "")
+    names = {f.name for f in fields(SourcePolicy)}
+    for entry in filter(None, (e.strip() for e in raw.split(","))):
+        try:
+            key, value = entry.split("=", 1)
+            name, _, attr = key.strip().partition(".")
+            if attr not in names:
+                raise ValueError(attr)
+            cast = float if attr == "ttl_seconds" else int
+            source = SOURCES[name]
+            SOURCES[name] = replace(source, policy=replace(source.policy, **{attr: cast(value)}))
+        except (KeyError, ValueError, TypeError):
+            logger.warning("Ignoring invalid source policy override: %r", entry)
+
+
+_load_env_overrides()
+
+# ---------------------------------------------------------------------------
+# Lookup
+# ---------------------------------------------------------------------------
+
+
+def get_source(name: str) -> Optional[TaskSourceAdapter]:
+    """Return the source called ``name`` (case-insensitive), or None."""
+    return SOURCES.get(name.lower())
+
+
+def policy(name: str) -> SourcePolicy:
+    """Performance policy of ``name`` (the default policy for unknown sources)."""
+    source = SOURCES.get(name)
+    return source.policy if source is not None else SourcePolicy()
+
+
+def pushed(source: TaskSourceAdapter) -> bool:
+    """Whether ``source`` receives pushed changes instead of being polled.
+
+    True for sources with ``Capability.PUSH`` listed in
+    ``TASKCENTER_PUSH_SOURCES`` (comma-separated names), i.e. whose local
+    receiver is running and keeps the task store current.
+    """
+    enabled = {n.strip().lower() for n in os.environ.get("TASKCENTER_PUSH_SOURCES", "").split(",")}
+    return Capability.PUSH in source.capabilities and source.name in enabled
+
+
+def invalidate(name: str) -> int:
+    """Drop cached ``list_tasks`` results of ``name`` (call after writing to it)."""
+    return _list_flight.invalidate(lambda key: key[0] == name.lower())
+
+
+def sources(
+    capability: Optional[Capability] = None, configured_only: bool = False
+) -> List[TaskSourceAdapter]:
+    """Registered sources in registration order, optionally filtered."""
+    return [
+        s for s in SOURCES.values()
+        if (capability is None or capability in s.capabilities)
+        and (not configured_only or s.is_configured())
+    ]
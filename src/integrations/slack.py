@@ -11,22 +11,34 @@ Requires:
         defaults to all public channels the bot is in).
     - SLACK_TASK_REACTION: Reaction emoji name that marks a message as a task
         (default: "white_check_mark").
+    - SLACK_HISTORY_LOOKBACK_DAYS: History window for channels without a
+        watermark (default: 30; 0 scans full history).
+    - SLACK_SCAN_WORKERS: Channels scanned concurrently (default: 4).
+    - SLACK_TASK_MODE: How tagged messages are found: "history", "search",
+        "reactions" or "auto" (default). See ``find_tagged_messages``.
+    - SLACK_USER_TOKEN: User OAuth Token (xoxp-...) with ``search:read``,
+        enables the ``search.messages`` lookup.
+    - SLACK_TASK_USER: User ID whose reactions mark tasks, enables the
+        ``reactions.list`` lookup.
 
 Install:  pip install slack_sdk
 """
 
 import os
+import sqlite3
 import logging
-from abc import ABC, abstractmethod
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Protocol
-
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Tuple
 
 try:
     from models import UnifiedTask, TaskSource, TaskPriority
+    from integrations import ratelimit, registry
+    from db.sqlite_store import get_sync_cursors, save_tasks, set_sync_cursors
 except ImportError:
     from src.models import UnifiedTask, TaskSource, TaskPriority
+    from src.integrations import ratelimit, registry
+    from src.db.sqlite_store import get_sync_cursors, save_tasks, set_sync_cursors
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +49,27 @@ logger = logging.getLogger(__name__)
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN", "")
 SLACK_TASK_CHANNELS = os.environ.get("SLACK_TASK_CHANNELS", "")
 SLACK_TASK_REACTION = os.environ.get("SLACK_TASK_REACTION", "white_check_mark")
-SLACK_API_BASE = "https://slack.com/api"
+SLACK_API_BASE = os.environ.get("SLACK_API_BASE", "https://slack.com/api").rstrip("/")
+
+# How far back to scan channels that have no stored watermark (0 = unbounded).
+SLACK_HISTORY_LOOKBACK_DAYS = int(os.environ.get("SLACK_HISTORY_LOOKBACK_DAYS", "30"))
+# Maximum number of channels scanned concurrently (registry policy:
+# SLACK_SCAN_WORKERS or TASKCENTER_SOURCE_POLICIES).
+SLACK_SCAN_WORKERS = registry.policy("slack").concurrency
+# Overlap subtracted from watermarks so reactions added shortly after a
+# message was scanned are still picked up by the next incremental scan.
+SLACK_WATERMARK_GRACE_SECONDS = int(os.environ.get("SLACK_WATERMARK_GRACE_SECONDS", "3600"))
+
+SLACK_TASK_MODE = os.environ.get("SLACK_TASK_MODE", "auto")
+SLACK_USER_TOKEN = os.environ.get("SLACK_USER_TOKEN", "")
+SLACK_TASK_USER = os.environ.get("SLACK_TASK_USER", "")
+
+_HISTORY_PAGE_SIZE = registry.policy("slack").page_size or 200
+
+# Slack error codes meaning the token lacks the scope or type a lookup needs.
+_SCOPE_ERRORS = frozenset(
+    {"missing_scope", "not_allowed_token_type", "not_authed", "invalid_auth", "no_permission"}
+)
 
 
 # ---------------------------------------------------------------------------
@@ -72,32 +104,50 @@ class SlackTaskSource(Protocol):
 # ---------------------------------------------------------------------------
 
 
-def _slack_headers() -> Dict[str, str]:
-    """Build auth headers for Slack Web API."""
+def _slack_headers(token: Optional[str] = None) -> Dict[str, str]:
+    """Build auth headers for Slack Web API (bot token unless overridden)."""
     return {
-        "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
+        "Authorization": f"Bearer {token or SLACK_BOT_TOKEN}",
         "Content-Type": "application/json; charset=utf-8",
     }
 
 
 def _get_channel_ids() -> List[str]:
-    """Return configured channel IDs, or discover public channels the bot is in."""
+    """Return configured channel IDs, or discover public channels the bot is in.
+
+    Discovery follows ``conversations.list`` cursors so workspaces with more
+    than one page of channels are covered completely.
+    """
     if SLACK_TASK_CHANNELS:
         return [c.strip() for c in SLACK_TASK_CHANNELS.split(",") if c.strip()]
 
     # Auto-discover channels the bot has joined
+    channels: List[str] = []
+    cursor: Optional[str] = None
     try:
-        resp = requests.get(
-            f"{SLACK_API_BASE}/conversations.list",
-            headers=_slack_headers(),
-            params={"types": "public_channel", "limit": 200},
-        )
-        data = resp.json()
-        if data.get("ok"):
-            return [ch["id"] for ch in data.get("channels", []) if ch.get("is_member")]
+        while True:
+            params = {"types": "public_channel", "limit": 200, "exclude_archived": "true"}
+            if cursor:
+                params["cursor"] = cursor
+            resp = ratelimit.request(
+                "slack",
+                "GET",
+                f"{SLACK_API_BASE}/conversations.list",
+                bucket="slack:tier2",
+                headers=_slack_headers(),
+                params=params,
+            )
+            data = resp.json()
+            if not data.get("ok"):
+                logger.warning("Slack API error listing channels: %s", data.get("error"))
+                break
+            channels.extend(ch["id"] for ch in data.get("channels", []) if ch.get("is_member"))
+            cursor = (data.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
     except Exception as exc:
         logger.error("Failed to list Slack channels: %s", exc)
-    return []
+    return channels
 
 
 def _ts_to_datetime(ts: str) -> Optional[datetime]:
@@ -118,85 +168,423 @@ def _extract_priority(text: str) -> TaskPriority:
     return TaskPriority.NORMAL
 
 
+def _has_task_reaction(msg: dict) -> bool:
+    """Return True if the message carries the configured task reaction."""
+    return any(r.get("name") == SLACK_TASK_REACTION for r in msg.get("reactions", []))
+
+
+def _message_to_task(channel_id: str, msg: dict) -> UnifiedTask:
+    """Convert a Slack message payload into a UnifiedTask."""
+    text = msg.get("text", "")
+    title = text[:120] + ("..." if len(text) > 120 else "")
+    ts = msg.get("ts", "")
+
+    return UnifiedTask(
+        id=f"slack-{channel_id}-{ts}",
+        source=_SLACK_SOURCE,
+        title=title,
+        snippet=text[:300] if len(text) > 120 else None,
+        status="Pending",
+        priority=_extract_priority(text),
+        due_date=_ts_to_datetime(ts),
+        link=f"https://app.slack.com/client/{channel_id}/p{ts.replace('.', '')}",
+    )
+
+
+def _default_oldest() -> Optional[str]:
+    """Oldest timestamp to scan for channels without a watermark."""
+    if SLACK_HISTORY_LOOKBACK_DAYS <= 0:
+        return None
+    cutoff = datetime.now(timezone.utc) - timedelta(days=SLACK_HISTORY_LOOKBACK_DAYS)
+    return f"{cutoff.timestamp():.6f}"
+
+
+def _oldest_for(watermark: Optional[str]) -> Optional[str]:
+    """Turn a stored watermark into an ``oldest`` bound, minus the grace window."""
+    if not watermark:
+        return _default_oldest()
+    try:
+        return f"{max(0.0, float(watermark) - SLACK_WATERMARK_GRACE_SECONDS):.6f}"
+    except ValueError:
+        return _default_oldest()
+
+
+def _scan_channel(
+    channel_id: str, oldest: Optional[str], limit: int
+) -> Tuple[List[UnifiedTask], Optional[str], bool]:
+    """Page through one channel's history newer than ``oldest``.
+
+    Returns:
+        ``(tasks, newest_ts, complete)`` where ``complete`` is False if the
+        scan stopped early (API error or ``limit`` reached), in which case the
+        channel's watermark must not advance.
+    """
+    tasks: List[UnifiedTask] = []
+    newest: Optional[str] = None
+    cursor: Optional[str] = None
+
+    while True:
+        params = {"channel": channel_id, "limit": _HISTORY_PAGE_SIZE}
+        if oldest:
+            params["oldest"] = oldest
+        if cursor:
+            params["cursor"] = cursor
+
+        resp = ratelimit.request(
+            "slack",
+            "GET",
+            f"{SLACK_API_BASE}/conversations.history",
+            bucket="slack:tier3",
+            headers=_slack_headers(),
+            params=params,
+        )
+        data = resp.json()
+        if not data.get("ok"):
+            logger.warning("Slack API error for channel %s: %s", channel_id, data.get("error"))
+            return tasks, newest, False
+
+        for msg in data.get("messages", []):
+            ts = msg.get("ts", "")
+            if ts and (newest is None or float(ts) > float(newest)):
+                newest = ts
+            if not _has_task_reaction(msg):
+                continue
+            tasks.append(_message_to_task(channel_id, msg))
+            if len(tasks) >= limit:
+                return tasks, newest, False
+
+        cursor = (data.get("response_metadata") or {}).get("next_cursor")
+        if not data.get("has_more") or not cursor:
+            return tasks, newest, True
+
+
+class SlackScanResult(NamedTuple):
+    """Tasks found by a channel scan plus the updated per-channel watermarks."""
+
+    tasks: List[UnifiedTask]
+    watermarks: Dict[str, str]
+
+
+class _LookupUnavailable(Exception):
+    """Raised when a reaction lookup cannot run with the configured tokens or fails."""
+
+
+def _configured_channels() -> Optional[set]:
+    """Channel IDs to restrict lookups to, or None for all channels."""
+    if not SLACK_TASK_CHANNELS:
+        return None
+    return {c.strip() for c in SLACK_TASK_CHANNELS.split(",") if c.strip()}
+
+
+def _search_tagged_messages(limit: int) -> List[UnifiedTask]:
+    """Find tagged messages with ``search.messages`` (needs a user token)."""
+    if not SLACK_USER_TOKEN:
+        raise _LookupUnavailable("SLACK_USER_TOKEN not set")
+
+    allowed = _configured_channels()
+    tasks: List[UnifiedTask] = []
+    page = 1
+
+    while len(tasks) < limit:
+        resp = ratelimit.request(
+            "slack",
+            "GET",
+            f"{SLACK_API_BASE}/search.messages",
+            bucket="slack:tier2",
+            headers=_slack_headers(SLACK_USER_TOKEN),
+            params={
+                "query": f"has::{SLACK_TASK_REACTION}:",
+                "sort": "timestamp",
+                "sort_dir": "desc",
+                "count": 100,
+                "page": page,
+            },
+        )
+        data = resp.json()
+        if not data.get("ok"):
+            # A partial result would pass for a complete one: fall back instead.
+            if data.get("error") not in _SCOPE_ERRORS:
+                logger.warning("Slack search error: %s", data.get("error"))
+            raise _LookupUnavailable(data.get("error"))
+
+        messages = data.get("messages") or {}
+        for match in messages.get("matches", []):
+            channel_id = (match.get("channel") or {}).get("id", "")
+            if allowed is not None and channel_id not in allowed:
+                continue
+            tasks.append(_message_to_task(channel_id, match))
+            if len(tasks) >= limit:
+                break
+
+        if page >= (messages.get("paging") or {}).get("pages", 1):
+            break
+        page += 1
+
+    return tasks
+
+
+def _list_reacted_messages(limit: int) -> List[UnifiedTask]:
+    """Find messages ``SLACK_TASK_USER`` tagged, via ``reactions.list``."""
+    if not SLACK_TASK_USER:
+        raise _LookupUnavailable("SLACK_TASK_USER not set")
+
+    allowed = _configured_channels()
+    tasks: List[UnifiedTask] = []
+    cursor: Optional[str] = None
+
+    while len(tasks) < limit:
+        params = {"user": SLACK_TASK_USER, "full": "true", "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        resp = ratelimit.request(
+            "slack",
+            "GET",
+            f"{SLACK_API_BASE}/reactions.list",
+            bucket="slack:tier2",
+            headers=_slack_headers(),
+            params=params,
+        )
+        data = resp.json()
+        if not data.get("ok"):
+            # A partial result would pass for a complete one: fall back instead.
+            if data.get("error") not in _SCOPE_ERRORS:
+                logger.warning("Slack reactions.list error: %s", data.get("error"))
+            raise _LookupUnavailable(data.get("error"))
+
+        for item in data.get("items", []):
+            if item.get("type") != "message":
+                continue
+            channel_id = item.get("channel", "")
+            msg = item.get("message") or {}
+            if allowed is not None and channel_id not in allowed:
+                continue
+            if not any(
+                r.get("name") == SLACK_TASK_REACTION and SLACK_TASK_USER in r.get("users", [])
+                for r in msg.get("reactions", [])
+            ):
+                continue
+            tasks.append(_message_to_task(channel_id, msg))
+            if len(tasks) >= limit:
+                break
+
+        cursor = (data.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            break
+
+    return tasks
+
+
+_LOOKUPS = {
+    "search": [("search", _search_tagged_messages)],
+    "reactions": [("reactions", _list_reacted_messages)],
+    "auto": [("search", _search_tagged_messages), ("reactions", _list_reacted_messages)],
+    "history": [],
+}
+
+
 # ---------------------------------------------------------------------------
 # Public API (implements SlackTaskSource protocol)
 # ---------------------------------------------------------------------------
 
 
-def list_slack_tasks(limit: int = 50) -> List[UnifiedTask]:
-    """Fetch messages with the task reaction from monitored Slack channels.
+def _iter_channel_scans(
+    channel_ids: List[str], marks: Dict[str, str], limit: int, max_workers: int
+) -> Iterator[Tuple[str, Tuple[List[UnifiedTask], Optional[str], bool]]]:
+    """Scan channels concurrently, yielding each result in channel order."""
+
+    def scan(channel_id: str) -> Tuple[List[UnifiedTask], Optional[str], bool]:
+        try:
+            return _scan_channel(channel_id, _oldest_for(marks.get(channel_id)), limit)
+        except Exception as exc:
+            logger.error("Error fetching Slack tasks from channel %s: %s", channel_id, exc)
+            return [], None, False
+
+    workers = max(1, min(max_workers, len(channel_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slack-scan") as pool:
+        yield from zip(channel_ids, pool.map(scan, channel_ids))
 
-    This implementation searches channel histories for messages that have
-    the configured reaction emoji (default: ``white_check_mark``), treating
-    each such message as a pending task.
+
+def scan_slack_channels(
+    limit: int = 50,
+    watermarks: Optional[Dict[str, str]] = None,
+    channels: Optional[List[str]] = None,
+    max_workers: int = SLACK_SCAN_WORKERS,
+) -> SlackScanResult:
+    """Scan channel histories concurrently for messages with the task reaction.
+
+    Each channel is paged with ``conversations.history`` cursors, bounded by
+    an ``oldest`` timestamp: the channel's watermark (newest message seen by
+    the last complete scan, minus a grace window) or, without one, the
+    lookback window. Channels are scanned in parallel; the shared
+    ``slack:tier3`` bucket keeps the aggregate rate within Slack's limits.
 
     Args:
         limit: Maximum number of tasks to return across all channels.
+        watermarks: Per-channel newest-seen timestamps from a previous scan.
+        channels: Channel IDs to scan. Defaults to configured/discovered ones.
+        max_workers: Maximum channels scanned concurrently.
 
     Returns:
-        List of UnifiedTask instances sourced from Slack.
+        SlackScanResult with tasks (in channel order) and updated watermarks.
+        A channel's watermark only advances when it was scanned completely
+        and all of its tasks fit within ``limit``.
     """
+    marks: Dict[str, str] = dict(watermarks or {})
+
     if not SLACK_BOT_TOKEN:
         logger.warning("SLACK_BOT_TOKEN not set. Slack integration disabled.")
-        return []
+        return SlackScanResult([], marks)
 
-    channels = _get_channel_ids()
-    if not channels:
+    channel_ids = channels if channels is not None else _get_channel_ids()
+    if not channel_ids:
         logger.info("No Slack channels configured or discoverable.")
-        return []
+        return SlackScanResult([], marks)
 
     tasks: List[UnifiedTask] = []
+    for channel_id, (channel_tasks, newest, complete) in _iter_channel_scans(
+        channel_ids, marks, limit, max_workers
+    ):
+        room = limit - len(tasks)
+        tasks.extend(channel_tasks[:room])
+        if complete and newest and len(channel_tasks) <= room:
+            previous = marks.get(channel_id)
+            if previous is None or float(newest) > float(previous):
+                marks[channel_id] = newest
+
+    logger.info("Retrieved %d task(s) from %d Slack channel(s).", len(tasks), len(channel_ids))
+    return SlackScanResult(tasks, marks)
+
+
+def find_tagged_messages(limit: int = 50, mode: Optional[str] = None) -> Optional[List[UnifiedTask]]:
+    """Find task messages without scanning channel histories.
+
+    Cost scales with the number of tagged messages rather than channel
+    volume. Modes:
+        - ``search``: ``search.messages`` for ``has::<reaction>:`` (user token).
+        - ``reactions``: ``reactions.list`` for ``SLACK_TASK_USER``.
+        - ``auto``: try search, then reactions.
+        - ``history``: no lookup; callers scan histories.
 
-    for channel_id in channels:
-        if len(tasks) >= limit:
-            break
+    Args:
+        limit: Maximum number of tasks to return.
+        mode: Lookup mode. Defaults to ``SLACK_TASK_MODE``.
+
+    Returns:
+        The tasks found, or None if no lookup is available (missing token or
+        scope), meaning the caller should fall back to the history scan.
+    """
+    mode = (mode or SLACK_TASK_MODE).lower()
+    if mode not in _LOOKUPS:
+        logger.warning("Unknown SLACK_TASK_MODE %r; using history scan.", mode)
 
+    for name, lookup in _LOOKUPS.get(mode, []):
         try:
-            # Fetch recent messages
-            resp = requests.get(
-                f"{SLACK_API_BASE}/conversations.history",
-                headers=_slack_headers(),
-                params={"channel": channel_id, "limit": min(limit * 2, 200)},
-            )
-            data = resp.json()
-            if not data.get("ok"):
-                logger.warning("Slack API error for channel %s: %s", channel_id, data.get("error"))
-                continue
+            tasks = lookup(limit)
+        except _LookupUnavailable as exc:
+            logger.info("Slack %s lookup unavailable (%s); trying next method.", name, exc)
+            continue
+        logger.info("Retrieved %d task(s) from Slack via %s.", len(tasks), name)
+        return tasks
+    return None
+
+
+def iter_slack_tasks(
+    limit: int = 50,
+    watermarks: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+) -> Iterator[UnifiedTask]:
+    """Yield Slack task messages as each lookup or channel scan completes.
+
+    Same sources as ``list_slack_tasks``; with the history scan, each
+    channel's tasks are yielded as soon as that channel (and those before
+    it) finished. Watermarks are read but not advanced.
+    """
+    tasks = find_tagged_messages(limit=limit, mode=mode)
+    if tasks is not None:
+        yield from tasks
+        return
 
-            for msg in data.get("messages", []):
-                if len(tasks) >= limit:
-                    break
-
-                # Check if message has the task reaction
-                reactions = msg.get("reactions", [])
-                has_task_reaction = any(
-                    r.get("name") == SLACK_TASK_REACTION for r in reactions
-                )
-
-                if not has_task_reaction:
-                    continue
-
-                text = msg.get("text", "")
-                title = text[:120] + ("..." if len(text) > 120 else "")
-                ts = msg.get("ts", "")
-
-                task = UnifiedTask(
-                    id=f"slack-{channel_id}-{ts}",
-                    source=_SLACK_SOURCE,
-                    title=title,
-                    snippet=text[:300] if len(text) > 120 else None,
-                    status="Pending",
-                    priority=_extract_priority(text),
-                    due_date=_ts_to_datetime(ts),
-                    link=f"https://app.slack.com/client/{channel_id}/p{ts.replace('.', '')}",
-                )
-                tasks.append(task)
+    if not SLACK_BOT_TOKEN:
+        logger.warning("SLACK_BOT_TOKEN not set. Slack integration disabled.")
+        return
+    channel_ids = _get_channel_ids()
+    count = 0
+    for _, (channel_tasks, _, _) in _iter_channel_scans(
+        channel_ids, dict(watermarks or {}), limit, SLACK_SCAN_WORKERS
+    ):
+        for task in channel_tasks[: limit - count]:
+            yield task
+            count += 1
+        if count >= limit:
+            return
+
+
+def list_slack_tasks(
+    limit: int = 50,
+    watermarks: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+) -> List[UnifiedTask]:
+    """Fetch messages with the task reaction from monitored Slack channels.
 
-        except Exception as exc:
-            logger.error("Error fetching Slack tasks from channel %s: %s", channel_id, exc)
+    Messages carrying the configured reaction emoji (default:
+    ``white_check_mark``) are treated as pending tasks. They are located via
+    ``find_tagged_messages`` when a lookup is available, falling back to the
+    channel history scan (``scan_slack_channels``).
 
-    logger.info("Retrieved %d task(s) from Slack.", len(tasks))
-    return tasks
+    Args:
+        limit: Maximum number of tasks to return across all channels.
+        watermarks: Optional per-channel watermarks for an incremental scan.
+        mode: Lookup mode override (see ``find_tagged_messages``).
+
+    Returns:
+        List of UnifiedTask instances sourced from Slack.
+    """
+    tasks = find_tagged_messages(limit=limit, mode=mode)
+    if tasks is not None:
+        return tasks
+    return scan_slack_channels(limit=limit, watermarks=watermarks).tasks
+
+
+def iter_slack_changes(cursors: Dict[str, str], limit: int = 500) -> Iterator[UnifiedTask]:
+    """Yield Slack tasks not covered by the per-channel watermarks in ``cursors``.
+
+    Incremental fetch of the source registry (``Capability.INCREMENTAL``),
+    used by the sync engine. Uses ``find_tagged_messages`` when available;
+    otherwise scans histories from the watermarks (see
+    ``scan_slack_channels``) and, once all tasks were yielded, advances
+    them in ``cursors``.
+    """
+    tasks = find_tagged_messages(limit=limit)
+    if tasks is not None:
+        yield from tasks
+        return
+
+    result = scan_slack_channels(limit=limit, watermarks=cursors)
+    yield from result.tasks
+    cursors.update(result.watermarks)
+
+
+def sync_slack_tasks(conn: sqlite3.Connection, limit: int = 500) -> int:
+    """Incrementally scan Slack and persist new tasks and channel watermarks.
+
+    Uses ``find_tagged_messages`` when available; otherwise scans histories
+    from the stored per-channel watermarks.
+
+    Args:
+        conn: Open connection from ``db.sqlite_store``.
+        limit: Maximum number of tasks to ingest in this run.
+
+    Returns:
+        Number of tasks saved.
+    """
+    tasks = find_tagged_messages(limit=limit)
+    if tasks is not None:
+        return save_tasks(conn, tasks)
+
+    result = scan_slack_channels(limit=limit, watermarks=get_sync_cursors(conn, _SLACK_SOURCE))
+    saved = save_tasks(conn, result.tasks)
+    set_sync_cursors(conn, _SLACK_SOURCE, result.watermarks)
+    return saved
 
 
 def mark_slack_task_done(channel_id: str, message_ts: str) -> bool:
@@ -213,8 +601,11 @@ def mark_slack_task_done(channel_id: str, message_ts: str) -> bool:
         return False
 
     try:
-        resp = requests.post(
+        resp = ratelimit.request(
+            "slack",
+            "POST",
             f"{SLACK_API_BASE}/reactions.add",
+            bucket="slack:tier3",
             headers=_slack_headers(),
             json={
                 "channel": channel_id,
@@ -232,3 +623,22 @@ def mark_slack_task_done(channel_id: str, message_ts: str) -> bool:
     except Exception as exc:
         logger.error("Error marking Slack task done: %s", exc)
         return False
+
+
+def complete_slack_tasks(task_ids: Iterable[str]) -> Dict[str, bool]:
+    """Mark tasks done by their UnifiedTask IDs (``slack-{channel}-{ts}``).
+
+    Registry completion adapter around ``mark_slack_task_done``.
+
+    Returns:
+        Mapping of each task ID to whether the reaction was added.
+    """
+    results: Dict[str, bool] = {}
+    for task_id in task_ids:
+        parts = task_id.split("-", 2)
+        if len(parts) != 3 or parts[0] != "slack":
+            logger.warning("Not a Slack task ID: %s", task_id)
+            results[task_id] = False
+            continue
+        results[task_id] = mark_slack_task_done(parts[1], parts[2])
+    return results
@@ -0,0 +1,393 @@
+"""slack_events.py — Slack Events API receiver for G_TaskCenter.
+
+A lightweight local HTTP endpoint that receives Slack Events and writes task
+upserts and removals straight into the SQLite task store, so Slack tasks are
+current within seconds without polling ``list_slack_tasks``.
+
+Handled events:
+    - ``reaction_added`` / ``reaction_removed`` with ``SLACK_TASK_REACTION``
+      on a message: the message is (re)fetched and upserted, or removed once
+      it shows no task reaction. If the fetch fails, the task is kept.
+    - ``message`` with subtype ``message_changed``: tracked tasks (or newly
+      tagged messages) are updated with the edited text.
+    - ``message`` with subtype ``message_deleted``: the task is removed.
+
+Every request is authenticated with Slack's ``v0`` HMAC-SHA256 signature
+and rejected if older than five minutes.
+
+Requires:
+    - SLACK_SIGNING_SECRET: App signing secret (Basic Information page).
+    - SLACK_BOT_TOKEN: Used to fetch message text for reaction events.
+    - SLACK_EVENTS_HOST / SLACK_EVENTS_PORT: Bind address
+      (default: 127.0.0.1:3000). Expose it to Slack through a tunnel or
+      reverse proxy and subscribe to the events above.
+    - TASKCENTER_PUSH_SOURCES=slack: While the receiver runs, lets the sync
+      engine read Slack tasks from the task store instead of polling Slack
+      (see ``registry.pushed``).
+
+Usage::
+
+    python -m src.integrations.slack_events serve
+    python -m src.integrations.slack_events replay tests/fixtures/slack_events/*.json
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import hashlib
+import logging
+import argparse
+import sqlite3
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+try:
+    from integrations import ratelimit, slack
+    from db.sqlite_store import init_db, save_task, get_task, delete_task
+except ImportError:
+    from src.integrations import ratelimit, slack
+    from src.db.sqlite_store import init_db, save_task, get_task, delete_task
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET", "")
+SLACK_EVENTS_HOST = os.environ.get("SLACK_EVENTS_HOST", "127.0.0.1")
+SLACK_EVENTS_PORT = int(os.environ.get("SLACK_EVENTS_PORT", "3000"))
+
+# Requests older than this are rejected to prevent replay attacks.
+MAX_REQUEST_AGE_SECONDS = 60 * 5
+
+# ---------------------------------------------------------------------------
+# Signature verification
+# ---------------------------------------------------------------------------
+
+
+def sign_request(signing_secret: str, timestamp: str, body: bytes) -> str:
+    """Compute the ``X-Slack-Signature`` value for a request body."""
+    base = b"v0:" + timestamp.encode() + b":" + body
+    digest = hmac.new(signing_secret.encode(), base, hashlib.sha256).hexdigest()
+    return f"v0={digest}"
+
+
+def verify_signature(
+    signing_secret: str,
+    timestamp: Optional[str],
+    body: bytes,
+    signature: Optional[str],
+    now: Optional[float] = None,
+) -> bool:
+    """Check a request's Slack signature and freshness.
+
+    Args:
+        signing_secret: The app's signing secret.
+        timestamp: ``X-Slack-Request-Timestamp`` header.
+        body: Raw request body.
+        signature: ``X-Slack-Signature`` header.
+        now: Current epoch seconds (injectable for tests).
+
+    Returns:
+        True if the signature matches and the request is recent.
+    """
+    if not signing_secret or not timestamp or not signature:
+        return False
+    try:
+        age = abs((now if now is not None else time.time()) - int(timestamp))
+    except ValueError:
+        return False
+    if age > MAX_REQUEST_AGE_SECONDS:
+        return False
+    expected = sign_request(signing_secret, timestamp, body)
+    return hmac.compare_digest(expected, signature)
+
+
+# ---------------------------------------------------------------------------
+# Event processing
+# ---------------------------------------------------------------------------
+
+
+def _fetch_message(channel_id: str, ts: str) -> Optional[dict]:
+    """Fetch a single message (top-level or thread reply) by timestamp."""
+    for method, params in (
+        ("conversations.history", {"channel": channel_id, "latest": ts, "inclusive": "true", "limit": 1}),
+        ("conversations.replies", {"channel": channel_id, "ts": ts, "limit": 1}),
+    ):
+        resp = ratelimit.request(
+            "slack",
+            "GET",
+            f"{slack.SLACK_API_BASE}/{method}",
+            bucket="slack:tier3",
+            headers=slack._slack_headers(),
+            params=params,
+        )
+        data = resp.json()
+        if not data.get("ok"):
+            logger.warning("Slack %s error for %s/%s: %s", method, channel_id, ts, data.get("error"))
+            continue
+        for msg in data.get("messages", []):
+            if msg.get("ts") == ts:
+                return msg
+    return None
+
+
+def _task_id(channel_id: str, ts: str) -> str:
+    return f"slack-{channel_id}-{ts}"
+
+
+def _handle_reaction(conn: sqlite3.Connection, event: dict) -> str:
+    item = event.get("item") or {}
+    if event.get("reaction") != slack.SLACK_TASK_REACTION or item.get("type") != "message":
+        return "ignored"
+
+    channel_id, ts = item.get("channel", ""), item.get("ts", "")
+    try:
+        msg = _fetch_message(channel_id, ts)
+    except Exception as exc:
+        logger.error("Failed to fetch Slack message %s/%s: %s", channel_id, ts, exc)
+        msg = None
+
+    if msg is None:
+        # Other users may still hold the reaction: keep the task until a
+        # fetch (or a later event) shows otherwise.
+        if event["type"] == "reaction_removed":
+            logger.warning("Keeping Slack task %s: message could not be fetched", _task_id(channel_id, ts))
+        return "ignored"
+    if slack._has_task_reaction(msg):
+        save_task(conn, slack._message_to_task(channel_id, msg))
+        return "upsert"
+    if event["type"] == "reaction_removed":
+        delete_task(conn, _task_id(channel_id, ts))
+        return "delete"
+    return "ignored"
+
+
+def _handle_message(conn: sqlite3.Connection, event: dict) -> str:
+    channel_id = event.get("channel", "")
+    subtype = event.get("subtype")
+
+    if subtype == "message_deleted":
+        ts = event.get("deleted_ts") or (event.get("previous_message") or {}).get("ts", "")
+        return "delete" if delete_task(conn, _task_id(channel_id, ts)) else "ignored"
+
+    if subtype == "message_changed":
+        msg = event.get("message") or {}
+        ts = msg.get("ts", "")
+        if slack._has_task_reaction(msg) or get_task(conn, _task_id(channel_id, ts)):
+            save_task(conn, slack._message_to_task(channel_id, msg))
+            return "upsert"
+
+    return "ignored"
+
+
+def handle_event(conn: sqlite3.Connection, payload: Dict[str, Any]) -> str:
+    """Apply one ``event_callback`` payload to the task store.
+
+    Args:
+        conn: Open connection from ``db.sqlite_store``.
+        payload: Parsed Slack Events API request body.
+
+    Returns:
+        The action taken: 'upsert', 'delete' or 'ignored'.
+    """
+    if payload.get("type") != "event_callback":
+        return "ignored"
+
+    event = payload.get("event") or {}
+    channels = slack._configured_channels()
+    channel_id = event.get("channel") or (event.get("item") or {}).get("channel")
+    if channels is not None and channel_id not in channels:
+        return "ignored"
+
+    if event.get("type") in ("reaction_added", "reaction_removed"):
+        action = _handle_reaction(conn, event)
+    elif event.get("type") == "message":
+        action = _handle_message(conn, event)
+    else:
+        action = "ignored"
+
+    if action != "ignored":
+        logger.info("Slack event %s -> %s (%s)", event.get("type"), action, channel_id)
+    return action
+
+
+# ---------------------------------------------------------------------------
+# HTTP receiver
+# ---------------------------------------------------------------------------
+
+
+class SlackEventsHandler(BaseHTTPRequestHandler):
+    """Request handler for the Slack Events endpoint (any POST path)."""
+
+    server: "SlackEventsServer"
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server API)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if not verify_signature(
+            self.server.signing_secret,
+            self.headers.get("X-Slack-Request-Timestamp"),
+            body,
+            self.headers.get("X-Slack-Signature"),
+        ):
+            self._reply(401, {"error": "invalid signature"})
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._reply(400, {"error": "invalid JSON"})
+            return
+
+        if payload.get("type") == "url_verification":
+            self._reply(200, {"challenge": payload.get("challenge", "")})
+            return
+
+        try:
+            action = handle_event(self.server.connection(), payload)
+        except Exception as exc:
+            logger.error("Failed to process Slack event: %s", exc)
+            self._reply(500, {"error": "processing failed"})
+            return
+        self._reply(200, {"ok": True, "action": action})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class SlackEventsServer(HTTPServer):
+    """Single-threaded HTTP server owning one SQLite connection.
+
+    Requests are handled on the thread running ``serve_forever``, which
+    lazily opens the connection so it is never shared across threads.
+    """
+
+    def __init__(
+        self,
+        address: tuple = (SLACK_EVENTS_HOST, SLACK_EVENTS_PORT),
+        signing_secret: Optional[str] = None,
+        db_path: Optional[str] = None,
+    ) -> None:
+        self.signing_secret = signing_secret or SLACK_SIGNING_SECRET
+        if not self.signing_secret:
+            raise ValueError("SLACK_SIGNING_SECRET is required to receive Slack events.")
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        super().__init__(address, SlackEventsHandler)
+
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = init_db(self.db_path)
+        return self._conn
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            # Close on the serving thread, which is the one that opened it.
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def run_events_server(
+    host: str = SLACK_EVENTS_HOST,
+    port: int = SLACK_EVENTS_PORT,
+    db_path: Optional[str] = None,
+) -> None:
+    """Serve the Slack Events endpoint until interrupted."""
+    server = SlackEventsServer((host, port), db_path=db_path)
+    logger.info("Slack events receiver listening on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Local event replayer
+# ---------------------------------------------------------------------------
+
+
+def replay_events(
+    payloads: Iterable[Dict[str, Any]],
+    url: str,
+    signing_secret: Optional[str] = None,
+) -> List[requests.Response]:
+    """Sign and POST recorded event payloads to a receiver, in order.
+
+    Args:
+        payloads: Parsed Slack event request bodies (e.g. fixture files).
+        url: Receiver URL, e.g. ``http://127.0.0.1:3000/slack/events``.
+        signing_secret: Secret used to sign. Defaults to SLACK_SIGNING_SECRET.
+
+    Returns:
+        The receiver's responses.
+    """
+    secret = signing_secret or SLACK_SIGNING_SECRET
+    responses = []
+    for payload in payloads:
+        body = json.dumps(payload).encode()
+        timestamp = str(int(time.time()))
+        responses.append(
+            requests.post(
+                url,
+                data=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Slack-Request-Timestamp": timestamp,
+                    "X-Slack-Signature": sign_request(secret, timestamp, body),
+                },
+                timeout=10,
+            )
+        )
+    return responses
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Slack Events receiver for G_TaskCenter")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Run the events receiver")
+    serve.add_argument("--host", default=SLACK_EVENTS_HOST)
+    serve.add_argument("--port", type=int, default=SLACK_EVENTS_PORT)
+    serve.add_argument("--db", default=None, help="SQLite path (default: TASKCENTER_DB_PATH)")
+
+    replay = sub.add_parser("replay", help="Replay recorded event payloads")
+    replay.add_argument("files", nargs="+")
+    replay.add_argument("--url", default=f"http://{SLACK_EVENTS_HOST}:{SLACK_EVENTS_PORT}/slack/events")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "serve":
+        run_events_server(args.host, args.port, args.db)
+        return 0
+
+    payloads = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            payloads.append(json.load(f))
+    for path, resp in zip(args.files, replay_events(payloads, args.url)):
+        print(f"{path}: {resp.status_code} {resp.text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,353 @@
+"""metrics.py — Latency and request-count instrumentation for G_TaskCenter.
+
+Records per-call metrics for the MCP tools in ``server.py`` and for every
+outbound integration call made through ``integrations.ratelimit``:
+
+    - latency histograms (fixed buckets, Prometheus style),
+    - call / request counts and errors,
+    - bytes sent and received,
+    - retries and throttled responses,
+    - cache hits and misses.
+
+Series are keyed by ``(provider, endpoint)``. MCP tools use the provider
+``mcp`` and the tool name as endpoint; REST calls use ``METHOD /path`` with
+IDs replaced by ``{id}``; SDK calls use the SDK method name
+(e.g. ``gmail.users.messages.get``).
+
+Summaries are returned by ``get_performance_stats()`` and rendered in the
+Prometheus text exposition format by ``render_prometheus()``.
+
+Environment variables:
+    - TASKCENTER_METRICS: Set to ``0`` to disable recording. Every hook then
+      returns after a single flag check.
+    - TASKCENTER_METRICS_FILE: (optional) Path of a Prometheus text file,
+      rewritten after every MCP tool call (node_exporter textfile collector).
+"""
+
+import os
+import re
+import time
+import bisect
+import inspect
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+ENABLED: bool = os.environ.get("TASKCENTER_METRICS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+METRICS_FILE: Optional[str] = os.environ.get("TASKCENTER_METRICS_FILE") or None
+
+# Upper bounds of the latency buckets, in seconds (+Inf is implicit).
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# Counters kept for every series, in output order.
+_COUNTERS: Tuple[str, ...] = (
+    "calls", "errors", "bytes_in", "bytes_out", "retries", "throttled", "cache_hits", "cache_misses",
+)
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn recording on or off at runtime (recorded data is kept)."""
+    global ENABLED
+    ENABLED = enabled
+
+
+# ---------------------------------------------------------------------------
+# Series
+# ---------------------------------------------------------------------------
+
+
+class _Series:
+    """Histogram and counters for one (provider, endpoint) pair."""
+
+    __slots__ = ("buckets", "latency_sum", "latency_max") + _COUNTERS
+
+    def __init__(self) -> None:
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        for name in _COUNTERS:
+            setattr(self, name, 0)
+
+    @property
+    def observations(self) -> int:
+        return sum(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+        if seconds > self.latency_max:
+            self.latency_max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a latency quantile by linear interpolation within its bucket."""
+        total = self.observations
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.latency_max
+                upper = min(upper, self.latency_max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / count
+            seen += count
+        return self.latency_max
+
+    def summary(self) -> Dict[str, Any]:
+        n = self.observations
+        out: Dict[str, Any] = {name: getattr(self, name) for name in _COUNTERS}
+        out["latency_ms"] = {
+            "count": n,
+            "mean": round(1000 * self.latency_sum / n, 3) if n else None,
+            "p50": _ms(self.quantile(0.50)),
+            "p95": _ms(self.quantile(0.95)),
+            "p99": _ms(self.quantile(0.99)),
+            "max": _ms(self.latency_max) if n else None,
+        }
+        return out
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(1000 * seconds, 3)
+
+
+_series: Dict[Tuple[str, str], _Series] = {}
+_lock = threading.Lock()
+_started = time.time()
+
+
+def _get(provider: str, endpoint: str) -> _Series:
+    key = (provider, endpoint)
+    series = _series.get(key)
+    if series is None:
+        series = _series.setdefault(key, _Series())
+    return series
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+def record_call(
+    provider: str,
+    endpoint: str,
+    seconds: Optional[float] = None,
+    error: bool = False,
+    throttled: bool = False,
+    bytes_in: int = 0,
+    bytes_out: int = 0,
+) -> None:
+    """Record one completed call: its latency, outcome and payload sizes."""
+    if not ENABLED:
+        return
+    with _lock:
+        series = _get(provider, endpoint)
+        series.calls += 1
+        if seconds is not None:
+            series.observe(seconds)
+        if error:
+            series.errors += 1
+        if throttled:
+            series.throttled += 1
+        series.bytes_in += bytes_in
+        series.bytes_out += bytes_out
+
+
+def record_retry(provider: str, endpoint: str) -> None:
+    """Record that a call to ``provider``/``endpoint`` is being retried."""
+    if not ENABLED:
+        return
+    with _lock:
+        _get(provider, endpoint).retries += 1
+
+
+def record_cache(provider: str, endpoint: str, hit: bool) -> None:
+    """Record a cache lookup for ``provider``/``endpoint``."""
+    if not ENABLED:
+        return
+    with _lock:
+        series = _get(provider, endpoint)
+        if hit:
+            series.cache_hits += 1
+        else:
+            series.cache_misses += 1
+
+
+@contextmanager
+def timed(provider: str, endpoint: str) -> Iterator[None]:
+    """Record the latency of the enclosed block; exceptions count as errors."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record_call(provider, endpoint, time.perf_counter() - start, error=error)
+
+
+def instrument_tool(fn: F) -> F:
+    """Decorator recording latency and errors of an MCP tool.
+
+    Apply it below ``@mcp.tool()``; ``functools.wraps`` keeps the signature
+    FastMCP derives the tool schema from.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not ENABLED:
+            return fn(*args, **kwargs)
+        try:
+            with timed("mcp", name):
+                return fn(*args, **kwargs)
+        finally:
+            if METRICS_FILE:
+                write_prometheus(METRICS_FILE)
+
+    return wrapper  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------
+# Endpoint naming
+# ---------------------------------------------------------------------------
+
+# Path segments kept verbatim: words, API versions ("v1.0", "2") and method
+# names ("conversations.history", "$batch"). Anything else is an ID.
+_KEEP_SEGMENT = re.compile(r"^(?:[A-Za-z_$][A-Za-z_.$-]*|v\d+(?:\.\d+)?|\d{1,2})$")
+
+
+def endpoint_for_url(method: str, url: str) -> str:
+    """``GET https://host/v1/pages/3f2a…`` -> ``GET /v1/pages/{id}``."""
+    path = urlsplit(url).path
+    segments = [s if _KEEP_SEGMENT.match(s) else "{id}" for s in path.split("/") if s]
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
+def endpoint_for_callable(fn: Callable[..., Any]) -> str:
+    """Name an SDK call.
+
+    googleapiclient requests expose ``methodId`` (``gmail.users.messages.get``)
+    on the bound ``execute``; notion_client endpoint methods are named
+    after their class (``PagesEndpoint.create`` -> ``pages.create``).
+    """
+    owner = fn.__self__ if inspect.ismethod(fn) else None
+    method_id = getattr(owner, "methodId", None)
+    if isinstance(method_id, str):
+        return method_id
+    name = getattr(fn, "__name__", type(fn).__name__)
+    if owner is not None and not isinstance(owner, type):
+        cls = type(owner).__name__
+        if cls.endswith("Endpoint"):
+            cls = cls[: -len("Endpoint")].lower()
+        return f"{cls}.{name}"
+    return name
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def get_performance_stats() -> Dict[str, Any]:
+    """Summaries per provider and endpoint.
+
+    Returns:
+        ``{"enabled", "uptime_s", "tools": {name: summary},
+        "providers": {provider: {"totals": {...}, "endpoints": {endpoint: summary}}}}``.
+        Each summary holds the counters plus ``latency_ms`` with the mean,
+        p50/p95/p99 (estimated from the histogram buckets) and max.
+    """
+    with _lock:
+        snapshot = {key: series.summary() for key, series in _series.items()}
+
+    tools: Dict[str, Any] = {}
+    providers: Dict[str, Any] = {}
+    for (provider, endpoint), summary in sorted(snapshot.items()):
+        if provider == "mcp":
+            tools[endpoint] = summary
+            continue
+        entry = providers.setdefault(provider, {"totals": dict.fromkeys(_COUNTERS, 0), "endpoints": {}})
+        entry["endpoints"][endpoint] = summary
+        for name in _COUNTERS:
+            entry["totals"][name] += summary[name]
+    return {
+        "enabled": ENABLED,
+        "uptime_s": round(time.time() - _started, 1),
+        "tools": tools,
+        "providers": providers,
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus() -> str:
+    """Render every series in the Prometheus text exposition format."""
+    with _lock:
+        items = sorted(
+            (key, list(s.buckets), s.latency_sum, {n: getattr(s, n) for n in _COUNTERS})
+            for key, s in _series.items()
+        )
+
+    lines: List[str] = [
+        "# HELP taskcenter_call_duration_seconds Latency of MCP tools and outbound integration calls.",
+        "# TYPE taskcenter_call_duration_seconds histogram",
+    ]
+    for (provider, endpoint), buckets, total, _ in items:
+        labels = f'provider="{_label(provider)}",endpoint="{_label(endpoint)}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'taskcenter_call_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"taskcenter_call_duration_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"taskcenter_call_duration_seconds_count{{{labels}}} {cumulative}")
+
+    for name in _COUNTERS:
+        metric = f"taskcenter_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for (provider, endpoint), _, _, counters in items:
+            labels = f'provider="{_label(provider)}",endpoint="{_label(endpoint)}"'
+            lines.append(f"{metric}{{{labels}}} {counters[name]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Atomically write ``render_prometheus()`` to ``path``."""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not write metrics file %s: %s", path, exc)
+
+
+def reset() -> None:
+    """Drop every recorded series."""
+    global _started
+    with _lock:
+        _series.clear()
+        _started = time.time()
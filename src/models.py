@@ -1,5 +1,7 @@
 """models.py — Data models for G_TaskCenter unified tasks."""
 
+import hashlib
+import json
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -45,3 +47,19 @@ class UnifiedTask(BaseModel):
 
     class Config:
         use_enum_values = True
+
+    def fingerprint(self) -> str:
+        """Stable hash of the task's content fields.
+
+        Covers title, status, priority, due date and snippet; identity and
+        presentation fields (id, source, link) are excluded, so two fetches
+        of an unchanged task always produce the same value.
+        """
+        due = self.due_date.isoformat() if self.due_date else None
+        priority = getattr(self.priority, "value", self.priority)
+        payload = json.dumps(
+            [self.title, self.status, priority, due, self.snippet],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
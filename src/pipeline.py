@@ -0,0 +1,288 @@
+"""pipeline.py — Bounded streaming helpers for G_TaskCenter.
+
+The integrations expose ``iter_*`` generators that yield tasks page by page.
+These helpers connect them into pipelines without materialising whole
+backlogs: producers run in background threads and hand items over through
+bounded queues, so a slow consumer applies back-pressure instead of letting
+memory grow with the size of the backlog.
+
+Multi-stage pipelines are built from ``Stage`` objects: each stage has a
+bounded input queue, a pool of worker threads and ``StageStats`` recording
+items processed, per-item latency and throughput.
+
+Usage:
+    for task in merge(iter_task_emails(), iter_outlook_tasks()):
+        ...
+    save_tasks(conn, prefetch(iter_jira_tasks(limit=5000)))
+"""
+
+import os
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Items buffered between a producer and its consumer.
+PIPELINE_BUFFER_SIZE = int(os.environ.get("TASKCENTER_PIPELINE_BUFFER", "256"))
+
+# How often a blocked producer checks whether the consumer went away.
+_POLL_SECONDS = 0.1
+
+
+class _Done:
+    """End-of-stream marker for one producer."""
+
+
+class _Failed:
+    """Carries a producer exception to the consumer."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _produce(source: Iterable[T], out: "queue.Queue", stop: threading.Event) -> None:
+    """Drain ``source`` into ``out`` until exhausted or ``stop`` is set."""
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for item in source:
+            if not put(item):
+                return
+    except BaseException as exc:
+        put(_Failed(exc))
+        return
+    put(_Done())
+
+
+def merge(*sources: Iterable[T], maxsize: int = PIPELINE_BUFFER_SIZE) -> Iterator[T]:
+    """Consume several iterables concurrently and yield items as they arrive.
+
+    Each source runs in its own daemon thread, started immediately so that
+    fetching overlaps whatever the caller does before iterating; at most
+    ``maxsize`` items are buffered in total. An exception raised by a source
+    is re-raised in the consumer. Closing the returned iterator stops the
+    producers at their next hand-over.
+
+    Args:
+        *sources: Iterables (typically ``iter_*`` generators).
+        maxsize: Bound of the shared buffer.
+    """
+    buf: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+    for s in sources:
+        threading.Thread(
+            target=_produce, args=(s, buf, stop), daemon=True, name="pipeline-producer"
+        ).start()
+    return _consume(buf, stop, len(sources))
+
+
+def _consume(buf: "queue.Queue", stop: threading.Event, producers: int) -> Iterator[T]:
+    remaining = producers
+    try:
+        while remaining:
+            item = buf.get()
+            if isinstance(item, _Done):
+                remaining -= 1
+            elif isinstance(item, _Failed):
+                raise item.exc
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+def prefetch(source: Iterable[T], maxsize: int = PIPELINE_BUFFER_SIZE) -> Iterator[T]:
+    """Run ``source`` ahead of its consumer by up to ``maxsize`` items."""
+    return merge(source, maxsize=maxsize)
+
+
+def chunked(source: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of up to ``size`` consecutive items."""
+    it = iter(source)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage.
+
+    ``busy_seconds`` sums the time workers spent processing; latency is per
+    call of the stage function (one item, or one batch for batched stages).
+    Throughput is items per second of the stage's wall-clock lifetime.
+    """
+
+    name: str
+    items: int = 0
+    calls: int = 0
+    busy_seconds: float = 0.0
+    max_latency: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, seconds: float, items: int = 1) -> None:
+        with self._lock:
+            self.items += items
+            self.calls += 1
+            self.busy_seconds += seconds
+            self.max_latency = max(self.max_latency, seconds)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.finished = time.monotonic()
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            wall = (self.finished or time.monotonic()) - self.started if self.started else 0.0
+            return {
+                "items": self.items,
+                "wall_seconds": round(wall, 3),
+                "busy_seconds": round(self.busy_seconds, 3),
+                "avg_latency_ms": round(1000 * self.busy_seconds / self.calls, 2) if self.calls else 0.0,
+                "max_latency_ms": round(1000 * self.max_latency, 2),
+                "throughput_per_s": round(self.items / wall, 2) if wall > 0 else 0.0,
+            }
+
+
+class _EndOfStream:
+    """Sentinel closing a stage's input."""
+
+
+_END = _EndOfStream()
+
+
+class Stage:
+    """A pool of workers applying ``fn`` to items from a bounded queue.
+
+    ``fn`` returns an iterable of outputs (possibly empty), each forwarded
+    to ``downstream``. With ``batch_size`` > 1, ``fn`` receives lists of up
+    to that many items, gathered from whatever is queued (a partial batch is
+    flushed after ``batch_wait`` seconds without new input).
+
+    Errors raised by ``fn`` are logged through ``on_error`` and the item is
+    dropped, so one failure does not stall the pipeline. A stage fed by
+    several upstream stages is created with ``inputs`` set to their count;
+    its input closes once every upstream has called ``close()``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+        maxsize: int = PIPELINE_BUFFER_SIZE,
+        downstream: Optional["Stage"] = None,
+        batch_size: int = 1,
+        batch_wait: float = 0.05,
+        on_error: Optional[Callable[[str, BaseException], None]] = None,
+        inputs: int = 1,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.stats = StageStats(name)
+        self.downstream = downstream
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.on_error = on_error
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self._workers = max(1, workers)
+        self._threads: List[threading.Thread] = []
+        self._live = self._workers
+        self._live_lock = threading.Lock()
+        self._open_inputs = max(1, inputs)
+
+    def start(self) -> "Stage":
+        self.stats.start()
+        for i in range(self._workers):
+            t = threading.Thread(target=self._run, daemon=True, name=f"{self.name}-{i}")
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def put(self, item: Any) -> None:
+        """Queue an item, blocking while the stage is saturated."""
+        self._queue.put(item)
+
+    def close(self) -> None:
+        """Signal that one input will send nothing more."""
+        with self._live_lock:
+            self._open_inputs -= 1
+            if self._open_inputs > 0:
+                return
+        self._queue.put(_END)
+
+    def join(self) -> None:
+        """Wait for this stage (not its downstream) to drain."""
+        for t in self._threads:
+            t.join()
+
+    def _next_batch(self) -> Optional[List[Any]]:
+        first = self._queue.get()
+        if first is _END:
+            return None
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=self.batch_wait)
+            except queue.Empty:
+                break
+            if item is _END:
+                self._queue.put(_END)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    # Let sibling workers see the end marker too.
+                    self._queue.put(_END)
+                    return
+                arg = batch if self.batch_size > 1 else batch[0]
+                t0 = time.perf_counter()
+                try:
+                    outputs = list(self.fn(arg) or ())
+                except Exception as exc:
+                    outputs = []
+                    if self.on_error is not None:
+                        self.on_error(self.name, exc)
+                self.stats.record(time.perf_counter() - t0, len(batch))
+                if self.downstream is not None:
+                    for out in outputs:
+                        self.downstream.put(out)
+        finally:
+            with self._live_lock:
+                self._live -= 1
+                last = self._live == 0
+            if last:
+                self.stats.finish()
+                if self.downstream is not None:
+                    self.downstream.close()
@@ -1,35 +1,44 @@
-"""server.py — Official MCP local server for G_TaskCenter."""
+"""server.py — Official MCP local server for G_TaskCenter.
 
+Integration modules (and with them notion_client, googleapiclient, msal and
+requests) are imported on first use of their tools or of their entry in the
+task source registry (``integrations.registry``), so a stdio launch only
+pays for FastMCP and the local store before it can answer. See
+``benchmarks/startup.py`` for the cold-start budget.
+"""
+
+import importlib
 import logging
+from types import ModuleType
 from typing import List, Any
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
 try:
+    import metrics
+    from metrics import instrument_tool
     from models import UnifiedTask, TaskPriority
-    from integrations.notion import list_notion_tasks, create_task
-    from integrations.outlook import list_outlook_tasks, complete_outlook_task
-    from integrations.gmail import list_task_emails, archive_email_task
-    from integrations.n8n import (
-        get_workflows,
-        activate_workflow,
-        test_execute_workflow,
-        get_execution_status,
-    )
+    from integrations import registry
+    from db.sqlite_store import find_sync_regressions, get_connection, get_sync_stats
+
+    _PACKAGE = ""
 except ImportError:
+    from src import metrics
+    from src.metrics import instrument_tool
     from src.models import UnifiedTask, TaskPriority
-    from src.integrations.notion import list_notion_tasks, create_task
-    from src.integrations.outlook import list_outlook_tasks, complete_outlook_task
-    from src.integrations.gmail import list_task_emails, archive_email_task
-    from src.integrations.n8n import (
-        get_workflows,
-        activate_workflow,
-        test_execute_workflow,
-        get_execution_status,
-    )
+    from src.integrations import registry
+    from src.db.sqlite_store import find_sync_regressions, get_connection, get_sync_stats
+
+    _PACKAGE = "src."
 
 load_dotenv()
 
+
+def _integration(name: str) -> ModuleType:
+    """Import ``integrations.<name>`` on first use (later calls hit ``sys.modules``)."""
+    return importlib.import_module(f"{_PACKAGE}integrations.{name}")
+
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("g_taskcenter_server")
 
@@ -40,39 +49,30 @@ mcp = FastMCP("G_TaskCenter")
 
 
 @mcp.tool()
+@instrument_tool
 def list_unified_tasks() -> List[dict]:
     """
-    List all pending tasks from Notion, Outlook, and Gmail in a unified format.
+    List all pending tasks from every configured source in a unified format.
+
+    Concurrent identical calls share one fetch per source, and results are
+    reused for a few seconds (see ``integrations.registry``).
     """
     logger.info("Fetching unified tasks from all configured sources...")
     unified_tasks: List[UnifiedTask] = []
 
-    # 1. Notion
-    notion_tasks = list_notion_tasks()
-    unified_tasks.extend(notion_tasks)
-
-    # 2. Outlook
-    outlook_tasks = list_outlook_tasks()
-    unified_tasks.extend(outlook_tasks)
-
-    # 3. Gmail
-    gmail_tasks = list_task_emails()
-    unified_tasks.extend(gmail_tasks)
+    for source in registry.sources(configured_only=True):
+        unified_tasks.extend(source.list_tasks())
 
     # Serialize Pydantic objects for MCP consumption
     return [task.model_dump() for task in unified_tasks]
 
 
 @mcp.tool()
+@instrument_tool
 def get_source_tasks(source: str) -> List[dict]:
-    """Retrieve tasks from a specific service ('notion', 'outlook', or 'gmail')."""
-    tasks: List[UnifiedTask] = []
-    if source.lower() == "notion":
-        tasks = list_notion_tasks()
-    elif source.lower() == "outlook":
-        tasks = list_outlook_tasks()
-    elif source.lower() == "gmail":
-        tasks = list_task_emails()
+    """Retrieve tasks from a specific service ('notion', 'outlook', 'gmail', 'slack' or 'jira')."""
+    adapter = registry.get_source(source)
+    tasks: List[UnifiedTask] = adapter.list_tasks() if adapter else []
     return [t.model_dump() for t in tasks]
 
 
@@ -80,6 +80,7 @@ def get_source_tasks(source: str) -> List[dict]:
 
 
 @mcp.tool()
+@instrument_tool
 def create_notion_task(title: str, priority_level: str = "normal") -> dict:
     """Create a new task in Notion."""
     try:
@@ -87,37 +88,71 @@ def create_notion_task(title: str, priority_level: str = "normal") -> dict:
     except ValueError:
         priority = TaskPriority.NORMAL
 
-    task = create_task(title, priority)
+    task = _integration("notion").create_task(title, priority)
+    registry.invalidate("notion")
     return task.model_dump() if task else {"error": "Failed to create task."}
 
 
 @mcp.tool()
+@instrument_tool
 def complete_task_in_outlook(list_id: str, task_id: str) -> str:
     """Mark a task as complete in Outlook to-do."""
-    success = complete_outlook_task(list_id, task_id)
+    success = _integration("outlook").complete_outlook_task(list_id, task_id)
+    registry.invalidate("outlook")
     return "Task marked as complete" if success else "Failed to complete task"
 
 
 @mcp.tool()
+@instrument_tool
+def complete_tasks_in_outlook(tasks: List[dict]) -> dict:
+    """Mark several Outlook to-do tasks complete in one batch.
+
+    Each item needs ``list_id`` and ``task_id``.
+    """
+    results = _integration("outlook").complete_outlook_tasks((t["list_id"], t["task_id"]) for t in tasks)
+    registry.invalidate("outlook")
+    return {
+        "completed": [t for t, ok in results.items() if ok],
+        "failed": [t for t, ok in results.items() if not ok],
+    }
+
+
+@mcp.tool()
+@instrument_tool
 def archive_gmail(msg_id: str) -> str:
     """Archive an email in Gmail related to a task."""
-    success = archive_email_task(msg_id)
+    success = _integration("gmail").archive_email_task(msg_id)
+    registry.invalidate("gmail")
     return "Email archived successfully" if success else "Failed to archive email"
 
 
+@mcp.tool()
+@instrument_tool
+def archive_gmail_batch(msg_ids: List[str]) -> dict:
+    """Archive several Gmail task emails in one request (up to 1,000 per call)."""
+    results = _integration("gmail").archive_email_tasks(msg_ids)
+    registry.invalidate("gmail")
+    return {
+        "archived": [m for m, ok in results.items() if ok],
+        "failed": [m for m, ok in results.items() if not ok],
+    }
+
+
 # --- N8N WORKFLOW AUTOMATION TOOLS ---
 
 
 @mcp.tool()
+@instrument_tool
 def list_n8n_workflows() -> List[dict]:
     """Retrieve all configured workflows from the linked n8n instance."""
-    return get_workflows()
+    return _integration("n8n").get_workflows()
 
 
 @mcp.tool()
+@instrument_tool
 def toggle_n8n_workflow(workflow_id: str, active: bool) -> str:
     """Enable or disable an n8n workflow."""
-    success = activate_workflow(workflow_id, active)
+    success = _integration("n8n").activate_workflow(workflow_id, active)
     state_str = "activated" if active else "deactivated"
     return (
         f"Workflow {workflow_id} {state_str} successfully"
@@ -127,6 +162,7 @@ def toggle_n8n_workflow(workflow_id: str, active: bool) -> str:
 
 
 @mcp.tool()
+@instrument_tool
 def test_n8n_workflow(workflow_id: str, payload_json: str = "{}") -> dict:
     """Trigger a manual execution of an n8n workflow for testing purposes."""
     import json
@@ -135,13 +171,48 @@ def test_n8n_workflow(workflow_id: str, payload_json: str = "{}") -> dict:
         payload = json.loads(payload_json)
     except:
         payload = {}
-    return test_execute_workflow(workflow_id, payload)
+    return _integration("n8n").test_execute_workflow(workflow_id, payload)
 
 
 @mcp.tool()
+@instrument_tool
 def check_n8n_execution(execution_id: str) -> dict:
     """Get the result or status of a specific n8n execution."""
-    return get_execution_status(execution_id)
+    return _integration("n8n").get_execution_status(execution_id)
+
+
+# --- DIAGNOSTICS ---
+
+
+@mcp.tool()
+def get_performance_stats(prometheus: bool = False) -> dict:
+    """Latency, request, byte, retry and cache counters per tool and provider endpoint.
+
+    ``http_cache`` summarizes the conditional-request cache (304s, unchanged
+    bodies, misses, hit rate, disk usage). Set ``prometheus`` to also return
+    the Prometheus text exposition dump.
+    """
+    stats = metrics.get_performance_stats()
+    stats["http_cache"] = _integration("httpcache").get_cache_stats()
+    if prometheus:
+        stats["prometheus"] = metrics.render_prometheus()
+    return stats
+
+
+@mcp.tool()
+@instrument_tool
+def get_sync_performance(source: str = "", window: int = 20, threshold: float = 2.0) -> dict:
+    """Sync history per source: rolling p50/p95 duration, requests, bytes and throttle time, plus regressions.
+
+    A regression is a streak of recent runs ``threshold`` times slower (or
+    making that many more requests) than the median of the ``window`` runs
+    before them, e.g. "Outlook sync got 3.0x slower since Tuesday 2026-10-13".
+    """
+    with get_connection() as conn:
+        return {
+            "sources": get_sync_stats(conn, source or None, window),
+            "regressions": find_sync_regressions(conn, source or None, threshold, window),
+        }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+"""singleflight.py — Request coalescing for G_TaskCenter.
+
+When several MCP clients or agent steps ask for the same data at once (e.g.
+``list_unified_tasks`` or ``get_source_tasks("notion")``), each request would
+otherwise run its own full remote fetch. ``SingleFlight`` lets the first
+caller for a key run the fetch while concurrent callers with the same key
+wait for it and share its result. Successful results are then kept for a
+short TTL, which absorbs agent retry storms without spending API quota.
+
+Errors are handed to every waiting caller but never cached. Results of a
+fetch that was in flight when its key was invalidated (e.g. by a write to
+the same source) are returned to its callers but not cached either.
+
+Usage:
+    flight = SingleFlight(ttl=5.0)
+    tasks = flight.do(("notion", None), lambda: list(iter_notion_tasks()))
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+try:
+    import metrics
+except ImportError:
+    from src import metrics
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight execution and the callers waiting on it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Set when the key is invalidated while the call runs.
+        self.stale = False
+
+
+class SingleFlight:
+    """Coalesce concurrent calls per key and cache their results briefly.
+
+    Args:
+        ttl: Seconds a successful result is served to later callers
+            (0: results are only shared with concurrent callers).
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(self, ttl: float = 0.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self._stats = {"executed": 0, "shared": 0, "cached": 0}
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], T],
+        metric: Optional[Tuple[str, str]] = None,
+        ttl: Optional[float] = None,
+    ) -> T:
+        """Return ``fn()``, sharing one execution among concurrent callers of ``key``.
+
+        Args:
+            key: Identifies the request (e.g. source name and query parameters).
+            fn: Performs the request.
+            metric: Optional ``(provider, endpoint)`` under which the lookup
+                is recorded with ``metrics.record_cache``. Shared and cached
+                results count as hits.
+            ttl: Seconds this call's result is cached (None: ``self.ttl``).
+
+        Raises:
+            Whatever ``fn`` raised, in the caller that ran it and in every
+            caller that waited for it.
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and self._clock() >= entry[0]:
+                del self._results[key]
+                entry = None
+            call = self._calls.get(key) if entry is None else None
+            leader = entry is None and call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["cached" if entry is not None else "shared"] += 1
+
+        if metric is not None:
+            metrics.record_cache(metric[0], metric[1], not leader)
+        if entry is not None:
+            return entry[1]
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and not call.stale and ttl > 0:
+                    self._results[key] = (self._clock() + ttl, call.result)
+            call.done.set()
+        return call.result
+
+    def invalidate(self, match: Callable[[Hashable], bool]) -> int:
+        """Drop cached results whose key satisfies ``match``.
+
+        Matching calls still in flight complete normally, but their results
+        are not cached.
+
+        Returns:
+            Number of cached results dropped.
+        """
+        with self._lock:
+            dropped = [key for key in self._results if match(key)]
+            for key in dropped:
+                del self._results[key]
+            for key, call in self._calls.items():
+                if match(key):
+                    call.stale = True
+        return len(dropped)
+
+    def clear(self) -> None:
+        """Drop every cached result (in-flight calls are not cached)."""
+        self.invalidate(lambda key: True)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of executed, shared (joined in flight) and cached lookups."""
+        with self._lock:
+            return dict(self._stats)
@@ -1,14 +1,20 @@
 """sync_engine.py — Bi-directional task synchronization engine for G_TaskCenter."""
 
 import os
+import time
 import sqlite3
 import logging
-from typing import List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 
+import tracing
 from models import UnifiedTask, TaskSource, TaskPriority
-from integrations.gmail import list_task_emails, archive_email_task
-from integrations.outlook import list_outlook_tasks, complete_outlook_task
-from integrations.notion import list_notion_tasks, create_task
+from db.retention import maybe_compact
+from db.sqlite_store import ensure_source, get_connection, get_tasks, mark_synced
+from integrations import ratelimit, registry
+from integrations.notion import (
+    iter_notion_tasks, create_task, diff_properties, task_fields, update_tasks,
+)
+from pipeline import Stage, StageStats, merge
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("g_sync_engine")
@@ -18,11 +24,57 @@ DB_PATH = os.environ.get(
     os.path.join(os.path.dirname(__file__), "..", "data", "sync_state.db"),
 )
 
+# Pipeline sizing: concurrent Notion creates, Notion page updates per batch,
+# origin completions resolved per bulk call, tracking rows per write
+# transaction, and items buffered per stage.
+SYNC_NOTION_WORKERS = int(os.environ.get("SYNC_NOTION_WORKERS", "3"))
+SYNC_UPDATE_BATCH = int(os.environ.get("SYNC_UPDATE_BATCH", "20"))
+SYNC_RESOLVE_BATCH = int(os.environ.get("SYNC_RESOLVE_BATCH", "50"))
+SYNC_WRITE_BATCH = int(os.environ.get("SYNC_WRITE_BATCH", "100"))
+SYNC_QUEUE_SIZE = int(os.environ.get("SYNC_QUEUE_SIZE", "256"))
+
+T = TypeVar("T")
+
+
+# A tracking row: source_id, source_type, notion_id, status, fingerprint and
+# the Notion-facing fields last written (title, priority, due_date), which
+# the diff stage compares against to build minimal page updates.
+TrackedRow = Dict[str, Optional[str]]
+
+_TRACKED_COLUMNS = (
+    "source_id", "source_type", "notion_id", "status", "fingerprint", "title", "priority", "due_date",
+)
+
+# Columns added after the first release, applied to existing databases.
+_MIGRATED_COLUMNS = ("fingerprint", "title", "priority", "due_date")
+
+_UPSERT_TRACKED_SQL = """
+    INSERT INTO synced_tasks
+        (source_id, source_type, notion_id, status, fingerprint, title, priority, due_date)
+    VALUES
+        (:source_id, :source_type, :notion_id, :status, :fingerprint, :title, :priority, :due_date)
+    ON CONFLICT(source_id) DO UPDATE SET
+        source_type = excluded.source_type,
+        notion_id = excluded.notion_id,
+        status = excluded.status,
+        fingerprint = excluded.fingerprint,
+        title = excluded.title,
+        priority = excluded.priority,
+        due_date = excluded.due_date
+    WHERE synced_tasks.status IS NOT excluded.status
+       OR synced_tasks.notion_id IS NOT excluded.notion_id
+       OR synced_tasks.fingerprint IS NOT excluded.fingerprint
+       OR synced_tasks.title IS NOT excluded.title
+       OR synced_tasks.priority IS NOT excluded.priority
+       OR synced_tasks.due_date IS NOT excluded.due_date
+"""
+
 
 def _init_db():
     """Initialize the SQLite database to track synced items."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    # The connection is handed to the pipeline's writer thread.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -30,10 +82,28 @@ def _init_db():
             source_id TEXT PRIMARY KEY,
             source_type TEXT NOT NULL,
             notion_id TEXT NOT NULL,
-            status TEXT NOT NULL
+            status TEXT NOT NULL,
+            fingerprint TEXT,
+            title TEXT,
+            priority TEXT,
+            due_date TEXT
+        )
+    """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS source_cursors (
+            source TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            cursor TEXT NOT NULL,
+            PRIMARY KEY (source, scope)
         )
     """
     )
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(synced_tasks)")}
+    for column in _MIGRATED_COLUMNS:
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE synced_tasks ADD COLUMN {column} TEXT")
     conn.commit()
     return conn
 
@@ -41,98 +111,496 @@ def _init_db():
 def get_tracked_tasks(conn) -> dict:
     """Retrieve all previously synced tasks."""
     cursor = conn.cursor()
-    cursor.execute("SELECT source_id, source_type, notion_id, status FROM synced_tasks")
+    cursor.execute(f"SELECT {', '.join(_TRACKED_COLUMNS)} FROM synced_tasks")
     return {
-        row[0]: {"source_type": row[1], "notion_id": row[2], "status": row[3]}
+        row[0]: dict(zip(_TRACKED_COLUMNS[1:], row[1:]))
         for row in cursor.fetchall()
     }
 
 
 def update_tracked_task(
-    conn, source_id: str, source_type: str, notion_id: str, status: str
+    conn, source_id: str, source_type: str, notion_id: str, status: str, **fields
 ):
-    """Upsert a tracked task in the database."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO synced_tasks (source_id, source_type, notion_id, status)
-        VALUES (?, ?, ?, ?)
-    """,
-        (source_id, source_type, notion_id, status),
+    """Upsert a tracked task in the database.
+
+    ``fields`` may set ``fingerprint``, ``title``, ``priority`` and ``due_date``.
+    """
+    update_tracked_tasks(
+        conn,
+        [dict(fields, source_id=source_id, source_type=source_type, notion_id=notion_id, status=status)],
     )
+
+
+def update_tracked_tasks(conn, rows: Iterable[TrackedRow]) -> int:
+    """Upsert many tracking rows in one transaction.
+
+    Rows identical to the stored ones are skipped by the upsert.
+
+    Returns:
+        Number of rows actually written.
+    """
+    params = [{col: row.get(col) for col in _TRACKED_COLUMNS} for row in rows]
+    cursor = conn.executemany(_UPSERT_TRACKED_SQL, params)
     conn.commit()
+    return max(cursor.rowcount, 0)
 
 
-def run_sync_cycle():
+def get_source_cursors(conn) -> Dict[str, Dict[str, str]]:
+    """Resume points of incremental sources, keyed by source and scope.
+
+    They are kept next to the tracking rows (not in the task store), so a
+    reset tracking database also restarts the incremental fetches.
     """
-    Run a full bi-directional synchronization cycle:
-    1. Check Notion for completed tasks and resolve them in origin (Gmail/Outlook)
-    2. Pull new tasks from Outlook/Gmail and push to Notion
+    cursors: Dict[str, Dict[str, str]] = {}
+    for source, scope, value in conn.execute("SELECT source, scope, cursor FROM source_cursors"):
+        cursors.setdefault(source, {})[scope] = value
+    return cursors
+
+
+def save_source_cursors(conn, source: str, cursors: Dict[str, str]) -> None:
+    """Upsert the resume points of one incremental source."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO source_cursors (source, scope, cursor) VALUES (?, ?, ?)",
+        [(source, scope, value) for scope, value in cursors.items()],
+    )
+    conn.commit()
+
+
+def _tracked_row(source_id: str, data: dict, **changes) -> TrackedRow:
+    """A tracking row for ``source_id`` from its stored data plus ``changes``."""
+    row = {col: data.get(col) for col in _TRACKED_COLUMNS[1:]}
+    row.update(changes, source_id=source_id)
+    return row
+
+
+def _notion_fields(task: UnifiedTask) -> Dict[str, Optional[str]]:
+    """Notion page fields for a source task, as created and diffed."""
+    return task_fields(f"[{task.source.upper()}] {task.title}", task.priority, task.due_date)
+
+
+def _guarded(name: str, tasks: Iterable[UnifiedTask]) -> Iterator[UnifiedTask]:
+    """Stop a source stream on error without failing the other sources."""
+    try:
+        yield from tasks
+    except Exception as e:
+        logger.error(f"Error streaming {name} tasks: {e}")
+
+
+def _source_stream(
+    source: registry.TaskSourceAdapter,
+    cursors: Dict[str, str],
+    fetched: Dict[str, Dict[str, str]],
+) -> Iterator[UnifiedTask]:
+    """Stream a source's tasks: only its changes when it is incremental.
+
+    Sources whose changes are pushed (``registry.pushed``) are read from the
+    task store their receiver keeps current, without calling their API.
+    Incremental sources advance a copy of their ``cursors``, which is put in
+    ``fetched`` once the stream is exhausted. Other sources are read in full.
+    """
+    # Deferred so that importing the integration happens inside the guarded,
+    # metered stream of its fetch.
+    if registry.pushed(source):
+        with get_connection() as store:
+            tasks = get_tasks(store, source=source.name, limit=None)
+        yield from tasks
+        return
+    if registry.Capability.INCREMENTAL not in source.capabilities:
+        yield from source.iter_tasks()
+        return
+    marks = dict(cursors)
+    yield from source.iter_changes(marks)
+    fetched[source.name] = marks
+
+
+# Page properties that close a Notion task (the snapshot filters out "Done").
+_NOTION_DONE = {"Status": {"select": {"name": "Done"}}}
+
+
+class _NotionSnapshot:
+    """IDs of the tasks currently active in Notion, as seen by the diff stage."""
+
+    def __init__(self, active_ids: Set[str]) -> None:
+        self.active_ids = active_ids
+
+
+def _notion_snapshot() -> Iterator[_NotionSnapshot]:
+    # Completion detection needs the whole active set, so Notion is read in
+    # full and handed to the diff stage as a single item. Tracked tasks
+    # missing from it are completed at their origin, so a failed or
+    # unconfigured read must produce no snapshot rather than an empty one:
+    # errors propagate to ``_guarded``.
+    if not os.environ.get("NOTION_TOKEN") or not os.environ.get("NOTION_TASKS_DB_ID"):
+        logger.warning("Notion is not configured; skipping completion reconciliation.")
+        return
+    yield _NotionSnapshot({t.id for t in iter_notion_tasks()})
+
+
+def _log_source_runs(meters: Dict[str, ratelimit.UsageMeter], counts: Dict[str, int]) -> None:
+    """Append one ``sync_log`` row per source with its usage in this cycle.
+
+    Rows go to the task store (``db.sqlite_store``), where
+    ``get_sync_stats`` / ``find_sync_regressions`` read them back. Old rows
+    are rolled up and pruned by ``db.retention.maybe_compact``.
+    """
+    try:
+        with get_connection() as store:
+            for name, meter in meters.items():
+                ensure_source(store, name)
+                # The cycle keeps its own resume points; last_sync_at
+                # belongs to the task store's incremental syncs.
+                mark_synced(
+                    store, name, "sync_cycle", counts.get(name, meter.items),
+                    status="error" if meter.error_class else "success",
+                    message=f"{name} fetch failed" if meter.error_class else None,
+                    advance=False,
+                    **meter.log_fields(),
+                )
+            maybe_compact(store)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Could not record sync performance: {e}")
+
+
+def _log_stage_error(stage: str, exc: BaseException) -> None:
+    logger.error(f"Sync stage '{stage}' failed on an item: {exc}")
+
+
+def _within(parent: tracing.AnySpan, fn: Callable[[Any], T]) -> Callable[[Any], T]:
+    """Run a stage function with ``parent`` as the current span in its worker thread."""
+
+    def run(item: Any) -> T:
+        with tracing.activate(parent):
+            return fn(item)
+
+    return run
+
+
+def _create_in_notion(task: UnifiedTask) -> List[TrackedRow]:
+    """Create stage: push a new source task to Notion."""
+    logger.info(f"New task found in {task.source}: {task.title}. Creating in Notion.")
+    fields = _notion_fields(task)
+    with tracing.span("notion.create_page", source=task.source, task_id=task.id) as span:
+        new_notion = create_task(title=fields["title"], priority=task.priority, due_date=task.due_date)
+        span.set_attribute("created", bool(new_notion))
+    if not new_notion:
+        return []
+    return [
+        dict(fields, source_id=task.id, source_type=task.source, notion_id=new_notion.id,
+             status="active", fingerprint=task.fingerprint())
+    ]
+
+
+def _update_in_notion(batch: List[Tuple[TrackedRow, Dict[str, dict]]]) -> List[TrackedRow]:
+    """Update stage: PATCH changed properties of a batch of Notion pages.
+
+    Pages are updated concurrently (bounded by ``NOTION_MAX_IN_FLIGHT``).
+    Rows of failed updates are not written, so the change is retried on the
+    next cycle.
+    """
+    with tracing.span("notion.update_pages", items=len(batch)) as span:
+        results = update_tasks({row["notion_id"]: props for row, props in batch})
+        span.set_attribute("failed", sum(1 for ok in results.values() if not ok))
+    rows = []
+    for row, _ in batch:
+        if results.get(row["notion_id"]):
+            rows.append(row)
+        else:
+            logger.warning(f"Notion update failed for {row['source_id']}")
+    return rows
+
+
+def _resolve_in_origin(batch: List[Tuple[str, dict]]) -> List[TrackedRow]:
+    """Resolve stage: complete a batch of Notion-completed tasks at their origin.
+
+    Items of sources that can complete tasks (see ``integrations.registry``)
+    are resolved with one bulk call per source when it has
+    ``Capability.BATCH_WRITE`` and one call per task otherwise; only
+    successes are marked completed. Items of other sources are marked
+    directly.
+    """
+    by_id = dict(batch)
+    done: List[str] = []
+    by_source: Dict[str, List[str]] = {}
+    for source_id, data in batch:
+        by_source.setdefault(data["source_type"], []).append(source_id)
+
+    for name, ids in by_source.items():
+        source = registry.get_source(name)
+        if source is None or not source.can_complete():
+            logger.warning(
+                f"{name} tasks cannot be completed at the origin. "
+                f"Manual resolution needed for {', '.join(ids)}"
+            )
+            done.extend(ids)
+            continue
+        if registry.Capability.BATCH_WRITE in source.capabilities:
+            results = source.complete_tasks(ids)
+        else:
+            results = {}
+            for source_id in ids:
+                results.update(source.complete_tasks([source_id]))
+        for source_id, ok in results.items():
+            if ok:
+                done.append(source_id)
+            else:
+                logger.warning(f"{name} completion failed for {source_id}")
+
+    return [_tracked_row(sid, by_id[sid], status="completed") for sid in done if sid in by_id]
+
+
+def run_sync_cycle() -> Dict[str, object]:
+    """
+    Run a full bi-directional synchronization cycle as a staged pipeline:
+
+        fetch (sources, Notion) -> diff -> create in Notion  -> write
+                                               -> update in Notion  -> write
+                                               -> resolve in origin -> write
+
+    - fetch: the configured sources of ``integrations.registry`` and a
+      Notion snapshot stream concurrently into the diff stage. Sources with
+      ``Capability.INCREMENTAL`` only stream what changed since their last
+      cycle (see ``get_source_cursors``); their resume points advance once
+      the cycle completed without failed creates or updates for them, so
+      those are fetched and retried again.
+    - diff: new source tasks become create jobs. Tracked tasks whose content
+      fingerprint matches the stored one are skipped; changed ones are
+      compared field by field (title, priority, due date) with what was last
+      written to Notion and become update jobs carrying only the changed
+      properties. Once the Notion snapshot arrives, tracked tasks no longer
+      active in Notion become resolve jobs.
+    - create / update / resolve: worker pools calling Notion and the origin
+      platforms.
+    - write: upserts tracking rows in batches, skipping identical rows.
+
+    Queues between stages are bounded, so a slow stage applies back-pressure
+    to the ones feeding it.
+
+    When tracing is configured, the cycle is recorded as a ``sync.cycle``
+    trace: one span per stage, per source fetch and page, and per remote
+    mutation (see ``tracing``). Each source's fetch is also appended to the
+    task store's ``sync_log`` with its duration, request count, bytes,
+    rate-limit wait and error class.
+
+    Returns:
+        Counts of created, updated and completed tasks, of skipped work
+        (unchanged and duplicate source tasks, unchanged tracking rows),
+        per-stage statistics (items, latency, throughput), all of which are
+        logged, per-source fetch usage (``sources``) and the ``trace_id`` of
+        the cycle (None when tracing is off).
     """
     logger.info("Starting G_TaskCenter Sync Cycle...")
+    root = tracing.start_span("sync.cycle", parent=None)
+    try:
+        with tracing.activate(root):
+            result = _run_pipeline(root)
+    except BaseException as exc:
+        root.record_error(exc)
+        raise
+    finally:
+        root.end()
+    result["trace_id"] = root.trace_id
+    return result
+
+
+def _run_pipeline(root: tracing.AnySpan) -> Dict[str, object]:
+    """Build, run and drain the stages of one sync cycle under ``root``."""
     conn = _init_db()
     tracked = get_tracked_tasks(conn)
+    root.set_attribute("tracked", len(tracked))
+    written = {"created": 0, "updated": 0, "completed": 0}
+    skipped = {"unchanged": 0, "duplicate": 0, "write_unchanged": 0}
 
-    # 1. Pull current state from all platforms
-    logger.info("Fetching current states...")
-    notion_tasks = list_notion_tasks()
-    gmail_tasks = list_task_emails()
-    outlook_tasks = list_outlook_tasks()
-
-    # Quick lookup for Notion active tasks
-    active_notion_ids = {t.id for t in notion_tasks}
-
-    # --- PHASE 1: Reconcile Completions ---
-    # If a tracked task is no longer active in Notion (meaning it was marked Done),
-    # we should archive/complete it in the source system.
-    logger.info("Reconciling completed tasks...")
-    for source_id, data in tracked.items():
-        if data["status"] != "completed" and data["notion_id"] not in active_notion_ids:
+    spans = {
+        name: tracing.start_span(f"sync.{name}", parent=root)
+        for name in ("fetch", "diff", "create", "update", "resolve", "write")
+    }
+
+    def write_rows(rows: List[TrackedRow]) -> None:
+        with tracing.span("db.write", rows=len(rows)) as span:
+            changed = update_tracked_tasks(conn, rows)
+            span.set_attribute("written", changed)
+        skipped["write_unchanged"] += len(rows) - changed
+        for row in rows:
+            if row["status"] == "completed":
+                written["completed"] += 1
+            elif row["source_id"] not in tracked:
+                written["created"] += 1
+
+    # Sources whose resume points must not advance: a create or update of
+    # one of their tasks failed and has to be fetched again.
+    retry: Set[str] = set()
+
+    def create_page(task: UnifiedTask) -> List[TrackedRow]:
+        rows: List[TrackedRow] = []
+        try:
+            rows = _create_in_notion(task)
+        finally:
+            if not rows:
+                retry.add(task.source)
+        return rows
+
+    def update_pages(batch):
+        rows = _update_in_notion(batch)
+        # Pages closed for tasks done at the origin count as completed.
+        written["updated"] += sum(1 for row in rows if row["status"] != "completed")
+        if len(rows) < len(batch):
+            retry.update(row["source_type"] for row, _ in batch)
+        return rows
+
+    writer = Stage(
+        "write", _within(spans["write"], write_rows), batch_size=SYNC_WRITE_BATCH, maxsize=SYNC_QUEUE_SIZE,
+        on_error=_log_stage_error, inputs=3,
+    )
+    create = Stage(
+        "create", _within(spans["create"], create_page), workers=SYNC_NOTION_WORKERS, maxsize=SYNC_QUEUE_SIZE,
+        downstream=writer, on_error=_log_stage_error,
+    )
+    update = Stage(
+        "update", _within(spans["update"], update_pages), batch_size=SYNC_UPDATE_BATCH, maxsize=SYNC_QUEUE_SIZE,
+        downstream=writer, on_error=_log_stage_error,
+    )
+    resolve = Stage(
+        "resolve", _within(spans["resolve"], _resolve_in_origin), batch_size=SYNC_RESOLVE_BATCH, maxsize=SYNC_QUEUE_SIZE,
+        downstream=writer, on_error=_log_stage_error,
+    )
+
+    seen: Set[str] = set()
+    # Tracked tasks being completed in this cycle, at the origin or in Notion.
+    closing: Set[str] = set()
+    # Tasks read per source; Notion arrives as one snapshot of active IDs.
+    fetched: Dict[str, int] = {}
+
+    def diff_tracked(task: UnifiedTask, data: dict) -> None:
+        fingerprint = task.fingerprint()
+        if data.get("fingerprint") == fingerprint or data["status"] == "completed":
+            skipped["unchanged"] += 1
+            return
+        fields = _notion_fields(task)
+        row = _tracked_row(task.id, data, fingerprint=fingerprint, **fields)
+        if data.get("fingerprint") is None:
+            # Rows from before fields were tracked have no baseline to diff
+            # against: record the current state without touching Notion.
+            writer.put(row)
+            return
+        props = diff_properties(data, fields)
+        if props:
             logger.info(
-                f"Task {source_id} ({data['source_type']}) marked complete in Notion. Resolving in origin."
+                f"Task {task.id} changed in {task.source}: updating {', '.join(props)} in Notion."
             )
-            success = False
-            if data["source_type"] == TaskSource.GMAIL:
-                success = archive_email_task(source_id)
-            elif data["source_type"] == TaskSource.OUTLOOK:
-                # Assuming list_id isn't tracked, we might need a more complex Outlook completion.
-                # For this baseline, we log it. In a full implementation, list_id would be stored.
-                logger.warning(
-                    f"Outlook completion requires list_id. Manual resolution needed for {source_id}"
-                )
-                # success = complete_outlook_task(list_id, source_id)
+            update.put((row, props))
+        else:
+            # Only fields Notion does not mirror (status, snippet) changed.
+            writer.put(row)
 
-            # Mark local DB as completed
-            update_tracked_task(
-                conn, source_id, data["source_type"], data["notion_id"], "completed"
-            )
+    def route(item) -> None:
+        if isinstance(item, _NotionSnapshot):
+            fetched["notion"] = len(item.active_ids)
+            logger.info("Reconciling completed tasks...")
+            for source_id, data in tracked.items():
+                if (
+                    data["status"] != "completed"
+                    and data["notion_id"] not in item.active_ids
+                    and source_id not in closing
+                ):
+                    logger.info(
+                        f"Task {source_id} ({data['source_type']}) marked complete in Notion. Resolving in origin."
+                    )
+                    closing.add(source_id)
+                    resolve.put((source_id, data))
+        elif isinstance(item, registry.DoneAtOrigin):
+            for source_id in item.task_ids:
+                data = tracked.get(source_id)
+                if data is None or data["status"] == "completed" or source_id in closing:
+                    continue
+                logger.info(f"Task {source_id} ({item.source}) completed at the origin. Closing it in Notion.")
+                closing.add(source_id)
+                update.put((_tracked_row(source_id, data, status="completed"), _NOTION_DONE))
+        elif item.id in seen:
+            skipped["duplicate"] += 1
+        elif item.id in tracked:
+            seen.add(item.id)
+            diff_tracked(item, tracked[item.id])
+        else:
+            seen.add(item.id)
+            create.put(item)
 
-    # --- PHASE 2: Ingest New Tasks ---
-    # Find active tasks in Gmail/Outlook that aren't in our DB, and create them in Notion.
-    logger.info("Ingesting new tasks into Notion...")
+    diff = Stage("diff", _within(spans["diff"], route), maxsize=SYNC_QUEUE_SIZE, on_error=_log_stage_error)
+    fetch = StageStats("fetch")
 
-    def ingest_source(tasks: List[UnifiedTask]):
-        for t in tasks:
-            if t.id not in tracked:
-                logger.info(
-                    f"New task found in {t.source}: {t.title}. Creating in Notion."
-                )
-                new_notion = create_task(
-                    title=f"[{t.source.upper()}] {t.title}", priority=t.priority
-                )
-                if new_notion:
-                    update_tracked_task(conn, t.id, t.source, new_notion.id, "active")
-                    tracked[t.id] = {
-                        "source_type": t.source,
-                        "notion_id": new_notion.id,
-                        "status": "active",
-                    }
-
-    ingest_source(gmail_tasks)
-    ingest_source(outlook_tasks)
-
-    conn.close()
+    for stage in (writer, create, update, resolve, diff):
+        stage.start()
+
+    logger.info("Fetching current states...")
+    # Notion is the hub: it is read as a snapshot, not as a task source.
+    cursors = get_source_cursors(conn)
+    advanced: Dict[str, Dict[str, str]] = {}
+    sources = [
+        (s.name, _source_stream(s, cursors.get(s.name, {}), advanced))
+        for s in registry.sources(configured_only=True) if s.name != "notion"
+    ]
+    sources.append(("notion", _notion_snapshot()))
+    meters = {name: ratelimit.UsageMeter() for name, _ in sources}
+    fetch.start()
+    completed = False
+    try:
+        stream = merge(
+            *(
+                _guarded(name, tracing.traced_iter(
+                    f"fetch.{name}", ratelimit.metered_iter(meters[name], tasks), spans["fetch"], source=name,
+                ))
+                for name, tasks in sources
+            ),
+            maxsize=SYNC_QUEUE_SIZE,
+        )
+        t0 = time.perf_counter()
+        for item in stream:
+            # Time spent waiting on the sources, excluding diff back-pressure.
+            fetch.record(time.perf_counter() - t0)
+            diff.put(item)
+            t0 = time.perf_counter()
+        completed = True
+    finally:
+        fetch.finish()
+        diff.close()
+        diff.join()
+        create.close()
+        update.close()
+        resolve.close()
+        writer.join()
+        if completed:
+            for name, marks in advanced.items():
+                if name not in retry:
+                    save_source_cursors(conn, name, marks)
+        conn.close()
+        stage_stats = (fetch, diff.stats, create.stats, update.stats, resolve.stats, writer.stats)
+        for st in stage_stats:
+            spans[st.name].set_attribute("items", st.items)
+            spans[st.name].end()
+
+    stages = {st.name: st.as_dict() for st in stage_stats}
+    _log_source_runs(meters, fetched)
+    root.set_attributes(**written, **{f"skipped_{k}": v for k, v in skipped.items()})
+    for name, st in stages.items():
+        logger.info(
+            f"Stage {name}: {st['items']} items in {st['wall_seconds']}s "
+            f"({st['throughput_per_s']}/s, avg {st['avg_latency_ms']} ms, max {st['max_latency_ms']} ms)"
+        )
+    logger.info(
+        f"Skipped work: {skipped['unchanged']} unchanged task(s), {skipped['duplicate']} duplicate(s), "
+        f"{skipped['write_unchanged']} unchanged tracking row(s)."
+    )
     logger.info("Sync Cycle complete.")
+    return {
+        "created": written["created"],
+        "updated": written["updated"],
+        "completed": written["completed"],
+        "skipped": skipped,
+        "stages": stages,
+        "sources": {
+            name: dict(meter.log_fields(), items=fetched.get(name, meter.items))
+            for name, meter in meters.items()
+        },
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,412 @@
+"""tracing.py — Structured trace spans for G_TaskCenter.
+
+A minimal, dependency-free take on OpenTelemetry tracing: spans have a
+trace ID, a span ID, a parent, start/end timestamps, attributes and a
+status. Finished spans are buffered and handed to the configured exporters
+when their trace's root span ends:
+
+    - ``JsonlExporter``: appends one JSON object per span to a local file.
+    - ``OtlpHttpExporter``: POSTs OTLP/HTTP JSON to a collector
+      (``{endpoint}/v1/traces``).
+
+The current span is tracked in a ``contextvars.ContextVar``. Worker threads
+do not inherit it, so code that hands work to threads passes the parent
+explicitly (``start_span(..., parent=...)``, ``activate(span)``,
+``traced_iter(..., parent=...)``).
+
+When no exporter is configured every helper returns a shared no-op span,
+so instrumented code costs one check per span.
+
+Environment variables:
+    - TASKCENTER_TRACE_FILE: (optional) JSONL file spans are appended to.
+    - TASKCENTER_OTLP_ENDPOINT: (optional) Collector base URL, e.g.
+      ``http://localhost:4318``.
+    - TASKCENTER_SERVICE_NAME: ``service.name`` resource attribute
+      (default: ``g_taskcenter``).
+
+Usage:
+    with tracing.span("sync.cycle") as root:
+        with tracing.span("notion.page", page=1) as page:
+            page.set_attribute("items", 100)
+
+    python src/tracing.py data/traces.jsonl     # print the latest trace as a tree
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar, Union
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SERVICE_NAME = os.environ.get("TASKCENTER_SERVICE_NAME", "g_taskcenter")
+
+# Finished spans buffered before an export is forced, for long traces.
+MAX_EXPORT_BATCH = 512
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+
+class Span:
+    """One timed operation. End it exactly once, via ``end()`` or ``span()``."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes: Any) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, exc: BaseException) -> None:
+        """Mark the span as failed with ``exc``."""
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            _on_end(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return round((self.end_ns - self.start_ns) / 1e6, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": "ERROR" if self.error else "OK",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned while tracing is off; accepts and ignores everything."""
+
+    name = trace_id = span_id = parent_id = error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+AnySpan = Union[Span, _NoopSpan]
+
+_current: ContextVar[Optional[Span]] = ContextVar("taskcenter_current_span", default=None)
+
+# Sentinel: "use the current span as parent".
+_CURRENT: Any = object()
+
+
+def current_span() -> Optional[Span]:
+    """The active span in this thread/context, if any."""
+    return _current.get()
+
+
+def enabled() -> bool:
+    """True when at least one exporter is configured."""
+    return bool(_exporters)
+
+
+def start_span(name: str, parent: Any = _CURRENT, **attributes: Any) -> AnySpan:
+    """Start a span without activating it; the caller must ``end()`` it.
+
+    Args:
+        name: Span name, e.g. ``sync.fetch`` or ``notion.page``.
+        parent: Parent span. Defaults to the current span; ``None`` starts
+            a new trace.
+        **attributes: Initial attributes.
+    """
+    if not _exporters:
+        return NOOP_SPAN
+    if parent is _CURRENT:
+        parent = _current.get()
+    if not isinstance(parent, Span):
+        parent = None
+    return Span(name, parent, **attributes)
+
+
+@contextmanager
+def activate(span: AnySpan) -> Iterator[AnySpan]:
+    """Make ``span`` the current span for the enclosed block (without ending it)."""
+    if not isinstance(span, Span):
+        yield span
+        return
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, parent: Any = _CURRENT, **attributes: Any) -> Iterator[AnySpan]:
+    """Start, activate and end a span around the enclosed block.
+
+    Exceptions mark the span as failed and propagate.
+    """
+    s = start_span(name, parent, **attributes)
+    if s is NOOP_SPAN:
+        yield s
+        return
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as exc:
+        if not isinstance(exc, GeneratorExit):
+            s.record_error(exc)
+        raise
+    finally:
+        _current.reset(token)
+        s.end()
+
+
+def traced_iter(name: str, iterable: Iterable[T], parent: Any = _CURRENT, **attributes: Any) -> Iterator[T]:
+    """Wrap ``iterable`` in a span covering its whole iteration.
+
+    The span is current while the wrapped iterator computes each item (so
+    spans opened inside it, such as page fetches, become its children), but
+    not while the consumer handles the item. The number of items produced
+    is recorded as ``items``. Useful for generators consumed in another
+    thread, e.g. the producers of ``pipeline.merge``.
+    """
+    if not _exporters:
+        yield from iterable
+        return
+    if parent is _CURRENT:
+        parent = _current.get()
+    s = start_span(name, parent, **attributes)
+    it = iter(iterable)
+    count = 0
+    try:
+        while True:
+            token = _current.set(s)
+            try:
+                item = next(it)
+            except StopIteration:
+                break
+            finally:
+                _current.reset(token)
+            count += 1
+            yield item
+    except BaseException as exc:
+        if not isinstance(exc, GeneratorExit):
+            s.record_error(exc)
+        raise
+    finally:
+        s.set_attribute("items", count)
+        s.end()
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+
+class JsonlExporter:
+    """Append finished spans to a JSONL file, one object per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        directory = os.path.dirname(self.path)
+        with self._lock:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+def to_otlp(spans: Sequence[Span], service_name: str = SERVICE_NAME) -> Dict[str, Any]:
+    """Build an OTLP/JSON ``ExportTraceServiceRequest`` body."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "g_taskcenter.tracing"},
+                        "spans": [
+                            {
+                                "traceId": s.trace_id,
+                                "spanId": s.span_id,
+                                "parentSpanId": s.parent_id or "",
+                                "name": s.name,
+                                "kind": 1,  # SPAN_KIND_INTERNAL
+                                "startTimeUnixNano": str(s.start_ns),
+                                "endTimeUnixNano": str(s.end_ns),
+                                "attributes": _otlp_attributes(s.attributes),
+                                "status": (
+                                    {"code": 2, "message": s.error} if s.error else {"code": 1}
+                                ),
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OtlpHttpExporter:
+    """POST spans as OTLP/HTTP JSON to ``{endpoint}/v1/traces``."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0, service_name: str = SERVICE_NAME) -> None:
+        self.url = f"{endpoint.rstrip('/')}/v1/traces"
+        self.timeout = timeout
+        self.service_name = service_name
+
+    def export(self, spans: Sequence[Span]) -> None:
+        import requests  # only needed when exporting to a collector
+
+        resp = requests.post(self.url, json=to_otlp(spans, self.service_name), timeout=self.timeout)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"collector answered {resp.status_code}: {resp.text[:200]}")
+
+
+# ---------------------------------------------------------------------------
+# Processing
+# ---------------------------------------------------------------------------
+
+_exporters: List[Any] = []
+_pending: List[Span] = []
+_pending_lock = threading.Lock()
+
+
+def configure(*exporters: Any) -> None:
+    """Replace the exporters; with none, tracing is off. Pending spans are flushed first."""
+    flush()
+    _exporters[:] = exporters
+
+
+def configure_from_env() -> None:
+    """Configure exporters from ``TASKCENTER_TRACE_FILE`` / ``TASKCENTER_OTLP_ENDPOINT``."""
+    exporters: List[Any] = []
+    if os.environ.get("TASKCENTER_TRACE_FILE"):
+        exporters.append(JsonlExporter(os.environ["TASKCENTER_TRACE_FILE"]))
+    if os.environ.get("TASKCENTER_OTLP_ENDPOINT"):
+        exporters.append(OtlpHttpExporter(os.environ["TASKCENTER_OTLP_ENDPOINT"]))
+    configure(*exporters)
+
+
+def _on_end(span: Span) -> None:
+    with _pending_lock:
+        _pending.append(span)
+        ready = span.parent_id is None or len(_pending) >= MAX_EXPORT_BATCH
+    if ready:
+        flush()
+
+
+def flush() -> None:
+    """Export every buffered span now."""
+    with _pending_lock:
+        batch = list(_pending)
+        _pending.clear()
+    if not batch:
+        return
+    for exporter in list(_exporters):
+        try:
+            exporter.export(batch)
+        except Exception as exc:
+            logger.warning("Span export via %s failed: %s", type(exporter).__name__, exc)
+
+
+configure_from_env()
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans written by ``JsonlExporter``."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def format_trace(spans: List[Dict[str, Any]], trace_id: Optional[str] = None) -> str:
+    """Render one trace (default: the most recent) as an indented tree."""
+    if trace_id is None:
+        roots = [s for s in spans if s["parent_id"] is None]
+        if not roots:
+            return ""
+        trace_id = max(roots, key=lambda s: s["start_ns"])["trace_id"]
+    trace = [s for s in spans if s["trace_id"] == trace_id]
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in sorted(trace, key=lambda s: s["start_ns"]):
+        children.setdefault(s["parent_id"], []).append(s)
+
+    lines: List[str] = []
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for s in children.get(parent_id, []):
+            attrs = " ".join(f"{k}={v}" for k, v in s["attributes"].items())
+            status = f" !{s['error']}" if s["error"] else ""
+            lines.append(f"{'  ' * depth}{s['name']}  {s['duration_ms']} ms  {attrs}{status}".rstrip())
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python src/tracing.py TRACE_FILE [TRACE_ID]")
+        sys.exit(2)
+    print(format_trace(load_spans(sys.argv[1]), sys.argv[2] if len(sys.argv) > 2 else None))
@@ -0,0 +1,187 @@
+"""test_benchmarks.py — Smoke tests for the offline benchmark suite.
+
+Runs the fake provider servers on loopback ports and the synthetic corpus
+generator in-process; no external services or credentials are required.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+
+import requests
+
+# Ensure the repository root (for benchmarks/) and src/ are importable
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from benchmarks.corpus import (
+    evaluate_dedup, generate_corpus, pairwise_scores, read_jsonl, read_sqlite, write_jsonl, write_sqlite,
+)
+from benchmarks.fake_servers import FakeServer, GraphFake, JiraFake, NotionFake, ProviderProfile
+from benchmarks.run import compare, run_once
+from benchmarks.startup import check_budget, parse_importtime, run_startup
+from dedup.unifier import normalize_task
+
+
+class TestFakeServers(unittest.TestCase):
+    """Pagination, throttling and accounting of the fake providers."""
+
+    def test_jira_offset_pages_clamped(self):
+        with FakeServer(JiraFake(250)) as srv:
+            data = requests.get(
+                f"{srv.url}/rest/api/2/search",
+                params={"jql": "assignee = currentUser()", "startAt": 200, "maxResults": 500},
+            ).json()
+            self.assertEqual(data["total"], 250)
+            self.assertEqual(data["maxResults"], 100)
+            self.assertEqual(len(data["issues"]), 50)
+            self.assertEqual(srv.provider.stats()["requests"], 1)
+
+    def test_notion_cursor_pages(self):
+        with FakeServer(NotionFake(150)) as srv:
+            url = f"{srv.url}/v1/databases/db/query"
+            first = requests.post(url, json={"page_size": 100}).json()
+            second = requests.post(url, json={"start_cursor": first["next_cursor"]}).json()
+        self.assertTrue(first["has_more"])
+        self.assertEqual(len(second["results"]), 50)
+        self.assertFalse(second["has_more"])
+
+    def test_server_side_throttle(self):
+        with FakeServer(NotionFake(10, ProviderProfile(rate=0.01, burst=1, retry_after=2))) as srv:
+            url = f"{srv.url}/v1/databases/db/query"
+            self.assertEqual(requests.post(url, json={}).status_code, 200)
+            resp = requests.post(url, json={})
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(resp.headers["Retry-After"], "2")
+        self.assertEqual(resp.json()["code"], "rate_limited")
+
+    def test_graph_batch_throttles_per_item(self):
+        with FakeServer(GraphFake(100, ProviderProfile(rate=0.01, burst=3))) as srv:
+            body = {"requests": [
+                {"id": str(i), "method": "GET", "url": "/me/todo/lists/list-0000/tasks"}
+                for i in range(5)
+            ]}
+            data = requests.post(f"{srv.url}/v1.0/$batch", json=body).json()
+            stats = srv.provider.stats()
+        self.assertEqual([r["status"] for r in data["responses"]], [200, 200, 200, 429, 429])
+        self.assertIn("$skiptoken=50", data["responses"][0]["body"]["@odata.nextLink"])
+        self.assertEqual((stats["requests"], stats["batched"], stats["throttled"]), (1, 3, 2))
+
+
+class TestRunner(unittest.TestCase):
+    """End-to-end run of one scenario in a child process."""
+
+    def test_jira_scenario(self):
+        result = run_once("jira_list", 120, "local")
+        self.assertEqual(result["items"], 120)
+        self.assertEqual(result["requests"], 2)
+        self.assertEqual(result["throttled"], 0)
+        self.assertGreater(result["bytes"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"local/x/100": {"wall_s": 1.0, "requests": 10, "alloc_peak_mib": 5.0}}
+        ok = {"local/x/100": {"wall_s": 1.2, "requests": 10, "alloc_peak_mib": 5.0}}
+        slow = {"local/x/100": {"wall_s": 1.5, "requests": 11, "alloc_peak_mib": 5.0}}
+        self.assertEqual(compare(ok, baseline, 0.25), [])
+        self.assertEqual(len(compare(slow, baseline, 0.25)), 2)
+
+
+class TestStartup(unittest.TestCase):
+    """MCP server cold start stays within budget."""
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     notion_client.api\n"
+            "import time:       500 |        620 |   notion_client\n"
+            "import time:      1000 |       3620 | server\n"
+        )
+        records = parse_importtime(stderr)
+        self.assertEqual([(r.name, r.depth) for r in records],
+                         [("notion_client.api", 2), ("notion_client", 1), ("server", 0)])
+        self.assertEqual(records[-1].cumulative_us, 3620)
+
+    def test_server_cold_start_budget(self):
+        result = run_startup(runs=1)
+        self.assertEqual(result["lazy_loaded"], [])
+        self.assertEqual(check_budget(result), [])
+
+
+class TestCorpus(unittest.TestCase):
+    """Synthetic corpus generation and dedup evaluation."""
+
+    def test_seeded_and_deterministic(self):
+        a = [(t.task.model_dump(), t.cluster) for t in generate_corpus(200, seed=5)]
+        b = [(t.task.model_dump(), t.cluster) for t in generate_corpus(200, seed=5)]
+        c = [(t.task.model_dump(), t.cluster) for t in generate_corpus(200, seed=6)]
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_duplicate_rate_and_labels(self):
+        items = list(generate_corpus(5000, duplicate_rate=0.3, seed=1))
+        clusters = Counter(item.cluster for item in items)
+        self.assertAlmostEqual(1 - len(clusters) / len(items), 0.3, delta=0.03)
+        self.assertEqual(len({item.task.id for item in items}), len(items))
+
+        members = {}
+        for item in items:
+            members.setdefault(item.cluster, []).append(item.task)
+        for tasks in members.values():
+            canonical = tasks[0]
+            for dup in tasks[1:]:
+                self.assertNotEqual(dup.source, canonical.source)
+                if dup.source == "notion":
+                    self.assertTrue(dup.title.startswith(f"[{canonical.source.upper()}] "))
+                if dup.due_date and canonical.due_date:
+                    self.assertLessEqual(abs(dup.due_date - canonical.due_date).total_seconds(), 12 * 3600)
+
+    def test_perturbed_titles_stay_close(self):
+        items = list(generate_corpus(500, duplicate_rate=0.5, seed=2))
+        first = {}
+        differs = 0
+        for item in items:
+            if item.cluster in first:
+                a, b = normalize_task(first[item.cluster]), normalize_task(item.task.title)
+                differs += a != b
+                self.assertLessEqual(abs(len(a) - len(b)), 3)
+            else:
+                first[item.cluster] = item.task.title
+        self.assertGreater(differs, 0)
+
+    def test_pairwise_scores(self):
+        self.assertEqual(pairwise_scores([0, 0, 1, 1], [0, 0, 1, 1]),
+                         {"precision": 1.0, "recall": 1.0, "f1": 1.0})
+        # Everything merged: 2 of 6 predicted pairs are right, both true pairs found.
+        scores = pairwise_scores([0, 0, 1, 1], [0, 0, 0, 0])
+        self.assertEqual((scores["precision"], scores["recall"]), (0.3333, 1.0))
+        # Nothing merged: no predicted pairs, no true pair found.
+        scores = pairwise_scores([0, 0, 1, 1], [0, 1, 2, 3])
+        self.assertEqual((scores["precision"], scores["recall"]), (1.0, 0.0))
+
+    def test_evaluate_dedup(self):
+        report = evaluate_dedup(generate_corpus(150, duplicate_rate=0.3, seed=4))
+        self.assertEqual(report["tasks"], 150)
+        self.assertGreater(report["recall"], 0.8)
+        self.assertGreater(report["precision"], 0.5)
+        self.assertGreater(report["tasks_per_s"], 0)
+
+    def test_jsonl_and_sqlite_round_trip(self):
+        items = list(generate_corpus(120, seed=3))
+        buf = io.StringIO()
+        self.assertEqual(write_jsonl(items, buf), 120)
+        self.assertEqual(list(read_jsonl(buf.getvalue().splitlines())), items)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "corpus.db")
+            self.assertEqual(write_sqlite(iter(items), path, chunk_size=50), 120)
+            loaded = read_sqlite(path)
+        self.assertEqual([(t.task.id, t.task.title, t.cluster) for t in loaded],
+                         [(t.task.id, t.task.title, t.cluster) for t in items])
+
+
+if __name__ == "__main__":
+    unittest.main()
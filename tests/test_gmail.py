@@ -0,0 +1,158 @@
+"""test_gmail.py — Tests for src/integrations/gmail.py.
+
+Credentials are pickled to a temporary file and token refresh is mocked;
+no Google account or network access is required.
+"""
+
+import os
+import sys
+import pickle
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from google.oauth2.credentials import Credentials
+
+from integrations import gmail
+from integrations.gmail import GmailClientCache
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _write_token(path: str, expires_in: float) -> None:
+    creds = Credentials(
+        token="access-0",
+        refresh_token="refresh",
+        token_uri="https://oauth2.example.invalid/token",
+        client_id="client",
+        client_secret="secret",
+        expiry=_utcnow() + timedelta(seconds=expires_in),
+    )
+    with open(path, "wb") as f:
+        pickle.dump(creds, f)
+
+
+def _fake_refresh(creds, request):
+    creds.token = "access-refreshed"
+    creds.expiry = _utcnow() + timedelta(hours=1)
+
+
+class TestGmailClientCache(unittest.TestCase):
+    """Tests for the process-wide Gmail client cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.token_path = os.path.join(self.tmpdir, "gmail_token.pickle")
+        self.cache = GmailClientCache(margin=300)
+        p = patch.object(Credentials, "refresh", autospec=True, side_effect=_fake_refresh)
+        self.refresh = p.start()
+        self.addCleanup(p.stop)
+
+    def test_service_built_once_per_thread(self):
+        _write_token(self.token_path, 3600)
+        with patch.object(gmail, "build_from_document", wraps=gmail.build_from_document) as b, \
+                patch.object(gmail.pickle, "load", wraps=pickle.load) as load:
+            first = self.cache.service(self.token_path)
+            second = self.cache.service(self.token_path)
+
+            other = []
+            t = threading.Thread(target=lambda: other.append(self.cache.service(self.token_path)))
+            t.start()
+            t.join()
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other[0])
+        self.assertEqual(b.call_count, 2)
+        self.assertEqual(load.call_count, 1)
+        self.refresh.assert_not_called()
+
+    def test_refreshes_in_place_before_expiry(self):
+        _write_token(self.token_path, 120)  # inside the 300 s margin
+        service = self.cache.service(self.token_path)
+        creds = self.cache.credentials(self.token_path)
+
+        self.assertEqual(self.refresh.call_count, 1)
+        self.assertEqual(creds.token, "access-refreshed")
+        self.assertIs(self.cache.service(self.token_path), service)
+
+        with open(self.token_path, "rb") as f:
+            self.assertEqual(pickle.load(f).token, "access-refreshed")
+
+    def test_missing_token_returns_none(self):
+        self.assertIsNone(self.cache.service(os.path.join(self.tmpdir, "missing.pickle")))
+
+    def test_token_written_after_first_use_is_picked_up(self):
+        self.assertIsNone(self.cache.credentials(self.token_path))
+        _write_token(self.token_path, 3600)
+        self.assertEqual(self.cache.credentials(self.token_path).token, "access-0")
+
+    def test_uses_static_discovery_document(self):
+        _write_token(self.token_path, 3600)
+        with patch.object(gmail, "build") as network_build:
+            service = self.cache.service(self.token_path)
+        network_build.assert_not_called()
+        self.assertTrue(hasattr(service, "users"))
+
+    def test_get_gmail_service_reads_env_path(self):
+        _write_token(self.token_path, 3600)
+        with patch.dict(os.environ, {"GMAIL_TOKEN_PATH": self.token_path}), \
+                patch.object(gmail, "_client_cache", self.cache):
+            self.assertIsNotNone(gmail.get_gmail_service())
+
+
+class TestFetchMessageDetails(unittest.TestCase):
+    """Tests for _fetch_message_details."""
+
+    def test_errors_not_retried_on_top_of_ratelimit(self):
+        service = MagicMock()
+        get = service.users.return_value.messages.return_value.get
+        get.return_value.execute.side_effect = RuntimeError("boom")
+        with self.assertRaises(RuntimeError):
+            gmail._fetch_message_details(service, "me", "m1")
+        self.assertEqual(get.return_value.execute.call_count, 1)
+
+
+class TestArchiveEmailTasks(unittest.TestCase):
+    """Tests for archive_email_tasks (messages.batchModify)."""
+
+    def setUp(self):
+        self.service = MagicMock()
+        self.batch = self.service.users.return_value.messages.return_value.batchModify
+        p = patch.object(gmail, "get_gmail_service", return_value=self.service)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def test_chunks_of_1000(self):
+        ids = [f"m{i}" for i in range(2500)]
+        results = gmail.archive_email_tasks(ids + ["m0"])
+
+        self.assertEqual(len(results), 2500)
+        self.assertTrue(all(results.values()))
+        sizes = [len(c.kwargs["body"]["ids"]) for c in self.batch.call_args_list]
+        self.assertEqual(sizes, [1000, 1000, 500])
+        self.assertEqual(self.batch.call_args.kwargs["body"]["removeLabelIds"], ["INBOX"])
+
+    def test_failed_chunk_reported(self):
+        self.batch.return_value.execute.side_effect = [RuntimeError("boom"), {}]
+        with patch.object(gmail, "BATCH_MODIFY_MAX_IDS", 2):
+            results = gmail.archive_email_tasks(["a", "b", "c"])
+        self.assertEqual(results, {"a": False, "b": False, "c": True})
+
+    def test_no_service(self):
+        with patch.object(gmail, "get_gmail_service", return_value=None):
+            self.assertEqual(gmail.archive_email_tasks(["a"]), {"a": False})
+
+    def test_empty(self):
+        self.assertEqual(gmail.archive_email_tasks([]), {})
+        self.batch.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""test_graph_batch.py — Tests for src/integrations/graph_batch.py.
+
+The Graph ``$batch`` endpoint is replaced by an in-process fake; no network
+access or credentials are required.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import graph_batch, ratelimit
+from integrations.graph_batch import BatchRequest, execute_batch, plan_batches
+from integrations.ratelimit import TokenBucket
+
+
+def _response(status: int, payload: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {}
+    resp.text = str(payload)
+    return resp
+
+
+class FakeBatchEndpoint:
+    """``$batch`` stand-in answering each sub-request via ``handler(item, round)``."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.batches = []
+
+    def __call__(self, provider, method, url, **kwargs):
+        assert url.endswith("/$batch")
+        items = kwargs["json"]["requests"]
+        self.batches.append(items)
+        responses = []
+        for item in items:
+            status, body, headers = self.handler(item, len(self.batches))
+            responses.append({"id": item["id"], "status": status, "body": body, "headers": headers})
+        return _response(200, {"responses": responses})
+
+
+class FakeClock:
+    """Monotonic clock whose sleep() advances time instantly."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class GraphBatchTestCase(unittest.TestCase):
+    """Base class with an instant graph bucket."""
+
+    def setUp(self):
+        ratelimit.reset_throttle_stats()
+        self.clock = FakeClock()
+        self.slept = self.clock.slept
+        bucket = TokenBucket(rate=1000.0, burst=20, clock=self.clock, sleep=self.clock.sleep)
+        p = patch.dict(ratelimit._buckets, {"graph": bucket})
+        p.start()
+        self.addCleanup(p.stop)
+        self.addCleanup(ratelimit.reset_throttle_stats)
+
+    def use_fake(self, handler) -> FakeBatchEndpoint:
+        fake = FakeBatchEndpoint(handler)
+        p = patch.object(ratelimit, "request", side_effect=fake)
+        p.start()
+        self.addCleanup(p.stop)
+        return fake
+
+
+class TestPlanBatches(unittest.TestCase):
+    """Tests for plan_batches."""
+
+    def test_chunks_of_20(self):
+        batches = plan_batches(BatchRequest(str(i), "GET", "/x") for i in range(45))
+        self.assertEqual([len(b) for b in batches], [20, 20, 5])
+
+    def test_dependency_groups_stay_together(self):
+        reqs = [BatchRequest(str(i), "GET", "/x") for i in range(19)]
+        reqs += [BatchRequest("a", "POST", "/y"), BatchRequest("b", "GET", "/z", depends_on=["a"])]
+        batches = plan_batches(reqs)
+        self.assertEqual([len(b) for b in batches], [19, 2])
+        self.assertEqual([r.id for r in batches[1]], ["a", "b"])
+
+    def test_invalid_plans_rejected(self):
+        with self.assertRaises(ValueError):
+            plan_batches([BatchRequest("1", "GET", "/x"), BatchRequest("1", "GET", "/y")])
+        with self.assertRaises(ValueError):
+            plan_batches([BatchRequest("1", "GET", "/x", depends_on=["9"])])
+        chain = [BatchRequest("0", "GET", "/x")]
+        chain += [BatchRequest(str(i), "GET", "/x", depends_on=[str(i - 1)]) for i in range(1, 21)]
+        with self.assertRaises(ValueError):
+            plan_batches(chain)
+
+    def test_to_json(self):
+        item = BatchRequest("1", "patch", graph_batch.GRAPH_API_BASE + "/me/x", body={"a": 1},
+                            depends_on=["0"]).to_json(graph_batch.GRAPH_API_BASE)
+        self.assertEqual(item["url"], "/me/x")
+        self.assertEqual(item["method"], "PATCH")
+        self.assertEqual(item["headers"], {"Content-Type": "application/json"})
+        self.assertEqual(item["dependsOn"], ["0"])
+
+
+class TestExecuteBatch(GraphBatchTestCase):
+    """Tests for execute_batch."""
+
+    def test_responses_indexed_by_id(self):
+        fake = self.use_fake(lambda item, n: (200, {"url": item["url"]}, {}))
+        reqs = [BatchRequest(str(i), "GET", f"/item/{i}") for i in range(25)]
+
+        results = execute_batch(reqs, "token")
+
+        self.assertEqual(len(fake.batches), 2)
+        self.assertEqual(results["24"].body, {"url": "/item/24"})
+        self.assertTrue(all(r.ok for r in results.values()))
+
+    def test_throttled_items_retried_with_dependants(self):
+        def handler(item, n):
+            if n == 1 and item["id"] == "b":
+                return 429, {"error": {"code": "TooManyRequests"}}, {"Retry-After": "3"}
+            if n == 1 and item["id"] == "c":
+                return 424, None, {}
+            return 200, {"ok": item["id"]}, {}
+
+        fake = self.use_fake(handler)
+        reqs = [
+            BatchRequest("a", "GET", "/a"),
+            BatchRequest("b", "PATCH", "/b", body={}),
+            BatchRequest("c", "GET", "/c", depends_on=["b"]),
+        ]
+
+        results = execute_batch(reqs, "token")
+
+        self.assertEqual([i["id"] for i in fake.batches[1]], ["b", "c"])
+        self.assertEqual(fake.batches[1][1]["dependsOn"], ["b"])
+        self.assertTrue(all(r.ok for r in results.values()))
+        self.assertGreaterEqual(sum(self.slept), 3.0)
+        stats = ratelimit.get_throttle_stats()["graph"]
+        self.assertEqual(stats["throttled"], 1)
+        self.assertEqual(stats["retries"], 1)
+
+    def test_gives_up_after_max_retries(self):
+        fake = self.use_fake(lambda item, n: (429, None, {"Retry-After": "1"}))
+        results = execute_batch([BatchRequest("a", "GET", "/a")], "token", max_retries=2)
+        self.assertEqual(results["a"].status, 429)
+        self.assertEqual(len(fake.batches), 3)
+
+    def test_failed_batch_post(self):
+        p = patch.object(ratelimit, "request", return_value=_response(401, {"error": "x"}))
+        p.start()
+        self.addCleanup(p.stop)
+        results = execute_batch([BatchRequest("a", "GET", "/a")], "token")
+        self.assertEqual(results["a"].status, 401)
+        self.assertFalse(results["a"].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
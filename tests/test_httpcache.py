@@ -0,0 +1,152 @@
+"""test_httpcache.py — Tests for src/integrations/httpcache.py.
+
+Conditional requests run against the n8n and Jira stand-ins from
+``benchmarks/fake_servers.py``; the cache lives in a temporary directory.
+No external services required.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure the repository root (for benchmarks/) and src/ are importable
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import metrics
+from benchmarks.fake_servers import FakeServer, JiraFake, N8nFake
+from integrations import httpcache, n8n
+from integrations.httpcache import HttpCache
+
+
+def _response(status, body=b"", headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = body
+    resp.headers = headers or {}
+    return resp
+
+
+class HttpCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = HttpCache(self.tmpdir.name)
+
+
+class TestConditionalRequests(HttpCacheTestCase):
+    """ETag round trips against a fake provider."""
+
+    def test_etag_revalidation(self):
+        with FakeServer(N8nFake(50)) as srv:
+            url = f"{srv.url}/api/v1/workflows"
+            first = self.cache.get("n8n", url)
+            second = self.cache.get("n8n", url)
+            # A new process reads the entry back from disk.
+            third = HttpCache(self.tmpdir.name).get("n8n", url)
+            bytes_out = srv.provider.stats()["bytes_out"]
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertIs(second.json(), first.json())
+        self.assertEqual(len(third.json()["data"]), 50)
+        self.assertTrue(third.from_cache)
+        self.assertEqual(bytes_out, len(first.content))  # the 304s carry no body
+        self.assertEqual(self.cache.stats()["not_modified"], 1)
+        self.assertEqual(self.cache.stats()["hit_rate"], 0.5)
+
+    def test_unchanged_body_without_validators(self):
+        with FakeServer(JiraFake(20)) as srv:
+            url = f"{srv.url}/rest/api/2/search"
+            first = self.cache.get("jira", url, params={"jql": "x", "startAt": 0})
+            second = self.cache.get("jira", url, params={"jql": "x", "startAt": 0})
+            other = self.cache.get("jira", url, params={"jql": "x", "startAt": 10})
+
+        self.assertIs(second.json(), first.json())
+        self.assertTrue(second.from_cache)
+        self.assertFalse(other.from_cache)
+        self.assertEqual(self.cache.stats()["entries"], 0)  # nothing to revalidate on disk
+
+    def test_last_modified_sent(self):
+        stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+        calls = []
+
+        def fake(provider, method, url, **kwargs):
+            calls.append(kwargs["headers"])
+            if len(calls) == 1:
+                return _response(200, b'{"value": [1]}', {"Last-Modified": stamp})
+            return _response(304)
+
+        with patch.object(httpcache.ratelimit, "request", side_effect=fake):
+            self.cache.get("graph", "https://graph/me/todo/lists", headers={"Authorization": "Bearer a"})
+            resp = self.cache.get("graph", "https://graph/me/todo/lists", headers={"Authorization": "Bearer b"})
+
+        self.assertEqual(calls[1], {"Authorization": "Bearer b", "If-Modified-Since": stamp})
+        self.assertEqual(resp.json(), {"value": [1]})
+
+    def test_errors_and_non_json_pass_through(self):
+        error = _response(500, b"boom")
+        html = _response(200, b"<html>", {"ETag": '"1"'})
+        with patch.object(httpcache.ratelimit, "request", side_effect=[error, html]):
+            self.assertIs(self.cache.get("n8n", "https://n8n/api"), error)
+            self.assertIs(self.cache.get("n8n", "https://n8n/api"), html)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_metrics(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        with FakeServer(N8nFake(5)) as srv:
+            for _ in range(3):
+                self.cache.get("n8n", f"{srv.url}/api/v1/workflows")
+
+        series = metrics.get_performance_stats()["providers"]["n8n"]["endpoints"]["GET /api/v1/workflows"]
+        self.assertEqual((series["cache_hits"], series["cache_misses"], series["calls"]), (2, 1, 3))
+
+
+class TestDiskBudget(HttpCacheTestCase):
+    """Least recently used entries are evicted beyond the budget."""
+
+    def test_lru_eviction(self):
+        body = b'{"data": "' + b"x" * 400 + b'"}'
+        self.cache.max_bytes = 2000
+
+        def fake(provider, method, url, **kwargs):
+            return _response(200, body, {"ETag": f'"{url}"'})
+
+        with patch.object(httpcache.ratelimit, "request", side_effect=fake):
+            for name in ("a", "b", "c"):
+                self.cache.get("n8n", f"https://n8n/{name}")
+            self.cache.get("n8n", "https://n8n/a")  # unchanged: refreshes a
+            self.cache.get("n8n", "https://n8n/d")
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (3, 1))
+        self.assertLessEqual(stats["bytes"], 2000)
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 3)
+        self.assertIsNone(self.cache._read(httpcache._key("n8n", "https://n8n/b", None)))
+
+
+class TestIntegration(HttpCacheTestCase):
+    """n8n get_workflows polls through the shared cache."""
+
+    def test_get_workflows_polls(self):
+        with FakeServer(N8nFake(30)) as srv, \
+                patch.object(httpcache, "_cache", self.cache), \
+                patch.object(n8n, "N8N_HOST", srv.url), \
+                patch.object(n8n, "N8N_API_KEY", "key"):
+            self.assertEqual(len(n8n.get_workflows()), 30)
+            self.assertEqual(len(n8n.get_workflows()), 30)
+        self.assertEqual(self.cache.stats()["not_modified"], 1)
+
+    def test_disabled(self):
+        with patch.object(httpcache, "ENABLED", False), \
+                patch.object(httpcache.ratelimit, "request", return_value=_response(200, b"{}")) as request:
+            httpcache.get("n8n", "https://n8n/api", headers={"A": "1"})
+        self.assertEqual(request.call_args.kwargs["headers"], {"A": "1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
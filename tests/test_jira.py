@@ -0,0 +1,411 @@
+"""test_jira.py — Tests for src/integrations/jira.py.
+
+The Jira REST API is replaced by an in-process fake; no network access or
+credentials are required.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import jira, registry
+from db.sqlite_store import init_db, get_task, get_last_sync, save_task, mark_synced, ensure_source
+
+
+def _issue(key: str, summary: str = None, status: str = "To Do", category: str = "new",
+           priority: str = "Medium", **extra) -> dict:
+    fields = {
+        "summary": summary or f"Issue {key}",
+        "status": {"name": status, "id": status, "statusCategory": {"key": category}},
+        "priority": {"name": priority},
+        "duedate": None,
+        "project": {"key": key.split("-")[0]},
+        "issuetype": {"id": "10001"},
+    }
+    fields.update(extra)
+    return {"key": key, "fields": fields}
+
+
+def _response(status: int, payload: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {}
+    resp.text = str(payload)
+    return resp
+
+
+class FakeJira:
+    """Jira REST stand-in serving a fixed issue list.
+
+    ``/rest/api/3/search/jql`` pages with opaque tokens, ``/rest/api/2/search``
+    with ``startAt``. Set ``jql_supported=False`` to emulate Jira Server.
+    ``key in (...)`` JQL filters the list and, like Jira, fails with 400
+    when a key does not exist; issue transitions are served from
+    ``transitions`` and POSTs answer with ``post_status`` (per key, else 204).
+    """
+
+    transitions = [{"id": "21", "name": "In Progress"}, {"id": "31", "name": "Done"}]
+
+    def __init__(self, issues: list, jql_supported: bool = True, max_page: int = 1000,
+                 latency: float = 0.0):
+        self.issues = issues
+        self.jql_supported = jql_supported
+        self.max_page = max_page
+        self.latency = latency
+        self.post_status = {}
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, provider, method, url, **kwargs):
+        params = kwargs.get("params", {})
+        with self._lock:
+            self.calls.append((method, url, dict(params), kwargs.get("json")))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            return self._respond(method, url, params)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _matching(self, params):
+        jql = params.get("jql", "")
+        if jql.startswith("key in ("):
+            keys = set(jql[len("key in ("):-1].split(", "))
+            return [i for i in self.issues if i["key"] in keys]
+        return self.issues
+
+    def _respond(self, method, url, params):
+        if url.endswith("/transitions"):
+            key = url.split("/")[-2]
+            if method == "GET":
+                return _response(200, {"transitions": self.transitions})
+            return _response(self.post_status.get(key, 204))
+        issues = self._matching(params)
+        jql = params.get("jql", "")
+        if jql.startswith("key in (") and len(issues) < len(jql.split(", ")):
+            return _response(400, {"errorMessages": ["An issue with key does not exist"]})
+        if url.endswith("/rest/api/3/search/jql"):
+            if not self.jql_supported:
+                return _response(404, {"errorMessages": ["Not found"]})
+            start = int(params.get("nextPageToken") or 0)
+            size = int(params["maxResults"])
+            end = start + size
+            page = {"issues": issues[start:end], "isLast": end >= len(issues)}
+            if end < len(issues):
+                page["nextPageToken"] = str(end)
+            return _response(200, page)
+        if url.endswith("/rest/api/2/search"):
+            start = int(params["startAt"])
+            size = min(int(params["maxResults"]), self.max_page)
+            return _response(200, {
+                "startAt": start,
+                "maxResults": size,
+                "total": len(issues),
+                "issues": issues[start:start + size],
+            })
+        return _response(404)
+
+
+class JiraTestCase(unittest.TestCase):
+    """Base class configuring Jira credentials."""
+
+    def setUp(self):
+        for p in (
+            patch.object(jira, "JIRA_BASE_URL", "https://jira.example.invalid"),
+            patch.object(jira, "JIRA_USER_EMAIL", "me@example.invalid"),
+            patch.object(jira, "JIRA_API_TOKEN", "token"),
+            patch.object(jira, "JIRA_PROJECT_KEY", ""),
+            patch.object(jira, "JIRA_JQL_FILTER", ""),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def use_fake(self, fake: FakeJira) -> FakeJira:
+        p = patch.object(jira.ratelimit, "request", side_effect=fake)
+        p.start()
+        self.addCleanup(p.stop)
+        return fake
+
+
+class TestListJiraTasks(JiraTestCase):
+    """Tests for list_jira_tasks."""
+
+    def test_maps_fields(self):
+        self.use_fake(FakeJira([
+            _issue("P-1", "Fix login", priority="Highest", description="Long text", duedate="2026-03-01"),
+        ]))
+        tasks = jira.list_jira_tasks()
+
+        self.assertEqual(len(tasks), 1)
+        task = tasks[0]
+        self.assertEqual(task.id, "jira-P-1")
+        self.assertEqual(task.title, "Fix login")
+        self.assertEqual(task.priority, "high")
+        self.assertEqual(task.snippet, "Long text")
+        self.assertEqual(task.due_date.year, 2026)
+        self.assertEqual(task.link, "https://jira.example.invalid/browse/P-1")
+
+    def test_paginates_up_to_limit(self):
+        self.use_fake(FakeJira([_issue(f"P-{i}") for i in range(120)]))
+        tasks = jira.list_jira_tasks(limit=110)
+        self.assertEqual([t.id for t in tasks], [f"jira-P-{i}" for i in range(110)])
+
+
+    def test_pages_fetched_concurrently_in_order(self):
+        fake = self.use_fake(FakeJira([_issue(f"P-{i}") for i in range(500)], latency=0.02))
+        with patch.object(jira, "JIRA_MAX_IN_FLIGHT", 3), patch.object(jira, "JIRA_PAGE_SIZE", 50):
+            tasks = jira.list_jira_tasks(limit=500)
+
+        self.assertEqual([t.id for t in tasks], [f"jira-P-{i}" for i in range(500)])
+        self.assertEqual(len(fake.calls), 10)
+        self.assertEqual({c[2]["maxResults"] for c in fake.calls}, {50})
+        self.assertEqual(fake.peak_in_flight, 3)
+
+    def test_clamped_page_size_does_not_skip_issues(self):
+        fake = self.use_fake(FakeJira([_issue(f"P-{i}") for i in range(100)], max_page=20))
+        tasks = jira.list_jira_tasks(limit=100)
+        self.assertEqual([t.id for t in tasks], [f"jira-P-{i}" for i in range(100)])
+        self.assertEqual([c[2]["startAt"] for c in fake.calls], [0, 20, 40, 60, 80])
+
+    def test_failed_page_keeps_earlier_pages(self):
+        fake = FakeJira([_issue(f"P-{i}") for i in range(150)])
+
+        def flaky(provider, method, url, **kwargs):
+            if kwargs["params"]["startAt"] == 100:
+                return _response(500, {"error": "boom"})
+            return fake(provider, method, url, **kwargs)
+
+        self.use_fake(flaky)
+        tasks = jira.list_jira_tasks(limit=150)
+        self.assertEqual([t.id for t in tasks], [f"jira-P-{i}" for i in range(100)])
+
+
+class TestIterJiraTasks(JiraTestCase):
+    """Tests for the iter_jira_tasks generator."""
+
+    def test_first_page_yielded_before_consumer_finishes(self):
+        fake = self.use_fake(FakeJira([_issue(f"P-{i}") for i in range(120)]))
+        stream = jira.iter_jira_tasks(limit=120)
+
+        self.assertEqual(next(stream).id, "jira-P-0")
+        self.assertEqual(len(list(stream)), 119)
+        self.assertEqual(len(fake.calls), 2)  # pages of JIRA_PAGE_SIZE (100)
+
+    def test_not_configured_yields_nothing(self):
+        with patch.object(jira, "JIRA_BASE_URL", ""):
+            self.assertEqual(list(jira.iter_jira_tasks()), [])
+
+
+class TestIncrementalJql(JiraTestCase):
+    """Tests for _build_incremental_jql."""
+
+    def test_initial_sync_excludes_done(self):
+        jql = jira._build_incremental_jql(None)
+        self.assertIn("statusCategory != Done", jql)
+        self.assertNotIn("updated", jql.split("ORDER BY")[0])
+
+    def test_updated_bound_is_relative_with_overlap(self):
+        since = datetime.now(timezone.utc) - timedelta(minutes=29, seconds=30)
+        with patch.object(jira, "JIRA_INCREMENTAL_OVERLAP_MINUTES", 5):
+            jql = jira._build_incremental_jql(since)
+        self.assertIn('updated >= "-35m"', jql)
+        self.assertNotIn("statusCategory", jql)
+
+    def test_custom_filter_order_by_is_stripped(self):
+        with patch.object(jira, "JIRA_JQL_FILTER", "project = X ORDER BY rank"):
+            jql = jira._build_incremental_jql(datetime.now(timezone.utc))
+        self.assertTrue(jql.startswith("(project = X) AND updated"))
+
+
+class TestFetchJiraChanges(JiraTestCase):
+    """Tests for fetch_jira_changes."""
+
+    def test_token_pagination_and_minimal_fields(self):
+        fake = self.use_fake(FakeJira(
+            [_issue(f"P-{i}") for i in range(5)] + [_issue("P-9", status="Done", category="done")]
+        ))
+        changes = jira.fetch_jira_changes(datetime.now(timezone.utc), page_size=2)
+
+        self.assertEqual([t.id for t in changes.active], [f"jira-P-{i}" for i in range(5)])
+        self.assertEqual(changes.done, ["jira-P-9"])
+        self.assertEqual(len(fake.calls), 3)
+        self.assertEqual(fake.calls[0][2]["fields"], "summary,status,priority,duedate")
+        self.assertEqual(fake.calls[1][2]["nextPageToken"], "2")
+
+    def test_falls_back_to_legacy_search(self):
+        fake = self.use_fake(FakeJira([_issue("P-1")], jql_supported=False))
+        changes = jira.fetch_jira_changes(None)
+        self.assertEqual([t.id for t in changes.active], ["jira-P-1"])
+        self.assertTrue(fake.calls[-1][1].endswith("/rest/api/2/search"))
+
+    def test_error_returns_none(self):
+        self.use_fake(lambda *a, **k: _response(500, {"error": "boom"}))
+        self.assertIsNone(jira.fetch_jira_changes(None))
+
+
+class TestIterJiraChanges(JiraTestCase):
+    """Tests for the registry's incremental Jira fetch."""
+
+    def test_advances_sync_point_after_full_stream(self):
+        fake = self.use_fake(FakeJira([_issue("P-1"), _issue("P-2", status="Done", category="done")]))
+        cursors = {}
+        active, done = list(jira.iter_jira_changes(cursors))
+        self.assertEqual(active.id, "jira-P-1")
+        self.assertEqual(done, registry.DoneAtOrigin("jira", ["jira-P-2"]))
+        self.assertIn("statusCategory != Done", fake.calls[0][2]["jql"])
+
+        list(jira.iter_jira_changes(cursors))
+        self.assertIsNotNone(datetime.fromisoformat(cursors["updated_since"]).tzinfo)
+        self.assertIn("updated >=", fake.calls[-1][2]["jql"])
+
+    def test_failure_keeps_sync_point(self):
+        self.use_fake(lambda *a, **k: _response(500, {"error": "boom"}))
+        cursors = {"updated_since": "2026-01-01T00:00:00+00:00"}
+        with self.assertRaises(RuntimeError):
+            list(jira.iter_jira_changes(cursors))
+        self.assertEqual(cursors, {"updated_since": "2026-01-01T00:00:00+00:00"})
+
+
+class TestSyncJiraIncremental(JiraTestCase):
+    """Tests for sync_jira_incremental against a temporary store."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = init_db(os.path.join(self.tmpdir, "test.db"))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_upserts_and_deletes_done(self):
+        save_task(self.conn, jira._issue_to_task(_issue("P-2")))
+        ensure_source(self.conn, "jira")
+        mark_synced(self.conn, "jira", "incremental_pull", 1)
+
+        fake = self.use_fake(FakeJira([
+            _issue("P-1", "New one"),
+            _issue("P-2", status="Done", category="done"),
+        ]))
+        result = jira.sync_jira_incremental(self.conn)
+
+        self.assertEqual(result, {"upserted": 1, "deleted": 1})
+        self.assertEqual(get_task(self.conn, "jira-P-1").title, "New one")
+        self.assertIsNone(get_task(self.conn, "jira-P-2"))
+        self.assertIn("updated >=", fake.calls[0][2]["jql"])
+
+    def test_failure_keeps_sync_point(self):
+        self.use_fake(lambda *a, **k: _response(500, {"error": "boom"}))
+        self.assertIsNone(jira.sync_jira_incremental(self.conn))
+        self.assertIsNone(get_last_sync(self.conn, "jira"))
+
+
+class TestTransitionJiraIssues(JiraTestCase):
+    """Tests for transition_jira_issues."""
+
+    def setUp(self):
+        super().setUp()
+        jira._transition_cache.clear()
+        self.addCleanup(jira._transition_cache.clear)
+
+    def test_bulk_transition_caches_ids_per_context(self):
+        issues = [_issue(f"P-{i}") for i in range(30)] + [_issue("Q-1", status="Review")]
+        fake = self.use_fake(FakeJira(issues, latency=0.01))
+        keys = [f"jira-P-{i}" for i in range(30)] + ["Q-1"]
+
+        results = jira.transition_jira_issues(keys, "done", max_workers=5)
+
+        self.assertEqual(list(results), keys)
+        self.assertTrue(all(r.success for r in results.values()))
+        self.assertEqual(results["Q-1"].key, "Q-1")
+        gets = [c for c in fake.calls if c[0] == "GET" and c[1].endswith("/transitions")]
+        posts = [c for c in fake.calls if c[0] == "POST"]
+        self.assertEqual(len(gets), 2)  # one per (project, type, status)
+        self.assertEqual(len(posts), 31)
+        self.assertEqual(posts[0][3], {"transition": {"id": "31"}})
+        self.assertLessEqual(fake.peak_in_flight, 5)
+        self.assertGreater(fake.peak_in_flight, 1)
+
+        # A second batch in the same contexts needs no transitions GET.
+        jira.transition_jira_issues(["P-0", "P-1"], "Done")
+        gets = [c for c in fake.calls if c[0] == "GET" and c[1].endswith("/transitions")]
+        self.assertEqual(len(gets), 2)
+
+    def test_cache_expires(self):
+        now = [0.0]
+        cache = jira.TransitionCache(ttl=10, clock=lambda: now[0])
+        cache.put(("P", "1", "1"), {"done": "31"})
+        self.assertEqual(cache.get(("P", "1", "1")), {"done": "31"})
+        now[0] = 10.0
+        self.assertIsNone(cache.get(("P", "1", "1")))
+
+    def test_per_issue_failures(self):
+        fake = self.use_fake(FakeJira([_issue("P-1"), _issue("P-2")]))
+        fake.post_status["P-2"] = 403
+
+        results = jira.transition_jira_issues(["P-1", "P-2", "P-404"], "Done")
+
+        self.assertTrue(results["P-1"].success)
+        self.assertFalse(results["P-2"].success)
+        self.assertIn("403", results["P-2"].error)
+        self.assertEqual(results["P-404"].error, "Issue not found")
+
+    def test_invalid_key_fails_only_itself(self):
+        fake = self.use_fake(FakeJira([_issue(f"P-{i}") for i in range(3)]))
+
+        results = jira.transition_jira_issues(["P-0", "NOPE-1", "P-1", "P-2"], "Done")
+
+        self.assertEqual([k for k, r in results.items() if r.success], ["P-0", "P-1", "P-2"])
+        self.assertEqual(results["NOPE-1"].error, "Issue not found")
+        searches = [c[2]["jql"] for c in fake.calls if c[1].endswith("/search/jql")]
+        self.assertEqual(searches[0], "key in (P-0, NOPE-1, P-1, P-2)")
+        self.assertEqual(len(searches), 5)  # the chunk, then each key alone
+
+    def test_unknown_transition_name(self):
+        self.use_fake(FakeJira([_issue("P-1")]))
+        result = jira.transition_jira_issues(["P-1"], "Archive")["P-1"]
+        self.assertFalse(result.success)
+        self.assertIn("not available", result.error)
+
+    def test_stale_cached_id_is_refreshed(self):
+        fake = self.use_fake(FakeJira([_issue("P-1")]))
+        jira._transition_cache.put(("P", "10001", "To Do"), {"done": "99"})
+
+        def post_status(key, default=204):
+            posted = [c for c in fake.calls if c[0] == "POST"]
+            return 400 if posted[-1][3]["transition"]["id"] == "99" else default
+
+        fake.post_status = MagicMock(get=post_status)
+        result = jira.transition_jira_issues(["P-1"], "Done")["P-1"]
+
+        self.assertTrue(result.success)
+        posted_ids = [c[3]["transition"]["id"] for c in fake.calls if c[0] == "POST"]
+        self.assertEqual(posted_ids, ["99", "31"])
+
+    def test_not_configured(self):
+        with patch.object(jira, "JIRA_BASE_URL", ""):
+            result = jira.transition_jira_issues(["P-1"])["P-1"]
+        self.assertFalse(result.success)
+
+    def test_complete_jira_issues(self):
+        fake = self.use_fake(FakeJira([_issue("P-1"), _issue("P-2")]))
+        fake.post_status["P-2"] = 403
+
+        self.assertEqual(
+            jira.complete_jira_issues(["jira-P-1", "P-2"]), {"jira-P-1": True, "P-2": False}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""test_mcp_server.py — Tests for the legacy scripts/mcp_server.py tools.
+
+The tools are called directly. The MCP SDK's ``FastMCP`` is replaced by a
+minimal double whose decorators return the functions unchanged, so the
+tests do not depend on the installed SDK version. Integration functions
+are patched; no external services required.
+"""
+
+import os
+import sys
+import json
+import types
+import asyncio
+import importlib
+import unittest
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from src.integrations import notion, outlook, registry
+from src.models import TaskSource, UnifiedTask
+
+
+class _FastMCP:
+    """Stands in for ``mcp.server.fastmcp.FastMCP``."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def tool(self):
+        return lambda fn: fn
+
+    def lifespan(self, fn):
+        return fn
+
+
+def _load_script():
+    fastmcp = types.ModuleType("mcp.server.fastmcp")
+    fastmcp.FastMCP = _FastMCP
+    with patch.dict(sys.modules, {"mcp.server.fastmcp": fastmcp}):
+        sys.modules.pop("scripts.mcp_server", None)
+        return importlib.import_module("scripts.mcp_server")
+
+
+def _task(task_id: str, source: TaskSource) -> UnifiedTask:
+    return UnifiedTask(id=task_id, source=source, title=f"Task {task_id}", status="active")
+
+
+class TestLegacyTools(unittest.TestCase):
+    """Read-only tools of the legacy server go through the source registry."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.script = _load_script()
+
+    def setUp(self):
+        registry._list_flight.clear()
+
+    def test_sync_notion_backlog(self):
+        with patch.object(notion, "iter_notion_tasks", return_value=iter([_task("n1", TaskSource.NOTION)])):
+            out = asyncio.run(self.script.sync_notion_backlog())
+        self.assertEqual([t["id"] for t in json.loads(out)], ["n1"])
+
+    def test_list_outlook_todo(self):
+        with patch.object(outlook, "iter_outlook_tasks", return_value=iter([_task("o1", TaskSource.OUTLOOK)])):
+            out = asyncio.run(self.script.list_outlook_todo())
+        self.assertEqual(json.loads(out)[0]["source"], "outlook")
+
+    def test_empty_source_message(self):
+        with patch.object(outlook, "iter_outlook_tasks", return_value=iter([])):
+            out = asyncio.run(self.script.list_outlook_todo())
+        self.assertIn("No Outlook tasks", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""test_metrics.py — Tests for src/metrics.py and its hooks.
+
+Uses mocked HTTP responses and SDK callables. No external services required.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import metrics
+from integrations import ratelimit
+from integrations.ratelimit import TokenBucket
+
+
+def _response(status: int, body: bytes = b"", headers: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.content = body
+    resp.request.body = b'{"q": 1}'
+    return resp
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.set_enabled(True)
+
+    def tearDown(self):
+        metrics.reset()
+        metrics.set_enabled(True)
+
+
+class TestRecording(MetricsTestCase):
+    """Histograms, counters and summaries."""
+
+    def test_histogram_quantiles(self):
+        for _ in range(90):
+            metrics.record_call("p", "e", 0.004)
+        for _ in range(10):
+            metrics.record_call("p", "e", 0.8)
+
+        summary = metrics.get_performance_stats()["providers"]["p"]["endpoints"]["e"]
+        latency = summary["latency_ms"]
+        self.assertEqual(summary["calls"], 100)
+        self.assertEqual(latency["count"], 100)
+        self.assertLessEqual(latency["p50"], 5.0)
+        self.assertGreater(latency["p95"], 500.0)
+        self.assertLessEqual(latency["p99"], latency["max"])
+        self.assertEqual(latency["max"], 800.0)
+
+    def test_totals_per_provider(self):
+        metrics.record_call("jira", "GET /a", 0.01, bytes_in=100, bytes_out=10)
+        metrics.record_call("jira", "GET /b", 0.01, error=True, throttled=True)
+        metrics.record_retry("jira", "GET /b")
+        metrics.record_cache("jira", "transitions", hit=True)
+        metrics.record_cache("jira", "transitions", hit=False)
+
+        totals = metrics.get_performance_stats()["providers"]["jira"]["totals"]
+        self.assertEqual(
+            totals,
+            {"calls": 2, "errors": 1, "bytes_in": 100, "bytes_out": 10, "retries": 1,
+             "throttled": 1, "cache_hits": 1, "cache_misses": 1},
+        )
+
+    def test_disabled_records_nothing(self):
+        metrics.set_enabled(False)
+        metrics.record_call("p", "e", 0.1)
+        metrics.record_cache("p", "e", hit=True)
+        with metrics.timed("p", "e"):
+            pass
+        self.assertEqual(metrics.get_performance_stats()["providers"], {})
+
+    def test_instrument_tool(self):
+        @metrics.instrument_tool
+        def my_tool(x: int) -> int:
+            """Doc."""
+            if x < 0:
+                raise ValueError(x)
+            return x * 2
+
+        self.assertEqual(my_tool(2), 4)
+        with self.assertRaises(ValueError):
+            my_tool(-1)
+        self.assertEqual(my_tool.__name__, "my_tool")
+        self.assertEqual(my_tool.__doc__, "Doc.")
+
+        tool = metrics.get_performance_stats()["tools"]["my_tool"]
+        self.assertEqual((tool["calls"], tool["errors"]), (2, 1))
+
+    def test_prometheus_dump(self):
+        metrics.record_call("slack", 'GET /api/"x"', 0.02, bytes_in=5)
+        text = metrics.render_prometheus()
+        self.assertIn("# TYPE taskcenter_call_duration_seconds histogram", text)
+        self.assertIn(
+            'taskcenter_call_duration_seconds_bucket{provider="slack",endpoint="GET /api/\\"x\\"",le="0.025"} 1',
+            text,
+        )
+        self.assertIn(
+            'taskcenter_call_duration_seconds_bucket{provider="slack",endpoint="GET /api/\\"x\\"",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn('taskcenter_bytes_in_total{provider="slack",endpoint="GET /api/\\"x\\""} 5', text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "taskcenter.prom")
+            metrics.write_prometheus(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), text)
+
+
+class TestEndpointNaming(unittest.TestCase):
+    """URL and SDK call names are collapsed into stable endpoint labels."""
+
+    def test_ids_replaced(self):
+        cases = {
+            "https://graph.microsoft.com/v1.0/me/todo/lists/AAMkAGI2/tasks?$top=50":
+                "GET /v1.0/me/todo/lists/{id}/tasks",
+            "https://x.atlassian.net/rest/api/2/issue/PROJ-42/transitions":
+                "GET /rest/api/2/issue/{id}/transitions",
+            "https://slack.com/api/conversations.history": "GET /api/conversations.history",
+            "https://graph.microsoft.com/v1.0/$batch": "GET /v1.0/$batch",
+            "https://n8n.local/api/v1/workflows/1234/activate": "GET /api/v1/workflows/{id}/activate",
+        }
+        for url, expected in cases.items():
+            self.assertEqual(metrics.endpoint_for_url("get", url), expected)
+
+    def test_sdk_callables(self):
+        class PagesEndpoint:
+            def create(self):
+                pass
+
+        class HttpRequest:
+            methodId = "gmail.users.messages.get"
+
+            def execute(self):
+                pass
+
+        def databases_query():
+            pass
+
+        self.assertEqual(metrics.endpoint_for_callable(PagesEndpoint().create), "pages.create")
+        self.assertEqual(metrics.endpoint_for_callable(HttpRequest().execute), "gmail.users.messages.get")
+        self.assertEqual(metrics.endpoint_for_callable(databases_query), "databases_query")
+
+
+class TestRateLimitHooks(MetricsTestCase):
+    """ratelimit.request() / call() feed the registry."""
+
+    def setUp(self):
+        super().setUp()
+        ratelimit._buckets["test"] = TokenBucket(rate=1000.0, burst=1000, sleep=lambda s: None)
+
+    def tearDown(self):
+        ratelimit._buckets.pop("test", None)
+        ratelimit.reset_throttle_stats()
+        super().tearDown()
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_request_records_bytes_and_retries(self, mock_request):
+        mock_request.side_effect = [
+            _response(429, b"{}", {"Retry-After": "0"}),
+            _response(200, b'{"ok": true}'),
+        ]
+        ratelimit.request("test", "POST", "https://example.invalid/v1/pages/123456789")
+
+        series = metrics.get_performance_stats()["providers"]["test"]["endpoints"]["POST /v1/pages/{id}"]
+        self.assertEqual(series["calls"], 2)
+        self.assertEqual(series["throttled"], 1)
+        self.assertEqual(series["retries"], 1)
+        self.assertEqual(series["errors"], 0)
+        self.assertEqual(series["bytes_in"], 14)
+        self.assertEqual(series["bytes_out"], 16)
+        self.assertEqual(series["latency_ms"]["count"], 2)
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_request_error_status(self, mock_request):
+        mock_request.return_value = _response(500)
+        ratelimit.request("test", "GET", "https://example.invalid/x")
+        self.assertEqual(metrics.get_performance_stats()["providers"]["test"]["totals"]["errors"], 1)
+
+    def test_call_records_sdk_errors(self):
+        def failing():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            ratelimit.call("test", failing)
+        self.assertEqual(ratelimit.call("test", lambda: "ok"), "ok")
+
+        endpoints = metrics.get_performance_stats()["providers"]["test"]["endpoints"]
+        self.assertEqual(endpoints["failing"]["errors"], 1)
+        self.assertEqual(endpoints["<lambda>"]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
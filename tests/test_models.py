@@ -158,3 +158,27 @@ class TestUnifiedTask:
         assert reconstructed.id == original.id
         assert reconstructed.source == original.source
         assert reconstructed.title == original.title
+
+
+class TestFingerprint:
+    """Test UnifiedTask.fingerprint()."""
+
+    def _task(self, **kwargs):
+        data = {"id": "t1", "source": TaskSource.GMAIL, "title": "Pay invoice", "status": "Pending"}
+        data.update(kwargs)
+        return UnifiedTask(**data)
+
+    def test_stable_across_instances(self):
+        assert self._task().fingerprint() == self._task().fingerprint()
+
+    def test_ignores_identity_fields(self):
+        other = self._task(id="t2", source=TaskSource.OUTLOOK, link="https://example.com")
+        assert other.fingerprint() == self._task().fingerprint()
+
+    def test_content_fields_change_hash(self):
+        base = self._task().fingerprint()
+        assert self._task(title="Pay invoices").fingerprint() != base
+        assert self._task(status="Done").fingerprint() != base
+        assert self._task(priority=TaskPriority.HIGH).fingerprint() != base
+        assert self._task(snippet="due Friday").fingerprint() != base
+        assert self._task(due_date=datetime(2026, 3, 1)).fingerprint() != base
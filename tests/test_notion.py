@@ -0,0 +1,93 @@
+"""test_notion.py — Tests for src/integrations/notion.py.
+
+The Notion client is mocked; no token or network access is required.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import notion
+from integrations.notion import diff_properties, task_fields, update_tasks
+from models import TaskPriority
+
+
+class TestDiffProperties(unittest.TestCase):
+    """Tests for task_fields / diff_properties."""
+
+    def test_unchanged_sends_nothing(self):
+        fields = task_fields("[GMAIL] Pay invoice", TaskPriority.HIGH, datetime(2026, 3, 1))
+        self.assertEqual(diff_properties(fields, dict(fields)), {})
+
+    def test_only_changed_properties(self):
+        old = task_fields("[GMAIL] Pay invoice", TaskPriority.NORMAL)
+        new = task_fields("[GMAIL] Pay invoice", TaskPriority.HIGH, datetime(2026, 3, 1))
+        self.assertEqual(diff_properties(old, new), {
+            "Priority": {"select": {"name": "High"}},
+            "Due Date": {"date": {"start": "2026-03-01T00:00:00"}},
+        })
+
+    def test_cleared_due_date(self):
+        old = task_fields("T", due_date=datetime(2026, 3, 1))
+        self.assertEqual(diff_properties(old, task_fields("T")), {"Due Date": {"date": None}})
+
+    def test_title_change(self):
+        props = diff_properties(task_fields("Old"), task_fields("New"))
+        self.assertEqual(props, {"Name": {"title": [{"text": {"content": "New"}}]}})
+
+
+class TestUpdateTasks(unittest.TestCase):
+    """Tests for update_tasks."""
+
+    def setUp(self):
+        self.client = MagicMock()
+        for p in (
+            patch.object(notion, "get_notion_client", return_value=self.client),
+            patch.object(notion.ratelimit, "call", side_effect=lambda provider, fn, **kw: fn(**kw)),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_empty_updates_not_sent(self):
+        results = update_tasks({"p1": {}, "p2": {"Name": {}}})
+        self.assertEqual(results, {"p1": True, "p2": True})
+        self.client.pages.update.assert_called_once_with(page_id="p2", properties={"Name": {}})
+
+    def test_failures_reported_per_page(self):
+        def update(page_id, properties):
+            if page_id == "bad":
+                raise RuntimeError("409")
+            return {}
+
+        self.client.pages.update.side_effect = update
+        results = update_tasks({"ok": {"Name": {}}, "bad": {"Name": {}}})
+        self.assertEqual(results, {"ok": True, "bad": False})
+
+    def test_concurrency_bounded(self):
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def update(page_id, properties):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.02)
+            with lock:
+                state["now"] -= 1
+
+        self.client.pages.update.side_effect = update
+        results = update_tasks({f"p{i}": {"Name": {}} for i in range(12)}, max_workers=3)
+        self.assertTrue(all(results.values()))
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+"""test_outlook.py — Tests for src/integrations/outlook.py.
+
+MSAL and Microsoft Graph are mocked; no Azure credentials are required.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import outlook
+from integrations.outlook import GraphTokenManager
+
+
+class FakeClock:
+    """Wall clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class OutlookTestCase(unittest.TestCase):
+    """Base class configuring Outlook credentials and a temporary cache file."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmpdir, "outlook_cache.bin")
+        for p in (
+            patch.object(outlook, "CLIENT_ID", "client"),
+            patch.object(outlook, "TENANT_ID", "tenant"),
+            patch.object(outlook, "CLIENT_SECRET", "secret"),
+            patch.object(outlook, "CACHE_FILE", self.cache_file),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+        self.app = MagicMock()
+        self.app.get_accounts.return_value = []
+        self.app.acquire_token_for_client.side_effect = self._issue_token
+        self.issued = 0
+        p = patch.object(outlook.msal, "ConfidentialClientApplication", return_value=self.app)
+        self.app_cls = p.start()
+        self.addCleanup(p.stop)
+
+    def _issue_token(self, scopes):
+        self.issued += 1
+        return {"access_token": f"token-{self.issued}", "expires_in": 3600}
+
+
+class TestGraphTokenManager(OutlookTestCase):
+    """Tests for the in-memory Graph token manager."""
+
+    def manager(self, clock=None) -> GraphTokenManager:
+        mgr = GraphTokenManager(margin=300, clock=clock or FakeClock())
+        self.addCleanup(mgr.reset)
+        return mgr
+
+    def test_token_reused_until_margin(self):
+        clock = FakeClock()
+        mgr = self.manager(clock)
+
+        self.assertEqual(mgr.get_token(), "token-1")
+        clock.now += 3000
+        self.assertEqual(mgr.get_token(), "token-1")
+        self.assertEqual(self.app_cls.call_count, 1)
+        self.assertEqual(self.app.acquire_token_for_client.call_count, 1)
+
+        clock.now += 400  # inside the 300 s refresh margin
+        self.assertEqual(mgr.get_token(), "token-2")
+        self.assertEqual(self.app_cls.call_count, 1)
+
+    def test_background_refresh_scheduled(self):
+        mgr = self.manager()
+        mgr.get_token()
+        self.assertIsNotNone(mgr._timer)
+        self.assertAlmostEqual(mgr._timer.interval, 3300)
+
+        mgr._refresh()
+        self.assertEqual(mgr.get_token(), "token-2")
+
+    def test_cache_file_written_only_on_change(self):
+        mgr = self.manager()
+        with patch.object(outlook, "_load_cache") as load:
+            cache = MagicMock()
+            cache.has_state_changed = True
+            cache.serialize.return_value = "{}"
+            load.return_value = cache
+            mgr.get_token()
+            self.assertTrue(os.path.exists(self.cache_file))
+            self.assertFalse(cache.has_state_changed)
+
+            os.remove(self.cache_file)
+            mgr._refresh()
+            self.assertFalse(os.path.exists(self.cache_file))
+            load.assert_called_once()
+
+    def test_config_change_rebuilds_app(self):
+        mgr = self.manager()
+        mgr.get_token()
+        with patch.object(outlook, "CLIENT_ID", "other"):
+            mgr.get_token()
+        self.assertEqual(self.app_cls.call_count, 2)
+
+    def test_missing_credentials(self):
+        mgr = self.manager()
+        with patch.object(outlook, "CLIENT_SECRET", None):
+            self.assertIsNone(mgr.get_token())
+        self.app_cls.assert_not_called()
+
+    def test_failed_acquisition_returns_none(self):
+        self.app.acquire_token_for_client.side_effect = None
+        self.app.acquire_token_for_client.return_value = {"error": "invalid_client"}
+        mgr = self.manager()
+        self.assertIsNone(mgr.get_token())
+        self.assertIsNone(mgr._timer)
+
+
+def _response(status: int, payload: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {}
+    resp.text = str(payload)
+    return resp
+
+
+class FakeGraph:
+    """Graph stand-in for To-Do lists, task pages and ``$batch``.
+
+    Each list holds ``pages`` pages of two tasks; later pages are linked via
+    absolute ``@odata.nextLink`` URLs, as Graph does.
+    """
+
+    BASE = "https://graph.microsoft.com/v1.0"
+
+    def __init__(self, n_lists: int, pages: int = 1):
+        self.n_lists = n_lists
+        self.pages = pages
+        self.calls = []
+        self.patched = []
+        self.sub_requests = []
+
+    def _tasks_page(self, list_id: str, page: int) -> dict:
+        body = {"value": [
+            {"id": f"{list_id}-{page}-{i}", "title": f"Task {i}", "status": status,
+             "importance": "high"}
+            for i, status in enumerate(["notStarted", "completed"])
+        ]}
+        if page + 1 < self.pages:
+            body["@odata.nextLink"] = f"{self.BASE}/me/todo/lists/{list_id}/tasks?$skiptoken={page + 1}"
+        return body
+
+    def _sub(self, item: dict):
+        url = item["url"]
+        self.sub_requests.append((item["method"], url))
+        if item["method"] == "PATCH":
+            self.patched.append(url.rsplit("/", 1)[-1])
+            return 404 if url.endswith("/missing") else 200, {}
+        list_id = url.split("/")[4]
+        page = int(url.split("$skiptoken=")[1]) if "$skiptoken=" in url else 0
+        return 200, self._tasks_page(list_id, page)
+
+    def __call__(self, provider, method, url, **kwargs):
+        self.calls.append((method, url))
+        if url.endswith("/$batch"):
+            responses = []
+            for item in kwargs["json"]["requests"]:
+                status, body = self._sub(item)
+                responses.append({"id": item["id"], "status": status, "body": body})
+            return _response(200, {"responses": responses})
+        if url == f"{self.BASE}/me/todo/lists":
+            return _response(200, {"value": [{"id": f"L{i}"} for i in range(self.n_lists)]})
+        return _response(404)
+
+
+class TestBatchedGraphCalls(unittest.TestCase):
+    """list_outlook_tasks / complete_outlook_tasks via Graph $batch."""
+
+    def setUp(self):
+        for p in (
+            patch.object(outlook, "get_access_token", return_value="token"),
+            patch.object(outlook.ratelimit, "get_bucket", return_value=MagicMock(burst=20)),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def use_fake(self, fake: FakeGraph) -> FakeGraph:
+        p = patch.object(outlook.ratelimit, "request", side_effect=fake)
+        p.start()
+        self.addCleanup(p.stop)
+        return fake
+
+    def test_lists_read_in_batches(self):
+        fake = self.use_fake(FakeGraph(n_lists=45, pages=2))
+        tasks = outlook.list_outlook_tasks()
+
+        self.assertEqual(len(tasks), 90)  # one open task per page
+        self.assertEqual(tasks[0].id, "L0-0-0")
+        self.assertEqual(tasks[0].priority, "high")
+        batch_calls = [c for c in fake.calls if c[1].endswith("/$batch")]
+        self.assertEqual(len(batch_calls), 6)  # 3 batches per page depth
+        self.assertEqual(len(fake.calls), 7)
+
+    def test_complete_many(self):
+        fake = self.use_fake(FakeGraph(n_lists=0))
+        results = outlook.complete_outlook_tasks([("L1", "t1"), ("L1", "missing"), ("L2", "t2")])
+
+        self.assertEqual(results, {"t1": True, "missing": False, "t2": True})
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(fake.patched, ["t1", "missing", "t2"])
+
+    def test_batch_size_from_policy(self):
+        fake = self.use_fake(FakeGraph(n_lists=45))
+        with patch.object(outlook, "OUTLOOK_BATCH_SIZE", 10):
+            outlook.list_outlook_tasks()
+        self.assertEqual(len([c for c in fake.calls if c[1].endswith("/$batch")]), 5)
+
+    def test_complete_by_task_id(self):
+        self.addCleanup(outlook._TASK_LISTS.clear)
+        outlook._TASK_LISTS.clear()
+        fake = self.use_fake(FakeGraph(n_lists=2))
+
+        results = outlook.complete_outlook_task_ids(["L1-0-0", "L0-0-1", "gone"])
+
+        self.assertEqual(results, {"L1-0-0": True, "L0-0-1": True, "gone": False})
+        self.assertEqual(fake.patched, ["L1-0-0", "L0-0-1"])
+        self.assertIn(("PATCH", "/me/todo/lists/L1/tasks/L1-0-0"), fake.sub_requests)
+
+        fake.calls.clear()
+        outlook.complete_outlook_task_ids(["L0-0-0"])
+        self.assertEqual(len(fake.calls), 1)  # list known: no re-listing
+
+
+if __name__ == "__main__":
+    unittest.main()
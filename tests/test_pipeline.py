@@ -0,0 +1,165 @@
+"""test_pipeline.py — Tests for src/pipeline.py.
+
+Pure in-process tests; no external services required.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pipeline import Stage, chunked, merge, prefetch
+
+
+class TestMerge(unittest.TestCase):
+    """Tests for merge() and prefetch()."""
+
+    def test_yields_every_item_from_every_source(self):
+        items = list(merge(iter(range(50)), iter(range(100, 130)), maxsize=4))
+        self.assertEqual(sorted(items), list(range(50)) + list(range(100, 130)))
+
+    def test_per_source_order_preserved(self):
+        items = list(merge(iter(range(20)), iter(["a", "b", "c"]), maxsize=2))
+        self.assertEqual([i for i in items if isinstance(i, int)], list(range(20)))
+        self.assertEqual([i for i in items if isinstance(i, str)], ["a", "b", "c"])
+
+    def test_buffer_is_bounded(self):
+        produced = []
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        stream = prefetch(source(), maxsize=5)
+        time.sleep(0.2)
+        # maxsize buffered, plus one item in hand waiting for a free slot.
+        self.assertLessEqual(len(produced), 6)
+        self.assertEqual(list(stream), list(range(100)))
+
+    def test_producers_start_before_iteration(self):
+        started = threading.Event()
+
+        def source():
+            started.set()
+            yield 1
+
+        stream = merge(source())
+        self.assertTrue(started.wait(1.0))
+        self.assertEqual(list(stream), [1])
+
+    def test_source_error_reraised(self):
+        def failing():
+            yield 1
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            list(merge(failing()))
+
+    def test_close_stops_producer(self):
+        finished = threading.Event()
+
+        def endless():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                finished.set()
+
+        stream = prefetch(endless(), maxsize=2)
+        self.assertEqual(next(stream), 0)
+        stream.close()
+        self.assertTrue(finished.wait(2.0))
+
+    def test_no_sources(self):
+        self.assertEqual(list(merge()), [])
+
+
+class TestChunked(unittest.TestCase):
+    """Tests for chunked()."""
+
+    def test_chunks(self):
+        self.assertEqual(list(chunked(range(7), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_empty(self):
+        self.assertEqual(list(chunked([], 3)), [])
+
+
+class TestStage(unittest.TestCase):
+    """Tests for Stage and StageStats."""
+
+    def test_workers_feed_downstream(self):
+        out = []
+        sink = Stage("sink", lambda batch: out.extend(batch), batch_size=10, maxsize=4).start()
+        square = Stage("square", lambda x: [x * x], workers=3, maxsize=2, downstream=sink).start()
+        for i in range(20):
+            square.put(i)
+        square.close()
+        sink.join()
+
+        self.assertEqual(sorted(out), [i * i for i in range(20)])
+        self.assertEqual(square.stats.items, 20)
+        self.assertEqual(sink.stats.items, 20)
+        self.assertLessEqual(sink.stats.calls, 20)
+
+    def test_batches_bounded(self):
+        sizes = []
+        stage = Stage("batch", lambda batch: sizes.append(len(batch)), batch_size=4).start()
+        for i in range(10):
+            stage.put(i)
+        stage.close()
+        stage.join()
+        self.assertEqual(sum(sizes), 10)
+        self.assertLessEqual(max(sizes), 4)
+
+    def test_multiple_inputs(self):
+        out = []
+        sink = Stage("sink", lambda x: out.append(x), inputs=2).start()
+        a = Stage("a", lambda x: [x], downstream=sink).start()
+        b = Stage("b", lambda x: [-x], downstream=sink).start()
+        a.put(1)
+        a.close()
+        a.join()
+        b.put(2)
+        b.close()
+        sink.join()
+        self.assertEqual(sorted(out), [-2, 1])
+
+    def test_errors_reported_and_skipped(self):
+        errors = []
+
+        def fn(x):
+            if x == 2:
+                raise ValueError("bad")
+            return [x]
+
+        out = []
+        sink = Stage("sink", lambda x: out.append(x)).start()
+        stage = Stage("s", fn, downstream=sink, on_error=lambda n, e: errors.append(n)).start()
+        for i in range(4):
+            stage.put(i)
+        stage.close()
+        sink.join()
+        self.assertEqual(out, [0, 1, 3])
+        self.assertEqual(errors, ["s"])
+
+    def test_stats_report(self):
+        stage = Stage("slow", lambda x: time.sleep(0.01)).start()
+        for i in range(3):
+            stage.put(i)
+        stage.close()
+        stage.join()
+        report = stage.stats.as_dict()
+        self.assertEqual(report["items"], 3)
+        self.assertGreaterEqual(report["max_latency_ms"], 10)
+        self.assertGreater(report["throughput_per_s"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
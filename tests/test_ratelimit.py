@@ -0,0 +1,279 @@
+"""test_ratelimit.py — Tests for src/integrations/ratelimit.py.
+
+Uses a fake clock and mocked HTTP responses. No external services required.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import ratelimit
+from integrations.ratelimit import TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    """Monotonic clock whose sleep() advances time instantly."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _response(status: int, headers: dict = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for TokenBucket pacing."""
+
+    def test_burst_is_free(self):
+        """Requests within the burst size do not wait."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=3, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+    def test_paces_after_burst(self):
+        """Once the burst is spent, acquisitions are spaced by 1/rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        waited = bucket.acquire()
+        self.assertAlmostEqual(waited, 0.5)
+        self.assertAlmostEqual(clock.now, 0.5)
+
+    def test_pause_blocks_until_deadline(self):
+        """pause() holds every caller until the deadline passes."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100.0, burst=10, clock=clock, sleep=clock.sleep)
+        bucket.pause(3.0)
+        waited = bucket.acquire()
+        self.assertGreaterEqual(waited, 3.0)
+        self.assertGreaterEqual(clock.now, 3.0)
+
+
+class TestEnvOverrides(unittest.TestCase):
+    """Tests for TASKCENTER_RATE_LIMITS parsing."""
+
+    def setUp(self):
+        saved = dict(ratelimit.PROVIDER_LIMITS)
+        self.addCleanup(lambda: (ratelimit.PROVIDER_LIMITS.clear(), ratelimit.PROVIDER_LIMITS.update(saved)))
+
+    def test_non_positive_rates_ignored(self):
+        raw = "jira=2.5:4, gmail=0, notion=-1:2, graph=nan, n8n=inf, slack=abc"
+        with patch.dict(os.environ, {"TASKCENTER_RATE_LIMITS": raw}):
+            with self.assertLogs(ratelimit.logger, "WARNING") as logs:
+                ratelimit._load_env_overrides()
+
+        self.assertEqual(ratelimit.PROVIDER_LIMITS["jira"], ratelimit.RateLimit(2.5, 4))
+        self.assertEqual(ratelimit.PROVIDER_LIMITS["gmail"].rate, 40.0)
+        self.assertEqual(ratelimit.PROVIDER_LIMITS["notion"].rate, 3.0)
+        self.assertEqual(len(logs.records), 5)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Tests for Retry-After header parsing."""
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("7", default=1.0), 7.0)
+
+    def test_missing_uses_default(self):
+        self.assertEqual(parse_retry_after(None, default=2.5), 2.5)
+
+    def test_garbage_uses_default(self):
+        self.assertEqual(parse_retry_after("soon", default=1.5), 1.5)
+
+    def test_http_date_in_past_is_zero(self):
+        self.assertEqual(
+            parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", default=9.0), 0.0
+        )
+
+    def test_capped(self):
+        self.assertEqual(
+            parse_retry_after("100000", default=1.0), ratelimit.MAX_RETRY_AFTER
+        )
+
+
+class TestRequest(unittest.TestCase):
+    """Tests for ratelimit.request() retry behaviour."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        ratelimit.reset_throttle_stats()
+        ratelimit._buckets["test"] = TokenBucket(
+            rate=1000.0, burst=1000, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def tearDown(self):
+        ratelimit._buckets.pop("test", None)
+        ratelimit.reset_throttle_stats()
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_retries_after_429(self, mock_request):
+        """A 429 is retried after the Retry-After delay."""
+        mock_request.side_effect = [
+            _response(429, {"Retry-After": "4"}),
+            _response(200),
+        ]
+
+        resp = ratelimit.request("test", "GET", "https://example.invalid/x")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertGreaterEqual(self.clock.now, 4.0)
+
+        stats = ratelimit.get_throttle_stats()["test"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["throttled"], 1)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["retry_after_seconds"], 4.0)
+        self.assertGreaterEqual(stats["wait_seconds"], 4.0)
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_gives_up_after_max_retries(self, mock_request):
+        """The last throttled response is returned once retries run out."""
+        mock_request.return_value = _response(429, {"Retry-After": "1"})
+
+        resp = ratelimit.request("test", "GET", "https://example.invalid/x", max_retries=2)
+
+        self.assertEqual(resp.status_code, 429)
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_other_errors_not_retried(self, mock_request):
+        """Non-throttle errors are returned immediately."""
+        mock_request.return_value = _response(500)
+
+        resp = ratelimit.request("test", "GET", "https://example.invalid/x")
+
+        self.assertEqual(resp.status_code, 500)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_503_with_retry_after_is_throttle(self, mock_request):
+        """Graph-style 503 + Retry-After is treated as throttling."""
+        mock_request.side_effect = [
+            _response(503, {"Retry-After": "2"}),
+            _response(200),
+        ]
+
+        resp = ratelimit.request("test", "GET", "https://example.invalid/x")
+        self.assertEqual(resp.status_code, 200)
+
+
+class TestCall(unittest.TestCase):
+    """Tests for ratelimit.call() with SDK-style exceptions."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        ratelimit._buckets["sdk"] = TokenBucket(
+            rate=1000.0, burst=1000, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def tearDown(self):
+        ratelimit._buckets.pop("sdk", None)
+        ratelimit.reset_throttle_stats()
+
+    def test_retries_on_status_exception(self):
+        """Exceptions carrying status=429 are retried."""
+
+        class RateLimited(Exception):
+            status = 429
+            headers = {"retry-after": "3"}
+
+        fn = MagicMock(side_effect=[RateLimited(), "ok"])
+        self.assertEqual(ratelimit.call("sdk", fn, 1, key="v"), "ok")
+        fn.assert_called_with(1, key="v")
+        self.assertGreaterEqual(self.clock.now, 3.0)
+
+    def test_retries_on_googleapiclient_style_exception(self):
+        """Exceptions with resp.status == 429 are retried."""
+        resp = {"retry-after": "1"}
+
+        class HttpError(Exception):
+            pass
+
+        err = HttpError()
+        err.resp = MagicMock()
+        err.resp.status = 429
+        err.resp.get = resp.get
+
+        fn = MagicMock(side_effect=[err, "done"])
+        self.assertEqual(ratelimit.call("sdk", fn), "done")
+
+    def test_other_exceptions_propagate(self):
+        """Non-throttle exceptions are re-raised untouched."""
+        fn = MagicMock(side_effect=ValueError("boom"))
+        with self.assertRaises(ValueError):
+            ratelimit.call("sdk", fn)
+        self.assertEqual(fn.call_count, 1)
+
+
+class TestUsageMeter(unittest.TestCase):
+    """Tests for metered() / metered_iter() attribution."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        ratelimit._buckets["test"] = TokenBucket(
+            rate=1000.0, burst=1000, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def tearDown(self):
+        ratelimit._buckets.pop("test", None)
+        ratelimit.reset_throttle_stats()
+
+    @patch("integrations.ratelimit.requests.request")
+    def test_request_feeds_active_meter(self, mock_request):
+        """Requests, throttling and the Retry-After wait land in the meter."""
+        mock_request.side_effect = [
+            _response(429, {"Retry-After": "4"}),
+            _response(200),
+            _response(200),
+        ]
+        meter = ratelimit.UsageMeter()
+        with ratelimit.metered(meter):
+            ratelimit.request("test", "GET", "https://example.invalid/x")
+        ratelimit.request("test", "GET", "https://example.invalid/y")  # outside: not counted
+
+        fields = meter.log_fields()
+        self.assertEqual((meter.requests, meter.throttled), (2, 1))
+        self.assertGreaterEqual(fields["throttle_seconds"], 4.0)
+        self.assertIsNone(fields["error_class"])
+
+    def test_metered_iter_counts_items_and_errors(self):
+        """Items are counted; an exception in the producer sets error_class."""
+
+        def pages():
+            yield ratelimit.call("test", lambda: 1)
+            yield ratelimit.call("test", lambda: 2)
+            raise ConnectionError("reset")
+
+        meter = ratelimit.UsageMeter()
+        out = []
+        with self.assertRaises(ConnectionError):
+            for item in ratelimit.metered_iter(meter, pages()):
+                out.append(item)
+                ratelimit.call("test", lambda: 3)  # consumer work is not attributed
+
+        self.assertEqual(out, [1, 2])
+        self.assertEqual((meter.items, meter.requests), (2, 2))
+        self.assertEqual(meter.error_class, "ConnectionError")
+        self.assertGreaterEqual(meter.log_fields()["duration_ms"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""test_registry.py — Tests for src/integrations/registry.py.
+
+Integration functions are patched; no external services required.
+"""
+
+import os
+import sys
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import tracing
+from integrations import gmail, notion, outlook, registry
+from integrations.registry import Capability, RegisteredSource, SourcePolicy
+from models import TaskSource, UnifiedTask
+
+
+def _task(task_id: str, source: TaskSource = TaskSource.GMAIL) -> UnifiedTask:
+    return UnifiedTask(id=task_id, source=source, title=f"Task {task_id}", status="active")
+
+
+class TestLookup(unittest.TestCase):
+    """Registered sources, capability filters and configuration checks."""
+
+    def test_builtin_sources(self):
+        self.assertEqual(
+            [s.name for s in registry.sources()], ["notion", "gmail", "outlook", "slack", "jira"]
+        )
+        self.assertIs(registry.get_source("Jira"), registry.SOURCES["jira"])
+        self.assertIsNone(registry.get_source("trello"))
+
+    def test_capability_filter(self):
+        self.assertEqual(
+            [s.name for s in registry.sources(Capability.INCREMENTAL)], ["slack", "jira"]
+        )
+        self.assertEqual(
+            [s.name for s in registry.sources(Capability.BATCH_WRITE)], ["gmail", "outlook", "slack", "jira"]
+        )
+        self.assertEqual([s.name for s in registry.sources(Capability.PUSH)], ["slack"])
+
+    def test_pushed_only_when_enabled(self):
+        with patch.dict(os.environ, {"TASKCENTER_PUSH_SOURCES": ""}):
+            self.assertFalse(registry.pushed(registry.get_source("slack")))
+        with patch.dict(os.environ, {"TASKCENTER_PUSH_SOURCES": "Slack, jira"}):
+            self.assertTrue(registry.pushed(registry.get_source("slack")))
+            self.assertFalse(registry.pushed(registry.get_source("jira")))
+
+    def test_configured_only(self):
+        env = {"SLACK_BOT_TOKEN": "xoxb-test", "JIRA_BASE_URL": "", "JIRA_API_TOKEN": "t"}
+        with patch.dict(os.environ, env):
+            names = [s.name for s in registry.sources(configured_only=True)]
+        self.assertEqual(names, ["notion", "gmail", "outlook", "slack"])
+
+    def test_completion_support(self):
+        self.assertEqual(
+            [s.name for s in registry.sources() if s.can_complete()], ["gmail", "outlook", "slack", "jira"]
+        )
+
+
+class TestPolicies(unittest.TestCase):
+    """Per-source policies and TASKCENTER_SOURCE_POLICIES overrides."""
+
+    def setUp(self):
+        saved = dict(registry.SOURCES)
+        self.addCleanup(lambda: (registry.SOURCES.clear(), registry.SOURCES.update(saved)))
+
+    def test_defaults(self):
+        self.assertEqual(registry.policy("notion").page_size, 100)
+        self.assertEqual(registry.policy("slack").page_size, 200)
+        self.assertEqual(registry.policy("unknown"), SourcePolicy())
+        self.assertEqual(
+            {s.policy.ttl_seconds for s in registry.sources()}, {registry.LIST_CACHE_TTL}
+        )
+
+    def test_env_overrides(self):
+        raw = "jira.concurrency=8, slack.page_size=50, jira.ttl_seconds=60, bogus, trello.concurrency=2, gmail.color=1"
+        with patch.dict(os.environ, {"TASKCENTER_SOURCE_POLICIES": raw}):
+            with self.assertLogs(registry.logger, "WARNING") as logs:
+                registry._load_env_overrides()
+
+        self.assertEqual((registry.policy("jira").concurrency, registry.policy("jira").ttl_seconds), (8, 60.0))
+        self.assertEqual(registry.policy("jira").page_size, 100)
+        self.assertEqual(registry.policy("slack").page_size, 50)
+        self.assertEqual(len(logs.records), 3)
+
+
+class TestRegisteredSource(unittest.TestCase):
+    """Lazy iteration and completion through module functions."""
+
+    def setUp(self):
+        registry._list_flight.clear()
+        self.addCleanup(registry._list_flight.clear)
+
+    def test_iter_with_and_without_limit_arg(self):
+        tasks = [_task(f"g{i}") for i in range(5)]
+        with patch.object(gmail, "iter_task_emails", side_effect=lambda limit=20: iter(tasks[:limit])):
+            self.assertEqual(len(registry.get_source("gmail").list_tasks(3)), 3)
+        with patch.object(notion, "iter_notion_tasks", side_effect=lambda: iter(tasks)):
+            self.assertEqual(len(registry.get_source("notion").list_tasks(2)), 2)
+            self.assertEqual(len(registry.get_source("notion").list_tasks()), 5)
+
+    def test_list_tasks_contains_errors(self):
+        def broken(limit=20):
+            raise RuntimeError("down")
+            yield
+
+        with patch.object(gmail, "iter_task_emails", side_effect=broken):
+            self.assertEqual(registry.get_source("gmail").list_tasks(), [])
+
+    def test_complete_tasks_is_traced(self):
+        spans = []
+
+        class Exporter:
+            def export(self, batch):
+                spans.extend(batch)
+
+        tracing.configure(Exporter())
+        self.addCleanup(tracing.configure)
+        with patch.object(gmail, "archive_email_tasks", side_effect=lambda ids: {i: i != "m2" for i in ids}):
+            results = registry.get_source("gmail").complete_tasks(["m1", "m2"])
+
+        self.assertEqual(results, {"m1": True, "m2": False})
+        (span,) = spans
+        self.assertEqual(span.name, "gmail.archive")
+        self.assertEqual(span.attributes, {"source": "gmail", "items": 2, "failed": 1})
+
+    def test_list_results_reused_until_completion(self):
+        calls = []
+
+        def fetch(limit=20):
+            calls.append(limit)
+            return iter([_task("m1")])
+
+        source = registry.get_source("gmail")
+        with patch.object(gmail, "iter_task_emails", side_effect=fetch), \
+                patch.object(gmail, "archive_email_tasks", side_effect=lambda ids: {i: True for i in ids}):
+            first = source.list_tasks()
+            first.clear()
+            self.assertEqual([t.id for t in source.list_tasks()], ["m1"])
+            source.list_tasks(5)
+            self.assertEqual(calls, [20, 5])
+
+            source.complete_tasks(["m1"])
+            source.list_tasks()
+            self.assertEqual(calls, [20, 5, 20])
+
+    def test_list_cache_ttl_per_source(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return iter([_task("o1", TaskSource.OUTLOOK)])
+
+        uncached = replace(registry.get_source("outlook"), policy=SourcePolicy(ttl_seconds=0))
+        with patch.object(outlook, "iter_outlook_tasks", side_effect=fetch):
+            uncached.list_tasks()
+            uncached.list_tasks()
+            self.assertEqual(len(calls), 2)
+            registry.get_source("outlook").list_tasks()
+            registry.get_source("outlook").list_tasks()
+            self.assertEqual(len(calls), 3)
+
+    def test_source_without_completion(self):
+        source = RegisteredSource("trello", "gmail", "iter_task_emails")
+        self.assertFalse(source.can_complete())
+        with self.assertRaises(NotImplementedError):
+            source.complete_tasks(["t1"])
+
+    def test_incremental_sources_have_changes(self):
+        for source in registry.sources(Capability.INCREMENTAL):
+            self.assertIsNotNone(source.changes_fn, source.name)
+        with self.assertRaises(NotImplementedError):
+            registry.get_source("gmail").iter_changes({})
+
+    def test_capabilities_need_their_functions(self):
+        with self.assertRaises(ValueError):
+            RegisteredSource("trello", "gmail", "iter_task_emails", capabilities=frozenset({Capability.INCREMENTAL}))
+        with self.assertRaises(ValueError):
+            RegisteredSource("trello", "gmail", "iter_task_emails", capabilities=frozenset({Capability.BATCH_WRITE}))
+
+    def test_register_custom_source(self):
+        saved = dict(registry.SOURCES)
+        self.addCleanup(lambda: (registry.SOURCES.clear(), registry.SOURCES.update(saved)))
+        registry.register(RegisteredSource("trello", "gmail", "iter_task_emails", required_env=("TRELLO_KEY",)))
+
+        self.assertEqual(registry.sources()[-1].name, "trello")
+        with patch.dict(os.environ, {"TRELLO_KEY": ""}):
+            self.assertNotIn("trello", [s.name for s in registry.sources(configured_only=True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""test_retention.py — Tests for src/db/retention.py.
+
+Uses temporary SQLite databases. No external services required.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from db.sqlite_store import get_sync_log, init_db
+from db.retention import (
+    compact_sync_log,
+    enable_incremental_vacuum,
+    get_sync_rollups,
+    maybe_compact,
+)
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+class RetentionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = init_db(os.path.join(self.tmpdir, "test.db"))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def log(self, when, source="gmail", status="success", duration_ms=100.0, requests=2, message=None):
+        """Insert one raw sync_log row at ``when`` (datetime or SQLite-format string)."""
+        timestamp = when.isoformat() if isinstance(when, datetime) else when
+        self.conn.execute(
+            "INSERT INTO sync_log (source, operation, task_count, status, message, timestamp,"
+            " duration_ms, request_count, bytes_transferred, throttle_seconds)"
+            " VALUES (?, 'sync_cycle', 5, ?, ?, ?, ?, ?, 1000, 0.5)",
+            (source, status, message, timestamp, duration_ms, requests),
+        )
+        self.conn.commit()
+
+
+class TestCompaction(RetentionTestCase):
+    """Raw rows -> hourly -> daily rollups."""
+
+    def test_old_rows_rolled_up_and_deleted(self):
+        old = NOW - timedelta(days=40)
+        self.log(old.replace(minute=5), duration_ms=100.0)
+        self.log(old.replace(minute=35), duration_ms=300.0, requests=4)
+        self.log(old.replace(minute=50), status="error", duration_ms=None, requests=None)
+        self.log("2026-09-01 08:15:00", source="outlook")  # datetime('now') format
+        self.log(NOW - timedelta(days=2))
+
+        result = compact_sync_log(self.conn, retention_days=30, now=NOW)
+
+        self.assertEqual(result["raw_rows"], 4)
+        self.assertEqual(len(get_sync_log(self.conn)), 1)
+        hourly = {(r["source"], r["status"]): r for r in get_sync_rollups(self.conn)}
+        ok = hourly[("gmail", "success")]
+        self.assertEqual(ok["bucket"], old.strftime("%Y-%m-%dT%H:00:00"))
+        self.assertEqual(
+            (ok["runs"], ok["task_count"], ok["timed_runs"], ok["request_count"], ok["bytes_transferred"]),
+            (2, 10, 2, 6, 2000),
+        )
+        self.assertEqual((ok["duration_ms_max"], ok["avg_duration_ms"]), (300.0, 200.0))
+        self.assertEqual(ok["throttle_seconds"], 1.0)
+        self.assertEqual(hourly[("gmail", "error")]["timed_runs"], 0)
+        self.assertIsNone(hourly[("gmail", "error")]["avg_duration_ms"])
+        self.assertEqual(hourly[("outlook", "success")]["bucket"], "2026-09-01T08:00:00")
+
+    def test_batches_merge_into_existing_buckets(self):
+        old = NOW - timedelta(days=40)
+        for minute in range(10):
+            self.log(old.replace(minute=minute), duration_ms=float(minute))
+        compact_sync_log(self.conn, retention_days=30, batch_size=3, pause=0, now=NOW)
+        # A late row for the same hour merges into the existing bucket.
+        self.log(old.replace(minute=59), duration_ms=500.0)
+        result = compact_sync_log(self.conn, retention_days=30, batch_size=3, pause=0, now=NOW)
+
+        self.assertEqual(result["raw_rows"], 1)
+        (row,) = get_sync_rollups(self.conn)
+        self.assertEqual((row["runs"], row["duration_ms_max"]), (11, 500.0))
+        self.assertEqual(row["duration_ms_sum"], sum(range(10)) + 500.0)
+        self.assertEqual(compact_sync_log(self.conn, retention_days=30, now=NOW)["raw_rows"], 0)
+
+    def test_hourly_rolled_into_daily(self):
+        day = NOW - timedelta(days=200)
+        self.log(day.replace(hour=1), duration_ms=100.0)
+        self.log(day.replace(hour=5), duration_ms=700.0)
+        self.log(NOW - timedelta(days=60))
+
+        result = compact_sync_log(self.conn, retention_days=30, hourly_days=180, now=NOW)
+
+        self.assertEqual((result["raw_rows"], result["hourly_rows"]), (3, 2))
+        (daily,) = get_sync_rollups(self.conn, "daily")
+        self.assertEqual(daily["bucket"], day.strftime("%Y-%m-%d"))
+        self.assertEqual((daily["runs"], daily["avg_duration_ms"], daily["duration_ms_max"]), (2, 400.0, 700.0))
+        self.assertEqual(len(get_sync_rollups(self.conn, "hourly")), 1)
+
+    def test_rollup_filters(self):
+        old = NOW - timedelta(days=40)
+        self.log(old, source="gmail")
+        self.log(old + timedelta(days=1), source="jira")
+        compact_sync_log(self.conn, retention_days=30, now=NOW)
+
+        self.assertEqual([r["source"] for r in get_sync_rollups(self.conn, source="jira")], ["jira"])
+        since = (old + timedelta(days=1)).strftime("%Y-%m-%d")
+        self.assertEqual([r["source"] for r in get_sync_rollups(self.conn, since=since)], ["jira"])
+
+
+class TestVacuum(RetentionTestCase):
+    """Incremental vacuum releases pages freed by deletes."""
+
+    def test_pages_released(self):
+        self.assertEqual(self.conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        old = NOW - timedelta(days=40)
+        for i in range(300):
+            self.log(old + timedelta(seconds=i), message="x" * 2000)
+
+        result = compact_sync_log(self.conn, retention_days=30, now=NOW)
+
+        self.assertGreater(result["pages_released"], 0)
+        self.assertEqual(self.conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+
+    def test_enable_on_legacy_database(self):
+        path = os.path.join(self.tmpdir, "legacy.db")
+        legacy = sqlite3.connect(path)
+        legacy.execute("CREATE TABLE t (x)")
+        legacy.close()
+
+        conn = init_db(path)
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+        enable_incremental_vacuum(conn)
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        conn.close()
+
+
+class TestMaybeCompact(RetentionTestCase):
+    """maybe_compact() runs at most once per interval."""
+
+    def test_interval(self):
+        self.log(NOW - timedelta(days=40))
+        self.assertEqual(maybe_compact(self.conn, now=NOW)["raw_rows"], 1)
+
+        self.log(NOW - timedelta(days=40))
+        self.assertIsNone(maybe_compact(self.conn, now=NOW + timedelta(hours=1)))
+        self.assertEqual(maybe_compact(self.conn, now=NOW + timedelta(hours=7))["raw_rows"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,73 @@ class TestModelsImport:
         assert expected == fields
 
 
+class TestToolInstrumentation:
+    """Every MCP tool is wrapped by metrics.instrument_tool."""
+
+    def test_tools_are_instrumented(self):
+        import asyncio
+        import server
+
+        names = [t.name for t in asyncio.run(server.mcp.list_tools())]
+        assert "get_performance_stats" in names
+        for name in names:
+            if name != "get_performance_stats":
+                assert hasattr(getattr(server, name), "__wrapped__"), name
+
+
+class TestLazyIntegrations:
+    """Integration modules are imported on first use of their tools."""
+
+    def test_integration_loaded_on_demand(self):
+        import sys
+        import server
+
+        module = server._integration("n8n")
+        assert module is sys.modules[module.__name__]
+        assert hasattr(module, "get_workflows")
+
+
+class TestRequestCoalescing:
+    """Identical concurrent read tools share one fetch per source."""
+
+    def test_concurrent_get_source_tasks(self):
+        import threading
+        import time
+        from unittest.mock import patch
+        import server
+        from integrations import notion, registry
+        from models import TaskSource, UnifiedTask
+
+        registry._list_flight.clear()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            yield UnifiedTask(id="n1", source=TaskSource.NOTION, title="Task", status="active")
+
+        results = []
+        with patch.object(notion, "iter_notion_tasks", side_effect=fetch), \
+                patch.object(notion, "create_task", return_value=None):
+            threads = [
+                threading.Thread(target=lambda: results.append(server.get_source_tasks("notion")))
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(calls) == 1
+            assert [[t["id"] for t in r] for r in results] == [["n1"]] * 5
+
+            server.get_source_tasks("Notion")
+            assert len(calls) == 1
+            server.create_notion_task("New task")
+            server.get_source_tasks("notion")
+            assert len(calls) == 2
+        registry._list_flight.clear()
+
+
 class TestRequirements:
     """Validate that requirements.txt lists expected dependencies."""
 
@@ -0,0 +1,162 @@
+"""test_singleflight.py — Tests for src/singleflight.py.
+
+No external services required.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import metrics
+from singleflight import SingleFlight
+
+
+class SlowFetch:
+    """Counts calls and blocks each one until released."""
+
+    def __init__(self, result="tasks"):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.result = result
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(self.result, BaseException):
+            raise self.result
+        return self.result
+
+
+def _run_concurrently(flight, key, fn, n):
+    """Start ``n`` callers of ``flight.do(key, fn)``; return threads and outcomes."""
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(flight.do(key, fn))
+        except Exception as exc:
+            outcomes.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, outcomes
+
+
+def _wait_for_waiters(flight, n):
+    deadline = time.monotonic() + 5
+    while flight.stats()["shared"] < n and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestCoalescing(unittest.TestCase):
+    """Concurrent identical calls share one execution."""
+
+    def test_concurrent_calls_share_one_fetch(self):
+        flight = SingleFlight()
+        fetch = SlowFetch()
+        threads, outcomes = _run_concurrently(flight, ("notion", None), fetch, 8)
+        fetch.started.wait(5)
+        _wait_for_waiters(flight, 7)
+        fetch.release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(outcomes, ["tasks"] * 8)
+        self.assertEqual(flight.stats(), {"executed": 1, "shared": 7, "cached": 0})
+        # Without a TTL the next call fetches again.
+        fetch.release.set()
+        flight.do(("notion", None), fetch)
+        self.assertEqual(fetch.calls, 2)
+
+    def test_distinct_keys_run_separately(self):
+        flight = SingleFlight(ttl=60)
+        self.assertEqual(flight.do(("gmail", 10), lambda: 10), 10)
+        self.assertEqual(flight.do(("gmail", 20), lambda: 20), 20)
+        self.assertEqual(flight.stats()["executed"], 2)
+
+    def test_errors_shared_not_cached(self):
+        flight = SingleFlight(ttl=60)
+        fetch = SlowFetch(RuntimeError("notion 500"))
+        threads, outcomes = _run_concurrently(flight, "k", fetch, 3)
+        fetch.started.wait(5)
+        _wait_for_waiters(flight, 2)
+        fetch.release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual([type(o) for o in outcomes], [RuntimeError] * 3)
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+
+class TestResultCache(unittest.TestCase):
+    """Results are reused for the TTL and dropped on invalidation."""
+
+    def test_ttl(self):
+        now = [0.0]
+        flight = SingleFlight(ttl=5, clock=lambda: now[0])
+        calls = []
+        fetch = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(flight.do("k", fetch), 1)
+        now[0] = 4.9
+        self.assertEqual(flight.do("k", fetch), 1)
+        now[0] = 5.0
+        self.assertEqual(flight.do("k", fetch), 2)
+        self.assertEqual(flight.stats(), {"executed": 2, "shared": 0, "cached": 1})
+
+    def test_per_call_ttl(self):
+        now = [0.0]
+        flight = SingleFlight(ttl=5, clock=lambda: now[0])
+        calls = []
+        fetch = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(flight.do("long", fetch, ttl=60), 1)
+        self.assertEqual(flight.do("off", fetch, ttl=0), 2)
+        now[0] = 30.0
+        self.assertEqual(flight.do("long", fetch), 1)
+        self.assertEqual(flight.do("off", fetch, ttl=0), 3)
+
+    def test_invalidate(self):
+        flight = SingleFlight(ttl=60)
+        flight.do(("gmail", None), lambda: "old")
+        flight.do(("jira", None), lambda: "jira")
+
+        self.assertEqual(flight.invalidate(lambda key: key[0] == "gmail"), 1)
+        self.assertEqual(flight.do(("gmail", None), lambda: "new"), "new")
+        self.assertEqual(flight.do(("jira", None), lambda: "other"), "jira")
+
+    def test_invalidated_in_flight_result_not_cached(self):
+        flight = SingleFlight(ttl=60)
+        fetch = SlowFetch("before write")
+        threads, outcomes = _run_concurrently(flight, "k", fetch, 1)
+        fetch.started.wait(5)
+        flight.invalidate(lambda key: True)
+        fetch.release.set()
+        threads[0].join()
+
+        self.assertEqual(outcomes, ["before write"])
+        self.assertEqual(flight.do("k", lambda: "after write"), "after write")
+
+    def test_metrics(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        flight = SingleFlight(ttl=60)
+        for _ in range(3):
+            flight.do("k", lambda: 1, ("notion", "list_tasks"))
+
+        series = metrics.get_performance_stats()["providers"]["notion"]["endpoints"]["list_tasks"]
+        self.assertEqual((series["cache_hits"], series["cache_misses"]), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
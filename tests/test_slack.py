@@ -0,0 +1,365 @@
+"""test_slack.py — Tests for src/integrations/slack.py.
+
+The Slack Web API is replaced by an in-process fake; no network access or
+tokens are required.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import slack
+from db.sqlite_store import init_db, get_tasks, get_sync_cursors, set_sync_cursors
+
+
+def _msg(ts: str, text: str, tagged: bool = True) -> dict:
+    msg = {"ts": ts, "text": text}
+    if tagged:
+        msg["reactions"] = [{"name": slack.SLACK_TASK_REACTION, "count": 1}]
+    return msg
+
+
+class FakeSlack:
+    """Minimal Slack Web API stand-in keyed by method name.
+
+    ``history`` maps channel ID to a list of pages (each a list of messages,
+    newest first). ``conversations.history`` honours ``cursor`` and ``oldest``.
+    """
+
+    def __init__(
+        self,
+        history: dict,
+        channels: list = None,
+        channel_page_size: int = 2,
+        search_pages: list = None,
+        reaction_pages: list = None,
+        errors: dict = None,
+    ):
+        self.history = history
+        self.channels = channels or []
+        self.channel_page_size = channel_page_size
+        self.search_pages = search_pages or [[]]
+        self.reaction_pages = reaction_pages or [[]]
+        self.errors = errors or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, provider, method, url, **kwargs):
+        params = kwargs.get("params", {})
+        api_method = url.rsplit("/", 1)[-1]
+        with self._lock:
+            self.calls.append((api_method, dict(params)))
+        resp = MagicMock()
+        resp.status_code = 200
+        if api_method in self.errors:
+            resp.json.return_value = {"ok": False, "error": self.errors[api_method]}
+        else:
+            handler = getattr(self, "_" + api_method.replace(".", "_"))
+            resp.json.return_value = handler(params)
+        return resp
+
+    def _search_messages(self, params):
+        page = int(params.get("page", 1))
+        return {
+            "ok": True,
+            "messages": {
+                "matches": self.search_pages[page - 1],
+                "paging": {"page": page, "pages": len(self.search_pages)},
+            },
+        }
+
+    def _reactions_list(self, params):
+        index = int(params.get("cursor") or 0)
+        has_more = index + 1 < len(self.reaction_pages)
+        return {
+            "ok": True,
+            "items": self.reaction_pages[index],
+            "response_metadata": {"next_cursor": str(index + 1) if has_more else ""},
+        }
+
+    def _conversations_list(self, params):
+        start = int(params.get("cursor") or 0)
+        page = self.channels[start:start + self.channel_page_size]
+        nxt = start + self.channel_page_size
+        return {
+            "ok": True,
+            "channels": page,
+            "response_metadata": {"next_cursor": str(nxt) if nxt < len(self.channels) else ""},
+        }
+
+    def _conversations_history(self, params):
+        pages = self.history.get(params["channel"])
+        if pages is None:
+            return {"ok": False, "error": "channel_not_found"}
+        index = int(params.get("cursor") or 0)
+        oldest = float(params.get("oldest") or 0)
+        messages = [m for m in pages[index] if float(m["ts"]) > oldest]
+        has_more = index + 1 < len(pages)
+        return {
+            "ok": True,
+            "messages": messages,
+            "has_more": has_more,
+            "response_metadata": {"next_cursor": str(index + 1) if has_more else ""},
+        }
+
+
+class SlackTestCase(unittest.TestCase):
+    """Base class patching the token, channel config and lookback window."""
+
+    def setUp(self):
+        patches = [
+            patch.object(slack, "SLACK_BOT_TOKEN", "xoxb-test"),
+            patch.object(slack, "SLACK_TASK_CHANNELS", ""),
+            patch.object(slack, "SLACK_HISTORY_LOOKBACK_DAYS", 0),
+            patch.object(slack, "SLACK_WATERMARK_GRACE_SECONDS", 0),
+            patch.object(slack, "SLACK_TASK_MODE", "auto"),
+            patch.object(slack, "SLACK_USER_TOKEN", ""),
+            patch.object(slack, "SLACK_TASK_USER", ""),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def use_fake(self, fake: FakeSlack) -> FakeSlack:
+        p = patch.object(slack.ratelimit, "request", side_effect=fake)
+        p.start()
+        self.addCleanup(p.stop)
+        return fake
+
+
+class TestChannelDiscovery(SlackTestCase):
+    """Tests for _get_channel_ids pagination."""
+
+    def test_follows_cursors(self):
+        """All pages of conversations.list are read and only member channels kept."""
+        fake = self.use_fake(FakeSlack({}, channels=[
+            {"id": "C1", "is_member": True},
+            {"id": "C2", "is_member": False},
+            {"id": "C3", "is_member": True},
+            {"id": "C4", "is_member": True},
+            {"id": "C5", "is_member": True},
+        ]))
+        self.assertEqual(slack._get_channel_ids(), ["C1", "C3", "C4", "C5"])
+        self.assertEqual(sum(1 for c in fake.calls if c[0] == "conversations.list"), 3)
+
+    def test_configured_channels_skip_discovery(self):
+        """SLACK_TASK_CHANNELS short-circuits discovery."""
+        fake = self.use_fake(FakeSlack({}))
+        with patch.object(slack, "SLACK_TASK_CHANNELS", "C9, C8"):
+            self.assertEqual(slack._get_channel_ids(), ["C9", "C8"])
+        self.assertEqual(fake.calls, [])
+
+
+class TestScanSlackChannels(SlackTestCase):
+    """Tests for cursor pagination, concurrency and watermarks."""
+
+    def test_reads_every_history_page(self):
+        """Tagged messages on later pages are returned."""
+        self.use_fake(FakeSlack({
+            "C1": [
+                [_msg("300.0", "urgent: ship it"), _msg("290.0", "chatter", tagged=False)],
+                [_msg("200.0", "second page task")],
+            ],
+        }))
+        result = slack.scan_slack_channels(channels=["C1"])
+
+        self.assertEqual([t.id for t in result.tasks], ["slack-C1-300.0", "slack-C1-200.0"])
+        self.assertEqual(result.tasks[0].priority, "high")
+        self.assertEqual(result.watermarks, {"C1": "300.0"})
+
+    def test_results_keep_channel_order(self):
+        """Concurrent scans are reassembled in channel order."""
+        self.use_fake(FakeSlack({
+            "C1": [[_msg("10.0", "a")]],
+            "C2": [[_msg("20.0", "b")]],
+            "C3": [[_msg("30.0", "c")]],
+        }))
+        result = slack.scan_slack_channels(channels=["C1", "C2", "C3"], max_workers=3)
+        self.assertEqual([t.title for t in result.tasks], ["a", "b", "c"])
+
+    def test_watermark_bounds_next_scan(self):
+        """A stored watermark is passed as ``oldest`` and filters old messages."""
+        fake = self.use_fake(FakeSlack({
+            "C1": [[_msg("300.0", "new"), _msg("100.0", "old")]],
+        }))
+        result = slack.scan_slack_channels(channels=["C1"], watermarks={"C1": "200.0"})
+
+        self.assertEqual([t.title for t in result.tasks], ["new"])
+        history_calls = [c for c in fake.calls if c[0] == "conversations.history"]
+        self.assertEqual(float(history_calls[0][1]["oldest"]), 200.0)
+
+    def test_watermark_not_advanced_when_truncated(self):
+        """Channels whose tasks were cut by ``limit`` keep their old watermark."""
+        self.use_fake(FakeSlack({
+            "C1": [[_msg("30.0", "a")]],
+            "C2": [[_msg("50.0", "b")], [_msg("40.0", "c")]],
+        }))
+        result = slack.scan_slack_channels(
+            channels=["C1", "C2"], watermarks={"C2": "1.0"}, limit=2
+        )
+        self.assertEqual(len(result.tasks), 2)
+        self.assertEqual(result.watermarks, {"C1": "30.0", "C2": "1.0"})
+
+    def test_api_error_is_isolated(self):
+        """A failing channel does not prevent others from being scanned."""
+        self.use_fake(FakeSlack({"C2": [[_msg("5.0", "ok")]]}))
+        result = slack.scan_slack_channels(channels=["C1", "C2"])
+        self.assertEqual([t.title for t in result.tasks], ["ok"])
+        self.assertNotIn("C1", result.watermarks)
+
+    def test_disabled_without_token(self):
+        """No token means no API calls and no tasks."""
+        fake = self.use_fake(FakeSlack({"C1": [[_msg("1.0", "x")]]}))
+        with patch.object(slack, "SLACK_BOT_TOKEN", ""):
+            self.assertEqual(slack.list_slack_tasks(), [])
+        self.assertEqual(fake.calls, [])
+
+
+class TestTaggedMessageLookup(SlackTestCase):
+    """Tests for search.messages / reactions.list lookups and fallback."""
+
+    def _match(self, channel: str, ts: str, text: str) -> dict:
+        return {"channel": {"id": channel}, "ts": ts, "text": text}
+
+    def test_search_mode_avoids_history(self):
+        """With a user token, tasks come from paged search results."""
+        fake = self.use_fake(FakeSlack(
+            {"C1": [[_msg("1.0", "history")]]},
+            search_pages=[[self._match("C1", "9.0", "a")], [self._match("C2", "8.0", "b")]],
+        ))
+        with patch.object(slack, "SLACK_USER_TOKEN", "xoxp-test"):
+            tasks = slack.list_slack_tasks()
+
+        self.assertEqual([t.id for t in tasks], ["slack-C1-9.0", "slack-C2-8.0"])
+        self.assertNotIn("conversations.history", [c[0] for c in fake.calls])
+        self.assertEqual(fake.calls[0][1]["query"], f"has::{slack.SLACK_TASK_REACTION}:")
+
+    def test_search_respects_configured_channels(self):
+        """Search matches outside SLACK_TASK_CHANNELS are dropped."""
+        self.use_fake(FakeSlack(
+            {}, search_pages=[[self._match("C1", "9.0", "a"), self._match("C2", "8.0", "b")]],
+        ))
+        with patch.object(slack, "SLACK_USER_TOKEN", "xoxp-test"), \
+                patch.object(slack, "SLACK_TASK_CHANNELS", "C2"):
+            tasks = slack.list_slack_tasks()
+        self.assertEqual([t.title for t in tasks], ["b"])
+
+    def test_missing_scope_falls_back_to_history(self):
+        """A missing_scope error falls back to the channel history scan."""
+        fake = self.use_fake(FakeSlack(
+            {"C1": [[_msg("1.0", "from history")]]},
+            errors={"search.messages": "missing_scope"},
+        ))
+        with patch.object(slack, "SLACK_USER_TOKEN", "xoxp-test"), \
+                patch.object(slack, "SLACK_TASK_CHANNELS", "C1"):
+            tasks = slack.list_slack_tasks(mode="search")
+        self.assertEqual([t.title for t in tasks], ["from history"])
+        self.assertIn("conversations.history", [c[0] for c in fake.calls])
+
+    def test_error_on_later_page_falls_back_to_history(self):
+        """A failure after the first search page is not taken as a complete result."""
+        fake = FakeSlack(
+            {"C1": [[_msg("1.0", "from history")]]},
+            search_pages=[[self._match("C1", "9.0", "a")], [self._match("C1", "8.0", "b")]],
+        )
+
+        def flaky(provider, method, url, **kwargs):
+            if url.endswith("search.messages") and kwargs["params"]["page"] == 2:
+                resp = MagicMock()
+                resp.json.return_value = {"ok": False, "error": "ratelimited"}
+                return resp
+            return fake(provider, method, url, **kwargs)
+
+        self.use_fake(flaky)
+        with patch.object(slack, "SLACK_USER_TOKEN", "xoxp-test"), \
+                patch.object(slack, "SLACK_TASK_CHANNELS", "C1"):
+            with self.assertLogs(slack.logger, "WARNING"):
+                tasks = slack.list_slack_tasks(mode="search")
+        self.assertEqual([t.title for t in tasks], ["from history"])
+
+    def test_reactions_error_falls_back_to_history(self):
+        """Non-scope reactions.list errors fall back to the history scan too."""
+        self.use_fake(FakeSlack(
+            {"C1": [[_msg("1.0", "from history")]]},
+            errors={"reactions.list": "internal_error"},
+        ))
+        with patch.object(slack, "SLACK_TASK_USER", "U1"), \
+                patch.object(slack, "SLACK_TASK_CHANNELS", "C1"):
+            tasks = slack.list_slack_tasks(mode="reactions")
+        self.assertEqual([t.title for t in tasks], ["from history"])
+
+    def test_reactions_mode_filters_by_user(self):
+        """reactions.list items only count when SLACK_TASK_USER added the reaction."""
+        reaction = slack.SLACK_TASK_REACTION
+        items = [
+            {"type": "message", "channel": "C1", "message": {
+                "ts": "5.0", "text": "mine",
+                "reactions": [{"name": reaction, "users": ["U1"]}]}},
+            {"type": "message", "channel": "C1", "message": {
+                "ts": "4.0", "text": "other emoji",
+                "reactions": [{"name": "eyes", "users": ["U1"]}]}},
+            {"type": "file", "file": {"id": "F1"}},
+        ]
+        self.use_fake(FakeSlack({}, reaction_pages=[items[:2], items[2:]]))
+        with patch.object(slack, "SLACK_TASK_USER", "U1"):
+            tasks = slack.list_slack_tasks(mode="reactions")
+        self.assertEqual([t.title for t in tasks], ["mine"])
+
+    def test_history_mode_skips_lookups(self):
+        """mode='history' never calls the lookup endpoints."""
+        self.assertIsNone(slack.find_tagged_messages(mode="history"))
+
+
+class TestSyncSlackTasks(SlackTestCase):
+    """Tests for the store-backed incremental sync."""
+
+    def test_persists_tasks_and_watermarks(self):
+        """sync_slack_tasks saves tasks and uses stored watermarks next time."""
+        fake = self.use_fake(FakeSlack({"C1": [[_msg("300.0", "task")]]}))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = init_db(os.path.join(tmpdir, "test.db"))
+            with patch.object(slack, "SLACK_TASK_CHANNELS", "C1"):
+                set_sync_cursors(conn, "slack", {"C1": "100.0"})
+                self.assertEqual(slack.sync_slack_tasks(conn), 1)
+
+            self.assertEqual(get_sync_cursors(conn, "slack"), {"C1": "300.0"})
+            self.assertEqual([t.id for t in get_tasks(conn, source="slack")], ["slack-C1-300.0"])
+            self.assertEqual(float(fake.calls[0][1]["oldest"]), 100.0)
+            conn.close()
+
+
+class TestIterSlackChanges(SlackTestCase):
+    """Tests for the registry's incremental Slack fetch."""
+
+    def test_scans_from_watermarks_and_advances_them(self):
+        fake = self.use_fake(FakeSlack({"C1": [[_msg("300.0", "task")]]}))
+        cursors = {"C1": "100.0"}
+        with patch.object(slack, "SLACK_TASK_CHANNELS", "C1"), patch.object(slack, "SLACK_TASK_MODE", "history"):
+            tasks = slack.iter_slack_changes(cursors)
+            self.assertEqual(next(tasks).id, "slack-C1-300.0")
+            self.assertEqual(cursors, {"C1": "100.0"})
+            self.assertEqual(list(tasks), [])
+
+        self.assertEqual(cursors, {"C1": "300.0"})
+        self.assertEqual(float(fake.calls[0][1]["oldest"]), 100.0)
+
+
+class TestCompleteSlackTasks(SlackTestCase):
+    """complete_slack_tasks maps task IDs to reactions.add calls."""
+
+    def test_parses_task_ids(self):
+        with patch.object(slack, "mark_slack_task_done", side_effect=lambda c, ts: c == "C1") as mark:
+            results = slack.complete_slack_tasks(["slack-C1-300.0", "slack-C2-5.5", "gmail-1"])
+
+        self.assertEqual(results, {"slack-C1-300.0": True, "slack-C2-5.5": False, "gmail-1": False})
+        self.assertEqual([c.args for c in mark.call_args_list], [("C1", "300.0"), ("C2", "5.5")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+"""test_slack_events.py — Tests for src/integrations/slack_events.py.
+
+Replays recorded Slack Events fixtures (tests/fixtures/slack_events/) against
+a local receiver backed by a temporary SQLite store. Message lookups are
+mocked; no Slack access is required.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from integrations import slack, slack_events
+from integrations.slack_events import (
+    SlackEventsServer,
+    handle_event,
+    replay_events,
+    sign_request,
+    verify_signature,
+)
+from db.sqlite_store import init_db, get_task, save_task
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "slack_events")
+SECRET = "8f742231b10e8888abcd99yyyzzz85a5"
+TASK_ID = "slack-C0G9QF9GZ-1360782400.498405"
+
+
+def _fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tagged_message(text: str = "renew the TLS certificate") -> dict:
+    return {
+        "ts": "1360782400.498405",
+        "text": text,
+        "reactions": [{"name": "white_check_mark", "count": 1}],
+    }
+
+
+class TestSignature(unittest.TestCase):
+    """Tests for Slack v0 request signing."""
+
+    def test_round_trip(self):
+        body = b'{"type":"event_callback"}'
+        sig = sign_request(SECRET, "1531420618", body)
+        self.assertTrue(verify_signature(SECRET, "1531420618", body, sig, now=1531420618))
+
+    def test_tampered_body_rejected(self):
+        sig = sign_request(SECRET, "1531420618", b"original")
+        self.assertFalse(verify_signature(SECRET, "1531420618", b"tampered", sig, now=1531420618))
+
+    def test_stale_timestamp_rejected(self):
+        sig = sign_request(SECRET, "1531420618", b"x")
+        self.assertFalse(verify_signature(SECRET, "1531420618", b"x", sig, now=1531420618 + 301))
+
+    def test_missing_headers_rejected(self):
+        self.assertFalse(verify_signature(SECRET, None, b"x", None))
+
+
+class TestHandleEvent(unittest.TestCase):
+    """Tests for handle_event() applied to recorded fixtures."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = init_db(os.path.join(self.tmpdir, "test.db"))
+        for p in (
+            patch.object(slack, "SLACK_TASK_REACTION", "white_check_mark"),
+            patch.object(slack, "SLACK_TASK_CHANNELS", ""),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.conn.close()
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_reaction_added_upserts(self, mock_fetch):
+        mock_fetch.return_value = _tagged_message("urgent: renew cert")
+        self.assertEqual(handle_event(self.conn, _fixture("reaction_added")), "upsert")
+
+        task = get_task(self.conn, TASK_ID)
+        self.assertEqual(task.title, "urgent: renew cert")
+        self.assertEqual(task.priority, "high")
+        mock_fetch.assert_called_once_with("C0G9QF9GZ", "1360782400.498405")
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_reaction_removed_deletes_when_no_reaction_left(self, mock_fetch):
+        save_task(self.conn, slack._message_to_task("C0G9QF9GZ", _tagged_message()))
+        mock_fetch.return_value = {"ts": "1360782400.498405", "text": "x", "reactions": []}
+
+        self.assertEqual(handle_event(self.conn, _fixture("reaction_removed")), "delete")
+        self.assertIsNone(get_task(self.conn, TASK_ID))
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_reaction_removed_keeps_task_tagged_by_others(self, mock_fetch):
+        mock_fetch.return_value = _tagged_message()
+        self.assertEqual(handle_event(self.conn, _fixture("reaction_removed")), "upsert")
+        self.assertIsNotNone(get_task(self.conn, TASK_ID))
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_reaction_removed_keeps_task_when_fetch_fails(self, mock_fetch):
+        save_task(self.conn, slack._message_to_task("C0G9QF9GZ", _tagged_message()))
+        for failure in (None, RuntimeError("slack down")):
+            if failure is None:
+                mock_fetch.return_value = None
+            else:
+                mock_fetch.side_effect = failure
+            with self.assertLogs("integrations.slack_events", "WARNING"):
+                self.assertEqual(handle_event(self.conn, _fixture("reaction_removed")), "ignored")
+            self.assertIsNotNone(get_task(self.conn, TASK_ID))
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_other_reactions_ignored(self, mock_fetch):
+        payload = _fixture("reaction_added")
+        payload["event"]["reaction"] = "eyes"
+        self.assertEqual(handle_event(self.conn, payload), "ignored")
+        mock_fetch.assert_not_called()
+
+    def test_message_changed_updates_text(self):
+        self.assertEqual(handle_event(self.conn, _fixture("message_changed")), "upsert")
+        task = get_task(self.conn, TASK_ID)
+        self.assertTrue(task.title.startswith("URGENT: renew"))
+
+    def test_message_changed_untracked_untagged_ignored(self):
+        payload = _fixture("message_changed")
+        payload["event"]["message"].pop("reactions")
+        self.assertEqual(handle_event(self.conn, payload), "ignored")
+        self.assertIsNone(get_task(self.conn, TASK_ID))
+
+    def test_message_deleted_removes_task(self):
+        save_task(self.conn, slack._message_to_task("C0G9QF9GZ", _tagged_message()))
+        self.assertEqual(handle_event(self.conn, _fixture("message_deleted")), "delete")
+        self.assertIsNone(get_task(self.conn, TASK_ID))
+
+    def test_unmonitored_channel_ignored(self):
+        with patch.object(slack, "SLACK_TASK_CHANNELS", "C999"):
+            self.assertEqual(handle_event(self.conn, _fixture("message_changed")), "ignored")
+
+
+class TestReceiverReplay(unittest.TestCase):
+    """End-to-end: replay signed fixtures against a live local receiver."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "events.db")
+        self.server = SlackEventsServer(("127.0.0.1", 0), signing_secret=SECRET, db_path=self.db_path)
+        self.url = "http://127.0.0.1:%d/slack/events" % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+
+    @patch("integrations.slack_events._fetch_message")
+    def test_replay_sequence(self, mock_fetch):
+        mock_fetch.return_value = _tagged_message()
+        names = ["url_verification", "reaction_added", "message_changed", "message_deleted"]
+        responses = replay_events([_fixture(n) for n in names], self.url, signing_secret=SECRET)
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 200, 200])
+        self.assertEqual(responses[0].json()["challenge"], _fixture("url_verification")["challenge"])
+        self.assertEqual(
+            [r.json()["action"] for r in responses[1:]], ["upsert", "upsert", "delete"]
+        )
+
+        conn = init_db(self.db_path)
+        self.assertIsNone(get_task(conn, TASK_ID))
+        conn.close()
+
+    def test_bad_signature_rejected(self):
+        responses = replay_events([_fixture("reaction_added")], self.url, signing_secret="wrong")
+        self.assertEqual(responses[0].status_code, 401)
+
+    def test_server_requires_secret(self):
+        with patch.object(slack_events, "SLACK_SIGNING_SECRET", ""):
+            with self.assertRaises(ValueError):
+                SlackEventsServer(("127.0.0.1", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
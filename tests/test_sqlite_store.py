@@ -20,11 +20,18 @@ from db.sqlite_store import (
     save_task,
     save_tasks,
     get_tasks,
+    get_task,
     delete_task,
     register_source,
     get_sources,
+    ensure_source,
+    get_last_sync,
     mark_synced,
     get_sync_log,
+    get_sync_cursors,
+    set_sync_cursors,
+    get_sync_stats,
+    find_sync_regressions,
 )
 
 
@@ -78,6 +85,48 @@ class TestInitDb(unittest.TestCase):
             conn2 = init_db(db_path)
             conn2.close()
 
+    def test_adds_fingerprint_column_to_old_database(self):
+        """init_db migrates a tasks table created without a fingerprint column."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "old.db")
+            old = sqlite3.connect(db_path)
+            old.execute(
+                "CREATE TABLE tasks (id TEXT PRIMARY KEY, source TEXT NOT NULL, title TEXT NOT NULL,"
+                " snippet TEXT, status TEXT NOT NULL DEFAULT 'Pending',"
+                " priority TEXT NOT NULL DEFAULT 'normal', due_date TEXT, link TEXT,"
+                " created_at TEXT NOT NULL DEFAULT (datetime('now')),"
+                " updated_at TEXT NOT NULL DEFAULT (datetime('now')))"
+            )
+            old.close()
+
+            conn = init_db(db_path)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            self.assertIn("fingerprint", columns)
+            self.assertTrue(save_task(conn, _make_task()))
+            conn.close()
+
+    def test_adds_performance_columns_to_old_sync_log(self):
+        """init_db migrates a sync_log table created without performance columns."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "old.db")
+            old = sqlite3.connect(db_path)
+            old.execute(
+                "CREATE TABLE sync_log (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL,"
+                " operation TEXT NOT NULL, task_count INTEGER NOT NULL DEFAULT 0,"
+                " status TEXT NOT NULL DEFAULT 'success', message TEXT,"
+                " timestamp TEXT NOT NULL DEFAULT (datetime('now')))"
+            )
+            old.execute("INSERT INTO sync_log (source, operation) VALUES ('gmail', 'pull')")
+            old.commit()
+            old.close()
+
+            conn = init_db(db_path)
+            mark_synced(conn, "gmail", "pull", 1, duration_ms=12.5)
+            log = get_sync_log(conn)
+            conn.close()
+        self.assertEqual(len(log), 2)
+        self.assertEqual(sorted(r["duration_ms"] is None for r in log), [False, True])
+
 
 class TestTaskCRUD(unittest.TestCase):
     """Tests for save_task, save_tasks, get_tasks, delete_task."""
@@ -132,6 +181,35 @@ class TestTaskCRUD(unittest.TestCase):
         results = get_tasks(self.conn)
         self.assertEqual(len(results), 5)
 
+    def test_save_tasks_from_generator_in_chunks(self):
+        """save_tasks consumes a generator in chunks."""
+        tasks = (_make_task(id=f"t{i}", title=f"Task {i}") for i in range(7))
+        count = save_tasks(self.conn, tasks, chunk_size=3)
+        self.assertEqual(count, 7)
+        self.assertEqual(len(get_tasks(self.conn, limit=100)), 7)
+
+    def test_unchanged_task_not_rewritten(self):
+        """save_task skips a task whose fingerprint matches the stored row."""
+        self.assertTrue(save_task(self.conn, _make_task(id="t1")))
+        self.conn.execute("UPDATE tasks SET updated_at = 'marker' WHERE id = 't1'")
+        self.conn.commit()
+
+        self.assertFalse(save_task(self.conn, _make_task(id="t1")))
+        row = self.conn.execute("SELECT updated_at FROM tasks WHERE id = 't1'").fetchone()
+        self.assertEqual(row["updated_at"], "marker")
+
+        self.assertTrue(save_task(self.conn, _make_task(id="t1", status="Done")))
+        self.assertEqual(get_task(self.conn, "t1").status, "Done")
+
+    def test_save_tasks_counts_unchanged(self):
+        """save_tasks reports written vs unchanged rows."""
+        save_tasks(self.conn, [_make_task(id=f"t{i}") for i in range(4)])
+        counts = {}
+        batch = [_make_task(id=f"t{i}") for i in range(4)] + [_make_task(id="t1", title="Edited")]
+        count = save_tasks(self.conn, batch[:1] + batch[2:], counts=counts)
+        self.assertEqual(count, 4)
+        self.assertEqual(counts, {"written": 1, "unchanged": 3})
+
     def test_get_tasks_filter_by_source(self):
         """get_tasks filters by source."""
         save_task(self.conn, _make_task(id="g1", source="gmail", title="Gmail task"))
@@ -164,6 +242,12 @@ class TestTaskCRUD(unittest.TestCase):
         self.assertTrue(delete_task(self.conn, "to-delete"))
         self.assertEqual(len(get_tasks(self.conn)), 0)
 
+    def test_get_task_by_id(self):
+        """get_task returns the stored task or None."""
+        save_task(self.conn, _make_task(id="one", title="First"))
+        self.assertEqual(get_task(self.conn, "one").title, "First")
+        self.assertIsNone(get_task(self.conn, "missing"))
+
     def test_delete_nonexistent_task(self):
         """delete_task returns False when task doesn't exist."""
         self.assertFalse(delete_task(self.conn, "nonexistent"))
@@ -203,6 +287,15 @@ class TestSourceManagement(unittest.TestCase):
         self.assertIn("gmail", names)
         self.assertIn("slack", names)
 
+    def test_ensure_source_keeps_existing(self):
+        """ensure_source registers once and does not reset state."""
+        ensure_source(self.conn, "jira")
+        mark_synced(self.conn, "jira", "pull", 1)
+        ensure_source(self.conn, "jira")
+
+        self.assertEqual(len(get_sources(self.conn)), 1)
+        self.assertIsNotNone(get_last_sync(self.conn, "jira"))
+
     def test_register_source_upsert(self):
         """register_source updates existing source on conflict."""
         register_source(self.conn, "gmail", enabled=True)
@@ -245,6 +338,24 @@ class TestSyncLog(unittest.TestCase):
         notion_src = next(s for s in sources if s["name"] == "notion")
         self.assertIsNotNone(notion_src["last_sync_at"])
 
+    def test_error_does_not_advance_last_sync(self):
+        """Failed operations are logged but leave last_sync_at untouched."""
+        register_source(self.conn, "jira")
+        mark_synced(self.conn, "jira", "pull", 0, "error", "boom")
+        self.assertIsNone(get_last_sync(self.conn, "jira"))
+
+        mark_synced(self.conn, "jira", "pull", 1)
+        last = get_last_sync(self.conn, "jira")
+        self.assertIsNotNone(last)
+        self.assertIsNotNone(last.tzinfo)
+
+    def test_success_without_advance(self):
+        """Runs that keep their own sync point leave last_sync_at untouched."""
+        register_source(self.conn, "jira")
+        mark_synced(self.conn, "jira", "sync_cycle", 3, advance=False)
+        self.assertIsNone(get_last_sync(self.conn, "jira"))
+        self.assertEqual(get_sync_log(self.conn, source="jira")[0]["status"], "success")
+
     def test_get_sync_log_filter_by_source(self):
         """get_sync_log filters by source."""
         register_source(self.conn, "gmail")
@@ -274,6 +385,119 @@ class TestSyncLog(unittest.TestCase):
         self.assertEqual(log[0]["status"], "error")
         self.assertEqual(log[0]["message"], "API rate limited")
 
+    def test_mark_synced_records_performance(self):
+        """mark_synced stores duration, requests, bytes, throttle time and error class."""
+        mark_synced(
+            self.conn, "outlook", "sync_cycle", 40, "error", "boom",
+            duration_ms=812.5, request_count=7, bytes_transferred=52000,
+            throttle_seconds=1.25, error_class="ConnectionError",
+        )
+        row = get_sync_log(self.conn)[0]
+        self.assertEqual(
+            (row["duration_ms"], row["request_count"], row["bytes_transferred"],
+             row["throttle_seconds"], row["error_class"]),
+            (812.5, 7, 52000, 1.25, "ConnectionError"),
+        )
+
+
+class TestSyncPerformance(unittest.TestCase):
+    """Tests for get_sync_stats and find_sync_regressions."""
+
+    def setUp(self):
+        self.conn = init_db(os.path.join(tempfile.mkdtemp(), "test.db"))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def log_runs(self, source, durations, start_day=1, requests=10, status="success"):
+        """Log one run per day with the given durations (ms)."""
+        for i, duration in enumerate(durations):
+            mark_synced(
+                self.conn, source, "sync_cycle", 5, status,
+                duration_ms=duration, request_count=requests, bytes_transferred=1000,
+                throttle_seconds=0.0, error_class=None if status == "success" else "Timeout",
+            )
+            self.conn.execute(
+                "UPDATE sync_log SET timestamp = ? WHERE id = (SELECT MAX(id) FROM sync_log)",
+                (datetime(2026, 10, start_day + i, 9, tzinfo=timezone.utc).isoformat(),),
+            )
+        self.conn.commit()
+
+    def test_rolling_percentiles(self):
+        self.log_runs("gmail", [100, 200, 300, 400, 500])
+        self.log_runs("gmail", [50], start_day=6, status="error")
+        mark_synced(self.conn, "gmail", "pull", 1)  # no measurements: ignored
+
+        stats = get_sync_stats(self.conn)["gmail"]
+        self.assertEqual((stats["runs"], stats["errors"]), (6, 1))
+        self.assertEqual(stats["error_classes"], {"Timeout": 1})
+        self.assertEqual(stats["duration_ms"]["p50"], 300)
+        self.assertAlmostEqual(stats["duration_ms"]["p95"], 480)
+        self.assertEqual(stats["duration_ms"]["last"], 500)
+        self.assertEqual(stats["request_count"]["p50"], 10)
+
+    def test_window_keeps_most_recent_runs(self):
+        self.log_runs("jira", [1000] * 5 + [10] * 3)
+        stats = get_sync_stats(self.conn, source="jira", window=3)
+        self.assertEqual(stats["jira"]["runs"], 3)
+        self.assertEqual(stats["jira"]["duration_ms"]["p95"], 10)
+
+    def test_regression_streak_reported_since_first_slow_run(self):
+        # 2026-10-06 is a Tuesday.
+        self.log_runs("outlook", [1000, 1100, 900, 1000, 1050, 3000, 3100, 2900])
+        self.log_runs("gmail", [1000, 1100, 900, 1000, 1050, 1200])
+
+        regressions = find_sync_regressions(self.conn)
+        self.assertEqual(len(regressions), 1)
+        reg = regressions[0]
+        self.assertEqual((reg["source"], reg["metric"], reg["runs"]), ("outlook", "duration_ms", 3))
+        self.assertEqual(reg["baseline"], 1000)
+        self.assertEqual(reg["ratio"], 3.0)
+        self.assertTrue(reg["since"].startswith("2026-10-06"))
+        self.assertEqual(reg["message"], "Outlook sync got 3.0x slower since Tuesday 2026-10-06")
+
+    def test_request_count_regression(self):
+        self.log_runs("notion", [1000] * 4)
+        self.log_runs("notion", [1000], start_day=5, requests=40)
+        reg = find_sync_regressions(self.conn, threshold=3.0)
+        self.assertEqual([(r["metric"], r["ratio"]) for r in reg], [("request_count", 4.0)])
+        self.assertIn("made 4.0x more requests", reg[0]["message"])
+
+    def test_fast_or_short_histories_not_flagged(self):
+        self.log_runs("slack", [10, 12, 11, 60])  # 5x slower but far below the noise floor
+        self.log_runs("jira", [1000, 5000])  # not enough history for a baseline
+        self.assertEqual(find_sync_regressions(self.conn), [])
+
+
+class TestSyncCursors(unittest.TestCase):
+    """Tests for get_sync_cursors and set_sync_cursors."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "test.db")
+        self.conn = init_db(self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_empty_by_default(self):
+        """A source without cursors returns an empty mapping."""
+        self.assertEqual(get_sync_cursors(self.conn, "slack"), {})
+
+    def test_set_and_get(self):
+        """Cursors are stored per source and scope."""
+        set_sync_cursors(self.conn, "slack", {"C1": "100.0", "C2": "200.0"})
+        set_sync_cursors(self.conn, "jira", {"search": "tok"})
+
+        self.assertEqual(get_sync_cursors(self.conn, "slack"), {"C1": "100.0", "C2": "200.0"})
+        self.assertEqual(get_sync_cursors(self.conn, "jira"), {"search": "tok"})
+
+    def test_upsert(self):
+        """Setting an existing scope replaces its cursor."""
+        set_sync_cursors(self.conn, "slack", {"C1": "100.0"})
+        set_sync_cursors(self.conn, "slack", {"C1": "150.0"})
+        self.assertEqual(get_sync_cursors(self.conn, "slack"), {"C1": "150.0"})
+
 
 class TestGetConnection(unittest.TestCase):
     """Tests for the get_connection context manager."""
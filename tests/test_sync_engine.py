@@ -0,0 +1,425 @@
+"""test_sync_engine.py — Tests for src/sync_engine.py.
+
+All platform calls are patched; the tracking database lives in a temporary
+directory.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+# Ensure src/ is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import sync_engine
+import tracing
+from db import sqlite_store
+from integrations import gmail, jira, outlook, registry, slack
+from integrations.jira import TransitionResult
+from models import TaskSource, UnifiedTask
+
+
+def _task(task_id: str, source: TaskSource) -> UnifiedTask:
+    return UnifiedTask(id=task_id, source=source, title=f"Task {task_id}", status="active")
+
+
+class TestRunSyncCycle(unittest.TestCase):
+    """Pipeline behaviour of run_sync_cycle."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.created = []
+        self.gmail = [_task("g1", TaskSource.GMAIL), _task("g2", TaskSource.GMAIL)]
+        self.outlook = [_task("o1", TaskSource.OUTLOOK), _task("g1", TaskSource.GMAIL)]
+        self.notion = []
+        self.archive_ok = {}
+        self.updates = []
+        self.update_ok = True
+        for p in (
+            patch.object(sync_engine, "DB_PATH", os.path.join(self.tmpdir, "sync.db")),
+            patch.object(sqlite_store, "DEFAULT_DB_PATH", os.path.join(self.tmpdir, "taskcenter.db")),
+            patch.object(gmail, "iter_task_emails", side_effect=lambda: iter(self.gmail)),
+            patch.object(outlook, "iter_outlook_tasks", side_effect=lambda: iter(self.outlook)),
+            patch.object(sync_engine, "iter_notion_tasks", side_effect=lambda: iter(list(self.notion))),
+            patch.object(sync_engine, "create_task", side_effect=self._create),
+            patch.object(gmail, "archive_email_tasks", side_effect=self._archive),
+            patch.object(jira, "transition_jira_issues", side_effect=self._transition),
+            patch.object(outlook, "complete_outlook_task_ids", side_effect=lambda ids: {i: True for i in ids}),
+            patch.object(sync_engine, "update_tasks", side_effect=self._update),
+            # Slack and Jira are fetched only when configured.
+            patch.dict(os.environ, {
+                "SLACK_BOT_TOKEN": "", "JIRA_BASE_URL": "", "NOTION_TOKEN": "secret", "NOTION_TASKS_DB_ID": "db",
+                "TASKCENTER_PUSH_SOURCES": "",
+            }),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _create(self, title, priority, due_date=None):
+        self.created.append(title)
+        page = _task(f"n-{len(self.created)}-{title}", TaskSource.NOTION)
+        self.notion.append(page)
+        return page
+
+    def _update(self, updates):
+        self.updates.append(updates)
+        return {page_id: self.update_ok for page_id in updates}
+
+    def _archive(self, ids):
+        return {i: self.archive_ok.get(i, True) for i in ids}
+
+    def _transition(self, keys, name):
+        return {k: TransitionResult(k, k != "PROJ-2", None if k != "PROJ-2" else "409") for k in keys}
+
+    def tracked(self) -> dict:
+        conn = sync_engine._init_db()
+        try:
+            return sync_engine.get_tracked_tasks(conn)
+        finally:
+            conn.close()
+
+    def seed(self, rows):
+        conn = sync_engine._init_db()
+        sync_engine.update_tracked_tasks(conn, [
+            dict(zip(("source_id", "source_type", "notion_id", "status", "fingerprint"), row))
+            for row in rows
+        ])
+        conn.close()
+
+    def test_new_tasks_created_once_and_tracked(self):
+        report = sync_engine.run_sync_cycle()
+
+        self.assertEqual(sorted(self.created), ["[GMAIL] Task g1", "[GMAIL] Task g2", "[OUTLOOK] Task o1"])
+        tracked = self.tracked()
+        self.assertEqual(set(tracked), {"g1", "g2", "o1"})
+        self.assertTrue(all(d["status"] == "active" for d in tracked.values()))
+        self.assertEqual(report["created"], 3)
+        self.assertEqual(report["completed"], 0)
+
+    def test_completions_resolved_in_origin(self):
+        self.gmail, self.outlook = [], []
+        self.notion = [_task("n-keep", TaskSource.NOTION)]
+        self.archive_ok = {"g-bad": False}
+        self.seed([
+            ("g-ok", "gmail", "n-g-ok", "active", None),
+            ("g-bad", "gmail", "n-g-bad", "active", None),
+            ("PROJ-1", "jira", "n-j1", "active", None),
+            ("PROJ-2", "jira", "n-j2", "active", None),
+            ("o-1", "outlook", "n-o1", "active", None),
+            ("kept", "gmail", "n-keep", "active", None),
+        ])
+
+        report = sync_engine.run_sync_cycle()
+
+        status = {k: v["status"] for k, v in self.tracked().items()}
+        self.assertEqual(status, {
+            "g-ok": "completed", "g-bad": "active", "PROJ-1": "completed",
+            "PROJ-2": "active", "o-1": "completed", "kept": "active",
+        })
+        self.assertEqual(report["completed"], 3)
+        self.assertEqual(self.created, [])
+
+    def test_sources_without_batch_write_completed_one_by_one(self):
+        self.gmail, self.outlook = [], []
+        self.notion = [_task("n-keep", TaskSource.NOTION)]
+        self.seed([("g-1", "gmail", "n-g1", "active", None), ("g-2", "gmail", "n-g2", "active", None)])
+        single = replace(registry.SOURCES["gmail"], capabilities=frozenset())
+        with patch.dict(registry.SOURCES, {"gmail": single}), \
+                patch.object(gmail, "archive_email_tasks", side_effect=self._archive) as archive:
+            report = sync_engine.run_sync_cycle()
+
+        self.assertEqual(sorted(c.args[0] for c in archive.call_args_list), [["g-1"], ["g-2"]])
+        self.assertEqual(report["completed"], 2)
+
+    def test_pushed_source_read_from_task_store(self):
+        with sqlite_store.get_connection() as store:
+            sqlite_store.save_task(store, _task("slack-C1-3.0", TaskSource.SLACK))
+        env = {"SLACK_BOT_TOKEN": "xoxb-test", "TASKCENTER_PUSH_SOURCES": "slack"}
+        with patch.dict(os.environ, env), \
+                patch.object(slack, "iter_slack_tasks") as full_scan, \
+                patch.object(slack, "iter_slack_changes") as changes:
+            sync_engine.run_sync_cycle()
+
+        full_scan.assert_not_called()
+        changes.assert_not_called()
+        self.assertIn("[SLACK] Task slack-C1-3.0", self.created)
+
+    def _assert_nothing_resolved(self, report):
+        self.assertEqual(report["completed"], 0)
+        self.assertEqual(report["stages"]["resolve"]["items"], 0)
+        self.assertEqual({v["status"] for v in self.tracked().values()}, {"active"})
+
+    def test_failed_notion_read_resolves_nothing(self):
+        self.gmail, self.outlook = [], []
+        self.seed([("g-ok", "gmail", "n-g-ok", "active", None), ("PROJ-1", "jira", "n-j1", "active", None)])
+
+        def broken():
+            raise RuntimeError("notion 503")
+            yield
+
+        with patch.object(sync_engine, "iter_notion_tasks", side_effect=broken), \
+                patch.object(gmail, "archive_email_tasks") as archive, \
+                patch.object(jira, "transition_jira_issues") as transition:
+            report = sync_engine.run_sync_cycle()
+
+        archive.assert_not_called()
+        transition.assert_not_called()
+        self._assert_nothing_resolved(report)
+        self.assertEqual(report["sources"]["notion"]["error_class"], "RuntimeError")
+
+    def test_unconfigured_notion_resolves_nothing(self):
+        self.gmail, self.outlook = [], []
+        self.seed([("g-ok", "gmail", "n-g-ok", "active", None)])
+        with patch.dict(os.environ, {"NOTION_TOKEN": ""}), \
+                patch.object(gmail, "archive_email_tasks") as archive:
+            report = sync_engine.run_sync_cycle()
+        archive.assert_not_called()
+        self._assert_nothing_resolved(report)
+
+    def test_registry_sources_fetched_and_resolved(self):
+        self.notion = [_task("n-keep", TaskSource.NOTION)]
+        self.seed([("slack-C1-1.0", "slack", "n-s1", "active", None)])
+        with patch.dict(os.environ, {"SLACK_BOT_TOKEN": "xoxb-test"}), \
+                patch.object(slack, "iter_slack_tasks") as full_scan, \
+                patch.object(slack, "iter_slack_changes", side_effect=self._changes([_task("slack-C1-2.0", TaskSource.SLACK)])), \
+                patch.object(slack, "complete_slack_tasks", side_effect=lambda ids: {i: True for i in ids}) as complete:
+            report = sync_engine.run_sync_cycle()
+
+        full_scan.assert_not_called()
+        complete.assert_called_once_with(["slack-C1-1.0"])
+        self.assertIn("[SLACK] Task slack-C1-2.0", self.created)
+        self.assertEqual(self.tracked()["slack-C1-1.0"]["status"], "completed")
+        self.assertIn("slack", report["sources"])
+
+    def test_issues_done_at_origin_closed_in_notion(self):
+        self.gmail, self.outlook = [], []
+        self.notion = [_task("n-j1", TaskSource.NOTION), _task("n-j2", TaskSource.NOTION)]
+        self.seed([("PROJ-1", "jira", "n-j1", "active", None), ("PROJ-2", "jira", "n-j2", "active", None)])
+
+        def changes(cursors):
+            yield registry.DoneAtOrigin("jira", ["PROJ-1", "PROJ-9"])
+            cursors["updated_since"] = "2026-01-01T00:00:00+00:00"
+
+        env = {"JIRA_BASE_URL": "https://jira.test", "JIRA_USER_EMAIL": "a@b.c", "JIRA_API_TOKEN": "t"}
+        with patch.dict(os.environ, env), \
+                patch.object(jira, "iter_jira_changes", side_effect=changes), \
+                patch.object(jira, "transition_jira_issues") as transition:
+            report = sync_engine.run_sync_cycle()
+
+        transition.assert_not_called()
+        self.assertEqual(self.updates, [{"n-j1": sync_engine._NOTION_DONE}])
+        status = {k: v["status"] for k, v in self.tracked().items()}
+        self.assertEqual(status, {"PROJ-1": "completed", "PROJ-2": "active"})
+        self.assertEqual((report["completed"], report["updated"]), (1, 0))
+
+    def _changes(self, tasks, mark="2.0"):
+        """An incremental generator yielding ``tasks`` and advancing cursor C1 to ``mark``."""
+        seen = self.cursors_seen = []
+
+        def changes(cursors):
+            seen.append(dict(cursors))
+            yield from tasks
+            cursors["C1"] = mark
+
+        return changes
+
+    def test_incremental_cursors_advance_between_cycles(self):
+        with patch.dict(os.environ, {"SLACK_BOT_TOKEN": "xoxb-test"}), \
+                patch.object(slack, "iter_slack_changes", side_effect=self._changes([_task("slack-C1-2.0", TaskSource.SLACK)])):
+            sync_engine.run_sync_cycle()
+            sync_engine.run_sync_cycle()
+
+        self.assertEqual(self.cursors_seen, [{}, {"C1": "2.0"}])
+        conn = sync_engine._init_db()
+        try:
+            self.assertEqual(sync_engine.get_source_cursors(conn), {"slack": {"C1": "2.0"}})
+        finally:
+            conn.close()
+
+    def test_incremental_cursors_kept_after_failed_create(self):
+        def create(title, priority, due_date=None):
+            if "SLACK" in title:
+                return None
+            return self._create(title, priority, due_date)
+
+        with patch.dict(os.environ, {"SLACK_BOT_TOKEN": "xoxb-test"}), \
+                patch.object(sync_engine, "create_task", side_effect=create), \
+                patch.object(slack, "iter_slack_changes", side_effect=self._changes([_task("slack-C1-2.0", TaskSource.SLACK)])):
+            sync_engine.run_sync_cycle()
+            sync_engine.run_sync_cycle()
+
+        self.assertEqual(self.cursors_seen, [{}, {}])
+        self.assertNotIn("slack-C1-2.0", self.tracked())
+
+    def test_incremental_cursors_kept_after_fetch_error(self):
+        def broken(cursors):
+            cursors["updated_since"] = "2026-01-01T00:00:00+00:00"
+            raise RuntimeError("Jira fetch failed")
+            yield
+
+        env = {"JIRA_BASE_URL": "https://jira.test", "JIRA_USER_EMAIL": "a@b.c", "JIRA_API_TOKEN": "t"}
+        with patch.dict(os.environ, env), patch.object(jira, "iter_jira_changes", side_effect=broken):
+            report = sync_engine.run_sync_cycle()
+
+        self.assertEqual(report["sources"]["jira"]["error_class"], "RuntimeError")
+        conn = sync_engine._init_db()
+        try:
+            self.assertEqual(sync_engine.get_source_cursors(conn), {})
+        finally:
+            conn.close()
+
+    def test_stage_report(self):
+        report = sync_engine.run_sync_cycle()
+        stages = report["stages"]
+        self.assertEqual(list(stages), ["fetch", "diff", "create", "update", "resolve", "write"])
+        self.assertEqual(stages["fetch"]["items"], 5)  # 4 tasks + the Notion snapshot
+        self.assertEqual(stages["create"]["items"], 3)
+        self.assertEqual(stages["write"]["items"], 3)
+        for st in stages.values():
+            self.assertIn("throughput_per_s", st)
+            self.assertIn("avg_latency_ms", st)
+
+    def test_unchanged_tasks_skipped(self):
+        sync_engine.run_sync_cycle()
+        self.created.clear()
+
+        report = sync_engine.run_sync_cycle()
+        self.assertEqual(self.created, [])
+        self.assertEqual(report["skipped"]["unchanged"], 3)
+        self.assertEqual(report["skipped"]["duplicate"], 1)  # g1 arrives from both feeds
+        self.assertEqual(report["stages"]["write"]["items"], 0)
+
+    def test_changed_task_refreshes_fingerprint(self):
+        sync_engine.run_sync_cycle()
+        before = self.tracked()["g2"]["fingerprint"]
+        self.gmail[1] = UnifiedTask(id="g2", source=TaskSource.GMAIL, title="Task g2", status="urgent")
+
+        report = sync_engine.run_sync_cycle()
+        after = self.tracked()["g2"]
+        self.assertNotEqual(after["fingerprint"], before)
+        self.assertEqual(after["fingerprint"], self.gmail[1].fingerprint())
+        self.assertEqual(report["skipped"]["unchanged"], 2)
+        self.assertEqual(report["created"], 0)
+        self.assertEqual(self.updates, [])  # status is not mirrored in Notion
+
+    def test_field_changes_patched_in_notion(self):
+        sync_engine.run_sync_cycle()
+        notion_id = self.tracked()["o1"]["notion_id"]
+        self.outlook[0] = UnifiedTask(
+            id="o1", source=TaskSource.OUTLOOK, title="Task o1", status="active", priority="high"
+        )
+
+        report = sync_engine.run_sync_cycle()
+
+        self.assertEqual(self.updates, [{notion_id: {"Priority": {"select": {"name": "High"}}}}])
+        self.assertEqual(report["updated"], 1)
+        self.assertEqual(self.tracked()["o1"]["priority"], "high")
+        self.assertEqual(self.tracked()["o1"]["fingerprint"], self.outlook[0].fingerprint())
+
+        # Nothing changed since: no further PATCH.
+        sync_engine.run_sync_cycle()
+        self.assertEqual(len(self.updates), 1)
+
+    def test_failed_update_retried_next_cycle(self):
+        sync_engine.run_sync_cycle()
+        before = self.tracked()["g2"]
+        self.gmail[1] = UnifiedTask(id="g2", source=TaskSource.GMAIL, title="Renamed", status="active")
+        self.update_ok = False
+
+        report = sync_engine.run_sync_cycle()
+        self.assertEqual(report["updated"], 0)
+        self.assertEqual(self.tracked()["g2"], before)
+
+        self.update_ok = True
+        sync_engine.run_sync_cycle()
+        self.assertEqual(self.tracked()["g2"]["title"], "[GMAIL] Renamed")
+        self.assertEqual(list(self.updates[-1].values()),
+                         [{"Name": {"title": [{"text": {"content": "[GMAIL] Renamed"}}]}}])
+
+    def test_legacy_table_migrated(self):
+        import sqlite3
+
+        conn = sqlite3.connect(sync_engine.DB_PATH)
+        conn.execute(
+            "CREATE TABLE synced_tasks (source_id TEXT PRIMARY KEY, source_type TEXT NOT NULL,"
+            " notion_id TEXT NOT NULL, status TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO synced_tasks VALUES ('g1', 'gmail', 'n-g1', 'active')")
+        conn.commit()
+        conn.close()
+        self.notion = [_task("n-g1", TaskSource.NOTION)]
+
+        sync_engine.run_sync_cycle()
+        self.assertEqual(self.tracked()["g1"]["fingerprint"], self.gmail[0].fingerprint())
+
+    def test_failing_source_does_not_stop_cycle(self):
+        def broken():
+            yield _task("g1", TaskSource.GMAIL)
+            raise RuntimeError("gmail down")
+
+        with patch.object(gmail, "iter_task_emails", side_effect=broken):
+            report = sync_engine.run_sync_cycle()
+        self.assertEqual(set(self.tracked()), {"g1", "o1"})
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["sources"]["gmail"]["error_class"], "RuntimeError")
+        self.assertIsNone(report["sources"]["outlook"]["error_class"])
+
+    def test_source_runs_logged(self):
+        report = sync_engine.run_sync_cycle()
+        sync_engine.run_sync_cycle()
+
+        self.assertEqual(set(report["sources"]), {"gmail", "outlook", "notion"})
+        self.assertEqual(report["sources"]["gmail"]["items"], 2)
+        with sqlite_store.get_connection() as conn:
+            stats = sqlite_store.get_sync_stats(conn)
+        self.assertEqual(set(stats), {"gmail", "outlook", "notion"})
+        self.assertEqual(stats["outlook"]["runs"], 2)
+        self.assertIsNotNone(stats["outlook"]["duration_ms"]["p50"])
+
+    def test_create_errors_are_contained(self):
+        def flaky(title, priority, due_date=None):
+            if "o1" in title:
+                raise RuntimeError("notion 500")
+            return self._create(title, priority, due_date)
+
+        with patch.object(sync_engine, "create_task", side_effect=flaky):
+            sync_engine.run_sync_cycle()
+        self.assertEqual(set(self.tracked()), {"g1", "g2"})
+
+    def test_cycle_is_traced(self):
+        spans = []
+
+        class Exporter:
+            def export(self, batch):
+                spans.extend(batch)
+
+        tracing.configure(Exporter())
+        self.addCleanup(tracing.configure)
+        report = sync_engine.run_sync_cycle()
+
+        by_name = {}
+        for s in spans:
+            by_name.setdefault(s.name, []).append(s)
+        root = by_name["sync.cycle"][0]
+        self.assertEqual(report["trace_id"], root.trace_id)
+        self.assertEqual({s.trace_id for s in spans}, {root.trace_id})
+        self.assertEqual(root.attributes["created"], 3)
+        for stage in ("fetch", "diff", "create", "update", "resolve", "write"):
+            self.assertEqual(by_name[f"sync.{stage}"][0].parent_id, root.span_id)
+        fetch = by_name["sync.fetch"][0]
+        gmail = by_name["fetch.gmail"][0]
+        self.assertEqual(gmail.parent_id, fetch.span_id)
+        self.assertEqual(gmail.attributes, {"source": "gmail", "items": 2})
+        creates = by_name["notion.create_page"]
+        self.assertEqual(len(creates), 3)
+        self.assertEqual({s.parent_id for s in creates}, {by_name["sync.create"][0].span_id})
+
+    def test_untraced_cycle_has_no_trace_id(self):
+        self.assertIsNone(sync_engine.run_sync_cycle()["trace_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""test_tracing.py — Tests for src/tracing.py.
+
+Spans are captured in memory, in a temporary JSONL file or by the OTLP
+collector stand-in from ``benchmarks/fake_servers.py``. No external services
+required.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# Ensure the repository root (for benchmarks/) and src/ are importable
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import tracing
+from benchmarks.fake_servers import FakeServer, OtlpCollectorFake
+
+
+class MemoryExporter:
+    """Collects exported spans."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def by_name(self, name):
+        return next(s for s in self.spans if s.name == name)
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.exporter = MemoryExporter()
+        tracing.configure(self.exporter)
+
+    def tearDown(self):
+        tracing.configure()
+
+
+class TestDisabled(unittest.TestCase):
+    """Without exporters every helper is a no-op."""
+
+    def test_noop(self):
+        tracing.configure()
+        with tracing.span("x", a=1) as s:
+            s.set_attribute("b", 2)
+            self.assertIs(s, tracing.NOOP_SPAN)
+            self.assertIsNone(tracing.current_span())
+        self.assertEqual(list(tracing.traced_iter("it", [1, 2])), [1, 2])
+        self.assertFalse(tracing.enabled())
+
+
+class TestSpans(TracingTestCase):
+    """Parent/child links, attributes, errors and export timing."""
+
+    def test_nested_spans_share_trace(self):
+        with tracing.span("root", cycle=1) as root:
+            with tracing.span("child", page=2) as child:
+                child.set_attribute("items", 10)
+            self.assertEqual(self.exporter.spans, [])  # exported when the root ends
+        self.assertEqual([s.name for s in self.exporter.spans], ["child", "root"])
+        self.assertEqual(child.trace_id, root.trace_id)
+        self.assertEqual(child.parent_id, root.span_id)
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(child.attributes, {"page": 2, "items": 10})
+        self.assertGreaterEqual(root.duration_ms, child.duration_ms)
+
+    def test_error_status(self):
+        with self.assertRaises(ValueError):
+            with tracing.span("boom"):
+                raise ValueError("bad")
+        span = self.exporter.by_name("boom")
+        self.assertEqual(span.to_dict()["status"], "ERROR")
+        self.assertEqual(span.error, "ValueError: bad")
+
+    def test_traced_iter_in_worker_thread(self):
+        def pages():
+            for n in (1, 2):
+                with tracing.span("page", page=n):
+                    pass
+                yield n
+
+        root = tracing.start_span("root", parent=None)
+        out = []
+        worker = threading.Thread(target=lambda: out.extend(tracing.traced_iter("fetch", pages(), root)))
+        worker.start()
+        worker.join()
+        root.end()
+
+        fetch = self.exporter.by_name("fetch")
+        self.assertEqual(out, [1, 2])
+        self.assertEqual(fetch.parent_id, root.span_id)
+        self.assertEqual(fetch.attributes["items"], 2)
+        self.assertEqual(
+            [s.parent_id for s in self.exporter.spans if s.name == "page"], [fetch.span_id] * 2
+        )
+
+    def test_activate_sets_parent(self):
+        root = tracing.start_span("root", parent=None)
+        with tracing.activate(root):
+            with tracing.span("child"):
+                pass
+        self.assertIsNone(tracing.current_span())
+        root.end()
+        self.assertEqual(self.exporter.by_name("child").parent_id, root.span_id)
+
+
+class TestExporters(unittest.TestCase):
+    """JSONL files and OTLP/HTTP JSON."""
+
+    def tearDown(self):
+        tracing.configure()
+
+    def test_jsonl_round_trip_and_tree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces", "sync.jsonl")
+            tracing.configure(tracing.JsonlExporter(path))
+            with tracing.span("sync.cycle"):
+                with tracing.span("fetch.gmail", source="gmail"):
+                    pass
+            spans = tracing.load_spans(path)
+
+        self.assertEqual([s["name"] for s in spans], ["fetch.gmail", "sync.cycle"])
+        tree = tracing.format_trace(spans).splitlines()
+        self.assertTrue(tree[0].startswith("sync.cycle"))
+        self.assertTrue(tree[1].startswith("  fetch.gmail"))
+        self.assertIn("source=gmail", tree[1])
+
+    def test_otlp_collector(self):
+        with FakeServer(OtlpCollectorFake(0)) as srv:
+            tracing.configure(tracing.OtlpHttpExporter(srv.url))
+            with tracing.span("sync.cycle") as root:
+                with tracing.span("notion.page", page=3, ratio=0.5, ok=True):
+                    pass
+            received = list(srv.provider.spans)
+
+        self.assertEqual(len(received), 2)
+        page = next(s for s in received if s["name"] == "notion.page")
+        self.assertEqual(page["traceId"], root.trace_id)
+        self.assertEqual(page["parentSpanId"], root.span_id)
+        self.assertEqual(
+            page["attributes"],
+            [
+                {"key": "page", "value": {"intValue": "3"}},
+                {"key": "ratio", "value": {"doubleValue": 0.5}},
+                {"key": "ok", "value": {"boolValue": True}},
+            ],
+        )
+        self.assertEqual(page["status"], {"code": 1})
+
+    def test_failing_exporter_is_contained(self):
+        class Broken:
+            def export(self, spans):
+                raise OSError("disk full")
+
+        memory = MemoryExporter()
+        tracing.configure(Broken(), memory)
+        with tracing.span("x"):
+            pass
+        self.assertEqual(len(memory.spans), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,16 +7,19 @@ deduplication pipeline.
 import os
 import sys
 import unittest
+from unittest.mock import patch
 from datetime import datetime, timedelta, timezone
 
 # Ensure src/ is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from models import UnifiedTask, TaskSource, TaskPriority
+from dedup import unifier
 from dedup.unifier import (
     normalize_task,
     compute_similarity,
     merge_duplicates,
+    cluster_tasks,
     unify_tasks,
     DEFAULT_SIMILARITY_THRESHOLD,
 )
@@ -226,6 +229,14 @@ class TestUnifyTasks(unittest.TestCase):
         result = unify_tasks(tasks, similarity_threshold=0.60)
         self.assertEqual(len(result), 1)
 
+    def test_cluster_tasks_returns_indices(self):
+        tasks = [
+            _make_task(id="a", title="Review budget"),
+            _make_task(id="b", title="Deploy release"),
+            _make_task(id="c", source="notion", title="[GMAIL] Review budget!"),
+        ]
+        self.assertEqual(cluster_tasks(tasks), [[0, 2], [1]])
+
     def test_three_way_merge(self):
         tasks = [
             _make_task(id="t1", source="gmail", title="Deploy v2.0", priority="low"),
@@ -236,6 +247,40 @@ class TestUnifyTasks(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].priority, "high")
 
+    def test_unchanged_input_reuses_result(self):
+        tasks = [
+            _make_task(id="t1", title="Fix login bug"),
+            _make_task(id="t2", title="Fix login bug"),
+        ]
+        first = unify_tasks(tasks)
+        with patch.object(unifier, "SequenceMatcher", side_effect=AssertionError("recomputed")):
+            again = unify_tasks([t.model_copy() for t in tasks])
+        self.assertEqual([t.id for t in again], [t.id for t in first])
+
+        # A content change invalidates the memoized result.
+        tasks[1] = _make_task(id="t2", title="Write quarterly report")
+        self.assertEqual(len(unify_tasks(tasks)), 2)
+
+    def test_link_change_invalidates_result(self):
+        unifier.clear_unify_cache()
+        tasks = [_make_task(id="t1", title="Fix login bug"), _make_task(id="t2", title="Fix login bug")]
+        first = unify_tasks(tasks)
+        self.assertIsNone(first[0].link)
+
+        # fingerprint() ignores links, but merged results carry them.
+        tasks[0] = _make_task(id="t1", title="Fix login bug", link="https://mail.example/t1")
+        self.assertEqual(unify_tasks(tasks)[0].link, "https://mail.example/t1")
+
+    def test_cached_result_not_shared_with_callers(self):
+        unifier.clear_unify_cache()
+        tasks = [
+            _make_task(id="t1", title="Fix login bug", link="https://a.example"),
+            _make_task(id="t2", title="Fix login bug"),
+        ]
+        unify_tasks(tasks)[0].link = "changed"
+        unify_tasks(tasks)[0].link = "changed again"
+        self.assertEqual(unify_tasks(tasks)[0].link, "https://a.example")
+
 
 if __name__ == "__main__":
     unittest.main()